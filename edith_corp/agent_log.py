@@ -0,0 +1,167 @@
+"""
+EDITH Corporation - エージェントの構造化ログ
+各エージェントの進捗メッセージを print ではなくここから出す。
+stdout は結果JSON専用にして、ログは stderr（またはファイル）に1行1JSONで書く。
+
+- レベル付き（debug / info / warning / error）。EDITH_LOG_LEVEL で下限を指定（既定 INFO）
+- 呼び出し側はキューに積むだけ（QueueHandler）。書き込みは別スレッド（QueueListener）
+- 出力先は EDITH_LOG_FILE があればそのファイル（追記）、なければ stderr
+- EDITH_LOG_FORMAT=text で人が読む形式（[エージェント名] メッセージ）
+- ミッショントレース中なら trace_id を付ける
+
+    from agent_log import get_logger
+    log = get_logger("リサーチ足軽")
+    log.info("記事提案完了", suggestions=5)
+
+    {"ts": "2026-02-10T09:00:00.123+09:00", "level": "info", "agent": "リサーチ足軽",
+     "msg": "記事提案完了", "suggestions": 5, "pid": 1234, "thread": "MainThread"}
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+ENV_LOG_FILE = "EDITH_LOG_FILE"
+ENV_LOG_LEVEL = "EDITH_LOG_LEVEL"
+ENV_LOG_FORMAT = "EDITH_LOG_FORMAT"
+
+ROOT_LOGGER = "edith"
+
+# logging.Logger._log が受け付けるキーワード（それ以外は構造化フィールドとして扱う）
+_LOGGING_KWARGS = ("exc_info", "stack_info", "stacklevel")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """1レコード1行のJSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "agent": getattr(record, "agent", record.name),
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        entry["pid"] = record.process
+        entry["thread"] = record.threadName
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """[エージェント名] メッセージ key=value"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None) or {}
+        line = f"[{getattr(record, 'agent', record.name)}] {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.levelno >= logging.WARNING:
+            line = f"{record.levelname}: {line}"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """呼び出し側のスレッドで本文と例外を文字列化してからキューに積む"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        mission_trace = sys.modules.get("mission_trace")
+        if mission_trace is not None:
+            record.trace_id = mission_trace.current_trace_id()
+        return record
+
+
+class AgentLogger(logging.LoggerAdapter):
+    """エージェント名と構造化フィールドを付けるアダプタ"""
+
+    def __init__(self, logger: logging.Logger, agent: str):
+        super().__init__(logger, {"agent": agent})
+        self.agent = agent
+
+    def process(self, msg: Any, kwargs: Dict[str, Any]):
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in _LOGGING_KWARGS}
+        kwargs["extra"] = {"agent": self.agent, "fields": fields}
+        return msg, kwargs
+
+
+_configure_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _target_handler() -> logging.Handler:
+    path = os.environ.get(ENV_LOG_FILE)
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handler: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    if os.environ.get(ENV_LOG_FORMAT, "json") == "text":
+        handler.setFormatter(TextFormatter())
+    else:
+        handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+def configure():
+    """ルートロガー "edith" にキューを繋ぐ（何度呼んでも1回だけ）"""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(os.environ.get(ENV_LOG_LEVEL, "INFO").upper())
+        root.propagate = False
+        root.addHandler(_QueueHandler(log_queue))
+
+        _listener = logging.handlers.QueueListener(log_queue, _target_handler())
+        _listener.start()
+        atexit.register(shutdown)
+
+
+def shutdown():
+    """キューに残ったログを書き出して書き込みスレッドを止める"""
+    global _listener
+    with _configure_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        for handler in list(logging.getLogger(ROOT_LOGGER).handlers):
+            logging.getLogger(ROOT_LOGGER).removeHandler(handler)
+
+
+def get_logger(agent: str) -> AgentLogger:
+    """
+    エージェント用のロガーを取得
+
+    Args:
+        agent: エージェント名（例: "コンテンツ足軽大将"）
+
+    Returns:
+        log.info("メッセージ", key=value) の形で使えるロガー
+    """
+    configure()
+    return AgentLogger(logging.getLogger(f"{ROOT_LOGGER}.{agent}"), agent)
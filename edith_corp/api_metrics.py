@@ -0,0 +1,682 @@
+#!/usr/bin/env python3
+"""
+EDITH Corporation - 外部API呼び出しの計測（サービス別・エンドポイント別）
+WordPress / Gemini / Brevo / Search Console / GA4 / Google Calendar の各クライアントが
+install() を呼ぶと、http_instrumentation のフックで全HTTP呼び出しを数える。
+
+- サービス別・エンドポイント別（"POST /v3/contacts/{id}" のようにIDを伏せた形）に
+  呼び出し数・エラー数・ステータス別件数・429（レート制限）・リトライ数・送信バイト数
+- レイテンシはHDR風の対数線形ヒストグラム（2倍ごとに32区間、誤差およそ3%）で保持し、
+  p50 / p90 / p99 / max を後から出せる
+- レスポンスヘッダーの x-ratelimit-* / x-sib-ratelimit-* から残りクォータの最小値を記録
+- 日ごとの集計を REPORTS_DIR/api_metrics/api_metrics_YYYY-MM-DD.json に
+  プロセス終了時と一定間隔（バックグラウンドスレッド）でマージして書き込む（複数プロセスの集計を消さない）
+- 書き込めない・ファイルが壊れているなどの失敗は警告だけにし、計測対象の呼び出しには影響させない
+  （壊れたファイルは .corrupt-<時刻> に退避して作り直す）
+- 環境変数 EDITH_API_METRICS=0 で無効（ベンチマーク・検証用サーバー向けの実行はこれで集計に入れない）
+
+使い方:
+  python3 api_metrics.py report                        # 今日
+  python3 api_metrics.py report --days 7 --sort p99    # 直近7日・遅い順
+  python3 api_metrics.py report --date 2026-02-10 --service brevo --endpoints 20
+"""
+
+import argparse
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows ではプロセス間ロックなし
+    fcntl = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import http_instrumentation
+from output_paths import REPORTS_DIR
+
+METRICS_DIR = REPORTS_DIR / "api_metrics"
+ENV_DISABLE = "EDITH_API_METRICS"
+
+FLUSH_INTERVAL = 60  # 長時間動くプロセスでも、この秒数ごとにバックグラウンドで書き出す
+MAX_ENDPOINTS = 200  # サービスごとのエンドポイント数の上限（超えた分は "(other)"）
+
+# ホスト → サービス名
+HOST_SERVICES = {
+    "generativelanguage.googleapis.com": "gemini",
+    "api.brevo.com": "brevo",
+    "searchconsole.googleapis.com": "search_console",
+    "analyticsdata.googleapis.com": "ga4",
+    "oauth2.googleapis.com": "google_oauth",
+}
+
+# www.googleapis.com のようにホストを共有するAPIはパスの先頭で判定
+PATH_SERVICES = [
+    ("/calendar/", "google_calendar"),
+    ("/webmasters/", "search_console"),
+    ("/discovery/", "google_discovery"),
+]
+
+# 残りクォータのレスポンスヘッダー（先に見つかった方を使う）
+QUOTA_LIMIT_HEADERS = ("x-sib-ratelimit-limit", "x-ratelimit-limit")
+QUOTA_REMAINING_HEADERS = ("x-sib-ratelimit-remaining", "x-ratelimit-remaining")
+
+# 同じURLへの直前の呼び出しがこの状態なら、次の呼び出しをリトライとして数える
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-f]{16,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[A-Za-z0-9_]{20,})$",
+    re.IGNORECASE,
+)
+
+
+# ==================== ヒストグラム ====================
+
+class LatencyHistogram:
+    """
+    HDR風の対数線形ヒストグラム（マイクロ秒）
+
+    64µs 未満は1µs刻み、それ以上は2倍ごとに32区間。区間番号が連続するように
+    index = shift * 32 + (value >> shift) とし、疎な辞書 {index: 件数} で持つ。
+    """
+
+    SUB_BUCKETS = 32
+
+    __slots__ = ("counts", "count", "sum_us", "min_us", "max_us")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    @classmethod
+    def bucket_index(cls, value_us: int) -> int:
+        shift = max(0, value_us.bit_length() - 6)
+        return shift * cls.SUB_BUCKETS + (value_us >> shift)
+
+    @classmethod
+    def bucket_range(cls, index: int) -> Tuple[int, int]:
+        """区間 [下限, 上限) を返す"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index, index + 1
+        shift = index // cls.SUB_BUCKETS - 1
+        sub = index - shift * cls.SUB_BUCKETS
+        return sub << shift, (sub + 1) << shift
+
+    def record(self, value_us: int):
+        value_us = max(0, int(value_us))
+        index = self.bucket_index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, q: float) -> float:
+        """
+        q（0〜100）パーセンタイルの推定値（ミリ秒）
+
+        該当区間の中央値を返し、観測した min / max の範囲に収める。
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bucket_range(index)
+                value = min(max((low + high - 1) / 2, self.min_us or 0), self.max_us)
+                return value / 1000
+        return self.max_us / 1000
+
+    def mean_ms(self) -> float:
+        return self.sum_us / self.count / 1000 if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_us": self.sum_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "buckets": {str(k): v for k, v in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        hist = cls()
+        hist.counts = {int(k): v for k, v in data.get("buckets", {}).items()}
+        hist.count = data.get("count", 0)
+        hist.sum_us = data.get("sum_us", 0)
+        hist.min_us = data.get("min_us")
+        hist.max_us = data.get("max_us", 0)
+        return hist
+
+
+# ==================== 集計 ====================
+
+class CallStats:
+    """呼び出し数・エラー・ステータス・レイテンシの集計（サービス単位・エンドポイント単位で共通）"""
+
+    __slots__ = ("calls", "errors", "retries", "rate_limited", "bytes_sent", "status", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.bytes_sent = 0
+        self.status: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+
+    def record(self, status: Optional[int], error: Optional[str], elapsed_us: int,
+               bytes_sent: int, retry: bool):
+        self.calls += 1
+        self.bytes_sent += bytes_sent
+        self.retries += retry
+        if error or status is None:
+            self.errors += 1
+            key = error or "no_response"
+        else:
+            key = f"{status // 100}xx"
+            self.errors += status >= 400
+            self.rate_limited += status == 429
+        self.status[key] = self.status.get(key, 0) + 1
+        self.latency.record(elapsed_us)
+
+    def merge(self, other: "CallStats"):
+        self.calls += other.calls
+        self.errors += other.errors
+        self.retries += other.retries
+        self.rate_limited += other.rate_limited
+        self.bytes_sent += other.bytes_sent
+        for key, n in other.status.items():
+            self.status[key] = self.status.get(key, 0) + n
+        self.latency.merge(other.latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "bytes_sent": self.bytes_sent,
+            "status": self.status,
+            "latency": self.latency.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CallStats":
+        stats = cls()
+        for key in ("calls", "errors", "retries", "rate_limited", "bytes_sent"):
+            setattr(stats, key, data.get(key, 0))
+        stats.status = dict(data.get("status", {}))
+        stats.latency = LatencyHistogram.from_dict(data.get("latency", {}))
+        return stats
+
+
+class ServiceStats(CallStats):
+    """サービス単位の集計 + エンドポイント別の内訳 + 残りクォータ"""
+
+    __slots__ = ("endpoints", "quota")
+
+    def __init__(self):
+        super().__init__()
+        self.endpoints: Dict[str, CallStats] = {}
+        self.quota: Dict[str, Any] = {}
+
+    def endpoint(self, name: str) -> CallStats:
+        stats = self.endpoints.get(name)
+        if stats is None:
+            if len(self.endpoints) >= MAX_ENDPOINTS:
+                name = "(other)"
+                stats = self.endpoints.get(name)
+            if stats is None:
+                stats = self.endpoints[name] = CallStats()
+        return stats
+
+    def record_quota(self, limit: Optional[int], remaining: Optional[int]):
+        if limit is not None:
+            self.quota["limit"] = max(self.quota.get("limit", 0), limit)
+        if remaining is not None:
+            self.quota["remaining_min"] = min(self.quota.get("remaining_min", remaining), remaining)
+            self.quota["remaining_last"] = remaining
+
+    def merge(self, other: "ServiceStats"):
+        super().merge(other)
+        for name, stats in other.endpoints.items():
+            self.endpoint(name).merge(stats)
+        self.record_quota(other.quota.get("limit"), other.quota.get("remaining_min"))
+        if "remaining_last" in other.quota:
+            self.quota["remaining_last"] = other.quota["remaining_last"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data["quota"] = self.quota
+        data["endpoints"] = {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ServiceStats":
+        stats = cls()
+        base = CallStats.from_dict(data)
+        for key in CallStats.__slots__:
+            setattr(stats, key, getattr(base, key))
+        stats.quota = dict(data.get("quota", {}))
+        stats.endpoints = {name: CallStats.from_dict(d) for name, d in data.get("endpoints", {}).items()}
+        return stats
+
+
+# ==================== 分類 ====================
+
+# クライアントが登録したURL接頭辞 → サービス名（自前ホストのWordPressや検証用サーバー向け）
+_registered: List[Tuple[str, str]] = []
+
+
+def register_service(name: str, base_url: str):
+    """
+    URL接頭辞をサービス名に対応付ける（長い接頭辞が優先）
+
+    Args:
+        name: サービス名（例: "wordpress"）
+        base_url: このURLで始まる呼び出しを name として数える
+    """
+    parts = urlsplit(base_url)
+    prefix = f"{parts.netloc}{parts.path.rstrip('/')}"
+    if (prefix, name) not in _registered:
+        _registered.append((prefix, name))
+        _registered.sort(key=lambda item: -len(item[0]))
+
+
+def classify(host: str, path: str) -> str:
+    """ホストとパスからサービス名を決める（不明ならホスト名）"""
+    target = f"{host}{path}"
+    for prefix, name in _registered:
+        if target == prefix or target.startswith(prefix + "/"):
+            return name
+    if host in HOST_SERVICES:
+        return HOST_SERVICES[host]
+    if host.endswith("googleapis.com"):
+        for path_prefix, name in PATH_SERVICES:
+            if path.startswith(path_prefix):
+                return name
+    if "/wp-json/" in path:
+        return "wordpress"
+    return host
+
+
+def normalize_endpoint(method: str, path: str) -> str:
+    """
+    パス中のIDを {id} に置き換えたエンドポイント名
+
+    数字・16進・UUID・長い英数字・メールアドレス・URLエンコードされた値をIDとみなす。
+    "123456:runReport" のような「ID:動詞」は動詞を残す。
+    """
+    segments = []
+    for segment in path.split("/"):
+        name, sep, verb = segment.partition(":")
+        if name and ("@" in name or "%" in name or _ID_SEGMENT.match(name)):
+            name = "{id}"
+        segments.append(f"{name}{sep}{verb}")
+    return f"{method} {'/'.join(segments) or '/'}"
+
+
+def _header_int(headers: Any, names: Tuple[str, ...]) -> Optional[int]:
+    if not headers:
+        return None
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def _warn(message: str):
+    print(f"⚠️ {message}", file=sys.stderr)
+
+
+# ==================== 記録 ====================
+
+class ApiMetrics:
+    """プロセス内の集計（日付 → サービス名 → ServiceStats）"""
+
+    def __init__(self, metrics_dir: Optional[Path] = None):
+        self.metrics_dir = Path(metrics_dir or METRICS_DIR)
+        self._days: Dict[str, Dict[str, ServiceStats]] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.local()
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _is_retry(self, call: Dict[str, Any]) -> bool:
+        """同じスレッドで同じURLへの直前の呼び出しが失敗していればリトライ"""
+        key = (call["method"], call["url"])
+        retry = getattr(self._thread, "last_failed", None) == key
+        failed = call["error"] is not None or call["status"] in RETRYABLE_STATUS
+        self._thread.last_failed = key if failed else None
+        return retry
+
+    def record(self, call: Dict[str, Any], elapsed_us: int):
+        """1回の呼び出しを記録（メモリ上の集計だけ。書き出しは start() のスレッドと終了時）"""
+        service = classify(call["host"], call["path"])
+        endpoint = normalize_endpoint(call["method"], call["path"])
+        retry = self._is_retry(call)
+        headers = call.get("headers")
+        limit = _header_int(headers, QUOTA_LIMIT_HEADERS)
+        remaining = _header_int(headers, QUOTA_REMAINING_HEADERS)
+        args = (call["status"], call["error"], elapsed_us, call["bytes_sent"], retry)
+
+        with self._lock:
+            day = self._days.setdefault(date.today().isoformat(), {})
+            stats = day.get(service)
+            if stats is None:
+                stats = day[service] = ServiceStats()
+            stats.record(*args)
+            stats.endpoint(endpoint).record(*args)
+            stats.record_quota(limit, remaining)
+
+    def start(self):
+        """FLUSH_INTERVAL ごとに書き出すバックグラウンドスレッドを起動（何度呼んでも1つだけ）"""
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="api-metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        """バックグラウンドの書き出しを止める（未書き出しの集計は残る）"""
+        self._stopped.set()
+
+    def _flush_loop(self):
+        while not self._stopped.wait(FLUSH_INTERVAL):
+            self.flush()
+
+    def rollup_path(self, day: str) -> Path:
+        return self.metrics_dir / f"api_metrics_{day}.json"
+
+    @contextmanager
+    def _file_lock(self, path: Path) -> Iterator[None]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix(".json.lock"), "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def flush(self) -> List[Path]:
+        """
+        未書き出しの集計を日ごとのファイルにマージして書き込む
+
+        ロックの下で最新を読み直してから一時ファイル経由で置き換える。
+        例外は投げない（失敗した日の集計は警告を出してメモリに戻し、次回に書き出す）。
+
+        Returns:
+            書き込んだファイル
+        """
+        with self._lock:
+            days, self._days = self._days, {}
+
+        written = []
+        for day, services in days.items():
+            path = self.rollup_path(day)
+            try:
+                self._write_day(day, services, path)
+            except Exception as e:
+                _warn(f"API計測の書き出しに失敗（{path}）: {type(e).__name__}: {e}")
+                self._restore(day, services)
+                continue
+            written.append(path)
+        return written
+
+    def _write_day(self, day: str, services: Dict[str, ServiceStats], path: Path):
+        with self._file_lock(path):
+            try:
+                merged = _parse_rollup(path)
+            except ValueError as e:
+                corrupt_path = path.with_suffix(f".json.corrupt-{datetime.now():%Y%m%d%H%M%S}")
+                os.replace(path, corrupt_path)
+                _warn(f"壊れたAPI計測ファイルを {corrupt_path.name} に退避: {e}")
+                merged = {}
+
+            # 読み込んだ側にマージする（失敗時に戻す services 自体は変更しない）
+            for name, stats in services.items():
+                if name in merged:
+                    merged[name].merge(stats)
+                else:
+                    merged[name] = stats
+            data = {
+                "date": day,
+                "updated_at": datetime.now().isoformat(),
+                "services": {name: stats.to_dict() for name, stats in sorted(merged.items())},
+            }
+            tmp_path = path.with_suffix(f".json.{os.getpid()}.tmp")
+            try:
+                tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp_path, path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+    def _restore(self, day: str, services: Dict[str, ServiceStats]):
+        """書き出せなかった集計をメモリに戻す"""
+        with self._lock:
+            current = self._days.setdefault(day, {})
+            for name, stats in services.items():
+                if name in current:
+                    stats.merge(current[name])
+                current[name] = stats
+
+
+_metrics: Optional[ApiMetrics] = None
+_install_lock = threading.Lock()
+
+
+@contextmanager
+def _measure(call: Dict[str, Any]) -> Iterator[None]:
+    """http_instrumentation のリスナー: 呼び出し時間を測って記録（計測の失敗で呼び出しを失敗させない）"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _metrics is not None:
+            try:
+                _metrics.record(call, int((time.perf_counter() - start) * 1_000_000))
+            except Exception as e:
+                _warn(f"API計測の記録に失敗: {type(e).__name__}: {e}")
+
+
+def _flush_at_exit():
+    if _metrics is None:
+        return
+    try:
+        _metrics.stop()
+        _metrics.flush()
+    except Exception as e:
+        _warn(f"API計測の書き出しに失敗: {type(e).__name__}: {e}")
+
+
+def install(service: Optional[str] = None, base_url: Optional[str] = None) -> Optional[ApiMetrics]:
+    """
+    計測を有効にする（何度呼んでも1回だけ）。各APIクライアントの初期化で呼ぶ。
+
+    Args:
+        service: base_url を数えるサービス名（自前ホストのWordPressなど）
+        base_url: service に対応付けるURL接頭辞
+
+    Returns:
+        プロセス内の集計（EDITH_API_METRICS=0 なら None）
+    """
+    global _metrics
+    if os.environ.get(ENV_DISABLE, "1") == "0":
+        return None
+
+    if service and base_url:
+        register_service(service, base_url)
+
+    with _install_lock:
+        if _metrics is None:
+            _metrics = ApiMetrics()
+            _metrics.start()
+            http_instrumentation.add_listener(_measure)
+            atexit.register(_flush_at_exit)
+    return _metrics
+
+
+# ==================== レポート ====================
+
+def _parse_rollup(path: Path) -> Dict[str, ServiceStats]:
+    """日ごとのファイルを読む（なければ空、壊れていれば ValueError）"""
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return {}
+    try:
+        data = json.loads(raw.decode("utf-8"))
+        return {name: ServiceStats.from_dict(d) for name, d in data.get("services", {}).items()}
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError(f"{path.name} を読めません: {type(e).__name__}: {e}") from e
+
+
+def load_rollup(path: Path) -> Dict[str, ServiceStats]:
+    """日ごとのファイルを読む（なければ空、壊れていれば警告して空）"""
+    try:
+        return _parse_rollup(path)
+    except ValueError as e:
+        _warn(str(e))
+        return {}
+
+
+def load_range(days: List[str], metrics_dir: Optional[Path] = None) -> Dict[str, ServiceStats]:
+    """複数日の集計を合算"""
+    metrics = ApiMetrics(metrics_dir)
+    total: Dict[str, ServiceStats] = {}
+    for day in days:
+        for name, stats in load_rollup(metrics.rollup_path(day)).items():
+            if name in total:
+                total[name].merge(stats)
+            else:
+                total[name] = stats
+    return total
+
+
+SORT_KEYS = {
+    "calls": lambda s: s.calls,
+    "errors": lambda s: s.errors,
+    "p50": lambda s: s.latency.percentile(50),
+    "p99": lambda s: s.latency.percentile(99),
+    "total": lambda s: s.latency.sum_us,
+}
+
+
+def _row(name: str, stats: CallStats, width: int) -> str:
+    hist = stats.latency
+    return (
+        f"{name:<{width}} {stats.calls:>7} {stats.errors:>6} {stats.rate_limited:>5} {stats.retries:>7} "
+        f"{hist.percentile(50):>9.1f} {hist.percentile(90):>9.1f} {hist.percentile(99):>9.1f} "
+        f"{hist.max_us / 1000:>9.1f} {hist.sum_us / 1_000_000:>9.1f}"
+    )
+
+
+def print_report(services: Dict[str, ServiceStats], sort: str = "p99", endpoints: int = 10):
+    """サービス別の表と、サービスごとの上位エンドポイントを表示"""
+    if not services:
+        print("（記録なし）")
+        return
+
+    key = SORT_KEYS[sort]
+    header = (f"{'calls':>7} {'errors':>6} {'429':>5} {'retries':>7} "
+              f"{'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9} {'total(s)':>9}")
+
+    print(f"{'service':<20} {header}")
+    ordered = sorted(services.items(), key=lambda item: -key(item[1]))
+    for name, stats in ordered:
+        print(_row(name, stats, 20))
+
+    for name, stats in ordered:
+        print(f"\n📡 {name}")
+        if stats.quota:
+            quota = stats.quota
+            print(f"   クォータ: limit={quota.get('limit', '-')} "
+                  f"残り最小={quota.get('remaining_min', '-')} 最終={quota.get('remaining_last', '-')}")
+        if endpoints <= 0:
+            continue
+        width = max(20, min(60, max(len(e) for e in stats.endpoints)))
+        print(f"   {'endpoint':<{width}} {header}")
+        top = sorted(stats.endpoints.items(), key=lambda item: -key(item[1]))[:endpoints]
+        for endpoint, endpoint_stats in top:
+            print(f"   {_row(endpoint[:width], endpoint_stats, width)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="外部API呼び出しの集計")
+    subparsers = parser.add_subparsers(dest="command")
+
+    p_report = subparsers.add_parser("report", help="サービス別・エンドポイント別の集計を表示")
+    p_report.add_argument("--date", help="対象日（YYYY-MM-DD、省略時は今日）")
+    p_report.add_argument("--days", type=int, default=1, help="対象日から遡る日数")
+    p_report.add_argument("--service", help="このサービスだけ表示")
+    p_report.add_argument("--sort", choices=sorted(SORT_KEYS), default="p99", help="並び順")
+    p_report.add_argument("--endpoints", type=int, default=10, help="サービスごとに表示するエンドポイント数")
+    p_report.add_argument("--json", action="store_true", help="集計をJSONで出力")
+
+    args = parser.parse_args()
+
+    if args.command == "report":
+        end = date.fromisoformat(args.date) if args.date else date.today()
+        days = [(end - timedelta(days=i)).isoformat() for i in range(max(1, args.days))][::-1]
+        services = load_range(days)
+        if args.service:
+            services = {k: v for k, v in services.items() if k == args.service}
+
+        if args.json:
+            print(json.dumps({
+                "days": days,
+                "services": {
+                    name: {
+                        **{k: v for k, v in stats.to_dict().items() if k not in ("endpoints", "latency")},
+                        "mean_ms": round(stats.latency.mean_ms(), 3),
+                        "p50_ms": stats.latency.percentile(50),
+                        "p90_ms": stats.latency.percentile(90),
+                        "p99_ms": stats.latency.percentile(99),
+                        "max_ms": stats.latency.max_us / 1000,
+                    }
+                    for name, stats in services.items()
+                },
+            }, ensure_ascii=False, indent=2))
+            return
+
+        print(f"📊 API呼び出し集計 {days[0]} 〜 {days[-1]}")
+        print_report(services, sort=args.sort, endpoints=args.endpoints)
+        return
+
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
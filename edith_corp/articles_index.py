@@ -0,0 +1,203 @@
+"""
+EDITH Corporation - 記事インデックス（articles_index.json）の共通アクセス
+ブログ部門（投稿・SEO）とリサーチ部門が同じインスタンスを共有して読み書きする。
+
+- スラッグ → 記事のマップと最大IDを保持（重複判定・ID採番が O(1)）
+- 読み込みは更新日時（mtime）とサイズが変わったときだけ再パース
+- 書き込みはアドバイザリロック（.lock ファイル）の下で最新を読み直してから、
+  一時ファイル経由で置き換える（他プロセスの追加を消さない）
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows ではプロセス間ロックなし（プロセス内ロックのみ）
+    fcntl = None
+
+from output_paths import BLOG_ARTICLES_INDEX
+
+
+class ArticlesIndex:
+    """articles_index.json のキャッシュ付きアクセサ"""
+
+    _instances: Dict[Path, "ArticlesIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, path: Optional[Path] = None) -> "ArticlesIndex":
+        """パスごとに1つのインスタンスを返す（プロセス内でキャッシュを共有）"""
+        path = Path(path or BLOG_ARTICLES_INDEX)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or BLOG_ARTICLES_INDEX)
+        self.lock_path = self.path.with_suffix(".json.lock")
+        self._lock = threading.RLock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._data: Dict = self._empty()
+        self._by_slug: Dict[str, Dict] = {}
+        self._max_id = 0
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {"version": 1, "updated_at": "", "total_articles": 0, "articles": []}
+
+    # ==================== 読み込み ====================
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        """ファイルが変わっていれば読み直す（JSON破損時は json.JSONDecodeError）"""
+        signature = self._stat_signature()
+        if signature is not None and signature == self._signature:
+            return
+
+        data = json.loads(self.path.read_text(encoding="utf-8")) if signature else self._empty()
+        data.setdefault("articles", [])
+        self._set_data(data, signature)
+
+    def _set_data(self, data: Dict, signature: Optional[Tuple[int, int]]):
+        self._data = data
+        self._signature = signature
+        self._by_slug = {a.get("slug"): a for a in data["articles"] if a.get("slug")}
+        self._max_id = max((a.get("id") or 0 for a in data["articles"]), default=0)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def articles(self) -> List[Dict]:
+        """全記事（新しい順）"""
+        with self._lock:
+            self._refresh()
+            return list(self._data["articles"])
+
+    def get(self, slug: str) -> Optional[Dict]:
+        """スラッグで記事を取得"""
+        with self._lock:
+            self._refresh()
+            return self._by_slug.get(slug)
+
+    def __contains__(self, slug: str) -> bool:
+        return self.get(slug) is not None
+
+    @property
+    def max_id(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._max_id
+
+    @property
+    def updated_at(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._data.get("updated_at", "")
+
+    # ==================== 書き込み ====================
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """プロセス内ロック + .lock ファイルの排他ロック"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                except Exception:
+                    # 書き込み途中で失敗したらメモリ上の変更を捨てて次回読み直す
+                    self._signature = None
+                    raise
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self):
+        """一時ファイル経由で置き換え（ロック内で呼ぶ）"""
+        self._data["total_articles"] = len(self._data["articles"])
+        self._data["updated_at"] = datetime.now().isoformat()
+        tmp_path = self.path.with_suffix(f".json.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._signature = self._stat_signature()
+
+    def upsert_many(self, entries: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        記事をまとめて追加・更新して1回だけ書き込む
+
+        既存スラッグは渡されたフィールド（title / url / excerpt など）を更新し、
+        新規スラッグは id・published_date・source を補って先頭に追加する。
+
+        Args:
+            entries: [{"slug": ..., "title": ..., "url": ..., "excerpt": ...}, ...]
+
+        Returns:
+            (追加した記事, 更新した記事)
+        """
+        if not entries:
+            return [], []
+
+        with self._file_lock():
+            self._refresh()
+            return self._upsert_locked(entries)
+
+    def _upsert_locked(self, entries: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """upsert_many の本体（ロック内・最新読み込み済みで呼ぶ）"""
+        added: List[Dict] = []
+        updated: List[Dict] = []
+
+        for fields in entries:
+            slug = fields.get("slug", "")
+            existing = self._by_slug.get(slug)
+            if existing is not None:
+                existing.update({k: v for k, v in fields.items() if k not in ("id", "published_date")})
+                updated.append(existing)
+                continue
+
+            self._max_id += 1
+            entry = {
+                "id": self._max_id,
+                "title": fields.get("title", ""),
+                "slug": slug,
+                "url": fields.get("url", ""),
+                "published_date": fields.get("published_date") or datetime.now().strftime("%Y-%m-%d"),
+                "excerpt": fields.get("excerpt", ""),
+                "source": fields.get("source", "wordpress")
+            }
+            self._by_slug[slug] = entry
+            added.append(entry)
+
+        # 新規分を先頭に追加（最新記事が上）
+        self._data["articles"] = added[::-1] + self._data["articles"]
+        self._write()
+
+        return added, updated
+
+    def add(self, fields: Dict) -> Optional[Dict]:
+        """
+        記事を1件追加（同じスラッグが既にあれば何もしない）
+
+        Returns:
+            追加した記事（登録済みなら None）
+        """
+        with self._file_lock():
+            self._refresh()
+            if fields.get("slug", "") in self._by_slug:
+                return None
+            added, _ = self._upsert_locked([fields])
+        return added[0]
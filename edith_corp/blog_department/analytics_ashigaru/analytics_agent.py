@@ -5,8 +5,15 @@ Task Toolと連携してMAU分析を自動実行
 """
 
 import json
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from agent_log import get_logger
+
+log = get_logger("分析足軽")
 
 class AnalyticsAshigaru:
     """分析足軽 - MAU分析・改善サイクル専門"""
@@ -26,13 +33,13 @@ class AnalyticsAshigaru:
             "Heat Map Analysis"
         ]
 
-        print(f"[分析足軽] 配属完了 - MAU {self.current_mau} → {self.target_mau}達成を監視")
+        log.info(f"配属完了 - MAU {self.current_mau} → {self.target_mau}達成を監視")
 
     def measure_current_mau(self, data_source: str = "auto_detect") -> Dict[str, Any]:
         """現在のMAU測定"""
 
-        print(f"[分析足軽] 📊 MAU測定開始")
-        print(f"[分析足軽] データソース: {data_source}")
+        log.info("📊 MAU測定開始")
+        log.info(f"データソース: {data_source}")
 
         # 実際の実装では、Task Toolを使ってGoogle Analytics APIを呼び出し
         # Task(subagent_type="general-purpose", prompt="Google Analytics MAU取得...")
@@ -74,16 +81,16 @@ class AnalyticsAshigaru:
             }
         }
 
-        print(f"[分析足軽] ✅ MAU測定完了")
-        print(f"[分析足軽] 現在MAU: {mau_measurement['current_month']['mau']:,}")
-        print(f"[分析足軽] 目標達成率: {mau_measurement['goal_tracking']['current_progress']}")
+        log.info("✅ MAU測定完了")
+        log.info(f"現在MAU: {mau_measurement['current_month']['mau']:,}")
+        log.info(f"目標達成率: {mau_measurement['goal_tracking']['current_progress']}")
 
         return mau_measurement
 
     def analyze_growth_factors(self, mau_data: Dict[str, Any]) -> Dict[str, Any]:
         """成長要因分析"""
 
-        print(f"[分析足軽] 🔍 成長要因分析開始")
+        log.info("🔍 成長要因分析開始")
 
         growth_analysis = {
             "positive_factors": [
@@ -160,15 +167,15 @@ class AnalyticsAshigaru:
             "confidence_level": "85%"
         }
 
-        print(f"[分析足軽] ✅ 成長要因分析完了")
-        print(f"[分析足軽] 成長ポテンシャル: +{net_growth_potential}%")
+        log.info("✅ 成長要因分析完了")
+        log.info(f"成長ポテンシャル: +{net_growth_potential}%")
 
         return growth_analysis
 
     def create_improvement_recommendations(self, growth_data: Dict[str, Any]) -> List[Dict]:
         """改善提案作成"""
 
-        print(f"[分析足軽] 💡 改善提案作成開始")
+        log.info("💡 改善提案作成開始")
 
         recommendations = [
             {
@@ -233,8 +240,8 @@ class AnalyticsAshigaru:
         for rec in recommendations:
             rec["roi_calculation"] = self._calculate_recommendation_roi(rec)
 
-        print(f"[分析足軽] ✅ 改善提案作成完了")
-        print(f"[分析足軽] 提案数: {len(recommendations)}項目")
+        log.info("✅ 改善提案作成完了")
+        log.info(f"提案数: {len(recommendations)}項目")
 
         return recommendations
 
@@ -280,7 +287,7 @@ class AnalyticsAshigaru:
     def generate_mau_report(self, include_recommendations: bool = True) -> Dict[str, Any]:
         """MAU分析レポート総合生成"""
 
-        print(f"\n[分析足軽] 📈 MAU分析レポート生成開始")
+        log.info("📈 MAU分析レポート生成開始")
 
         # 1. MAU測定
         mau_data = self.measure_current_mau()
@@ -331,9 +338,9 @@ class AnalyticsAshigaru:
                 "estimated_timeline": "3-4ヶ月"
             }
 
-        print(f"[分析足軽] ✅ MAU分析レポート完了")
-        print(f"[分析足軽] 現在進捗: {comprehensive_report['report_summary']['progress_percentage']}")
-        print(f"[分析足軽] 改善提案: {len(recommendations)}項目")
+        log.info("✅ MAU分析レポート完了")
+        log.info(f"現在進捗: {comprehensive_report['report_summary']['progress_percentage']}")
+        log.info(f"改善提案: {len(recommendations)}項目")
 
         return comprehensive_report
 
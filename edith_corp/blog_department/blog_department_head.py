@@ -17,6 +17,10 @@ _THIS_DIR = Path(__file__).resolve().parent
 import sys
 sys.path.insert(0, str(_THIS_DIR.parent))
 from output_paths import REPORTS_DIR, ensure_dirs
+from mission_trace import start_trace
+from agent_log import get_logger
+
+log = get_logger("ブログ事業部長")
 
 # ContentTaisho をインポート
 sys.path.insert(0, str(_THIS_DIR / "content_taisho"))
@@ -25,7 +29,7 @@ try:
     from content_taisho import ContentTaisho
 except ImportError as e:
     ContentTaisho = None
-    print(f"[ブログ事業部長] ContentTaisho インポート失敗: {e}")
+    log.warning(f"ContentTaisho インポート失敗: {e}")
 
 
 class BlogDepartmentHead:
@@ -51,35 +55,24 @@ class BlogDepartmentHead:
             "wordpress_posting": {"status": "active", "performance": 95}
         }
 
-        print(f"[{self.position}] 事業部稼働開始")
-        print(f"[{self.position}] 目標: MAU {self.current_mau:,} → {self.target_mau:,} ({self.target_period})")
+        log.info("事業部稼働開始")
+        log.info(f"目標: MAU {self.current_mau:,} → {self.target_mau:,} ({self.target_period})")
 
     def dispatch_daily_mission(self, mission_params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """日次ミッションをContentTaishoに委任"""
+        """日次ミッションをContentTaishoに委任（事業部長のスパンでトレース）"""
 
-        print(f"\n[{self.position}] 日次ミッション指揮開始")
+        with start_trace("BlogDepartmentHead.dispatch_daily_mission", kind="department"):
+            return self._dispatch_daily_mission(mission_params)
 
-        # 戦略パラメータを付加
-        enriched_params = {
-            "target_audience": "中小企業経営者・個人事業主",
-            "content_strategy": "問題解決型",
-            "focus_area": "AI・デジタル化",
-            "seo_policy": "ロングテールキーワード重視（3-4語）",
-            "writing_style": "成田悠輔風毒舌",
-            "target_mau": self.target_mau,
-            "current_mau": self.current_mau,
-        }
-
-        # 呼び出し元からのパラメータで上書き
-        if mission_params:
-            enriched_params.update(mission_params)
+    def _dispatch_daily_mission(self, mission_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        log.info("日次ミッション指揮開始")
 
-        print(f"[{self.position}] 戦略パラメータ付加完了")
-        print(f"[{self.position}] コンテンツ足軽大将に委任...")
+        enriched_params = self._enrich_mission_params(mission_params)
+        log.info("コンテンツ足軽大将に委任...")
 
         # ContentTaisho を生成して実行
         if not ContentTaisho:
-            print(f"[{self.position}] ContentTaisho が利用不可")
+            log.warning("ContentTaisho が利用不可")
             return {
                 "status": "failed",
                 "error": "ContentTaisho import failed",
@@ -90,7 +83,7 @@ class BlogDepartmentHead:
             taisho = ContentTaisho()
             mission_result = taisho.execute_daily_blog_mission(enriched_params)
         except Exception as e:
-            print(f"[{self.position}] ContentTaisho 実行エラー: {e}")
+            log.error(f"ContentTaisho 実行エラー: {e}")
             return {
                 "status": "failed",
                 "error": str(e),
@@ -102,10 +95,88 @@ class BlogDepartmentHead:
 
         return reviewed
 
+    def dispatch_batch_mission(self, count: int = None, mission_params: Dict[str, Any] = None,
+                               workers: int = None) -> Dict[str, Any]:
+        """
+        バッチミッション（1回のリサーチから複数記事）をContentTaishoに委任
+
+        Args:
+            count: 記事数（省略時は ContentTaisho.BATCH_SIZE）
+            mission_params: 戦略パラメータの上書き
+            workers: 記事ごとの工程の同時処理数（省略時は ContentTaisho.BATCH_WORKERS）
+
+        Returns:
+            レビュー済みのバッチ結果（記事ごとに department_review が付く）
+        """
+        with start_trace("BlogDepartmentHead.dispatch_batch_mission", kind="department", count=count):
+            return self._dispatch_batch_mission(count, mission_params, workers)
+
+    def _dispatch_batch_mission(self, count: int = None, mission_params: Dict[str, Any] = None,
+                                workers: int = None) -> Dict[str, Any]:
+        log.info("バッチミッション指揮開始", count=count)
+
+        enriched_params = self._enrich_mission_params(mission_params)
+
+        if not ContentTaisho:
+            log.warning("ContentTaisho が利用不可")
+            return {
+                "status": "failed",
+                "error": "ContentTaisho import failed",
+                "dispatched_by": self.position,
+            }
+
+        try:
+            taisho = ContentTaisho()
+            batch_result = taisho.execute_batch_blog_mission(enriched_params, count=count, workers=workers)
+        except Exception as e:
+            log.error(f"ContentTaisho 実行エラー: {e}")
+            return {
+                "status": "failed",
+                "error": str(e),
+                "dispatched_by": self.position,
+            }
+
+        # 記事ごとにレビューして、バッチ全体の評価を付ける
+        articles = [self._review_mission_result(article) for article in batch_result.get("articles", [])]
+        scores = [a["department_review"]["quality_score"] for a in articles]
+        batch_result["department_review"] = {
+            "reviewer": self.position,
+            "reviewed_at": datetime.now().isoformat(),
+            "mission_status": batch_result.get("status", "unknown"),
+            "articles_reviewed": len(articles),
+            "average_quality_score": round(sum(scores) / len(scores), 1) if scores else 0,
+        }
+        if batch_result.get("error"):
+            batch_result["department_review"]["failure_reason"] = batch_result["error"]
+
+        log.info(f"バッチ平均品質スコア: {batch_result['department_review']['average_quality_score']}/100")
+        return batch_result
+
+    def _enrich_mission_params(self, mission_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """事業部の戦略パラメータを付加（呼び出し元のパラメータが優先）"""
+
+        # 戦略パラメータを付加
+        enriched_params = {
+            "target_audience": "中小企業経営者・個人事業主",
+            "content_strategy": "問題解決型",
+            "focus_area": "AI・デジタル化",
+            "seo_policy": "ロングテールキーワード重視（3-4語）",
+            "writing_style": "成田悠輔風毒舌",
+            "target_mau": self.target_mau,
+            "current_mau": self.current_mau,
+        }
+
+        # 呼び出し元からのパラメータで上書き
+        if mission_params:
+            enriched_params.update(mission_params)
+
+        log.info("戦略パラメータ付加完了")
+        return enriched_params
+
     def _review_mission_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """ミッション結果をレビューして評価を付加"""
 
-        print(f"\n[{self.position}] ミッション結果レビュー")
+        log.info("ミッション結果レビュー")
 
         status = result.get("status", "unknown")
         steps = result.get("steps", [])
@@ -120,7 +191,7 @@ class BlogDepartmentHead:
         }
 
         if status == "success":
-            print(f"[{self.position}] ミッション成功 - {len(steps)}ステップ完了")
+            log.info(f"ミッション成功 - {len(steps)}ステップ完了")
 
             # 成果物チェック
             has_article = bool(deliverables.get("wordpress_ready_article", {}).get("content"))
@@ -142,10 +213,10 @@ class BlogDepartmentHead:
                 quality_score += 10
             review["quality_score"] = quality_score
 
-            print(f"[{self.position}] 品質スコア: {quality_score}/100")
+            log.info(f"品質スコア: {quality_score}/100")
         else:
             error = result.get("error", "不明")
-            print(f"[{self.position}] ミッション失敗: {error}")
+            log.warning(f"ミッション失敗: {error}")
             review["quality_score"] = 0
             review["failure_reason"] = error
 
@@ -155,12 +226,12 @@ class BlogDepartmentHead:
     def analyze_goal_requirements(self) -> Dict[str, Any]:
         """目標分析：MAU増加に必要な要素を自律分析"""
 
-        print(f"\n[{self.position}] 目標分析開始...")
+        log.info("目標分析開始...")
 
         growth_rate = ((self.target_mau - self.current_mau) / self.current_mau) * 100
         monthly_growth_required = growth_rate / 3
 
-        print(f"[{self.position}] 必要成長率: {growth_rate:.1f}% (月間 {monthly_growth_required:.1f}%)")
+        log.info(f"必要成長率: {growth_rate:.1f}% (月間 {monthly_growth_required:.1f}%)")
 
         growth_factors = {
             "content_frequency": {
@@ -204,13 +275,13 @@ class BlogDepartmentHead:
             "analysis_timestamp": datetime.now().isoformat()
         }
 
-        print(f"[{self.position}] 目標分析完了")
+        log.info("目標分析完了")
         return analysis_result
 
     def diagnose_current_capabilities(self) -> Dict[str, Any]:
         """現状診断：現在の足軽で目標達成可能か自律判定"""
 
-        print(f"\n[{self.position}] 現状診断開始...")
+        log.info("現状診断開始...")
 
         capability_gaps = {}
 
@@ -256,13 +327,13 @@ class BlogDepartmentHead:
             "diagnosis_timestamp": datetime.now().isoformat()
         }
 
-        print(f"[{self.position}] 診断結果: 現状組織では目標達成困難")
+        log.info("診断結果: 現状組織では目標達成困難")
         return diagnosis_result
 
     def propose_organizational_changes(self, goal_analysis: Dict, current_diagnosis: Dict) -> Dict[str, Any]:
         """組織設計提案：目標達成のための組織変更を自律提案"""
 
-        print(f"\n[{self.position}] 組織改革案策定中...")
+        log.info("組織改革案策定中...")
 
         new_ashigaru_proposals = {
             "seo_specialist_ashigaru": {
@@ -327,13 +398,13 @@ class BlogDepartmentHead:
             "proposal_timestamp": datetime.now().isoformat()
         }
 
-        print(f"[{self.position}] 組織改革案策定完了")
+        log.info("組織改革案策定完了")
         return proposal
 
     def submit_proposal_to_ceo(self, proposal: Dict[str, Any]):
         """CEO報告：組織変更提案をEDITH CEOに提出"""
 
-        print(f"\n[{self.position}] EDITH CEOに組織変更提案を提出")
+        log.info("EDITH CEOに組織変更提案を提出")
 
         ceo_report = {
             "from": self.position,
@@ -361,17 +432,15 @@ class BlogDepartmentHead:
             encoding="utf-8"
         )
 
-        print(f"[{self.position}] 提案書保存: {report_file}")
-        print(f"[{self.position}] CEO承認待ち")
+        log.info(f"提案書保存: {report_file}")
+        log.info("CEO承認待ち")
 
         return ceo_report
 
     def execute_autonomous_analysis(self):
         """完全自律分析実行"""
 
-        print(f"\n{'='*70}")
-        print(f"[{self.position}] 完全自律分析・提案プロセス開始")
-        print(f"{'='*70}")
+        log.info("完全自律分析・提案プロセス開始")
 
         # 1. 目標分析
         goal_analysis = self.analyze_goal_requirements()
@@ -385,10 +454,8 @@ class BlogDepartmentHead:
         # 4. CEO報告
         ceo_report = self.submit_proposal_to_ceo(organizational_proposal)
 
-        print(f"\n{'='*70}")
-        print(f"[{self.position}] 自律分析・提案プロセス完了")
-        print(f"[{self.position}] 次段階: EDITH CEO承認待ち")
-        print(f"{'='*70}")
+        log.info("自律分析・提案プロセス完了")
+        log.info("次段階: EDITH CEO承認待ち")
 
         return {
             "goal_analysis": goal_analysis,
@@ -398,6 +465,28 @@ class BlogDepartmentHead:
         }
 
 
+def run_mission(mission_type: str, mission_params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    部署プラグインのエントリポイント（department_registry.json の entry_point）
+
+    Args:
+        mission_type: ミッションタイプ（daily_blog / daily_blog_batch）
+        mission_params: ContentTaisho に渡す追加パラメータ。
+            daily_blog_batch では count（記事数）と workers（同時処理数）も指定できる
+
+    Returns:
+        レビュー済みのミッション結果
+    """
+    if mission_type == "daily_blog":
+        return BlogDepartmentHead().dispatch_daily_mission(mission_params)
+    if mission_type == "daily_blog_batch":
+        params = dict(mission_params or {})
+        count = params.pop("count", None)
+        workers = params.pop("workers", None)
+        return BlogDepartmentHead().dispatch_batch_mission(count, params, workers=workers)
+    raise ValueError(f"ブログ事業部長が実行できないミッション: {mission_type}")
+
+
 def main():
     """ブログ事業部長テスト実行"""
 
@@ -8,6 +8,8 @@ import os
 import sys
 import json
 import re
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
@@ -18,6 +20,10 @@ _BLOG_DEPT_DIR = _THIS_DIR.parent
 
 sys.path.insert(0, str(_BLOG_DEPT_DIR.parent))
 from output_paths import BLOG_ARTICLES_DIR, REPORTS_DIR, ensure_dirs
+from mission_trace import current_trace_id, span, start_trace, trace_methods, trace_path
+from agent_log import get_logger
+
+log = get_logger("コンテンツ足軽大将")
 
 sys.path.insert(0, str(_BLOG_DEPT_DIR / "research"))
 sys.path.insert(0, str(_BLOG_DEPT_DIR / "keyword_strategy"))
@@ -34,48 +40,51 @@ try:
     from research_agent import ResearchAshigaru
 except ImportError as e:
     ResearchAshigaru = None
-    print(f"[コンテンツ足軽大将] ResearchAshigaru インポート失敗: {e}")
+    log.warning(f"ResearchAshigaru インポート失敗: {e}")
 
 try:
     from seo_agent import SEOSpecialistAshigaru
 except ImportError as e:
     SEOSpecialistAshigaru = None
-    print(f"[コンテンツ足軽大将] SEOSpecialistAshigaru インポート失敗: {e}")
+    log.warning(f"SEOSpecialistAshigaru インポート失敗: {e}")
 
 try:
     from narita_writing_agent import NaritaWritingAshigaru
 except ImportError as e:
     NaritaWritingAshigaru = None
-    print(f"[コンテンツ足軽大将] NaritaWritingAshigaru インポート失敗: {e}")
+    log.warning(f"NaritaWritingAshigaru インポート失敗: {e}")
 
 try:
     from social_media_agent import SocialMediaAshigaru
 except ImportError as e:
     SocialMediaAshigaru = None
-    print(f"[コンテンツ足軽大将] SocialMediaAshigaru インポート失敗: {e}")
+    log.warning(f"SocialMediaAshigaru インポート失敗: {e}")
 
 try:
     from analytics_agent import AnalyticsAshigaru
 except ImportError as e:
     AnalyticsAshigaru = None
-    print(f"[コンテンツ足軽大将] AnalyticsAshigaru インポート失敗: {e}")
+    log.warning(f"AnalyticsAshigaru インポート失敗: {e}")
 
 try:
     from gemini3_image_generator import Gemini3ImageGenerator
 except ImportError as e:
     Gemini3ImageGenerator = None
-    print(f"[コンテンツ足軽大将] Gemini3ImageGenerator インポート失敗: {e}")
+    log.warning(f"Gemini3ImageGenerator インポート失敗: {e}")
 
 try:
     from wordpress_publisher import ArticlePublishingWorkflow
 except ImportError as e:
     ArticlePublishingWorkflow = None
-    print(f"[コンテンツ足軽大将] ArticlePublishingWorkflow インポート失敗: {e}")
+    log.warning(f"ArticlePublishingWorkflow インポート失敗: {e}")
 
 
 class ContentTaisho:
     """コンテンツ足軽大将 - 全足軽統括管理"""
 
+    BATCH_SIZE = 5     # バッチミッションの既定記事数（リサーチの提案数が上限）
+    BATCH_WORKERS = 3  # バッチミッションで記事ごとの工程（執筆〜投稿）を同時に進める数
+
     def __init__(self):
         self.rank = "足軽大将"
         self.position = "コンテンツ統括指揮官"
@@ -97,49 +106,54 @@ class ContentTaisho:
 
         self._initialize_ashigaru_units()
 
-        print(f"[コンテンツ足軽大将] 配属完了")
-        print(f"[コンテンツ足軽大将] 統括対象: {len(self.manages_units)}足軽")
+        log.info("配属完了")
+        log.info(f"統括対象: {len(self.manages_units)}足軽")
 
     def _initialize_ashigaru_units(self):
         """足軽ユニット初期化"""
 
         try:
+            # 公開メソッドをスパン付きに差し替え（トレース中だけ計測）
             if ResearchAshigaru:
-                self.research_ashigaru = ResearchAshigaru()
+                self.research_ashigaru = trace_methods(ResearchAshigaru())
             if SEOSpecialistAshigaru:
-                self.seo_ashigaru = SEOSpecialistAshigaru()
+                self.seo_ashigaru = trace_methods(SEOSpecialistAshigaru())
             if NaritaWritingAshigaru:
-                self.writing_ashigaru = NaritaWritingAshigaru()
+                self.writing_ashigaru = trace_methods(NaritaWritingAshigaru())
             if SocialMediaAshigaru:
-                self.social_ashigaru = SocialMediaAshigaru()
+                self.social_ashigaru = trace_methods(SocialMediaAshigaru())
             if AnalyticsAshigaru:
-                self.analytics_ashigaru = AnalyticsAshigaru()
+                self.analytics_ashigaru = trace_methods(AnalyticsAshigaru())
 
-            print(f"[コンテンツ足軽大将] 基本足軽ユニット初期化完了")
+            log.info("基本足軽ユニット初期化完了")
         except Exception as e:
-            print(f"[コンテンツ足軽大将] 一部足軽の初期化失敗: {e}")
+            log.warning(f"一部足軽の初期化失敗: {e}")
 
         # 画像生成足軽（APIキー不在時はスキップ）
         try:
             if Gemini3ImageGenerator:
-                self.image_generator = Gemini3ImageGenerator()
-                print(f"[コンテンツ足軽大将] 画像生成足軽 初期化完了")
+                self.image_generator = trace_methods(Gemini3ImageGenerator())
+                log.info("画像生成足軽 初期化完了")
         except Exception as e:
-            print(f"[コンテンツ足軽大将] 画像生成足軽 スキップ（APIキー未設定）: {e}")
+            log.warning(f"画像生成足軽 スキップ（APIキー未設定）: {e}")
 
         # WordPress投稿足軽
         try:
             if ArticlePublishingWorkflow:
-                self.wordpress_publisher = ArticlePublishingWorkflow()
-                print(f"[コンテンツ足軽大将] WordPress投稿足軽 初期化完了")
+                self.wordpress_publisher = trace_methods(ArticlePublishingWorkflow())
+                log.info("WordPress投稿足軽 初期化完了")
         except Exception as e:
-            print(f"[コンテンツ足軽大将] WordPress投稿足軽 スキップ: {e}")
+            log.warning(f"WordPress投稿足軽 スキップ: {e}")
 
     def execute_daily_blog_mission(self, mission_params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """日次ブログミッション完全実行"""
+        """日次ブログミッション完全実行（ステップ・足軽・HTTP呼び出しをトレース）"""
 
-        print(f"\n[コンテンツ足軽大将] 日次ブログミッション開始")
-        print(f"[コンテンツ足軽大将] 目標: MAU 11,000 → 15,000達成")
+        with start_trace("ContentTaisho.execute_daily_blog_mission", kind="taisho"):
+            return self._execute_daily_blog_mission(mission_params)
+
+    def _execute_daily_blog_mission(self, mission_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        log.info("日次ブログミッション開始")
+        log.info("目標: MAU 11,000 → 15,000達成")
 
         if not mission_params:
             mission_params = {
@@ -151,6 +165,8 @@ class ContentTaisho:
         mission_report = {
             "mission_id": f"daily_blog_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             "started_at": datetime.now().isoformat(),
+            "trace_id": current_trace_id(),
+            "trace_file": str(trace_path(current_trace_id())) if current_trace_id() else None,
             "steps": [],
             "outputs": {},
             "final_deliverables": {}
@@ -161,129 +177,138 @@ class ContentTaisho:
 
         try:
             # Step 1: トレンド調査・記事企画
-            print(f"\n[コンテンツ足軽大将] Step 1: リサーチ足軽による企画立案")
-            if self.research_ashigaru:
-                research_result = self.research_ashigaru.execute_research_mission(mission_params)
-                mission_report["steps"].append("Step1 トレンド調査完了")
-                mission_report["outputs"]["research"] = research_result
-
-                priority_article = research_result.get("priority_recommendation")
-                if priority_article:
-                    print(f"[コンテンツ足軽大将] 本日の記事: {priority_article['title']}")
-                else:
-                    print(f"[コンテンツ足軽大将] 記事企画の取得に失敗")
-                    mission_report["status"] = "failed"
-                    mission_report["error"] = "priority_article not found"
-                    return mission_report
+            with span("ContentTaisho.step1", kind="step", label="トレンド調査・記事企画"):
+                log.info("Step 1: リサーチ足軽による企画立案", step=1)
+                if self.research_ashigaru:
+                    research_result = self.research_ashigaru.execute_research_mission(mission_params)
+                    mission_report["steps"].append("Step1 トレンド調査完了")
+                    mission_report["outputs"]["research"] = research_result
+
+                    priority_article = research_result.get("priority_recommendation")
+                    if priority_article:
+                        log.info(f"本日の記事: {priority_article['title']}")
+                    else:
+                        log.warning("記事企画の取得に失敗")
+                        mission_report["status"] = "failed"
+                        mission_report["error"] = "priority_article not found"
+                        return mission_report
 
             # Step 2: SEO最適化戦略立案
-            print(f"\n[コンテンツ足軽大将] Step 2: SEO足軽による最適化戦略")
-            if self.seo_ashigaru and priority_article:
-                seo_strategy = self.seo_ashigaru.execute_seo_optimization({
-                    "topic": priority_article["title"],
-                    "content": ""
-                })
-                mission_report["steps"].append("Step2 SEO戦略立案完了")
-                mission_report["outputs"]["seo_strategy"] = seo_strategy
+            with span("ContentTaisho.step2", kind="step", label="SEO最適化戦略立案"):
+                log.info("Step 2: SEO足軽による最適化戦略", step=2)
+                if self.seo_ashigaru and priority_article:
+                    seo_strategy = self.seo_ashigaru.execute_seo_optimization({
+                        "topic": priority_article["title"],
+                        "content": ""
+                    })
+                    mission_report["steps"].append("Step2 SEO戦略立案完了")
+                    mission_report["outputs"]["seo_strategy"] = seo_strategy
 
             # Step 3: 成田悠輔風記事作成
-            print(f"\n[コンテンツ足軽大将] Step 3: ライティング足軽による記事作成")
-            if self.writing_ashigaru and priority_article:
-                article_brief = {
-                    "topic": priority_article["title"],
-                    "target_keywords": priority_article.get("target_keywords", []),
-                    "content_angle": priority_article.get("content_angle", ""),
-                    "seo_requirements": mission_report["outputs"].get("seo_strategy", {})
-                }
-
-                article_result = self.writing_ashigaru.generate_narita_style_article(article_brief)
-                mission_report["steps"].append("Step3 記事作成完了")
-                mission_report["outputs"]["article"] = article_result
+            with span("ContentTaisho.step3", kind="step", label="成田悠輔風記事作成"):
+                log.info("Step 3: ライティング足軽による記事作成", step=3)
+                if self.writing_ashigaru and priority_article:
+                    article_brief = {
+                        "topic": priority_article["title"],
+                        "target_keywords": priority_article.get("target_keywords", []),
+                        "content_angle": priority_article.get("content_angle", ""),
+                        "seo_requirements": mission_report["outputs"].get("seo_strategy", {})
+                    }
+
+                    article_result = self.writing_ashigaru.generate_narita_style_article(article_brief)
+                    mission_report["steps"].append("Step3 記事作成完了")
+                    mission_report["outputs"]["article"] = article_result
 
             # Step 4: 記事のSEO最終調整
-            print(f"\n[コンテンツ足軽大将] Step 4: 記事SEO最終調整")
-            if self.seo_ashigaru and article_result:
-                seo_strategy_data = mission_report["outputs"].get("seo_strategy", {})
-                keyword_analysis = seo_strategy_data.get("keyword_analysis", {})
-                final_seo = self.seo_ashigaru.optimize_content_structure(
-                    article_result.get("content", ""),
-                    keyword_analysis
-                )
-                mission_report["steps"].append("Step4 SEO最終調整完了")
-                mission_report["outputs"]["final_seo"] = final_seo
+            with span("ContentTaisho.step4", kind="step", label="記事のSEO最終調整"):
+                log.info("Step 4: 記事SEO最終調整", step=4)
+                if self.seo_ashigaru and article_result:
+                    seo_strategy_data = mission_report["outputs"].get("seo_strategy", {})
+                    keyword_analysis = seo_strategy_data.get("keyword_analysis", {})
+                    final_seo = self.seo_ashigaru.optimize_content_structure(
+                        article_result.get("content", ""),
+                        keyword_analysis
+                    )
+                    mission_report["steps"].append("Step4 SEO最終調整完了")
+                    mission_report["outputs"]["final_seo"] = final_seo
 
             # Step 5: SNS拡散戦略実行
-            print(f"\n[コンテンツ足軽大将] Step 5: SNS足軽による拡散戦略")
-            if self.social_ashigaru and article_result:
-                social_strategy = self.social_ashigaru.execute_social_strategy({
-                    "title": priority_article["title"],
-                    "content": article_result.get("content", ""),
-                    "url": "https://www.room8.co.jp/article"
-                })
-                mission_report["steps"].append("Step5 SNS戦略実行完了")
-                mission_report["outputs"]["social_strategy"] = social_strategy
+            with span("ContentTaisho.step5", kind="step", label="SNS拡散戦略実行"):
+                log.info("Step 5: SNS足軽による拡散戦略", step=5)
+                if self.social_ashigaru and article_result:
+                    social_strategy = self.social_ashigaru.execute_social_strategy({
+                        "title": priority_article["title"],
+                        "content": article_result.get("content", ""),
+                        "url": "https://www.room8.co.jp/article"
+                    })
+                    mission_report["steps"].append("Step5 SNS戦略実行完了")
+                    mission_report["outputs"]["social_strategy"] = social_strategy
 
             # Step 6: 効果測定・分析
-            print(f"\n[コンテンツ足軽大将] Step 6: 分析足軽による効果予測")
-            if self.analytics_ashigaru:
-                impact_analysis = self._analyze_mission_impact(mission_report["outputs"])
-                mission_report["steps"].append("Step6 効果分析完了")
-                mission_report["outputs"]["impact_analysis"] = impact_analysis
+            with span("ContentTaisho.step6", kind="step", label="効果測定・分析"):
+                log.info("Step 6: 分析足軽による効果予測", step=6)
+                if self.analytics_ashigaru:
+                    impact_analysis = self._analyze_mission_impact(mission_report["outputs"])
+                    mission_report["steps"].append("Step6 効果分析完了")
+                    mission_report["outputs"]["impact_analysis"] = impact_analysis
 
             # Step 7: 画像生成
-            print(f"\n[コンテンツ足軽大将] Step 7: 画像生成足軽による画像作成")
-            image_result = None
-            article_dir = None
-            if self.image_generator and article_result and priority_article:
-                try:
-                    article_data = self._prepare_article_data_for_images(
-                        priority_article, article_result, mission_report["outputs"]
-                    )
-                    article_dir = self._save_article_files(article_data)
-                    image_result = self.image_generator.generate_article_images_parallel(article_data)
-                    mission_report["steps"].append("Step7 画像生成完了")
-                    mission_report["outputs"]["image_generation"] = image_result
-                    print(f"[コンテンツ足軽大将] 画像生成完了: {image_result.get('successful_images', 0)}枚")
-                except Exception as e:
-                    print(f"[コンテンツ足軽大将] 画像生成スキップ: {e}")
-                    mission_report["steps"].append("Step7 画像生成スキップ（エラー）")
-            else:
-                print(f"[コンテンツ足軽大将] 画像生成スキップ（生成器未初期化またはデータ不足）")
-                mission_report["steps"].append("Step7 画像生成スキップ")
-                # 画像なしでもarticle_dirは作成
-                if article_result and priority_article:
-                    article_data = self._prepare_article_data_for_images(
-                        priority_article, article_result, mission_report["outputs"]
-                    )
-                    article_dir = self._save_article_files(article_data)
+            with span("ContentTaisho.step7", kind="step", label="画像生成"):
+                log.info("Step 7: 画像生成足軽による画像作成", step=7)
+                image_result = None
+                article_dir = None
+                if self.image_generator and article_result and priority_article:
+                    try:
+                        article_data = self._prepare_article_data_for_images(
+                            priority_article, article_result, mission_report["outputs"]
+                        )
+                        article_dir = self._save_article_files(article_data)
+                        image_result = self.image_generator.generate_article_images_parallel(article_data)
+                        mission_report["steps"].append("Step7 画像生成完了")
+                        mission_report["outputs"]["image_generation"] = image_result
+                        log.info(f"画像生成完了: {image_result.get('successful_images', 0)}枚")
+                    except Exception as e:
+                        log.warning(f"画像生成スキップ: {e}")
+                        mission_report["steps"].append("Step7 画像生成スキップ（エラー）")
+                else:
+                    log.warning("画像生成スキップ（生成器未初期化またはデータ不足）")
+                    mission_report["steps"].append("Step7 画像生成スキップ")
+                    # 画像なしでもarticle_dirは作成
+                    if article_result and priority_article:
+                        article_data = self._prepare_article_data_for_images(
+                            priority_article, article_result, mission_report["outputs"]
+                        )
+                        article_dir = self._save_article_files(article_data)
 
             # Step 8: WordPress投稿（ドラフトモード）
-            print(f"\n[コンテンツ足軽大将] Step 8: WordPress投稿足軽によるドラフト投稿")
-            wp_result = None
-            if self.wordpress_publisher and article_dir:
-                try:
-                    wp_result = self.wordpress_publisher.process_article_directory(
-                        article_dir, publish_mode="draft"
-                    )
-                    mission_report["steps"].append("Step8 WordPress投稿完了")
-                    mission_report["outputs"]["wordpress"] = wp_result
-                    print(f"[コンテンツ足軽大将] WordPress投稿完了: {wp_result.get('workflow_success', False)}")
-                except Exception as e:
-                    print(f"[コンテンツ足軽大将] WordPress投稿スキップ: {e}")
-                    mission_report["steps"].append("Step8 WordPress投稿スキップ（エラー）")
-            else:
-                print(f"[コンテンツ足軽大将] WordPress投稿スキップ（パブリッシャー未初期化またはディレクトリ未作成）")
-                mission_report["steps"].append("Step8 WordPress投稿スキップ")
+            with span("ContentTaisho.step8", kind="step", label="WordPress投稿（ドラフトモード）"):
+                log.info("Step 8: WordPress投稿足軽によるドラフト投稿", step=8)
+                wp_result = None
+                if self.wordpress_publisher and article_dir:
+                    try:
+                        wp_result = self.wordpress_publisher.process_article_directory(
+                            article_dir, publish_mode="draft"
+                        )
+                        mission_report["steps"].append("Step8 WordPress投稿完了")
+                        mission_report["outputs"]["wordpress"] = wp_result
+                        log.info(f"WordPress投稿完了: {wp_result.get('workflow_success', False)}")
+                    except Exception as e:
+                        log.warning(f"WordPress投稿スキップ: {e}")
+                        mission_report["steps"].append("Step8 WordPress投稿スキップ（エラー）")
+                else:
+                    log.warning("WordPress投稿スキップ（パブリッシャー未初期化またはディレクトリ未作成）")
+                    mission_report["steps"].append("Step8 WordPress投稿スキップ")
 
             # Step 9: 最終デリバラブル作成
-            print(f"\n[コンテンツ足軽大将] Step 9: 最終成果物統合")
-            mission_report["final_deliverables"] = self._create_final_deliverables(
-                mission_report["outputs"], image_result, wp_result, article_dir
-            )
-            mission_report["steps"].append("Step9 全ミッション完了")
+            with span("ContentTaisho.step9", kind="step", label="最終デリバラブル作成"):
+                log.info("Step 9: 最終成果物統合", step=9)
+                mission_report["final_deliverables"] = self._create_final_deliverables(
+                    mission_report["outputs"], image_result, wp_result, article_dir
+                )
+                mission_report["steps"].append("Step9 全ミッション完了")
 
         except Exception as e:
-            print(f"[コンテンツ足軽大将] ミッション実行エラー: {e}")
+            log.error(f"ミッション実行エラー: {e}")
             mission_report["error"] = str(e)
             mission_report["status"] = "failed"
             return mission_report
@@ -291,14 +316,258 @@ class ContentTaisho:
         mission_report["completed_at"] = datetime.now().isoformat()
         mission_report["status"] = "success"
 
-        print(f"\n[コンテンツ足軽大将] 日次ブログミッション完了")
-        print(f"[コンテンツ足軽大将] 実行ステップ: {len(mission_report['steps'])}")
-        print(f"[コンテンツ足軽大将] 成果物: {len(mission_report['final_deliverables'])}項目")
+        log.info("日次ブログミッション完了")
+        log.info(f"実行ステップ: {len(mission_report['steps'])}")
+        log.info(f"成果物: {len(mission_report['final_deliverables'])}項目")
 
         self._save_mission_report(mission_report)
 
         return mission_report
 
+    def execute_batch_blog_mission(
+        self, mission_params: Dict[str, Any] = None,
+        count: int = None, workers: int = None
+    ) -> Dict[str, Any]:
+        """
+        バッチブログミッション: 1回のリサーチから複数記事をまとめてドラフト投稿
+
+        リサーチとSEOのキーワードデータ（Search Console）は1回だけ取得して全記事で共有する。
+        記事ごとの執筆・SEO調整・SNS・画像生成・WordPress投稿は並列に進める。
+        画像生成は共有の生成キュー（APIキーごとに同時1本）、WordPressは共有セッションを使う。
+
+        Args:
+            mission_params: 日次ミッションと同じパラメータ
+            count: 記事数（省略時は BATCH_SIZE。リサーチの提案数が上限）
+            workers: 記事ごとの工程の同時処理数（省略時は BATCH_WORKERS）
+
+        Returns:
+            バッチ報告（articles に記事ごとの結果。全記事成功で success、一部成功で partial）
+        """
+        with start_trace("ContentTaisho.execute_batch_blog_mission", kind="taisho", count=count):
+            return self._execute_batch_blog_mission(mission_params, count, workers)
+
+    def _execute_batch_blog_mission(
+        self, mission_params: Dict[str, Any] = None,
+        count: int = None, workers: int = None
+    ) -> Dict[str, Any]:
+        count = count or self.BATCH_SIZE
+        log.info("バッチブログミッション開始", count=count)
+
+        if not mission_params:
+            mission_params = {
+                "target_audience": "中小企業経営者・個人事業主",
+                "content_strategy": "問題解決型",
+                "focus_area": "AI・デジタル化"
+            }
+
+        batch_report = {
+            "mission_id": f"blog_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "started_at": datetime.now().isoformat(),
+            "trace_id": current_trace_id(),
+            "trace_file": str(trace_path(current_trace_id())) if current_trace_id() else None,
+            "requested_count": count,
+            "steps": [],
+            "outputs": {},
+            "articles": []
+        }
+
+        try:
+            # Step 1: トレンド調査・記事企画（1回だけ）
+            with span("ContentTaisho.batch_step1", kind="step", label="トレンド調査・記事企画"):
+                log.info("Step 1: リサーチ足軽による企画立案", step=1)
+                suggestions = []
+                if self.research_ashigaru:
+                    research_result = self.research_ashigaru.execute_research_mission(mission_params)
+                    batch_report["outputs"]["research"] = research_result
+                    suggestions = research_result.get("article_suggestions", [])[:count]
+
+                if not suggestions:
+                    log.warning("記事企画の取得に失敗")
+                    batch_report["status"] = "failed"
+                    batch_report["error"] = "article_suggestions not found"
+                    return batch_report
+                batch_report["steps"].append(f"Step1 トレンド調査完了（{len(suggestions)}本）")
+                if len(suggestions) < count:
+                    log.warning(f"提案が{len(suggestions)}本のため{len(suggestions)}本で実行")
+
+            # Step 2: SEO戦略立案（キーワードデータは最初の1本で取得して使い回す）
+            with span("ContentTaisho.batch_step2", kind="step", label="SEO最適化戦略立案"):
+                log.info("Step 2: SEO足軽による最適化戦略", step=2)
+                seo_strategies = []
+                for suggestion in suggestions:
+                    seo_strategy = {}
+                    if self.seo_ashigaru:
+                        seo_strategy = self.seo_ashigaru.execute_seo_optimization({
+                            "topic": suggestion["title"],
+                            "content": ""
+                        })
+                    seo_strategies.append(seo_strategy)
+                batch_report["steps"].append("Step2 SEO戦略立案完了")
+
+            # 効果予測（バッチ全体で1回）
+            if self.analytics_ashigaru:
+                batch_report["outputs"]["impact_analysis"] = self._analyze_mission_impact(batch_report["outputs"])
+
+            # Step 3: WordPressのカテゴリー・タグ・投稿者を並列投稿の前に解決
+            with span("ContentTaisho.batch_step3", kind="step", label="WordPress投稿準備"):
+                log.info("Step 3: WordPressのカテゴリー・タグを事前解決", step=3)
+                if self.wordpress_publisher:
+                    self.wordpress_publisher.prepare_batch([
+                        {"category": "AI活用", "tags": s.get("target_keywords", ["AI導入", "中小企業"])}
+                        for s in suggestions
+                    ])
+                    batch_report["steps"].append("Step3 WordPress投稿準備完了")
+
+            # Step 4: 記事ごとの工程を並列実行
+            with span("ContentTaisho.batch_step4", kind="step", label="記事制作・投稿（並列）"):
+                slugs = self._unique_slugs([s["title"] for s in suggestions])
+                workers = min(workers or self.BATCH_WORKERS, len(suggestions))
+                log.info(f"Step 4: {len(suggestions)}本を{workers}並列で制作・投稿", step=4)
+
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blog-batch") as executor:
+                    futures = [
+                        executor.submit(
+                            contextvars.copy_context().run, self._run_batch_article,
+                            index, suggestion, seo_strategy, slug
+                        )
+                        for index, (suggestion, seo_strategy, slug)
+                        in enumerate(zip(suggestions, seo_strategies, slugs), 1)
+                    ]
+                    batch_report["articles"] = [future.result() for future in futures]
+                batch_report["steps"].append("Step4 記事制作・投稿完了")
+
+        except Exception as e:
+            log.error(f"バッチミッション実行エラー: {e}")
+            batch_report["error"] = str(e)
+            batch_report["status"] = "failed"
+            return batch_report
+
+        articles = batch_report["articles"]
+        succeeded = sum(1 for a in articles if a["status"] == "success")
+        batch_report["summary"] = {
+            "articles": len(articles),
+            "succeeded": succeeded,
+            "failed": len(articles) - succeeded,
+            "images_generated": sum(
+                a["final_deliverables"].get("image_generation", {}).get("successful_images", 0) for a in articles
+            ),
+            "wordpress_drafts": sum(
+                1 for a in articles if a["final_deliverables"].get("wordpress_publishing", {}).get("success")
+            ),
+        }
+        if succeeded == len(articles):
+            batch_report["status"] = "success"
+        elif succeeded:
+            batch_report["status"] = "partial"
+        else:
+            batch_report["status"] = "failed"
+            batch_report["error"] = "all articles failed"
+        batch_report["completed_at"] = datetime.now().isoformat()
+
+        log.info("バッチブログミッション完了", status=batch_report["status"], **batch_report["summary"])
+
+        self._save_mission_report(batch_report, prefix="batch_mission")
+
+        return batch_report
+
+    def _run_batch_article(
+        self, index: int, suggestion: Dict[str, Any],
+        seo_strategy: Dict[str, Any], slug: str
+    ) -> Dict[str, Any]:
+        """
+        バッチの1記事分: 執筆 → SEO最終調整 → SNS → ファイル保存 → 画像生成 → ドラフト投稿
+
+        例外は記事の結果（status: failed）にして、他の記事の処理は止めない。
+        """
+        article_report = {
+            "index": index,
+            "title": suggestion["title"],
+            "slug": slug,
+            "steps": [],
+            "outputs": {"seo_strategy": seo_strategy},
+            "final_deliverables": {}
+        }
+        image_result = None
+        wp_result = None
+        article_dir = None
+
+        with span("ContentTaisho.batch_article", kind="step", label=suggestion["title"], index=index):
+            try:
+                log.info(f"記事{index}: {suggestion['title']}", article=index)
+                outputs = article_report["outputs"]
+
+                if not self.writing_ashigaru:
+                    raise RuntimeError("ライティング足軽が未初期化")
+                article_result = self.writing_ashigaru.generate_narita_style_article({
+                    "topic": suggestion["title"],
+                    "target_keywords": suggestion.get("target_keywords", []),
+                    "content_angle": suggestion.get("content_angle", ""),
+                    "seo_requirements": seo_strategy
+                })
+                outputs["article"] = article_result
+                article_report["steps"].append("記事作成完了")
+
+                if self.seo_ashigaru:
+                    outputs["final_seo"] = self.seo_ashigaru.optimize_content_structure(
+                        article_result.get("content", ""),
+                        seo_strategy.get("keyword_analysis", {})
+                    )
+                    article_report["steps"].append("SEO最終調整完了")
+
+                if self.social_ashigaru:
+                    outputs["social_strategy"] = self.social_ashigaru.execute_social_strategy({
+                        "title": suggestion["title"],
+                        "content": article_result.get("content", ""),
+                        "url": "https://www.room8.co.jp/article"
+                    })
+                    article_report["steps"].append("SNS戦略実行完了")
+
+                article_data = self._prepare_article_data_for_images(suggestion, article_result, outputs)
+                article_data["slug"] = slug
+                article_dir = self._save_article_files(article_data)
+
+                if self.image_generator:
+                    try:
+                        image_result = self.image_generator.generate_article_images_parallel(article_data)
+                        outputs["image_generation"] = image_result
+                        article_report["steps"].append("画像生成完了")
+                    except Exception as e:
+                        log.warning(f"記事{index} 画像生成スキップ: {e}", article=index)
+                        article_report["steps"].append("画像生成スキップ（エラー）")
+
+                if self.wordpress_publisher:
+                    try:
+                        wp_result = self.wordpress_publisher.process_article_directory(
+                            article_dir, publish_mode="draft"
+                        )
+                        outputs["wordpress"] = wp_result
+                        article_report["steps"].append("WordPress投稿完了")
+                    except Exception as e:
+                        log.warning(f"記事{index} WordPress投稿スキップ: {e}", article=index)
+                        article_report["steps"].append("WordPress投稿スキップ（エラー）")
+
+                article_report["status"] = "success"
+            except Exception as e:
+                log.error(f"記事{index} 制作エラー: {e}", article=index)
+                article_report["status"] = "failed"
+                article_report["error"] = str(e)
+
+        article_report["final_deliverables"] = self._create_final_deliverables(
+            article_report["outputs"], image_result, wp_result, article_dir
+        )
+        return article_report
+
+    def _unique_slugs(self, titles: List[str]) -> List[str]:
+        """タイトル群のスラッグ（同じスラッグになった記事には -2, -3 … を付ける）"""
+
+        slugs = []
+        seen: Dict[str, int] = {}
+        for title in titles:
+            slug = self._generate_slug(title)
+            seen[slug] = seen.get(slug, 0) + 1
+            slugs.append(slug if seen[slug] == 1 else f"{slug}-{seen[slug]}")
+        return slugs
+
     def _prepare_article_data_for_images(
         self, priority_article: Dict, article_result: Dict, outputs: Dict
     ) -> Dict[str, Any]:
@@ -421,7 +690,7 @@ class ContentTaisho:
         meta_path = articles_dir / "meta.json"
         meta_path.write_text(json.dumps(meta_data, ensure_ascii=False, indent=2), encoding="utf-8")
 
-        print(f"[コンテンツ足軽大将] 記事ファイル保存: {articles_dir}")
+        log.info(f"記事ファイル保存: {articles_dir}")
         return str(articles_dir)
 
     def _analyze_mission_impact(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -504,13 +773,13 @@ class ContentTaisho:
 
         return deliverables
 
-    def _save_mission_report(self, report: Dict[str, Any]):
+    def _save_mission_report(self, report: Dict[str, Any], prefix: str = "daily_mission"):
         """ミッション報告書保存"""
 
         ensure_dirs()
         reports_dir = REPORTS_DIR
 
-        report_filename = f"daily_mission_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        report_filename = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         report_path = reports_dir / report_filename
 
         report_path.write_text(
@@ -518,12 +787,12 @@ class ContentTaisho:
             encoding="utf-8"
         )
 
-        print(f"[コンテンツ足軽大将] ミッション報告保存: {report_path}")
+        log.info(f"ミッション報告保存: {report_path}")
 
     def get_unit_status(self) -> Dict[str, Any]:
         """全足軽ユニット状況確認"""
 
-        print(f"\n[コンテンツ足軽大将] 足軽部隊状況確認")
+        log.info("足軽部隊状況確認")
 
         unit_status = {
             "taisho_info": {
@@ -564,7 +833,7 @@ class ContentTaisho:
             "readiness_score": self._calculate_readiness_score()
         }
 
-        print(f"[コンテンツ足軽大将] 部隊稼働率: {unit_status['readiness_score']}%")
+        log.info(f"部隊稼働率: {unit_status['readiness_score']}%")
 
         return unit_status
 
@@ -9,6 +9,9 @@ import json
 import base64
 import requests
 import time
+import queue
+import threading
+import contextvars
 from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
@@ -18,6 +21,10 @@ from dotenv import load_dotenv
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from output_paths import BLOG_ARTICLES_DIR, ensure_dirs
+import api_metrics
+from agent_log import get_logger
+
+log = get_logger("画像生成足軽")
 
 class Gemini3ImageGenerator:
     """Gemini 3を使用した並列画像生成（バッチ処理対応）"""
@@ -42,11 +49,24 @@ class Gemini3ImageGenerator:
         if not self.api_keys:
             raise ValueError("No GEMINI_IMAGE_API_KEY found in environment")
 
-        print(f"✅ {len(self.api_keys)}個のAPIキーで並列処理を実行")
+        log.info(f"✅ {len(self.api_keys)}個のAPIキーで並列処理を実行")
 
         # Gemini 3 Pro Image Preview エンドポイント（Nano Banana Pro）
         # 参照: /Users/tsuruta/Documents/000AGENTS/gemini3-image-generation-spec.md
         self.image_endpoint = "https://generativelanguage.googleapis.com/v1beta/models/gemini-3-pro-image-preview:generateContent"
+        api_metrics.install()
+
+        # 生成キュー: ワーカーはAPIキー数だけ。キーは空いているものを1本ずつ借りる
+        # （複数記事を同時に生成しても1キーあたりの同時リクエストは1本）
+        self._key_pool: "queue.Queue[tuple]" = queue.Queue()
+        for worker_id, key in enumerate(self.api_keys):
+            self._key_pool.put((worker_id, key))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # 生成リクエストは1つのセッションで接続を使い回す（ワーカー数まで保持）
+        self.session = requests.Session()
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=len(self.api_keys)))
 
     def extract_keywords_from_content(self, content: str, max_keywords: int = 3) -> List[str]:
         """コンテンツから重要キーワードを抽出（プレフィックスなし）"""
@@ -147,7 +167,7 @@ class Gemini3ImageGenerator:
 
         for attempt in range(1 + self.MAX_RETRIES):
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=self.IMAGE_TIMEOUT)
+                response = self.session.post(url, headers=headers, json=payload, timeout=self.IMAGE_TIMEOUT)
 
                 if response.status_code == 200:
                     result = response.json()
@@ -181,7 +201,7 @@ class Gemini3ImageGenerator:
                 elif response.status_code in (429, 500, 503) and attempt < self.MAX_RETRIES:
                     # レート制限 or サーバーエラー → リトライ
                     wait = 5 * (attempt + 1)
-                    print(f"    ⏳ {response.status_code} エラー、{wait}秒後にリトライ...")
+                    log.warning(f"⏳ {response.status_code} エラー、{wait}秒後にリトライ...", status=response.status_code)
                     time.sleep(wait)
                     continue
 
@@ -195,7 +215,7 @@ class Gemini3ImageGenerator:
 
             except requests.exceptions.Timeout:
                 if attempt < self.MAX_RETRIES:
-                    print(f"    ⏳ タイムアウト、リトライ中...")
+                    log.warning("⏳ タイムアウト、リトライ中...")
                     continue
                 return {
                     'success': False,
@@ -216,68 +236,61 @@ class Gemini3ImageGenerator:
             'title': task['title']
         }
 
-    def _distribute_tasks(self, num_images: int) -> List[int]:
-        """タスクをAPIキー間で分配"""
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """生成キューのワーカー（初回に作成し、以後は全記事で共有）"""
 
-        num_workers = len(self.api_keys)
-        base_load = num_images // num_workers
-        remainder = num_images % num_workers
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=len(self.api_keys), thread_name_prefix="gemini-image"
+                )
+            return self._executor
 
-        distribution = [base_load] * num_workers
-        for i in range(remainder):
-            distribution[i] += 1
+    def _generate_with_pooled_key(self, task: Dict) -> tuple:
+        """空いているAPIキーを借りて1枚生成し、キーを返す"""
 
-        # 0のワーカーは除外
-        distribution = [d for d in distribution if d > 0]
+        worker_id, api_key = self._key_pool.get()
+        try:
+            log.info(f"🎨 {task['title']}...", worker=worker_id + 1)
+            return worker_id, self._generate_single_image(task, api_key)
+        finally:
+            self._key_pool.put((worker_id, api_key))
 
-        return distribution
+    def close(self):
+        """生成キューのワーカーを止める（実行中の生成は待つ）"""
+
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     def _process_batch(self, tasks: List[Dict], batch_num: int = 1) -> Dict:
-        """バッチ単位で画像生成処理"""
+        """バッチ単位で画像生成処理（共有の生成キューに積んで完了を待つ）"""
 
         num_images = len(tasks)
-        print(f"   処理枚数: {num_images}枚")
-
-        # 負荷分散計算
-        distribution = self._distribute_tasks(num_images)
-        print(f"   負荷分散: {distribution}")
+        log.info(f"処理枚数: {num_images}枚")
 
         results = []
         successful = 0
 
-        # 並列実行
-        with ThreadPoolExecutor(max_workers=len(self.api_keys)) as executor:
-            futures = {}
-            task_index = 0
-
-            for worker_id, num_tasks in enumerate(distribution):
-                api_key = self.api_keys[worker_id]
-
-                for _ in range(num_tasks):
-                    if task_index < len(tasks):
-                        task = tasks[task_index]
-                        print(f"  🎨 Worker-{worker_id+1}: {task['title']}...")
-
-                        future = executor.submit(
-                            self._generate_single_image,
-                            task,
-                            api_key
-                        )
-                        futures[future] = (worker_id, task['title'])
-                        task_index += 1
-
-            # 結果収集
-            for future in as_completed(futures):
-                worker_id, title = futures[future]
-                result = future.result()
-
-                if result['success']:
-                    print(f"    ✅ Worker-{worker_id+1}: 成功")
-                    successful += 1
-                else:
-                    print(f"    ❌ Worker-{worker_id+1}: 失敗 - {result['error']}")
+        # 並列実行（トレースのスパンは投入元の文脈にぶら下げる）
+        executor = self._get_executor()
+        futures = [
+            executor.submit(contextvars.copy_context().run, self._generate_with_pooled_key, task)
+            for task in tasks
+        ]
+
+        # 結果収集
+        for future in as_completed(futures):
+            worker_id, result = future.result()
+
+            if result['success']:
+                log.info("✅ 成功", worker=worker_id + 1)
+                successful += 1
+            else:
+                log.error(f"❌ 失敗 - {result['error']}", worker=worker_id + 1)
 
-                results.append(result)
+            results.append(result)
 
         return {
             'results': results,
@@ -302,7 +315,7 @@ class Gemini3ImageGenerator:
         # ディレクトリ作成
         images_dir.mkdir(parents=True, exist_ok=True)
 
-        print(f"\n📁 保存先: {images_dir}")
+        log.info(f"📁 保存先: {images_dir}")
 
         # 生成タスクリスト作成
         all_tasks = []
@@ -349,7 +362,7 @@ class Gemini3ImageGenerator:
         total_successful = 0
 
         if total_images > self.MAX_BATCH_SIZE:
-            print(f"\n⚠️ {total_images}枚は多いため、{self.MAX_BATCH_SIZE}枚ずつバッチ処理します")
+            log.warning(f"⚠️ {total_images}枚は多いため、{self.MAX_BATCH_SIZE}枚ずつバッチ処理します")
 
             # バッチに分割
             for batch_start in range(0, total_images, self.MAX_BATCH_SIZE):
@@ -357,7 +370,7 @@ class Gemini3ImageGenerator:
                 batch_tasks = all_tasks[batch_start:batch_end]
                 batch_num = (batch_start // self.MAX_BATCH_SIZE) + 1
 
-                print(f"\n📦 バッチ {batch_num}: {batch_start+1}-{batch_end}枚目を処理")
+                log.info(f"📦 バッチ {batch_num}: {batch_start+1}-{batch_end}枚目を処理")
 
                 # バッチ処理実行
                 batch_results = self._process_batch(batch_tasks, batch_num)
@@ -366,11 +379,11 @@ class Gemini3ImageGenerator:
 
                 # 次のバッチがある場合は少し待機
                 if batch_end < total_images:
-                    print(f"   ⏳ 次のバッチまで3秒待機...")
+                    log.info("⏳ 次のバッチまで3秒待機...")
                     time.sleep(3)
         else:
             # 8枚以下なら通常処理
-            print(f"\n🚀 {total_images}枚の画像を{len(self.api_keys)}並列で生成開始")
+            log.info(f"🚀 {total_images}枚の画像を{len(self.api_keys)}並列で生成開始")
             batch_results = self._process_batch(all_tasks)
             all_results = batch_results['results']
             total_successful = batch_results['successful']
@@ -378,8 +391,8 @@ class Gemini3ImageGenerator:
         # 処理時間
         elapsed_time = time.time() - start_time
 
-        print(f"\n⏱️  総処理時間: {elapsed_time:.1f}秒")
-        print(f"📊 成功率: {total_successful}/{total_images}枚")
+        log.info(f"⏱️ 総処理時間: {elapsed_time:.1f}秒")
+        log.info(f"📊 成功率: {total_successful}/{total_images}枚")
 
         return {
             'article_directory': article_dir,
@@ -5,8 +5,15 @@ Task Toolと連携してトレンド調査を自動実行
 """
 
 import json
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from agent_log import get_logger
+
+log = get_logger("リサーチ足軽")
 
 class ResearchAshigaru:
     """リサーチ足軽 - トレンド分析・記事ネタ発掘専門"""
@@ -23,13 +30,13 @@ class ResearchAshigaru:
             "Reddit Japan"
         ]
 
-        print(f"[リサーチ足軽] 配属完了 - {self.specialty}を担当")
+        log.info(f"配属完了 - {self.specialty}を担当")
 
     def analyze_trending_topics(self, target_audience: str = "中小企業経営者") -> Dict[str, Any]:
         """トレンド分析実行"""
 
-        print(f"[リサーチ足軽] 🔍 トレンド分析開始")
-        print(f"[リサーチ足軽] 対象読者: {target_audience}")
+        log.info("🔍 トレンド分析開始")
+        log.info(f"対象読者: {target_audience}")
 
         # 実際の実装では、Task Toolを使ってWebサーチやAPIアクセスを実行
         # Task(subagent_type="general-purpose", prompt="Google Trends分析実行...")
@@ -89,17 +96,17 @@ class ResearchAshigaru:
             ]
         }
 
-        print(f"[リサーチ足軽] ✅ トレンド分析完了")
-        print(f"[リサーチ足軽] 注目トピック: {len(trending_analysis['hot_topics'])}個発見")
-        print(f"[リサーチ足軽] 新興トピック: {len(trending_analysis['emerging_topics'])}個発見")
+        log.info("✅ トレンド分析完了")
+        log.info(f"注目トピック: {len(trending_analysis['hot_topics'])}個発見")
+        log.info(f"新興トピック: {len(trending_analysis['emerging_topics'])}個発見")
 
         return trending_analysis
 
     def suggest_article_topics(self, trend_data: Dict[str, Any], content_strategy: str = "問題解決型") -> List[Dict]:
         """記事トピック提案"""
 
-        print(f"[リサーチ足軽] 📝 記事トピック提案開始")
-        print(f"[リサーチ足軽] コンテンツ戦略: {content_strategy}")
+        log.info("📝 記事トピック提案開始")
+        log.info(f"コンテンツ戦略: {content_strategy}")
 
         article_suggestions = []
 
@@ -133,8 +140,8 @@ class ResearchAshigaru:
         # 優先度順にソート
         article_suggestions.sort(key=lambda x: x["urgency_score"], reverse=True)
 
-        print(f"[リサーチ足軽] ✅ 記事提案完了")
-        print(f"[リサーチ足軽] 提案記事数: {len(article_suggestions)}本")
+        log.info("✅ 記事提案完了")
+        log.info(f"提案記事数: {len(article_suggestions)}本")
 
         return article_suggestions
 
@@ -197,8 +204,8 @@ class ResearchAshigaru:
     def execute_research_mission(self, mission_params: Dict[str, Any]) -> Dict[str, Any]:
         """リサーチミッション完全実行"""
 
-        print(f"\n[リサーチ足軽] 🎯 リサーチミッション開始")
-        print(f"[リサーチ足軽] 対象読者: {mission_params.get('target_audience', '中小企業経営者')}")
+        log.info("🎯 リサーチミッション開始")
+        log.info(f"対象読者: {mission_params.get('target_audience', '中小企業経営者')}")
 
         # 1. トレンド分析
         trend_data = self.analyze_trending_topics(mission_params.get('target_audience'))
@@ -227,8 +234,8 @@ class ResearchAshigaru:
             "researched_at": datetime.now().isoformat()
         }
 
-        print(f"[リサーチ足軽] ✅ リサーチミッション完了")
-        print(f"[リサーチ足軽] 最優先記事: {research_report['priority_recommendation']['title'] if research_report['priority_recommendation'] else 'N/A'}")
+        log.info("✅ リサーチミッション完了")
+        log.info(f"最優先記事: {research_report['priority_recommendation']['title'] if research_report['priority_recommendation'] else 'N/A'}")
 
         return research_report
 
@@ -2,16 +2,28 @@
 """
 足軽共通CLIラッパー - 全足軽への統一エントリポイント
 Task Toolエージェントが Bash python3 run_ashigaru.py <command> --json '{}' で呼び出す。
-結果はstdoutにJSON出力される。
+結果はstdoutにJSON出力される（stdoutは結果JSONだけ。進捗ログは agent_log 経由で
+stderr か EDITH_LOG_FILE に1行1JSONで出る）。
+
+環境変数 EDITH_TRACE_ID（と EDITH_TRACE_PARENT）が設定されていれば、
+足軽のメソッドと外部HTTP呼び出しをそのミッショントレースに追記する。
 """
 
+import os
 import sys
 import json
 import traceback
+from contextlib import redirect_stdout
 from pathlib import Path
 
 _THIS_DIR = Path(__file__).resolve().parent
 
+sys.path.insert(0, str(_THIS_DIR.parent))
+from mission_trace import ENV_TRACE_ID, start_trace, trace_methods
+from agent_log import get_logger
+
+log = get_logger("足軽CLI")
+
 
 def _add_paths():
     """足軽モジュールのインポートパスを追加"""
@@ -29,21 +41,21 @@ def _add_paths():
 def cmd_research(params: dict) -> dict:
     """リサーチ足軽: トレンド調査・記事企画"""
     from research_agent import ResearchAshigaru
-    agent = ResearchAshigaru()
+    agent = trace_methods(ResearchAshigaru())
     return agent.execute_research_mission(params)
 
 
 def cmd_seo(params: dict) -> dict:
     """SEO足軽: キーワード分析・最適化"""
     from seo_agent import SEOSpecialistAshigaru
-    agent = SEOSpecialistAshigaru()
+    agent = trace_methods(SEOSpecialistAshigaru())
     return agent.execute_seo_optimization(params)
 
 
 def cmd_seo_optimize(params: dict) -> dict:
     """SEO足軽: コンテンツ構造最適化"""
     from seo_agent import SEOSpecialistAshigaru
-    agent = SEOSpecialistAshigaru()
+    agent = trace_methods(SEOSpecialistAshigaru())
     content = params.get("content", "")
     keyword_data = params.get("keyword_data", {})
     return agent.optimize_content_structure(content, keyword_data)
@@ -52,21 +64,21 @@ def cmd_seo_optimize(params: dict) -> dict:
 def cmd_writing(params: dict) -> dict:
     """ライティング足軽: 成田悠輔風記事生成"""
     from narita_writing_agent import NaritaWritingAshigaru
-    agent = NaritaWritingAshigaru()
+    agent = trace_methods(NaritaWritingAshigaru())
     return agent.generate_narita_style_article(params)
 
 
 def cmd_social(params: dict) -> dict:
     """SNS足軽: 拡散戦略"""
     from social_media_agent import SocialMediaAshigaru
-    agent = SocialMediaAshigaru()
+    agent = trace_methods(SocialMediaAshigaru())
     return agent.execute_social_strategy(params)
 
 
 def cmd_analytics(params: dict) -> dict:
     """分析足軽: MAU分析レポート"""
     from analytics_agent import AnalyticsAshigaru
-    agent = AnalyticsAshigaru()
+    agent = trace_methods(AnalyticsAshigaru())
     return agent.generate_mau_report(
         include_recommendations=params.get("include_recommendations", True)
     )
@@ -75,14 +87,14 @@ def cmd_analytics(params: dict) -> dict:
 def cmd_image(params: dict) -> dict:
     """画像生成足軽: Gemini 3 画像生成"""
     from gemini3_image_generator import Gemini3ImageGenerator
-    gen = Gemini3ImageGenerator()
+    gen = trace_methods(Gemini3ImageGenerator())
     return gen.generate_article_images_parallel(params)
 
 
 def cmd_wordpress(params: dict) -> dict:
     """WordPress投稿足軽: 記事投稿"""
     from wordpress_publisher import ArticlePublishingWorkflow
-    workflow = ArticlePublishingWorkflow()
+    workflow = trace_methods(ArticlePublishingWorkflow())
     article_dir = params.get("article_dir", "")
     mode = params.get("mode", "draft")
     return workflow.process_article_directory(article_dir, publish_mode=mode)
@@ -133,10 +145,16 @@ def main():
     _add_paths()
 
     try:
-        result = COMMANDS[command](params)
-        # 結果をJSON出力（stderr にログが出るのでstdoutはJSONのみ）
+        # 足軽やライブラリが print しても結果JSONに混ざらないよう、実行中の stdout は stderr に回す
+        with redirect_stdout(sys.stderr):
+            if os.environ.get(ENV_TRACE_ID):
+                with start_trace(f"run_ashigaru.{command}", kind="ashigaru"):
+                    result = COMMANDS[command](params)
+            else:
+                result = COMMANDS[command](params)
         print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
     except Exception as e:
+        log.exception(f"{command} 実行エラー: {e}", command=command)
         print(json.dumps({
             "error": str(e),
             "traceback": traceback.format_exc(),
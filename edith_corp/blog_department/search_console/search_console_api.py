@@ -6,6 +6,7 @@ Search Console API連携モジュール
 
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
@@ -13,6 +14,12 @@ from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
 _THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+import api_metrics
+from agent_log import get_logger
+
+log = get_logger("Search Console API")
+integration_log = get_logger("Search Console")
 
 class SearchConsoleAPI:
     """Search Console APIラッパー"""
@@ -22,7 +29,7 @@ class SearchConsoleAPI:
         self.site_url = None
         self.service = None
 
-        print(f"[Search Console API] 初期化開始")
+        log.info("初期化開始")
 
     def authenticate(self, site_url: str):
         """API認証・サービス初期化"""
@@ -37,13 +44,14 @@ class SearchConsoleAPI:
             )
 
             # Search Console APIサービス構築
+            api_metrics.install()
             self.service = build('searchconsole', 'v1', credentials=credentials)
 
-            print(f"[Search Console API] ✅ 認証成功: {site_url}")
+            log.info(f"✅ 認証成功: {site_url}")
             return True
 
         except Exception as e:
-            print(f"[Search Console API] ❌ 認証失敗: {e}")
+            log.error(f"❌ 認証失敗: {e}")
             return False
 
     def get_search_analytics(self,
@@ -54,7 +62,7 @@ class SearchConsoleAPI:
         """検索アナリティクスデータ取得"""
 
         if not self.service:
-            print(f"[Search Console API] ⚠️ 未認証です")
+            log.warning("⚠️ 未認証です")
             return {}
 
         # デフォルト期間：過去28日間
@@ -67,7 +75,7 @@ class SearchConsoleAPI:
         if not dimensions:
             dimensions = ['query', 'page']
 
-        print(f"[Search Console API] 📊 データ取得: {start_date} ~ {end_date}")
+        log.info(f"📊 データ取得: {start_date} ~ {end_date}")
 
         try:
             request_body = {
@@ -84,12 +92,12 @@ class SearchConsoleAPI:
                 body=request_body
             ).execute()
 
-            print(f"[Search Console API] ✅ {len(response.get('rows', []))}件取得")
+            log.info(f"✅ {len(response.get('rows', []))}件取得")
 
             return self._process_search_data(response)
 
         except Exception as e:
-            print(f"[Search Console API] ❌ データ取得失敗: {e}")
+            log.error(f"❌ データ取得失敗: {e}")
             return {}
 
     def _process_search_data(self, raw_data: Dict) -> Dict[str, Any]:
@@ -360,10 +368,10 @@ class SearchConsoleIntegration:
         success = self.api.authenticate(site_url)
 
         if success:
-            print(f"[Search Console] ✅ 連携成功: {site_url}")
+            integration_log.info(f"✅ 連携成功: {site_url}")
             self._save_config()
         else:
-            print(f"[Search Console] ❌ 連携失敗")
+            integration_log.error("❌ 連携失敗")
 
         return success
 
@@ -382,13 +390,13 @@ class SearchConsoleIntegration:
         with open(str(config_dir / 'search_console_config.json'), 'w') as f:
             json.dump(config, f, indent=2)
 
-        print(f"[Search Console] 📁 設定保存完了")
+        integration_log.info("📁 設定保存完了")
 
     def get_weekly_report(self) -> Dict[str, Any]:
         """週次レポート生成"""
 
         if not self.api.service:
-            print(f"[Search Console] ⚠️ 未設定です")
+            integration_log.warning("⚠️ 未設定です")
             return {}
 
         # 過去7日間のデータ
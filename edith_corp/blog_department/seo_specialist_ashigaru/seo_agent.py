@@ -9,6 +9,8 @@ import json
 import re
 import sys
 import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
@@ -18,6 +20,10 @@ _BLOG_DIR = _THIS_DIR.parent
 
 sys.path.insert(0, str(_BLOG_DIR.parent))
 from output_paths import BLOG_ARTICLES_DIR, BLOG_ARTICLES_INDEX
+from articles_index import ArticlesIndex
+from agent_log import get_logger
+
+log = get_logger("SEO足軽")
 
 _ARTICLES_DIR = BLOG_ARTICLES_DIR
 
@@ -38,6 +44,8 @@ except ImportError:
 class SEOSpecialistAshigaru:
     """SEO専門足軽 - 検索流入30%増加を担当"""
 
+    SEARCH_INSIGHTS_TTL = 600  # Search Console データの使い回し期間（秒）
+
     def __init__(self):
         self.rank = "足軽"
         self.specialty = "SEO戦略・技術最適化"
@@ -48,26 +56,28 @@ class SEOSpecialistAshigaru:
         self.search_console = None
         if SearchConsoleIntegration:
             self.search_console = SearchConsoleIntegration()
-            print(f"[SEO足軽] Search Console連携準備完了")
+            log.info("Search Console連携準備完了")
+
+        # Search Console データのキャッシュ（複数記事の分析で1回だけ取得）
+        self._search_insights = None
+        self._search_insights_at = 0.0
+        self._search_insights_lock = threading.Lock()
 
         # 戦略記憶システム連携
         self.memory_integration = None
         if MemoryIntegration:
             self.memory_integration = MemoryIntegration()
-            print(f"[SEO足軽] 戦略記憶システム連携完了")
+            log.info("戦略記憶システム連携完了")
 
-        print(f"[SEO足軽] 配属完了 - {self.kpi_target}を目標に稼働開始")
+        log.info(f"配属完了 - {self.kpi_target}を目標に稼働開始")
 
     def analyze_keyword_opportunities(self, article_topic: str) -> Dict[str, Any]:
         """キーワード機会分析（Search Console実データ利用）"""
 
-        print(f"[SEO足軽] キーワード分析開始: {article_topic}")
+        log.info(f"キーワード分析開始: {article_topic}")
 
         # Search Consoleから実データ取得
-        real_search_data = None
-        if self.search_console and self.search_console.api.service:
-            print(f"[SEO足軽] Search Console実データ取得中...")
-            real_search_data = self.search_console.api.get_keyword_insights()
+        real_search_data = self.get_search_insights()
 
         # 実データがある場合は活用、なければモックデータ
         if real_search_data:
@@ -96,16 +106,35 @@ class SEOSpecialistAshigaru:
             }
         }
 
-        print(f"[SEO足軽] ✅ キーワード分析完了")
-        print(f"[SEO足軽] 主要キーワード: {len(keyword_analysis['primary_keywords'])}個")
-        print(f"[SEO足軽] 競合ギャップ: {len(keyword_analysis['content_gap_opportunities'])}個発見")
+        log.info("✅ キーワード分析完了")
+        log.info(f"主要キーワード: {len(keyword_analysis['primary_keywords'])}個")
+        log.info(f"競合ギャップ: {len(keyword_analysis['content_gap_opportunities'])}個発見")
 
         return keyword_analysis
 
+    def get_search_insights(self) -> Dict[str, Any]:
+        """
+        Search Console のキーワードインサイト（SEARCH_INSIGHTS_TTL 秒は取得済みのものを返す）
+
+        同時に呼ばれても取得は1回。返す辞書は共有なので書き換えないこと。
+
+        Returns:
+            get_keyword_insights() の結果（連携なし・取得失敗時は空の辞書）
+        """
+        if not (self.search_console and self.search_console.api.service):
+            return {}
+
+        with self._search_insights_lock:
+            if self._search_insights is None or time.monotonic() - self._search_insights_at > self.SEARCH_INSIGHTS_TTL:
+                log.info("Search Console実データ取得中...")
+                self._search_insights = self.search_console.api.get_keyword_insights() or {}
+                self._search_insights_at = time.monotonic()
+            return self._search_insights
+
     def _analyze_with_real_data(self, topic: str, search_data: Dict) -> Dict[str, Any]:
         """Search Console実データを使った分析"""
 
-        print(f"[SEO足軽] 🎯 実データ分析開始")
+        log.info("🎯 実データ分析開始")
 
         # 実際の検索パフォーマンスから関連キーワード抽出
         top_keywords = search_data.get('top_performing_keywords', [])
@@ -152,9 +181,9 @@ class SEOSpecialistAshigaru:
             }
         }
 
-        print(f"[SEO足軽] ✅ 実データ分析完了")
-        print(f"[SEO足軽] 関連キーワード: {len(related_keywords)}個")
-        print(f"[SEO足軽] 改善機会: {len(new_keyword_candidates)}個")
+        log.info("✅ 実データ分析完了")
+        log.info(f"関連キーワード: {len(related_keywords)}個")
+        log.info(f"改善機会: {len(new_keyword_candidates)}個")
 
         # 重要な発見を自動保存
         if self.memory_integration:
@@ -310,7 +339,7 @@ class SEOSpecialistAshigaru:
     def optimize_content_structure(self, raw_content: str, keyword_data: Dict) -> Dict[str, Any]:
         """コンテンツ構造の最適化 — 実コンテンツを解析して改善提案を返す"""
 
-        print(f"[SEO足軽] コンテンツSEO最適化開始...")
+        log.info("コンテンツSEO最適化開始...")
 
         parsed = self._parse_markdown(raw_content)
         keyword_stats = self._analyze_keyword_presence(raw_content, keyword_data)
@@ -331,9 +360,9 @@ class SEOSpecialistAshigaru:
             "keyword_presence": keyword_stats,
         }
 
-        print(f"[SEO足軽] ✅ SEO最適化完了")
-        print(f"[SEO足軽] 文字数: {parsed['char_count']}字 / 見出し: {len(parsed['headings'])}個")
-        print(f"[SEO足軽] 最適化要素: {len(optimized_content)}項目")
+        log.info("✅ SEO最適化完了")
+        log.info(f"文字数: {parsed['char_count']}字 / 見出し: {len(parsed['headings'])}個")
+        log.info(f"最適化要素: {len(optimized_content)}項目")
 
         return optimized_content
 
@@ -435,11 +464,11 @@ class SEOSpecialistAshigaru:
         }
 
     def _load_articles_index(self) -> List[Dict]:
-        """articles_index.json から全記事メタデータを読み込む"""
-        if BLOG_ARTICLES_INDEX.exists():
+        """articles_index.json から全記事メタデータを読み込む（変更がなければキャッシュを使う）"""
+        index = ArticlesIndex.shared(BLOG_ARTICLES_INDEX)
+        if index.exists():
             try:
-                data = json.loads(BLOG_ARTICLES_INDEX.read_text(encoding="utf-8"))
-                return data.get("articles", [])
+                return index.articles()
             except (json.JSONDecodeError, OSError):
                 pass
 
@@ -533,8 +562,8 @@ class SEOSpecialistAshigaru:
     def execute_seo_optimization(self, article_data: Dict) -> Dict[str, Any]:
         """SEO最適化の完全実行"""
 
-        print(f"\n[SEO足軽] 📊 SEO最適化タスク開始")
-        print(f"[SEO足軽] 対象記事: {article_data.get('topic', 'untitled')}")
+        log.info("📊 SEO最適化タスク開始")
+        log.info(f"対象記事: {article_data.get('topic', 'untitled')}")
 
         # 1. キーワード分析
         keyword_analysis = self.analyze_keyword_opportunities(article_data.get('topic', ''))
@@ -559,8 +588,8 @@ class SEOSpecialistAshigaru:
             "optimized_at": datetime.now().isoformat()
         }
 
-        print(f"[SEO足軽] ✅ SEO最適化完了")
-        print(f"[SEO足軽] 期待効果: 検索流入30%増加")
+        log.info("✅ SEO最適化完了")
+        log.info("期待効果: 検索流入30%増加")
 
         return seo_report
 
@@ -2,42 +2,162 @@
 """
 シリーズ記事管理システム - 継続的な記事シリーズの自動追跡
 チャットを閉じても次の記事で自動的にシリーズが継続される
+
+データベースは OUTPUT_ROOT 配下の固定パス（BLOG_SERIES_DB）に保存し、
+実行ディレクトリに依存しない。読み込み時に索引を作る。
+- カテゴリ → アクティブなシリーズID
+- 約束済みトピックのヒープ（promised_at の古い順）
+- シリーズごとの約束済み件数
+シリーズの upcoming も promised_at の古い順に保つ（完成記録はヒープと同じ順で取り出す）。
+
+使い方:
+  python3 series_tracker.py status
+  python3 series_tracker.py backfill [--workers 4] [--dry-run]   # 既存記事の次回予告を一括登録
+  python3 series_tracker.py test
 """
 
+import argparse
+import heapq
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from output_paths import BLOG_ARTICLES_DIR, BLOG_SERIES_DB
+
+# 旧保存先（series_management ディレクトリで実行したときの相対パス）
+_LEGACY_DB_PATH = Path(__file__).resolve().parent / "series_management" / "series_database.json"
+
+# 約束から何日経ったら緊急扱いにするか
+URGENT_AFTER_DAYS = 3
+
+# 次回予告（「次回は」「次は」「今度は」＋括弧書きのトピック）
+NEXT_TOPIC_PATTERN = re.compile(r"(?:次回は|次は|今度は)[「『](.*?)[」』]")
+
+# backfill の既定のワーカー数
+BACKFILL_WORKERS = 4
+
 
 class SeriesTracker:
     """シリーズ記事の自動追跡システム"""
 
-    def __init__(self):
-        self.series_db_path = "series_management/series_database.json"
+    def __init__(self, db_path: Optional[Path] = None):
+        self.series_db_path = Path(db_path or BLOG_SERIES_DB)
         self.series_db = self._load_series_database()
-
-        # シリーズディレクトリの作成
-        os.makedirs("series_management", exist_ok=True)
+        self._build_indexes()
 
         print(f"[シリーズ管理] 記事シリーズ追跡システム起動")
 
     def _load_series_database(self) -> Dict[str, Any]:
-        """シリーズデータベース読み込み"""
-
-        if os.path.exists(self.series_db_path):
-            with open(self.series_db_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        else:
-            return {
-                "active_series": {},
-                "completed_series": {},
-                "series_counter": 0,
-                "last_updated": None
-            }
+        """シリーズデータベース読み込み（新しい保存先になければ旧保存先から）"""
+
+        for path in (self.series_db_path, _LEGACY_DB_PATH):
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+
+        return {
+            "active_series": {},
+            "completed_series": {},
+            "series_counter": 0,
+            "last_updated": None
+        }
+
+    def _build_indexes(self):
+        """カテゴリ索引・約束済みヒープ・件数を作る（upcoming は promised_at 順の deque に置き換え）"""
+
+        self._category_index: Dict[str, str] = {}
+        self._promised_heap: List[Tuple[str, int, str, Dict[str, Any]]] = []
+        self._promised_counts: Dict[str, int] = {}
+        self._heap_seq = 0
+
+        for series_id, series_data in self.series_db["active_series"].items():
+            # 同じカテゴリが複数あれば先に作られたシリーズを使う（従来の線形探索と同じ）
+            self._category_index.setdefault(series_data["category"], series_id)
+            # 以前の backfill で古い約束が後ろに付いたデータも並べ直す（同時刻は登録順）
+            series_data["upcoming"] = deque(sorted(series_data["upcoming"], key=lambda u: u["promised_at"]))
+            self._promised_counts[series_id] = 0
+            for upcoming in series_data["upcoming"]:
+                if upcoming["status"] == "promised":
+                    self._push_promised(series_id, upcoming)
+
+    def _push_promised(self, series_id: str, entry: Dict[str, Any]):
+        self._heap_seq += 1
+        heapq.heappush(self._promised_heap, (entry["promised_at"], self._heap_seq, series_id, entry))
+        self._promised_counts[series_id] = self._promised_counts.get(series_id, 0) + 1
+
+    def _oldest_promised(self) -> Optional[Tuple[str, int, str, Dict[str, Any]]]:
+        """ヒープ先頭の約束済みトピック（完了済みのものは取り除く）"""
+
+        while self._promised_heap and self._promised_heap[0][3]["status"] != "promised":
+            heapq.heappop(self._promised_heap)
+        return self._promised_heap[0] if self._promised_heap else None
 
     def register_next_topic(self, current_article_title: str, next_topic: str, category: str = "AI活用") -> str:
         """次回記事予告の登録"""
 
+        series_id = self._add_promise(current_article_title, next_topic, category)
+
+        # データベース保存
+        self._save_database()
+
+        print(f"[シリーズ管理] 次回記事予告登録: {next_topic}")
+        print(f"[シリーズ管理] シリーズID: {series_id}")
+
+        return series_id
+
+    def register_promises(self, promises: List[Dict[str, Any]]) -> List[str]:
+        """
+        次回予告をまとめて登録して1回だけ保存する
+
+        Args:
+            promises: [{"promised_in": 記事タイトル, "next_topic": ..., "category": ..., "promised_at": ...}, ...]
+
+        Returns:
+            登録したシリーズIDのリスト（promises と同じ順）
+        """
+        series_ids = [
+            self._add_promise(
+                p["promised_in"],
+                p["next_topic"],
+                p.get("category", "AI活用"),
+                promised_at=p.get("promised_at")
+            )
+            for p in promises
+        ]
+
+        if series_ids:
+            self._save_database()
+            print(f"[シリーズ管理] 次回記事予告を一括登録: {len(series_ids)}件")
+
+        return series_ids
+
+    def known_topics(self, category: str) -> set:
+        """カテゴリのシリーズで予告済み・完成済みのトピック（backfill の重複除け）"""
+
+        series_id = self._category_index.get(category)
+        if series_id is None:
+            return set()
+        series_data = self.series_db["active_series"][series_id]
+        known = {u["next_topic"] for u in series_data["upcoming"]}
+        known.update(a["topic"] for a in series_data["articles"])
+        return known
+
+    def _add_promise(
+        self,
+        current_article_title: str,
+        next_topic: str,
+        category: str,
+        promised_at: Optional[str] = None
+    ) -> str:
+        """予告をメモリ上に追加（保存は呼び出し側）"""
+
         series_id = self._get_or_create_series_id(category)
 
         next_entry = {
@@ -45,7 +165,7 @@ class SeriesTracker:
             "category": category,
             "next_topic": next_topic,
             "promised_in": current_article_title,
-            "promised_at": datetime.now().isoformat(),
+            "promised_at": promised_at or datetime.now().isoformat(),
             "status": "promised",
             "priority": "high"
         }
@@ -55,37 +175,41 @@ class SeriesTracker:
             self.series_db["active_series"][series_id] = {
                 "category": category,
                 "articles": [],
-                "upcoming": [],
+                "upcoming": deque(),
                 "created_at": datetime.now().isoformat()
             }
+            self._category_index[category] = series_id
 
-        self.series_db["active_series"][series_id]["upcoming"].append(next_entry)
+        self._insert_upcoming(self.series_db["active_series"][series_id]["upcoming"], next_entry)
+        self._push_promised(series_id, next_entry)
 
-        # データベース保存
-        self._save_database()
+        return series_id
 
-        print(f"[シリーズ管理] 次回記事予告登録: {next_topic}")
-        print(f"[シリーズ管理] シリーズID: {series_id}")
+    @staticmethod
+    def _insert_upcoming(upcoming_queue: deque, entry: Dict[str, Any]):
+        """promised_at の順を保って追加（新しい約束は末尾、backfill の古い約束は後ろから位置を探す）"""
 
-        return series_id
+        position = len(upcoming_queue)
+        while position > 0 and upcoming_queue[position - 1]["promised_at"] > entry["promised_at"]:
+            position -= 1
+        upcoming_queue.insert(position, entry)
 
     def get_next_article_suggestion(self) -> Optional[Dict[str, Any]]:
-        """次に書くべき記事の提案"""
+        """次に書くべき記事の提案（最も古い約束から）"""
 
-        # 最優先：約束された記事
-        for series_id, series_data in self.series_db["active_series"].items():
-            for upcoming in series_data["upcoming"]:
-                if upcoming["status"] == "promised":
-                    return {
-                        "type": "promised",
-                        "series_id": series_id,
-                        "topic": upcoming["next_topic"],
-                        "category": upcoming["category"],
-                        "promised_in": upcoming["promised_in"],
-                        "urgency": "high"
-                    }
+        oldest = self._oldest_promised()
+        if oldest is None:
+            return None
 
-        return None
+        _, _, series_id, upcoming = oldest
+        return {
+            "type": "promised",
+            "series_id": series_id,
+            "topic": upcoming["next_topic"],
+            "category": upcoming["category"],
+            "promised_in": upcoming["promised_in"],
+            "urgency": "high"
+        }
 
     def mark_article_completed(self, article_title: str, series_id: str = None):
         """記事完成の記録"""
@@ -93,20 +217,25 @@ class SeriesTracker:
         if series_id and series_id in self.series_db["active_series"]:
             # 約束された記事の完成
             series_data = self.series_db["active_series"][series_id]
-
-            # upcomingから該当記事を削除してarticlesに移動
-            for i, upcoming in enumerate(series_data["upcoming"]):
-                if upcoming["status"] == "promised":
-                    completed_entry = {
-                        "title": article_title,
-                        "topic": upcoming["next_topic"],
-                        "completed_at": datetime.now().isoformat(),
-                        "series_position": len(series_data["articles"]) + 1
-                    }
-
-                    series_data["articles"].append(completed_entry)
-                    series_data["upcoming"].pop(i)
-                    break
+            upcoming_queue = series_data["upcoming"]
+
+            # promised_at 順に並んでいるので、最初の約束済みがこのシリーズで最も古い約束
+            # （get_next_article_suggestion が返すものと同じ）
+            upcoming = next((u for u in upcoming_queue if u["status"] == "promised"), None)
+
+            if upcoming is not None:
+                upcoming_queue.remove(upcoming)
+                completed_entry = {
+                    "title": article_title,
+                    "topic": upcoming["next_topic"],
+                    "completed_at": datetime.now().isoformat(),
+                    "series_position": len(series_data["articles"]) + 1
+                }
+
+                series_data["articles"].append(completed_entry)
+                # ヒープ側は次に先頭へ来たときに取り除かれる
+                upcoming["status"] = "completed"
+                self._promised_counts[series_id] -= 1
 
         self._save_database()
         print(f"[シリーズ管理] 記事完成記録: {article_title}")
@@ -114,10 +243,9 @@ class SeriesTracker:
     def _get_or_create_series_id(self, category: str) -> str:
         """カテゴリに対応するシリーズIDを取得または新規作成"""
 
-        # 既存のアクティブシリーズを検索
-        for series_id, series_data in self.series_db["active_series"].items():
-            if series_data["category"] == category:
-                return series_id
+        # 既存のアクティブシリーズ
+        if category in self._category_index:
+            return self._category_index[category]
 
         # 新規シリーズ作成
         self.series_db["series_counter"] += 1
@@ -139,47 +267,68 @@ class SeriesTracker:
         import random
         return random.choice(preview_patterns)
 
+    def _promised_before(self, threshold: str) -> List[Dict[str, Any]]:
+        """
+        promised_at が threshold 以前の約束済みトピック（古い順）
+
+        ヒープは親 <= 子なので、threshold より新しい節点の部分木は辿らない。
+        """
+
+        found = []
+        stack = [0] if self._promised_heap else []
+        while stack:
+            i = stack.pop()
+            promised_at, _, _, entry = self._promised_heap[i]
+            if promised_at > threshold:
+                continue
+            if entry["status"] == "promised":
+                found.append(entry)
+            stack.extend(c for c in (2 * i + 1, 2 * i + 2) if c < len(self._promised_heap))
+
+        return sorted(found, key=lambda e: e["promised_at"])
+
     def get_series_status(self) -> Dict[str, Any]:
         """現在のシリーズ状況"""
 
+        now = datetime.now()
+        threshold = (now - timedelta(days=URGENT_AFTER_DAYS + 1)).isoformat()
+
         status = {
             "active_series_count": len(self.series_db["active_series"]),
-            "total_promised_articles": 0,
+            "total_promised_articles": sum(self._promised_counts.values()),
             "urgent_articles": [],
             "series_details": []
         }
 
-        for series_id, series_data in self.series_db["active_series"].items():
-            promised_count = len([u for u in series_data["upcoming"] if u["status"] == "promised"])
-            status["total_promised_articles"] += promised_count
-
-            # 緊急度の高い約束された記事
-            for upcoming in series_data["upcoming"]:
-                if upcoming["status"] == "promised":
-                    days_since_promise = (datetime.now() - datetime.fromisoformat(upcoming["promised_at"])).days
-                    if days_since_promise > 3:  # 3日以上経過
-                        status["urgent_articles"].append({
-                            "topic": upcoming["next_topic"],
-                            "days_waiting": days_since_promise,
-                            "promised_in": upcoming["promised_in"]
-                        })
+        # 緊急度の高い約束された記事（3日以上経過）
+        for upcoming in self._promised_before(threshold):
+            status["urgent_articles"].append({
+                "topic": upcoming["next_topic"],
+                "days_waiting": (now - datetime.fromisoformat(upcoming["promised_at"])).days,
+                "promised_in": upcoming["promised_in"]
+            })
 
+        for series_id, series_data in self.series_db["active_series"].items():
             status["series_details"].append({
                 "series_id": series_id,
                 "category": series_data["category"],
                 "completed_articles": len(series_data["articles"]),
-                "promised_articles": promised_count
+                "promised_articles": self._promised_counts.get(series_id, 0)
             })
 
         return status
 
     def _save_database(self):
-        """データベース保存"""
+        """データベース保存（一時ファイルに書いてから置き換え）"""
 
         self.series_db["last_updated"] = datetime.now().isoformat()
 
-        with open(self.series_db_path, "w", encoding="utf-8") as f:
-            json.dump(self.series_db, f, ensure_ascii=False, indent=2)
+        self.series_db_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.series_db_path.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # upcoming の deque はリストとして書き出す
+            json.dump(self.series_db, f, ensure_ascii=False, indent=2, default=list)
+        os.replace(tmp_path, self.series_db_path)
 
         print(f"[シリーズ管理] データベース更新完了")
 
@@ -218,26 +367,119 @@ class SeriesIntegration:
     def _extract_next_topic_from_content(self, content: str) -> Optional[str]:
         """記事コンテンツから次回トピックを抽出"""
 
-        # 「次回は」「次は」「今度は」などのパターンを検索
-        import re
+        # 「次回は」「次は」「今度は」などのパターンを検索（本文中で最初の予告）
+        match = NEXT_TOPIC_PATTERN.search(content)
+        return match.group(1) if match else None
 
-        patterns = [
-            r"次回は[「『](.*?)[」』]",
-            r"次は[「『](.*?)[」』]",
-            r"今度は[「『](.*?)[」』]"
-        ]
+    def get_next_writing_suggestion(self) -> Optional[Dict[str, Any]]:
+        """次に書くべき記事の提案"""
+
+        return self.tracker.get_next_article_suggestion()
 
-        for pattern in patterns:
-            matches = re.search(pattern, content)
-            if matches:
-                return matches.group(1)
 
+def extract_next_topics(content: str) -> List[str]:
+    """記事コンテンツ中の次回予告トピックをすべて抽出（出現順・重複なし）"""
+
+    return list(dict.fromkeys(t.strip() for t in NEXT_TOPIC_PATTERN.findall(content) if t.strip()))
+
+
+def _scan_article(article_path: str) -> Optional[Dict[str, Any]]:
+    """
+    article.md 1件から次回予告を抽出（backfill のワーカープロセスで実行）
+
+    Returns:
+        {"title": ..., "promised_at": ..., "topics": [...]}（予告がなければ None）
+    """
+
+    path = Path(article_path)
+    topics = extract_next_topics(path.read_text(encoding="utf-8"))
+    if not topics:
         return None
 
-    def get_next_writing_suggestion(self) -> Optional[Dict[str, Any]]:
-        """次に書くべき記事の提案"""
+    # タイトルは meta.json → 本文の見出し → ディレクトリ名の順
+    title = ""
+    meta_path = path.parent / "meta.json"
+    if meta_path.exists():
+        try:
+            title = json.loads(meta_path.read_text(encoding="utf-8")).get("title", "")
+        except (json.JSONDecodeError, OSError):
+            pass
+    if not title:
+        with open(path, encoding="utf-8") as f:
+            title = next((line[2:].strip() for line in f if line.startswith("# ")), path.parent.name)
+
+    return {
+        "title": title,
+        "promised_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+        "topics": topics
+    }
 
-        return self.tracker.get_next_article_suggestion()
+
+def backfill_series(
+    articles_dir: Path = BLOG_ARTICLES_DIR,
+    workers: int = BACKFILL_WORKERS,
+    category: str = "AI活用",
+    dry_run: bool = False,
+    db_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    既存記事の次回予告をシリーズに一括登録
+
+    articles_dir 配下の */article.md をプロセスプールで走査し、
+    シリーズで未登録のトピックだけを promised_at（記事の更新日時）順に1回の保存で登録する。
+    同じトピックを複数の記事が予告していても1件だけ登録する。
+
+    Args:
+        articles_dir: 記事ディレクトリの親
+        workers: ワーカープロセス数
+        category: 登録するシリーズのカテゴリ
+        dry_run: 登録せずに件数だけ返す
+        db_path: シリーズデータベース（省略時は BLOG_SERIES_DB）
+
+    Returns:
+        {"scanned": n, "articles_with_promises": n, "found": n, "registered": n, "skipped_known": n}
+    """
+
+    article_paths = (str(p) for p in Path(articles_dir).glob("*/article.md"))
+
+    scanned = 0
+    results = []
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+        for result in executor.map(_scan_article, article_paths, chunksize=16):
+            scanned += 1
+            if result:
+                results.append(result)
+
+    tracker = SeriesTracker(db_path)
+    known = tracker.known_topics(category)
+
+    promises = []
+    found = 0
+    for result in sorted(results, key=lambda r: r["promised_at"]):
+        for topic in result["topics"]:
+            found += 1
+            if topic in known:
+                continue
+            known.add(topic)
+            promises.append({
+                "promised_in": result["title"],
+                "next_topic": topic,
+                "category": category,
+                "promised_at": result["promised_at"]
+            })
+
+    if not dry_run:
+        tracker.register_promises(promises)
+
+    return {
+        "scanned": scanned,
+        "articles_with_promises": len(results),
+        "found": found,
+        "registered": 0 if dry_run else len(promises),
+        "new_promises": len(promises),
+        "skipped_known": found - len(promises),
+        "dry_run": dry_run
+    }
 
 
 def test_series_management():
@@ -272,5 +514,36 @@ def test_series_management():
     print(f"約束済み記事数: {status['total_promised_articles']}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="シリーズ記事管理")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("status", help="シリーズ状況と次に書くべき記事")
+
+    p_backfill = subparsers.add_parser("backfill", help="既存記事の次回予告を一括登録")
+    p_backfill.add_argument("--articles-dir", default=str(BLOG_ARTICLES_DIR), help="記事ディレクトリの親")
+    p_backfill.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help="ワーカープロセス数")
+    p_backfill.add_argument("--category", default="AI活用", help="登録するシリーズのカテゴリ")
+    p_backfill.add_argument("--dry-run", action="store_true", help="登録せずに件数だけ表示")
+
+    subparsers.add_parser("test", help="動作テスト")
+
+    args = parser.parse_args()
+
+    if args.command == "status":
+        tracker = SeriesTracker()
+        result = {
+            "status": tracker.get_series_status(),
+            "next_suggestion": tracker.get_next_article_suggestion()
+        }
+    elif args.command == "backfill":
+        result = backfill_series(Path(args.articles_dir), args.workers, args.category, args.dry_run)
+    else:
+        test_series_management()
+        return
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
 if __name__ == "__main__":
-    test_series_management()
\ No newline at end of file
+    main()
\ No newline at end of file
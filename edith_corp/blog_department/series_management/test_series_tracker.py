@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+series_tracker のテスト（一時ディレクトリのシリーズデータベース）
+- 後から登録した古い約束も、提案と完成記録が同じトピックを指す
+- backfill はシリーズで登録済みのトピックを重複登録しない
+- backfill 後の完成記録は最も古い約束から
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from series_tracker import SeriesTracker, backfill_series
+from testutil import run_tests, temp_dir
+
+CATEGORY = "AI活用"
+
+
+def _write_article(articles_dir: Path, name: str, title: str, next_topic: str, days_ago: int):
+    article_dir = articles_dir / name
+    article_dir.mkdir(parents=True)
+    article_path = article_dir / "article.md"
+    article_path.write_text(f"# {title}\n\n本文。次回は「{next_topic}」について書きます。\n", encoding="utf-8")
+    mtime = time.time() - days_ago * 86400
+    os.utime(article_path, (mtime, mtime))
+
+
+def _topics(tracker: SeriesTracker, series_id: str):
+    return [u["next_topic"] for u in tracker.series_db["active_series"][series_id]["upcoming"]]
+
+
+def test_older_promise_registered_later():
+    """Test 1: 後から登録した古い約束を提案し、完成記録も同じトピックになる"""
+    with temp_dir() as tmp:
+        tracker = SeriesTracker(tmp / "series.json")
+        series_id = tracker.register_next_topic("記事L", "L", CATEGORY)
+        older = (datetime.now() - timedelta(days=10)).isoformat()
+        tracker.register_promises([
+            {"promised_in": "記事O", "next_topic": "O", "category": CATEGORY, "promised_at": older}
+        ])
+        assert _topics(tracker, series_id) == ["O", "L"]
+
+        assert tracker.get_next_article_suggestion()["topic"] == "O"
+        tracker.mark_article_completed("Oの記事", series_id)
+        assert tracker.series_db["active_series"][series_id]["articles"][-1]["topic"] == "O"
+        assert tracker.get_next_article_suggestion()["topic"] == "L"
+
+        # 保存したデータベースを読み直しても同じ順
+        reloaded = SeriesTracker(tmp / "series.json")
+        assert _topics(reloaded, series_id) == ["L"]
+        assert reloaded.get_next_article_suggestion()["topic"] == "L"
+
+
+def test_backfill_then_complete():
+    """Test 2: backfill は登録済みトピックを飛ばし、完成記録は最も古い約束から"""
+    with temp_dir() as tmp:
+        db_path = tmp / "series.json"
+        tracker = SeriesTracker(db_path)
+        series_id = tracker.register_next_topic("記事L", "L", CATEGORY)
+        tracker.register_next_topic("記事L2", "Y", CATEGORY)
+
+        articles_dir = tmp / "articles"
+        _write_article(articles_dir, "old", "古い記事", "O", days_ago=10)
+        _write_article(articles_dir, "other", "別の記事", "Y", days_ago=5)
+
+        result = backfill_series(articles_dir, workers=1, category=CATEGORY, db_path=db_path)
+        assert result["found"] == 2
+        assert result["registered"] == 1
+        assert result["skipped_known"] == 1
+
+        tracker = SeriesTracker(db_path)
+        assert _topics(tracker, series_id) == ["O", "L", "Y"]
+
+        assert tracker.get_next_article_suggestion()["topic"] == "O"
+        tracker.mark_article_completed("Oの記事", series_id)
+        assert tracker.series_db["active_series"][series_id]["articles"][-1]["topic"] == "O"
+        assert tracker.get_next_article_suggestion()["topic"] == "L"
+
+        # 完成済みのトピックも再度の backfill では登録しない
+        again = backfill_series(articles_dir, workers=1, category=CATEGORY, db_path=db_path)
+        assert again["registered"] == 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
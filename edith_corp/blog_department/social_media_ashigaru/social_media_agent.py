@@ -5,8 +5,15 @@ Task Toolと連携してSNS拡散を自動実行
 """
 
 import json
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from agent_log import get_logger
+
+log = get_logger("SNS足軽")
 
 class SocialMediaAshigaru:
     """SNS管理足軽 - ソーシャル拡散・エンゲージメント専門"""
@@ -24,13 +31,13 @@ class SocialMediaAshigaru:
             "note"
         ]
 
-        print(f"[SNS足軽] 配属完了 - {self.target_increase}を目標に稼働")
+        log.info(f"配属完了 - {self.target_increase}を目標に稼働")
 
     def analyze_content_for_social(self, article_content: Dict[str, Any]) -> Dict[str, Any]:
         """記事のSNS適性分析"""
 
-        print(f"[SNS足軽] 📊 SNS適性分析開始")
-        print(f"[SNS足軽] 対象記事: {article_content.get('title', 'untitled')}")
+        log.info("📊 SNS適性分析開始")
+        log.info(f"対象記事: {article_content.get('title', 'untitled')}")
 
         # 実際の実装では、Task Toolを使ってコンテンツ分析Agentを呼び出し
         # Task(subagent_type="general-purpose", prompt="SNS拡散分析実行...")
@@ -73,15 +80,15 @@ class SocialMediaAshigaru:
             ]
         }
 
-        print(f"[SNS足軽] ✅ 適性分析完了")
-        print(f"[SNS足軽] 総合拡散スコア: {content_analysis['shareability_score']}/100")
+        log.info("✅ 適性分析完了")
+        log.info(f"総合拡散スコア: {content_analysis['shareability_score']}/100")
 
         return content_analysis
 
     def generate_social_content(self, article_data: Dict, platform_strategy: Dict) -> Dict[str, Any]:
         """プラットフォーム別コンテンツ生成"""
 
-        print(f"[SNS足軽] ✏️ SNS投稿コンテンツ生成開始")
+        log.info("✏️ SNS投稿コンテンツ生成開始")
 
         social_content = {}
 
@@ -97,8 +104,8 @@ class SocialMediaAshigaru:
         # note投稿生成
         social_content["note"] = self._create_note_summary(article_data)
 
-        print(f"[SNS足軽] ✅ 全プラットフォーム投稿生成完了")
-        print(f"[SNS足軽] 生成プラットフォーム: {len(social_content)}個")
+        log.info("✅ 全プラットフォーム投稿生成完了")
+        log.info(f"生成プラットフォーム: {len(social_content)}個")
 
         return social_content
 
@@ -357,8 +364,8 @@ class SocialMediaAshigaru:
     def execute_social_strategy(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
         """SNS戦略の完全実行"""
 
-        print(f"\n[SNS足軽] 🚀 SNS拡散戦略実行開始")
-        print(f"[SNS足軽] 対象記事: {article_data.get('title', 'untitled')}")
+        log.info("🚀 SNS拡散戦略実行開始")
+        log.info(f"対象記事: {article_data.get('title', 'untitled')}")
 
         # 1. SNS適性分析
         content_analysis = self.analyze_content_for_social(article_data)
@@ -392,9 +399,9 @@ class SocialMediaAshigaru:
             "executed_at": datetime.now().isoformat()
         }
 
-        print(f"[SNS足軽] ✅ SNS戦略実行完了")
-        print(f"[SNS足軽] 投稿予定プラットフォーム: {len(social_content)}個")
-        print(f"[SNS足軽] 期待効果: SNS流入40%増加")
+        log.info("✅ SNS戦略実行完了")
+        log.info(f"投稿予定プラットフォーム: {len(social_content)}個")
+        log.info("期待効果: SNS流入40%増加")
 
         return social_strategy_report
 
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+WordPress投稿スループット計測
+fake_wordpress_server.py の代替サーバーを起動し、合成した記事ディレクトリを
+WordPressPublisher.publish_article_with_images で投稿して計測する
+- 記事あたりの往復回数（ルート別内訳）
+- アップロードバイト数（画像・全体）
+- 記事ごとの所要時間 p50/p99 と総所要時間
+
+articles_index.json は一時ディレクトリに向けるため本番のインデックスには影響しない
+API計測（api_metrics）も無効にして、代替サーバーへの呼び出しを本番の集計に入れない
+投稿足軽のログ（agent_log、stderr）は --verbose のときだけ出す（それ以外は WARNING 以上）
+
+使い方:
+  python3 benchmark_publish.py --articles 20 --latency-ms 80 --jitter-ms 40
+  python3 benchmark_publish.py --articles 50 --concurrency 4 --failure-rate 0.02 --json result.json
+"""
+
+import json
+import logging
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+
+os.environ["EDITH_API_METRICS"] = "0"  # 代替サーバーへの呼び出しを API 集計に入れない
+
+from fake_wordpress_server import FakeWordPressServer
+import wordpress_publisher
+import agent_log
+
+
+BENCH_USER = "benchmark"
+BENCH_PASSWORD = "bench pass word"
+SECTION_COUNT = 5
+
+
+def _png_bytes(size: int, rng: random.Random) -> bytes:
+    """おおよそ size バイトの有効なPNG（非圧縮の乱数画素）"""
+    width = 256
+    height = max(1, size // (width * 3 + 1))
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 0)) + chunk(b"IEND", b"")
+
+
+def create_synthetic_articles(root: Path, count: int, image_kb: int, seed: int = 0) -> List[Path]:
+    """
+    合成記事ディレクトリを作成（article.md / meta.json / images/00〜05）
+
+    Returns:
+        記事ディレクトリのリスト
+    """
+    rng = random.Random(seed)
+    categories = wordpress_publisher.ALLOWED_CATEGORIES
+    article_dirs = []
+
+    for i in range(count):
+        article_dir = root / f"2026-01-01_bench-{i:04d}"
+        images_dir = article_dir / "images"
+        images_dir.mkdir(parents=True)
+
+        meta = {
+            "title": f"ベンチマーク記事 {i}",
+            "slug": f"bench-article-{i:04d}",
+            "category": categories[i % len(categories)],
+            "tags": [f"タグ{i % 7}", f"タグ{i % 11}", "ベンチマーク"],
+            "seo": {"meta_description": f"ベンチマーク用の合成記事 {i} です。"}
+        }
+        (article_dir / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        sections = [f"# {meta['title']}\n\n導入文です。" + "本文の段落。" * 40]
+        for s in range(SECTION_COUNT):
+            sections.append(f"## 見出し{s + 1}\n\n" + "セクション本文。" * 60 + f"\n\n- 項目A\n- 項目B\n")
+        (article_dir / "article.md").write_text("\n\n".join(sections), encoding="utf-8")
+
+        for s in range(SECTION_COUNT + 1):
+            name = "00_eyecatch.png" if s == 0 else f"{s:02d}_section.png"
+            (images_dir / name).write_bytes(_png_bytes(image_kb * 1024, rng))
+
+        article_dirs.append(article_dir)
+
+    return article_dirs
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """最近傍順位法のパーセンタイル"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def run_benchmark(
+    articles: int = 20,
+    image_kb: int = 200,
+    concurrency: int = 1,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    failure_rate: float = 0.0,
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    代替サーバーを起動して合成記事を投稿し、計測結果を返す
+
+    Args:
+        articles: 記事数
+        image_kb: 画像1枚あたりのサイズ（KB）
+        concurrency: 同時に投稿する記事数
+        latency_ms: サーバー応答遅延（ミリ秒）
+        jitter_ms: 応答遅延の揺らぎ（ミリ秒）
+        failure_rate: 5xx を返す確率
+        verbose: 投稿足軽の INFO ログも表示する（False なら WARNING 以上だけ）
+    """
+    server = FakeWordPressServer(
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        failure_rate=failure_rate,
+        username=BENCH_USER,
+        password=BENCH_PASSWORD
+    )
+
+    env_keys = ["WORDPRESS_URL", "WORDPRESS_USERNAME", "WORDPRESS_APPLICATION_PASSWORD"]
+    saved_env = {key: os.environ.get(key) for key in env_keys}
+    saved_index = wordpress_publisher.BLOG_ARTICLES_INDEX
+
+    with server, tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        article_dirs = create_synthetic_articles(tmp_dir / "articles", articles, image_kb)
+
+        os.environ.update({
+            "WORDPRESS_URL": server.site_url,
+            "WORDPRESS_USERNAME": BENCH_USER,
+            "WORDPRESS_APPLICATION_PASSWORD": BENCH_PASSWORD
+        })
+        wordpress_publisher.BLOG_ARTICLES_INDEX = tmp_dir / "articles_index.json"
+
+        # agent_log の設定は import 時に済んでいるため、環境変数ではなくロガーのレベルで絞る
+        edith_logger = logging.getLogger(agent_log.ROOT_LOGGER)
+        saved_level = edith_logger.level
+        if not verbose:
+            edith_logger.setLevel(logging.WARNING)
+
+        durations: List[float] = []
+        results: List[Dict[str, Any]] = []
+
+        def publish(article_dir: Path) -> Dict[str, Any]:
+            started = time.perf_counter()
+            result = publisher.publish_article_with_images(str(article_dir))
+            durations.append(time.perf_counter() - started)
+            return result
+
+        try:
+            publisher = wordpress_publisher.WordPressPublisher()
+            server.reset_stats()
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                results = list(executor.map(publish, article_dirs))
+            wall = time.perf_counter() - started
+        finally:
+            edith_logger.setLevel(saved_level)
+            wordpress_publisher.BLOG_ARTICLES_INDEX = saved_index
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+        index_path = tmp_dir / "articles_index.json"
+        indexed = len(json.loads(index_path.read_text(encoding="utf-8"))["articles"]) if index_path.exists() else 0
+
+    stats = server.stats()
+    succeeded = sum(1 for r in results if r.get("post_success"))
+    return {
+        "articles": articles,
+        "concurrency": concurrency,
+        "succeeded": succeeded,
+        "failed": articles - succeeded,
+        "images_uploaded": sum(r.get("images_uploaded", 0) for r in results),
+        "indexed_articles": indexed,
+        "wall_seconds": round(wall, 3),
+        "articles_per_sec": round(articles / wall, 2) if wall else 0.0,
+        "round_trips": stats["requests"],
+        "round_trips_per_article": round(stats["requests"] / articles, 1) if articles else 0.0,
+        "round_trips_by_route": {k: round(v / articles, 2) for k, v in sorted(stats["request_counts"].items())},
+        "bytes_uploaded": stats["bytes_received"],
+        "media_bytes": stats["media_bytes"],
+        "article_p50_ms": round(_percentile(durations, 50) * 1000, 1),
+        "article_p99_ms": round(_percentile(durations, 99) * 1000, 1),
+        "status_counts": stats["status_counts"]
+    }
+
+
+def print_report(result: Dict[str, Any]):
+    """結果を表示"""
+    print("\n" + "=" * 70)
+    print("📊 WordPress投稿ベンチマーク")
+    print("=" * 70)
+    print(f"記事数: {result['articles']}（同時 {result['concurrency']}） 成功 {result['succeeded']} / 失敗 {result['failed']}")
+    print(f"総所要時間: {result['wall_seconds']}秒（{result['articles_per_sec']}記事/秒）")
+    print(f"記事あたり: p50 {result['article_p50_ms']}ms / p99 {result['article_p99_ms']}ms")
+    print(f"往復回数: {result['round_trips']}（記事あたり {result['round_trips_per_article']}）")
+    for route, per_article in result["round_trips_by_route"].items():
+        print(f"   {route:<24}{per_article:>8}/記事")
+    print(f"アップロード: {result['bytes_uploaded'] / 1024 / 1024:.1f}MB（画像 {result['media_bytes'] / 1024 / 1024:.1f}MB）")
+    print(f"記事インデックス登録: {result['indexed_articles']}件")
+    print(f"ステータス: {json.dumps(result['status_counts'])}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WordPress投稿スループット計測（代替サーバー使用）")
+    parser.add_argument("--articles", type=int, default=20, help="記事数")
+    parser.add_argument("--image-kb", type=int, default=200, help="画像1枚のサイズ（KB）")
+    parser.add_argument("--concurrency", type=int, default=1, help="同時投稿数")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="サーバー応答遅延（ミリ秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="応答遅延の揺らぎ（ミリ秒）")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="5xx を返す確率（0〜1）")
+    parser.add_argument("--verbose", action="store_true", help="投稿足軽の INFO ログも表示（stderr）")
+    parser.add_argument("--json", help="結果をJSONで保存するパス")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        articles=args.articles,
+        image_kb=args.image_kb,
+        concurrency=args.concurrency,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        verbose=args.verbose
+    )
+    print_report(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 保存: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+WordPress REST API ローカル代替サーバー（投稿処理の動作確認・計測用）
+WordPressPublisher が使う /wp-json/wp/v2 のエンドポイントをメモリ上で再現する
+- users/me, media, posts（sticky含む）, pages, tags, categories
+- 応答遅延・揺らぎ・失敗率（5xx）を指定可能
+- 受信バイト数・ルート別リクエスト数を集計
+
+使い方:
+  python3 fake_wordpress_server.py --port 8766 --latency-ms 80 --failure-rate 0.02
+  WORDPRESS_URL=http://127.0.0.1:8766 WORDPRESS_USERNAME=bench WORDPRESS_APPLICATION_PASSWORD=bench \\
+      EDITH_API_METRICS=0 python3 ...（WordPressPublisher を使う処理）
+
+代替サーバーに向けて実行するときは EDITH_API_METRICS=0 で API 計測を無効にする
+（/wp-json/ への呼び出しは wordpress として本番の api_metrics の集計に入るため）
+"""
+
+import base64
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+API_PREFIX = "/wp-json/wp/v2"
+
+
+class FakeWordPressServer:
+    """WordPress REST API 代替サーバー"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.username = username
+        self.password = password
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.posts: Dict[int, Dict[str, Any]] = {}
+        self.pages: Dict[int, Dict[str, Any]] = {}
+        self.media: Dict[int, Dict[str, Any]] = {}
+        self.terms: Dict[str, Dict[int, Dict[str, Any]]] = {"categories": {}, "tags": {}}
+        self._next_id = 1
+
+        self.request_counts: Dict[str, int] = {}
+        self.status_counts: Dict[int, int] = {}
+        self.bytes_received = 0
+        self.media_bytes = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def site_url(self) -> str:
+        """WORDPRESS_URL に設定するURL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """バックグラウンドで起動してサイトURLを返す"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.site_url
+
+    def stop(self):
+        """停止"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeWordPressServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        """集計値をリセット（投稿データは残す）"""
+        with self.lock:
+            self.request_counts = {}
+            self.status_counts = {}
+            self.bytes_received = 0
+            self.media_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """集計値のスナップショット"""
+        with self.lock:
+            return {
+                "requests": sum(self.request_counts.values()),
+                "request_counts": dict(self.request_counts),
+                "status_counts": dict(self.status_counts),
+                "bytes_received": self.bytes_received,
+                "media_bytes": self.media_bytes
+            }
+
+    # ==================== HTTP ====================
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self, method: str):
+                length = int(self.headers.get("content-length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                parsed = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+                route, status, body = server.handle(method, parsed.path, query, raw, self.headers)
+
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json; charset=UTF-8")
+                self.send_header("content-length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def handle(self, method: str, path: str, query: Dict[str, str], raw: bytes, headers) -> Tuple[str, int, Any]:
+        """1リクエストを処理して (ルート名, ステータス, レスポンスJSON) を返す"""
+
+        delay = self.latency_ms + (self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        route, status, body = self._route(method, path, query, raw, headers)
+
+        with self.lock:
+            self.request_counts[route] = self.request_counts.get(route, 0) + 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.bytes_received += len(raw)
+            if route == "POST media" and status == 201:
+                self.media_bytes += len(raw)
+
+        return route, status, body
+
+    def _route(self, method: str, path: str, query: Dict[str, str], raw: bytes, headers) -> Tuple[str, int, Any]:
+        if not path.startswith(API_PREFIX):
+            return "not_found", 404, _error("rest_no_route", "No route was found matching the URL and request method.")
+
+        parts = [p for p in path[len(API_PREFIX):].split("/") if p]
+        resource = parts[0] if parts else ""
+        item_id = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+        route = f"{method} {resource}{'/{id}' if item_id is not None else ''}"
+        if resource == "users" and parts[1:] == ["me"]:
+            route = f"{method} users/me"
+
+        if not self._authorized(headers.get("Authorization")):
+            return route, 401, _error("rest_not_logged_in", "You are not currently logged in.")
+
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            return route, self.random.choice([500, 502, 503]), _error("internal_server_error", "Injected failure")
+
+        if route == "GET users/me":
+            return route, 200, {"id": 1, "name": self.username or "admin", "slug": self.username or "admin"}
+
+        try:
+            data = json.loads(raw) if raw and resource != "media" else {}
+        except json.JSONDecodeError:
+            return route, 400, _error("rest_invalid_json", "Invalid JSON body passed.")
+
+        with self.lock:
+            if resource == "media" and method == "POST" and item_id is None:
+                return route, *self._create_media(raw, headers)
+            if resource in ("posts", "pages"):
+                store = self.posts if resource == "posts" else self.pages
+                if item_id is None and method == "GET":
+                    return route, 200, self._list_posts(store, query)
+                if item_id is None and method == "POST":
+                    return route, *self._create_post(store, resource, data)
+                if item_id is not None:
+                    return route, *self._post_item(store, item_id, method, data)
+            if resource in self.terms:
+                if item_id is None and method == "GET":
+                    return route, 200, self._list_terms(resource, query)
+                if item_id is None and method == "POST":
+                    return route, *self._create_term(resource, data)
+
+        return route, 404, _error("rest_no_route", "No route was found matching the URL and request method.")
+
+    def _authorized(self, authorization: Optional[str]) -> bool:
+        if self.username is None:
+            return True
+        expected = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        return authorization == f"Basic {expected}"
+
+    def _new_id(self) -> int:
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    # ==================== リソース ====================
+
+    def _create_media(self, raw: bytes, headers) -> Tuple[int, Dict]:
+        disposition = headers.get("Content-Disposition", "")
+        match = re.search(r'filename="?([^";]+)"?', disposition)
+        if not raw or not match:
+            return 400, _error("rest_upload_no_data", "No data supplied.")
+
+        media_id = self._new_id()
+        filename = match.group(1)
+        now = datetime.now()
+        self.media[media_id] = {
+            "id": media_id,
+            "source_url": f"{self.site_url}/wp-content/uploads/{now:%Y/%m}/{filename}",
+            "mime_type": headers.get("Content-Type", "application/octet-stream"),
+            "media_details": {"filesize": len(raw)}
+        }
+        return 201, self.media[media_id]
+
+    def _list_posts(self, store: Dict[int, Dict], query: Dict[str, str]) -> List[Dict]:
+        statuses = set(query.get("status", "publish").split(","))
+        posts = [p for p in store.values() if p["status"] in statuses]
+        if "slug" in query:
+            posts = [p for p in posts if p["slug"] == query["slug"]]
+        if "sticky" in query:
+            want = query["sticky"].lower() in ("1", "true")
+            posts = [p for p in posts if p.get("sticky", False) == want]
+        posts.sort(key=lambda p: p["date"], reverse=True)
+        return posts[:int(query.get("per_page", 10))]
+
+    def _unique_slug(self, store: Dict[int, Dict], slug: str, exclude_id: Optional[int] = None) -> str:
+        taken = {p["slug"] for p in store.values() if p["id"] != exclude_id}
+        candidate, suffix = slug, 2
+        while candidate in taken:
+            candidate = f"{slug}-{suffix}"
+            suffix += 1
+        return candidate
+
+    def _create_post(self, store: Dict[int, Dict], resource: str, data: Dict) -> Tuple[int, Dict]:
+        if not data.get("title") and not data.get("content"):
+            return 400, _error("empty_content", "Content, title, and excerpt are empty.")
+        if data.get("featured_media") and data["featured_media"] not in self.media:
+            return 400, _error("rest_invalid_featured_media", "Invalid featured media ID.")
+
+        post_id = self._new_id()
+        slug = self._unique_slug(store, data.get("slug") or f"{resource}-{post_id}")
+        post = {
+            "id": post_id,
+            "date": data.get("date") or datetime.now().isoformat(timespec="seconds"),
+            "slug": slug,
+            "status": data.get("status", "draft"),
+            "link": f"{self.site_url}/{slug}/",
+            "title": {"rendered": data.get("title", "")},
+            "content": {"rendered": data.get("content", "")},
+            "author": data.get("author", 1),
+            "featured_media": data.get("featured_media", 0),
+            "sticky": bool(data.get("sticky", False)),
+            "categories": data.get("categories", []),
+            "tags": data.get("tags", []),
+            "meta": data.get("meta", {})
+        }
+        store[post_id] = post
+        return 201, post
+
+    def _post_item(self, store: Dict[int, Dict], post_id: int, method: str, data: Dict) -> Tuple[int, Dict]:
+        post = store.get(post_id)
+        if post is None:
+            return 404, _error("rest_post_invalid_id", "Invalid post ID.")
+        if method == "GET":
+            return 200, post
+        if method == "DELETE":
+            post["status"] = "trash"
+            return 200, post
+
+        for key in ("status", "date", "author", "featured_media", "categories", "tags", "meta"):
+            if key in data:
+                post[key] = data[key]
+        if "sticky" in data:
+            post["sticky"] = bool(data["sticky"])
+        if "title" in data:
+            post["title"] = {"rendered": data["title"]}
+        if "content" in data:
+            post["content"] = {"rendered": data["content"]}
+        if data.get("slug"):
+            post["slug"] = self._unique_slug(store, data["slug"], exclude_id=post_id)
+            post["link"] = f"{self.site_url}/{post['slug']}/"
+        return 200, post
+
+    def _list_terms(self, taxonomy: str, query: Dict[str, str]) -> List[Dict]:
+        terms = list(self.terms[taxonomy].values())
+        if query.get("search"):
+            terms = [t for t in terms if query["search"].lower() in t["name"].lower()]
+        return terms[:int(query.get("per_page", 10))]
+
+    def _create_term(self, taxonomy: str, data: Dict) -> Tuple[int, Dict]:
+        name = data.get("name", "").strip()
+        if not name:
+            return 400, _error("rest_missing_callback_param", "Missing parameter(s): name")
+        for term in self.terms[taxonomy].values():
+            if term["name"] == name:
+                return 400, dict(_error("term_exists", "A term with the name provided already exists."),
+                                 data={"status": 400, "term_id": term["id"]})
+        term_id = self._new_id()
+        self.terms[taxonomy][term_id] = {"id": term_id, "name": name, "slug": name.lower(), "count": 0}
+        return 201, self.terms[taxonomy][term_id]
+
+
+def _error(code: str, message: str) -> Dict:
+    return {"code": code, "message": message, "data": {"status": None}}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WordPress REST API ローカル代替サーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="応答遅延（ミリ秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="応答遅延の揺らぎ（ミリ秒）")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="5xx を返す確率（0〜1）")
+    parser.add_argument("--username", help="Basic認証のユーザー名（省略時は認証なし）")
+    parser.add_argument("--password", help="Basic認証のパスワード")
+    args = parser.parse_args()
+
+    server = FakeWordPressServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        username=args.username,
+        password=args.password
+    )
+
+    print(f"[WordPress代替サーバー] 起動: {server.site_url}{API_PREFIX}")
+    print(f"[WordPress代替サーバー] WORDPRESS_URL={server.site_url} を設定すると接続先になります")
+    print("[WordPress代替サーバー] （EDITH_API_METRICS=0 も設定して本番の API 集計に入れないこと）")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[WordPress代替サーバー] 停止: {json.dumps(server.stats(), ensure_ascii=False)}")
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,16 @@ WordPress投稿足軽 - 記事とアイキャッチ画像の自動投稿シス
 """
 
 import os
+import re
 import sys
+import glob
 import json
+import hashlib
 import requests
 import base64
 import markdown
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -17,6 +22,12 @@ from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from output_paths import BLOG_ARTICLES_INDEX
+from articles_index import ArticlesIndex
+import api_metrics
+from agent_log import get_logger
+
+log = get_logger("WordPress投稿足軽")
+workflow_log = get_logger("記事投稿ワークフロー")
 
 # .env.localから環境変数を読み込み
 _project_root = Path(__file__).resolve().parent.parent.parent.parent
@@ -39,6 +50,10 @@ ALLOWED_CATEGORIES = [
 class WordPressPublisher:
     """WordPress投稿足軽 - 記事と画像の一括投稿"""
 
+    # 画像の挿入方針など、記事HTMLの組み立て方を変えたら上げる（全記事が更新対象になる）
+    PUBLISH_FORMAT_VERSION = 1
+    BULK_WORKERS = 4  # 一括更新の同時処理数
+
     def __init__(self):
         self.rank = "足軽"
         self.specialty = "WordPress自動投稿"
@@ -51,17 +66,29 @@ class WordPressPublisher:
 
         # API エンドポイント
         self.wp_api_base = f"{self.wp_site_url}/wp-json/wp/v2"
+        api_metrics.install("wordpress", self.wp_site_url)
+
+        # 全リクエストで1つのセッションを使う（接続を使い回す。並列投稿の同時接続数まで保持）
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.BULK_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         # カテゴリーIDキャッシュ
         self._category_cache = {}
         self._tag_cache = {}
+        self._current_user_id = None
 
-        print(f"[WordPress投稿足軽] 配属完了 - {self.specialty}を担当")
+        # 並列投稿で決めたスラッグ（確認から投稿までの間に他の記事が同じスラッグを選ばないように）
+        self._slug_lock = threading.Lock()
+        self._reserved_slugs = set()
+
+        log.info(f"配属完了 - {self.specialty}を担当")
 
     def publish_article_with_images(self, article_dir: str) -> Dict[str, Any]:
         """記事ディレクトリから完全投稿（記事+画像+メタデータ）"""
 
-        print(f"[WordPress投稿足軽] 📤 記事投稿開始: {article_dir}")
+        log.info(f"📤 記事投稿開始: {article_dir}")
 
         # ディレクトリ構造確認
         if not os.path.exists(article_dir):
@@ -80,6 +107,8 @@ class WordPressPublisher:
             return content_result
 
         article_html = content_result["content"]
+        image_hashes = self._hash_images(article_dir)
+        content_hash = self._compute_content_hash(meta_data, article_html, image_hashes)
 
         # 画像アップロード
         images_result = self._upload_images(article_dir)
@@ -95,7 +124,10 @@ class WordPressPublisher:
 
         if post_result["success"]:
             # WordPressデータを保存
-            self._save_wordpress_data(article_dir, post_result["post_data"], images_result)
+            self._save_wordpress_data(
+                article_dir, post_result["post_data"], images_result,
+                content_hash=content_hash, image_hashes=image_hashes
+            )
             # articles_index.json に自動追加（重複チェック用）
             self._add_to_articles_index(meta_data, post_result["post_data"])
 
@@ -110,9 +142,256 @@ class WordPressPublisher:
         if not post_result["success"]:
             result["error"] = post_result["error"]
 
-        print(f"[WordPress投稿足軽] {'✅ 投稿完了' if post_result['success'] else '❌ 投稿失敗'}")
+        if post_result["success"]:
+            log.info("✅ 投稿完了")
+        else:
+            log.error("❌ 投稿失敗")
         return result
 
+    # ==================== 一括再投稿・更新 ====================
+
+    def republish_articles(
+        self,
+        articles: Any,
+        workers: Optional[int] = None,
+        force: bool = False,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        既存記事の一括再投稿・更新
+
+        wordpress/publish_data.json の content_hash と比較して変更のない記事は
+        スキップし、投稿済みの記事は PUT で更新、未投稿の記事は新規作成する。
+        画像は内容が変わったものだけ再アップロードする。
+        articles_index.json は全記事の処理後に1回だけまとめて更新する。
+
+        Args:
+            articles: 記事ディレクトリのglob文字列、またはパスのリスト
+            workers: 同時処理数（省略時は BULK_WORKERS）
+            force: 変更がなくても更新する
+            dry_run: 判定だけ行い投稿しない
+
+        Returns:
+            {"total", "created", "updated", "skipped", "failed", "errors", "indexed"}
+        """
+        article_dirs = self._resolve_article_dirs(articles)
+        log.info(f"📚 一括更新開始: {len(article_dirs)}記事")
+
+        plans = []
+        errors = []
+        for article_dir in article_dirs:
+            plan = self._plan_republish(article_dir, force)
+            if "error" in plan:
+                errors.append({"article_directory": article_dir, "error": plan["error"]})
+            else:
+                plans.append(plan)
+
+        targets = [p for p in plans if p["action"] != "skip"]
+        skipped = len(plans) - len(targets)
+        summary = {
+            "total": len(article_dirs),
+            "created": 0,
+            "updated": 0,
+            "skipped": skipped,
+            "failed": len(errors),
+            "errors": errors,
+            "indexed": 0
+        }
+
+        if dry_run:
+            summary["planned"] = [{"article_directory": p["article_dir"], "action": p["action"]} for p in targets]
+            log.warning(f"一括更新（確認のみ）: 対象{len(targets)}件, スキップ{skipped}件")
+            return summary
+
+        self.prepare_bulk_publish(
+            [p["meta_data"] for p in targets],
+            creating=any(p["action"] == "create" for p in targets)
+        )
+
+        index_entries = []
+        with ThreadPoolExecutor(max_workers=workers or self.BULK_WORKERS) as executor:
+            futures = {executor.submit(self._republish_one, plan): plan for plan in targets}
+            for future in as_completed(futures):
+                plan = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+
+                if result["success"]:
+                    summary["created" if plan["action"] == "create" else "updated"] += 1
+                    index_entries.append((plan["meta_data"], result["post_data"]))
+                else:
+                    summary["failed"] += 1
+                    errors.append({"article_directory": plan["article_dir"], "error": result["error"]})
+
+        summary["indexed"] = self._update_articles_index_bulk(index_entries)
+
+        log.info(f"📚 一括更新完了: 作成{summary['created']}件, 更新{summary['updated']}件, "
+                 f"スキップ{summary['skipped']}件, 失敗{summary['failed']}件")
+        return summary
+
+    def _resolve_article_dirs(self, articles: Any) -> List[str]:
+        """glob文字列またはパスのリストを、meta.json を持つ記事ディレクトリのリストに展開"""
+
+        if isinstance(articles, (str, Path)):
+            candidates = sorted(glob.glob(str(articles)))
+        else:
+            candidates = [str(a) for a in articles]
+
+        article_dirs = []
+        for candidate in candidates:
+            if os.path.isdir(candidate) and os.path.exists(os.path.join(candidate, "meta.json")):
+                article_dirs.append(candidate)
+            else:
+                log.info(f"記事ディレクトリではないため除外: {candidate}")
+        return list(dict.fromkeys(article_dirs))
+
+    def _plan_republish(self, article_dir: str, force: bool) -> Dict[str, Any]:
+        """記事を読み込んで content_hash を計算し、作成/更新/スキップを判定"""
+
+        meta_result = self._load_article_metadata(article_dir)
+        if not meta_result["success"]:
+            return {"error": meta_result["error"]}
+        content_result = self._load_article_content(article_dir)
+        if not content_result["success"]:
+            return {"error": content_result["error"]}
+
+        meta_data = meta_result["data"]
+        image_hashes = self._hash_images(article_dir)
+        content_hash = self._compute_content_hash(meta_data, content_result["content"], image_hashes)
+        previous = self._load_wordpress_data(article_dir)
+
+        if not previous.get("post_id"):
+            action = "create"
+        elif not force and previous.get("content_hash") == content_hash:
+            action = "skip"
+        else:
+            action = "update"
+
+        return {
+            "article_dir": article_dir,
+            "action": action,
+            "meta_data": meta_data,
+            "content": content_result["content"],
+            "content_hash": content_hash,
+            "image_hashes": image_hashes,
+            "previous": previous
+        }
+
+    def _republish_one(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """1記事を作成または更新して publish_data.json を書き換える"""
+
+        article_dir = plan["article_dir"]
+        previous = plan["previous"]
+
+        # 内容の変わっていない画像は前回のメディアを再利用
+        previous_hashes = previous.get("image_hashes", {})
+        reusable = {
+            img["filename"]: img
+            for img in previous.get("images_uploaded", [])
+            if previous_hashes.get(img["filename"]) == plan["image_hashes"].get(img["filename"])
+        }
+        images_result = self._upload_images(article_dir, reusable=reusable)
+
+        article_html = plan["content"]
+        if images_result.get("images"):
+            article_html = self._insert_images_into_content(article_html, images_result["images"])
+
+        if plan["action"] == "create":
+            post_result = self._create_wordpress_post(
+                plan["meta_data"], article_html, images_result.get("featured_image_id")
+            )
+        else:
+            post_result = self._update_wordpress_post(
+                previous["post_id"], plan["meta_data"], article_html, images_result.get("featured_image_id")
+            )
+
+        if post_result["success"]:
+            self._save_wordpress_data(
+                article_dir, post_result["post_data"], images_result,
+                content_hash=plan["content_hash"],
+                image_hashes=plan["image_hashes"],
+                published_at=previous.get("published_at")
+            )
+        return post_result
+
+    def prepare_bulk_publish(self, metas: List[Dict[str, Any]], creating: bool = True):
+        """
+        並列投稿の前処理
+
+        カテゴリー・タグ・投稿者IDを並列処理の前にまとめて解決する（同名タームの重複作成を防ぐ）。
+
+        Args:
+            metas: 投稿する記事の meta.json の内容
+            creating: 新規投稿を含むか（投稿者IDの解決が必要）
+        """
+        self._warm_term_caches(metas)
+        if creating and self.wp_username and self.wp_app_password:
+            self._get_current_user_id()
+
+    def _warm_term_caches(self, metas: List[Dict[str, Any]]):
+        """記事群のカテゴリー・タグIDを事前に解決してキャッシュする"""
+
+        categories = set()
+        tags = set()
+        for meta_data in metas:
+            category = meta_data.get("category", "AIラボ")
+            categories.add(category if category in ALLOWED_CATEGORIES else "AIラボ")
+            tags.update(meta_data.get("tags", []))
+
+        for category in sorted(categories):
+            self._get_or_create_category(category)
+        for tag in sorted(tags):
+            self._get_or_create_tag(tag)
+
+    def _list_image_files(self, images_dir: str) -> List[str]:
+        """画像ファイル名をソートして返す（00_が先頭=アイキャッチ）"""
+
+        if not os.path.exists(images_dir):
+            return []
+        return sorted([
+            f for f in os.listdir(images_dir)
+            if f.lower().endswith(('.png', '.jpg', '.jpeg'))
+        ])
+
+    def _hash_images(self, article_dir: str) -> Dict[str, str]:
+        """画像ファイルごとの SHA-256"""
+
+        images_dir = os.path.join(article_dir, "images")
+        hashes = {}
+        for image_file in self._list_image_files(images_dir):
+            digest = hashlib.sha256()
+            with open(os.path.join(images_dir, image_file), "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            hashes[image_file] = digest.hexdigest()
+        return hashes
+
+    def _compute_content_hash(self, meta_data: Dict[str, Any], article_html: str, image_hashes: Dict[str, str]) -> str:
+        """投稿内容のハッシュ（メタデータ・変換後HTML・画像・組み立て方のバージョン）"""
+
+        payload = json.dumps({
+            "format_version": self.PUBLISH_FORMAT_VERSION,
+            "meta": meta_data,
+            "html": article_html,
+            "images": image_hashes
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_wordpress_data(self, article_dir: str) -> Dict[str, Any]:
+        """wordpress/publish_data.json を読み込む（なければ空）"""
+
+        publish_data_path = os.path.join(article_dir, "wordpress", "publish_data.json")
+        if not os.path.exists(publish_data_path):
+            return {}
+        try:
+            with open(publish_data_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            log.error(f"投稿データ読み込みエラー: {publish_data_path} ({e})")
+            return {}
+
     def _load_article_metadata(self, article_dir: str) -> Dict[str, Any]:
         """記事メタデータ読み込み"""
 
@@ -158,28 +437,30 @@ class WordPressPublisher:
         except Exception as e:
             return {"success": False, "error": f"記事コンテンツ読み込みエラー: {str(e)}"}
 
-    def _upload_images(self, article_dir: str) -> Dict[str, Any]:
-        """記事用画像の一括アップロード"""
+    def _upload_images(self, article_dir: str, reusable: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]:
+        """記事用画像の一括アップロード（reusable に含まれる画像は再アップロードしない）"""
 
         images_dir = os.path.join(article_dir, "images")
 
         if not os.path.exists(images_dir):
-            print(f"[WordPress投稿足軽] 画像ディレクトリなし: {images_dir}")
+            log.info(f"画像ディレクトリなし: {images_dir}")
             return {"uploaded_count": 0, "images": []}
 
         uploaded_images = []
         featured_image_id = None
+        reusable = reusable or {}
 
         # 画像ファイルをソートして処理（00_が先頭=アイキャッチ）
-        image_files = sorted([
-            f for f in os.listdir(images_dir)
-            if f.lower().endswith(('.png', '.jpg', '.jpeg'))
-        ])
+        image_files = self._list_image_files(images_dir)
 
         for idx, image_file in enumerate(image_files):
             image_path = os.path.join(images_dir, image_file)
 
-            upload_result = self._upload_single_image(image_path, image_file)
+            if image_file in reusable:
+                previous = reusable[image_file]
+                upload_result = {"success": True, "media_id": previous["media_id"], "url": previous["url"]}
+            else:
+                upload_result = self._upload_single_image(image_path, image_file)
 
             if upload_result["success"]:
                 uploaded_images.append({
@@ -191,11 +472,14 @@ class WordPressPublisher:
                 # インデックス0の画像をアイキャッチとして使用
                 if idx == 0:
                     featured_image_id = upload_result["media_id"]
-                    print(f"[WordPress投稿足軽] アイキャッチ画像: {image_file}")
+                    log.info(f"アイキャッチ画像: {image_file}")
 
-                print(f"[WordPress投稿足軽] 画像アップロード成功: {image_file}")
+                if image_file in reusable:
+                    log.info(f"画像は変更なし（再利用）: {image_file}")
+                else:
+                    log.info(f"画像アップロード成功: {image_file}")
             else:
-                print(f"[WordPress投稿足軽] 画像アップロード失敗: {image_file}")
+                log.warning(f"画像アップロード失敗: {image_file}")
 
         return {
             "uploaded_count": len(uploaded_images),
@@ -213,7 +497,6 @@ class WordPressPublisher:
             return html_content
 
         # H2タグを見つけて、各H2の直後に対応する画像を挿入
-        import re
         h2_pattern = re.compile(r'(<h2>.*?</h2>)', re.DOTALL)
         h2_matches = list(h2_pattern.finditer(html_content))
 
@@ -249,7 +532,7 @@ class WordPressPublisher:
                 'Content-Type': content_type
             }
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.wp_api_base}/media",
                 headers=headers,
                 data=image_data
@@ -281,7 +564,7 @@ class WordPressPublisher:
         mock_media_id = random.randint(1000, 9999)
         mock_url = f"https://www.room8.co.jp/wp-content/uploads/2026/02/{filename}"
 
-        print(f"[WordPress投稿足軽] モック画像アップロード: {filename} (ID: {mock_media_id})")
+        log.info(f"モック画像アップロード: {filename} (ID: {mock_media_id})")
 
         return {
             "success": True,
@@ -290,36 +573,51 @@ class WordPressPublisher:
         }
 
     def _ensure_unique_slug(self, slug: str) -> str:
-        """スラッグの重複チェック（投稿+固定ページ）。重複時は末尾に連番を付与"""
+        """
+        スラッグの重複チェック（投稿+固定ページ）。重複時は末尾に連番を付与
+
+        確認と予約はロックの中で行い、このインスタンスで予約済みのスラッグも重複として扱う
+        （republish_articles の並列作成で同じスラッグが2記事に付かないように）。
+        """
 
         if not self.wp_username or not self.wp_app_password:
             return slug
 
+        with self._slug_lock:
+            candidate = self._find_free_slug(slug)
+            self._reserved_slugs.add(candidate)
+            return candidate
+
+    def _find_free_slug(self, slug: str) -> str:
+        """WordPress にも予約済みにもないスラッグを探す（_slug_lock の中で呼ぶ）"""
+
         candidate = slug
         suffix = 2
 
         while True:
-            is_duplicate = False
-
-            for endpoint in ["posts", "pages"]:
-                try:
-                    response = requests.get(
-                        f"{self.wp_api_base}/{endpoint}",
-                        headers={'Authorization': self._get_auth_header()},
-                        params={"slug": candidate, "status": "publish,draft,future,private", "per_page": 1},
-                        timeout=10
-                    )
-                    if response.status_code == 200 and response.json():
-                        is_duplicate = True
-                        existing = response.json()[0]
-                        print(f"[WordPress投稿足軽] スラッグ重複検出: '{candidate}' が {endpoint} (ID:{existing['id']}) に存在")
-                        break
-                except Exception as e:
-                    print(f"[WordPress投稿足軽] スラッグチェックエラー ({endpoint}): {e}")
+            is_duplicate = candidate in self._reserved_slugs
+            if is_duplicate:
+                log.info(f"スラッグ重複検出: '{candidate}' は並列投稿で予約済み")
+            else:
+                for endpoint in ["posts", "pages"]:
+                    try:
+                        response = self.session.get(
+                            f"{self.wp_api_base}/{endpoint}",
+                            headers={'Authorization': self._get_auth_header()},
+                            params={"slug": candidate, "status": "publish,draft,future,private", "per_page": 1},
+                            timeout=10
+                        )
+                        if response.status_code == 200 and response.json():
+                            is_duplicate = True
+                            existing = response.json()[0]
+                            log.info(f"スラッグ重複検出: '{candidate}' が {endpoint} (ID:{existing['id']}) に存在")
+                            break
+                    except Exception as e:
+                        log.error(f"スラッグチェックエラー ({endpoint}): {e}")
 
             if not is_duplicate:
                 if candidate != slug:
-                    print(f"[WordPress投稿足軽] スラッグ変更: '{slug}' → '{candidate}'")
+                    log.info(f"スラッグ変更: '{slug}' → '{candidate}'")
                 return candidate
 
             candidate = f"{slug}-{suffix}"
@@ -342,78 +640,24 @@ class WordPressPublisher:
             original_slug = meta_data.get("slug", "")
             unique_slug = self._ensure_unique_slug(original_slug)
 
-            post_data = {
-                "title": meta_data.get("title", ""),
-                "slug": unique_slug,
-                "content": content,
-                "status": "future" if scheduled_date else "draft",
-            }
-
-            # 注目記事（先頭固定）
-            if wp_meta.get("sticky") or meta_data.get("sticky"):
-                post_data["sticky"] = True
-                print(f"[WordPress投稿足軽] 注目記事に設定")
+            post_data = self._build_post_payload(meta_data, content, featured_image_id)
+            post_data["slug"] = unique_slug
+            post_data["status"] = "future" if scheduled_date else "draft"
 
             if scheduled_date:
                 post_data["date"] = scheduled_date
-                print(f"[WordPress投稿足軽] 予約投稿: {scheduled_date}")
+                log.info(f"予約投稿: {scheduled_date}")
 
             if author_id:
                 post_data["author"] = author_id
 
-            if featured_image_id:
-                post_data["featured_media"] = featured_image_id
-
-            # カテゴリー設定（固定リストから選択）
-            category = meta_data.get("category", "AIラボ")
-            if category not in ALLOWED_CATEGORIES:
-                category = "AIラボ"
-            category_id = self._get_or_create_category(category)
-            if category_id:
-                post_data["categories"] = [category_id]
-
-            # タグ設定（meta.jsonのtagsから）
-            tags = meta_data.get("tags", [])
-            if tags:
-                tag_ids = [self._get_or_create_tag(tag) for tag in tags]
-                post_data["tags"] = [tid for tid in tag_ids if tid]
-
-            # SEOメタディスクリプション（Yoast SEO対応）
-            seo_meta = meta_data.get("seo", {})
-            if seo_meta.get("meta_description"):
-                post_data["meta"] = {
-                    "_yoast_wpseo_metadesc": seo_meta["meta_description"]
-                }
-
-            response = requests.post(
+            response = self.session.post(
                 f"{self.wp_api_base}/posts",
                 headers={'Authorization': self._get_auth_header()},
                 json=post_data
             )
 
-            if response.status_code == 201:
-                created_post = response.json()
-                return {
-                    "success": True,
-                    "post_data": {
-                        "id": created_post["id"],
-                        "url": created_post["link"],
-                        "status": created_post["status"],
-                        "title": created_post["title"]["rendered"]
-                    }
-                }
-            else:
-                try:
-                    error_body = response.json()
-                    error_detail = error_body.get("message", response.text[:500])
-                    error_code = error_body.get("code", "unknown")
-                except Exception:
-                    error_detail = response.text[:500]
-                    error_code = "unknown"
-                return {
-                    "success": False,
-                    "error": f"投稿失敗: {response.status_code} ({error_code}: {error_detail})"
-                }
+            return self._post_response_result(response, 201, "投稿失敗")
 
         except Exception as e:
             return {
@@ -421,6 +665,101 @@ class WordPressPublisher:
                 "error": str(e)
             }
 
+    def _update_wordpress_post(self, post_id: int, meta_data: Dict[str, Any], content: str, featured_image_id: Optional[int] = None) -> Dict[str, Any]:
+        """既存のWordPress記事を更新（スラッグ・公開状態・投稿者は変更しない）"""
+
+        if not self.wp_username or not self.wp_app_password:
+            result = self._mock_post_creation(meta_data, content, featured_image_id)
+            result["post_data"]["id"] = post_id
+            return result
+
+        try:
+            response = self.session.put(
+                f"{self.wp_api_base}/posts/{post_id}",
+                headers={'Authorization': self._get_auth_header()},
+                json=self._build_post_payload(meta_data, content, featured_image_id),
+                timeout=30
+            )
+
+            result = self._post_response_result(response, 200, "更新失敗")
+            if result["success"]:
+                log.info(f"記事更新: {result['post_data']['title']} (ID: {post_id})")
+            return result
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def _build_post_payload(self, meta_data: Dict[str, Any], content: str, featured_image_id: Optional[int] = None) -> Dict[str, Any]:
+        """投稿・更新共通のリクエスト本文（タイトル・本文・アイキャッチ・カテゴリー・タグ・SEO）"""
+
+        post_data = {
+            "title": meta_data.get("title", ""),
+            "content": content,
+        }
+
+        # 注目記事（先頭固定）
+        wp_meta = meta_data.get("wordpress", {})
+        if wp_meta.get("sticky") or meta_data.get("sticky"):
+            post_data["sticky"] = True
+            log.info("注目記事に設定")
+
+        if featured_image_id:
+            post_data["featured_media"] = featured_image_id
+
+        # カテゴリー設定（固定リストから選択）
+        category = meta_data.get("category", "AIラボ")
+        if category not in ALLOWED_CATEGORIES:
+            category = "AIラボ"
+        category_id = self._get_or_create_category(category)
+        if category_id:
+            post_data["categories"] = [category_id]
+
+        # タグ設定（meta.jsonのtagsから）
+        tags = meta_data.get("tags", [])
+        if tags:
+            tag_ids = [self._get_or_create_tag(tag) for tag in tags]
+            post_data["tags"] = [tid for tid in tag_ids if tid]
+
+        # SEOメタディスクリプション（Yoast SEO対応）
+        seo_meta = meta_data.get("seo", {})
+        if seo_meta.get("meta_description"):
+            post_data["meta"] = {
+                "_yoast_wpseo_metadesc": seo_meta["meta_description"]
+            }
+
+        return post_data
+
+    def _post_response_result(self, response, expected_status: int, error_label: str) -> Dict[str, Any]:
+        """投稿・更新レスポンスを結果辞書に変換"""
+
+        if response.status_code == expected_status:
+            post = response.json()
+            return {
+                "success": True,
+                "post_data": {
+                    "id": post["id"],
+                    "url": post["link"],
+                    "status": post["status"],
+                    "title": post["title"]["rendered"],
+                    "featured_media": post.get("featured_media")
+                }
+            }
+
+        try:
+            error_body = response.json()
+            error_detail = error_body.get("message", response.text[:500])
+            error_code = error_body.get("code", "unknown")
+        except Exception:
+            error_detail = response.text[:500]
+            error_code = "unknown"
+        return {
+            "success": False,
+            "error": f"{error_label}: {response.status_code} ({error_code}: {error_detail})"
+        }
+
     def _mock_post_creation(self, meta_data: Dict[str, Any], content: str, featured_image_id: Optional[int] = None) -> Dict[str, Any]:
         """モック記事投稿（開発用）"""
 
@@ -429,7 +768,7 @@ class WordPressPublisher:
         slug = meta_data.get("slug", "test-article")
         mock_url = f"https://www.room8.co.jp/{slug}/"
 
-        print(f"[WordPress投稿足軽] モック記事投稿: {meta_data.get('title', '')} (ID: {mock_post_id})")
+        log.info(f"モック記事投稿: {meta_data.get('title', '')} (ID: {mock_post_id})")
 
         return {
             "success": True,
@@ -453,7 +792,7 @@ class WordPressPublisher:
 
         try:
             # 既存カテゴリーを検索
-            response = requests.get(
+            response = self.session.get(
                 f"{self.wp_api_base}/categories",
                 headers={'Authorization': self._get_auth_header()},
                 params={"search": category_name, "per_page": 10},
@@ -465,11 +804,11 @@ class WordPressPublisher:
                 for cat in categories:
                     if cat["name"] == category_name:
                         self._category_cache[category_name] = cat["id"]
-                        print(f"[WordPress投稿足軽] カテゴリー取得: {category_name} (ID: {cat['id']})")
+                        log.info(f"カテゴリー取得: {category_name} (ID: {cat['id']})")
                         return cat["id"]
 
             # 見つからなければ作成
-            response = requests.post(
+            response = self.session.post(
                 f"{self.wp_api_base}/categories",
                 headers={'Authorization': self._get_auth_header()},
                 json={"name": category_name},
@@ -479,11 +818,11 @@ class WordPressPublisher:
             if response.status_code == 201:
                 cat_id = response.json()["id"]
                 self._category_cache[category_name] = cat_id
-                print(f"[WordPress投稿足軽] カテゴリー作成: {category_name} (ID: {cat_id})")
+                log.info(f"カテゴリー作成: {category_name} (ID: {cat_id})")
                 return cat_id
 
         except Exception as e:
-            print(f"[WordPress投稿足軽] カテゴリー処理エラー: {e}")
+            log.error(f"カテゴリー処理エラー: {e}")
 
         return None
 
@@ -498,7 +837,7 @@ class WordPressPublisher:
 
         try:
             # 既存タグを検索
-            response = requests.get(
+            response = self.session.get(
                 f"{self.wp_api_base}/tags",
                 headers={'Authorization': self._get_auth_header()},
                 params={"search": tag_name, "per_page": 10},
@@ -513,7 +852,7 @@ class WordPressPublisher:
                         return tag["id"]
 
             # 見つからなければ作成
-            response = requests.post(
+            response = self.session.post(
                 f"{self.wp_api_base}/tags",
                 headers={'Authorization': self._get_auth_header()},
                 json={"name": tag_name},
@@ -523,32 +862,36 @@ class WordPressPublisher:
             if response.status_code == 201:
                 tag_id = response.json()["id"]
                 self._tag_cache[tag_name] = tag_id
-                print(f"[WordPress投稿足軽] タグ作成: {tag_name} (ID: {tag_id})")
+                log.info(f"タグ作成: {tag_name} (ID: {tag_id})")
                 return tag_id
 
         except Exception as e:
-            print(f"[WordPress投稿足軽] タグ処理エラー: {e}")
+            log.error(f"タグ処理エラー: {e}")
 
         return None
 
     def _get_current_user_id(self) -> Optional[int]:
-        """認証中ユーザーのWordPress IDを取得"""
+        """認証中ユーザーのWordPress IDを取得（取得できたらキャッシュ）"""
+
+        if self._current_user_id:
+            return self._current_user_id
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.wp_api_base}/users/me",
                 headers={'Authorization': self._get_auth_header()},
                 timeout=10
             )
             if response.status_code == 200:
                 user_id = response.json().get("id")
-                print(f"[WordPress投稿足軽] 認証ユーザーID: {user_id}")
+                self._current_user_id = user_id
+                log.info(f"認証ユーザーID: {user_id}")
                 return user_id
             else:
-                print(f"[WordPress投稿足軽] ユーザーID取得失敗: {response.status_code}")
+                log.warning(f"ユーザーID取得失敗: {response.status_code}")
                 return None
         except Exception as e:
-            print(f"[WordPress投稿足軽] ユーザーID取得エラー: {e}")
+            log.error(f"ユーザーID取得エラー: {e}")
             return None
 
     def _get_auth_header(self) -> str:
@@ -565,7 +908,7 @@ class WordPressPublisher:
             return {"success": False, "error": "WordPress認証情報が未設定"}
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.wp_api_base}/posts",
                 headers={'Authorization': self._get_auth_header()},
                 params={"sticky": True, "per_page": 20},
@@ -601,7 +944,7 @@ class WordPressPublisher:
             return {"success": False, "error": "WordPress認証情報が未設定"}
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.wp_api_base}/posts/{post_id}",
                 headers={'Authorization': self._get_auth_header()},
                 json={"sticky": sticky},
@@ -611,7 +954,7 @@ class WordPressPublisher:
             if response.status_code == 200:
                 post = response.json()
                 action = "注目に追加" if sticky else "注目から削除"
-                print(f"[WordPress投稿足軽] {action}: {post['title']['rendered']} (ID: {post_id})")
+                log.info(f"{action}: {post['title']['rendered']} (ID: {post_id})")
                 return {
                     "success": True,
                     "post_id": post_id,
@@ -649,74 +992,94 @@ class WordPressPublisher:
                 results["errors"].append(f"設定失敗 ID:{pid}")
 
         results["success"] = len(results["errors"]) == 0
-        print(f"[WordPress投稿足軽] 注目記事入れ替え完了: 追加{len(results['added'])}件, 削除{len(results['removed'])}件")
+        log.info(f"注目記事入れ替え完了: 追加{len(results['added'])}件, 削除{len(results['removed'])}件")
         return results
 
-    def _save_wordpress_data(self, article_dir: str, post_data: Dict[str, Any], images_data: Dict[str, Any]):
-        """WordPress投稿データの保存"""
+    def _save_wordpress_data(
+        self,
+        article_dir: str,
+        post_data: Dict[str, Any],
+        images_data: Dict[str, Any],
+        content_hash: Optional[str] = None,
+        image_hashes: Optional[Dict[str, str]] = None,
+        published_at: Optional[str] = None
+    ):
+        """WordPress投稿データの保存（一括更新の変更判定用に content_hash も記録）"""
 
         wordpress_dir = os.path.join(article_dir, "wordpress")
         os.makedirs(wordpress_dir, exist_ok=True)
 
+        now = datetime.now().isoformat()
         publish_data = {
             "post_id": post_data.get("id"),
             "post_url": post_data.get("url"),
             "status": post_data.get("status"),
-            "published_at": datetime.now().isoformat(),
+            "published_at": published_at or now,
             "featured_media": post_data.get("featured_media"),
-            "images_uploaded": images_data.get("images", [])
+            "images_uploaded": images_data.get("images", []),
+            "content_hash": content_hash,
+            "image_hashes": image_hashes or {}
         }
+        if published_at:
+            publish_data["updated_at"] = now
 
         publish_data_path = os.path.join(wordpress_dir, "publish_data.json")
-        with open(publish_data_path, "w", encoding="utf-8") as f:
+        tmp_path = publish_data_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(publish_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, publish_data_path)
+
+        log.info(f"投稿データ保存: {publish_data_path}")
 
-        print(f"[WordPress投稿足軽] 投稿データ保存: {publish_data_path}")
+    def _index_fields(self, meta_data: Dict[str, Any], post_data: Dict[str, Any]) -> Dict[str, Any]:
+        """記事インデックスに登録するフィールド"""
+
+        return {
+            "title": meta_data.get("title", ""),
+            "slug": meta_data.get("slug", ""),
+            "url": post_data.get("url", ""),
+            "excerpt": meta_data.get("seo", {}).get("meta_description", "")
+        }
 
     def _add_to_articles_index(self, meta_data: Dict[str, Any], post_data: Dict[str, Any]):
         """articles_index.json に記事を追加（重複防止のため投稿時に即追加）"""
 
         try:
-            # 既存のインデックスを読み込み
-            if BLOG_ARTICLES_INDEX.exists():
-                index = json.loads(BLOG_ARTICLES_INDEX.read_text(encoding="utf-8"))
+            entry = ArticlesIndex.shared(BLOG_ARTICLES_INDEX).add(self._index_fields(meta_data, post_data))
+
+            if entry is None:
+                log.info(f"記事インデックス: {meta_data.get('slug', '')} は既に登録済み")
             else:
-                index = {"version": 1, "updated_at": "", "total_articles": 0, "articles": []}
+                log.info(f"記事インデックス追加: {entry['slug']} (ID: {entry['id']})")
 
-            slug = meta_data.get("slug", "")
+        except Exception as e:
+            log.error(f"記事インデックス更新エラー: {e}")
 
-            # 同じスラッグが既にあればスキップ
-            if any(a.get("slug") == slug for a in index.get("articles", [])):
-                print(f"[WordPress投稿足軽] 記事インデックス: {slug} は既に登録済み")
-                return
+    def _update_articles_index_bulk(self, entries: List[tuple]) -> int:
+        """
+        articles_index.json を1回の書き込みでまとめて更新
 
-            # 新しいIDを生成（既存の最大ID + 1）
-            max_id = max((a.get("id") or 0 for a in index.get("articles", [])), default=0)
+        既存スラッグはタイトル・URL・抜粋を更新し、新規スラッグは先頭に追加する。
 
-            new_entry = {
-                "id": max_id + 1,
-                "title": meta_data.get("title", ""),
-                "slug": slug,
-                "url": post_data.get("url", ""),
-                "published_date": datetime.now().strftime("%Y-%m-%d"),
-                "excerpt": meta_data.get("seo", {}).get("meta_description", ""),
-                "source": "wordpress"
-            }
+        Args:
+            entries: [(meta_data, post_data), ...]
 
-            # 先頭に追加（最新記事が上）
-            index["articles"].insert(0, new_entry)
-            index["total_articles"] = len(index["articles"])
-            index["updated_at"] = datetime.now().isoformat()
+        Returns:
+            追加・更新した件数
+        """
+        if not entries:
+            return 0
 
-            BLOG_ARTICLES_INDEX.write_text(
-                json.dumps(index, ensure_ascii=False, indent=2),
-                encoding="utf-8"
+        try:
+            added, updated = ArticlesIndex.shared(BLOG_ARTICLES_INDEX).upsert_many(
+                [self._index_fields(meta_data, post_data) for meta_data, post_data in entries]
             )
-
-            print(f"[WordPress投稿足軽] 記事インデックス追加: {slug} (ID: {new_entry['id']})")
+            log.info(f"記事インデックス一括更新: 追加{len(added)}件, 更新{len(updated)}件")
+            return len(added) + len(updated)
 
         except Exception as e:
-            print(f"[WordPress投稿足軽] 記事インデックス更新エラー: {e}")
+            log.error(f"記事インデックス更新エラー: {e}")
+            return 0
 
 
 class ArticlePublishingWorkflow:
@@ -728,7 +1091,7 @@ class ArticlePublishingWorkflow:
     def process_article_directory(self, article_dir: str, publish_mode: str = "draft") -> Dict[str, Any]:
         """記事ディレクトリの完全処理"""
 
-        print(f"[記事投稿ワークフロー] 📁 処理開始: {article_dir}")
+        workflow_log.info(f"📁 処理開始: {article_dir}")
 
         if not os.path.exists(article_dir):
             return {
@@ -765,6 +1128,57 @@ class ArticlePublishingWorkflow:
             workflow_result["error"] = publish_result.get("error", "不明なエラー")
 
         status = "✅ 成功" if workflow_result["workflow_success"] else "❌ 失敗"
-        print(f"[記事投稿ワークフロー] {status}")
+        workflow_log.info(f"{status}")
 
         return workflow_result
+
+    def prepare_batch(self, metas: List[Dict[str, Any]]):
+        """複数記事を並列で process_article_directory する前に、タームと投稿者IDを解決しておく"""
+
+        self.publisher.prepare_bulk_publish(metas, creating=True)
+
+    def process_article_directories(
+        self,
+        articles: Any,
+        workers: Optional[int] = None,
+        force: bool = False,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """複数記事ディレクトリの一括再投稿・更新（変更のない記事はスキップ）"""
+
+        workflow_log.info("📚 一括処理開始")
+        result = self.publisher.republish_articles(articles, workers=workers, force=force, dry_run=dry_run)
+        result["completed_at"] = datetime.now().isoformat()
+        return result
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WordPress投稿足軽 - 記事の一括再投稿・更新")
+    parser.add_argument("articles", nargs="*", help="記事ディレクトリ（glob可、例: '~/Documents/edith_output/blog/articles/2026-*'）")
+    parser.add_argument("--list", help="記事ディレクトリを1行1件で書いたファイル")
+    parser.add_argument("--workers", type=int, default=WordPressPublisher.BULK_WORKERS, help="同時処理数")
+    parser.add_argument("--force", action="store_true", help="変更がなくても更新する")
+    parser.add_argument("--dry-run", action="store_true", help="判定だけ行い投稿しない")
+    args = parser.parse_args()
+
+    article_dirs = []
+    for pattern in args.articles:
+        article_dirs.extend(sorted(glob.glob(os.path.expanduser(pattern))))
+    if args.list:
+        with open(args.list, "r", encoding="utf-8") as f:
+            article_dirs.extend(os.path.expanduser(line.strip()) for line in f if line.strip())
+
+    if not article_dirs:
+        parser.error("記事ディレクトリを指定してください")
+
+    workflow = ArticlePublishingWorkflow()
+    result = workflow.process_article_directories(
+        article_dirs, workers=args.workers, force=args.force, dry_run=args.dry_run
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,15 @@ Task Toolと連携して高品質記事を自動生成
 """
 
 import json
+import sys
 from datetime import datetime
 from typing import Dict, List, Any
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from agent_log import get_logger
+
+log = get_logger("ライティング足軽")
 
 class NaritaWritingAshigaru:
     """ライティング足軽 - 成田悠輔風毒舌記事専門"""
@@ -25,13 +32,13 @@ class NaritaWritingAshigaru:
             "no_self_description": "自分で辛辣・毒舌・厳しいとは絶対に言わない"
         }
 
-        print(f"[ライティング足軽] 成田悠輔風記事生成システム稼働")
+        log.info("成田悠輔風記事生成システム稼働")
 
     def generate_narita_style_article(self, article_brief: Dict[str, Any]) -> Dict[str, Any]:
         """成田悠輔風記事の完全生成"""
 
-        print(f"[ライティング足軽] 📝 記事生成開始")
-        print(f"[ライティング足軽] テーマ: {article_brief.get('topic', '')}")
+        log.info("📝 記事生成開始")
+        log.info(f"テーマ: {article_brief.get('topic', '')}")
 
         # 記事の核心メッセージ抽出
         core_message = self._extract_core_message(article_brief)
@@ -50,8 +57,8 @@ class NaritaWritingAshigaru:
             opening_section, body_sections, conclusion_section
         )
 
-        print(f"[ライティング足軽] ✅ 記事生成完了")
-        print(f"[ライティング足軽] 文字数: {len(complete_article['content'])}字")
+        log.info("✅ 記事生成完了")
+        log.info(f"文字数: {len(complete_article['content'])}字")
 
         return complete_article
 
@@ -0,0 +1,166 @@
+"""
+EDITH Corporation - 部署レジストリ（department_registry.json）の共通アクセス
+CEO のディスパッチはここから部署を引く。
+
+- mission_type → 部署キーのマップを読み込み時に1回だけ作る（ディスパッチは O(1)）
+- 読み込みは更新日時（mtime）とサイズが変わったときだけ再パース
+- 部署プラグイン: 部署は "entry_point" に "モジュール:関数" を書ける
+  （モジュールは edith_corp からのパス。例: "blog_department.blog_department_head:run_mission"）。
+  関数は初めて使うときに import し、プロセス内で呼び出す（サブプロセスを挟まない）
+
+    "web_marketing_department": {
+        ...,
+        "mission_types": ["daily_blog", ...],
+        "entry_point": "blog_department.blog_department_head:run_mission",
+        "in_process_missions": ["daily_blog"]
+    }
+
+エントリポイントの関数は entry_point(mission_type, mission_params) -> 結果の辞書。
+in_process_missions を省略すると mission_types すべてをプロセス内で実行できるものとみなす。
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_THIS_DIR = Path(__file__).resolve().parent
+if str(_THIS_DIR) not in sys.path:
+    sys.path.insert(0, str(_THIS_DIR))
+
+REGISTRY_PATH = _THIS_DIR / "department_registry.json"
+
+MissionEntryPoint = Callable[[str, Optional[Dict[str, Any]]], Dict[str, Any]]
+
+
+class DepartmentPluginError(Exception):
+    """エントリポイントの指定誤り・import 失敗"""
+
+
+class DepartmentRegistry:
+    """department_registry.json のキャッシュ付きアクセサ"""
+
+    _instances: Dict[Path, "DepartmentRegistry"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, path: Optional[Path] = None) -> "DepartmentRegistry":
+        """パスごとに1つのインスタンスを返す（プロセス内でキャッシュを共有）"""
+        path = Path(path or REGISTRY_PATH)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or REGISTRY_PATH)
+        self._lock = threading.RLock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._departments: Dict[str, Dict[str, Any]] = {}
+        self._by_mission: Dict[str, str] = {}
+        self._plugins: Dict[str, Tuple[str, MissionEntryPoint]] = {}
+
+    # ==================== 読み込み ====================
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        """
+        ファイルが変わっていれば読み直す
+
+        ファイルがなければ FileNotFoundError、JSON破損時は json.JSONDecodeError。
+        """
+        signature = self._stat_signature()
+        if signature is None:
+            raise FileNotFoundError(self.path)
+        if signature == self._signature:
+            return
+
+        departments = json.loads(self.path.read_text(encoding="utf-8"))
+        by_mission: Dict[str, str] = {}
+        for key, info in departments.items():
+            for mission_type in info.get("mission_types", []):
+                # 複数の部署が同じ mission_type を持つときは先に書かれた部署
+                by_mission.setdefault(mission_type, key)
+
+        self._departments = departments
+        self._by_mission = by_mission
+        self._signature = signature
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def departments(self) -> Dict[str, Dict[str, Any]]:
+        """全部署（部署キー → 設定）"""
+        with self._lock:
+            self._refresh()
+            return dict(self._departments)
+
+    def get(self, department: str) -> Optional[Dict[str, Any]]:
+        """部署キーで設定を取得"""
+        with self._lock:
+            self._refresh()
+            return self._departments.get(department)
+
+    def resolve(self, mission_type: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        mission_type を担当する部署
+
+        Returns:
+            (部署キー, 設定)（担当がなければ None）
+        """
+        with self._lock:
+            self._refresh()
+            key = self._by_mission.get(mission_type)
+            return (key, self._departments[key]) if key else None
+
+    # ==================== プラグイン ====================
+
+    def runs_in_process(self, department: str, mission_type: str) -> bool:
+        """この部署がエントリポイントで mission_type をプロセス内実行できるか"""
+        info = self.get(department) or {}
+        if not info.get("entry_point"):
+            return False
+        return mission_type in info.get("in_process_missions", info.get("mission_types", []))
+
+    def entry_point(self, department: str) -> MissionEntryPoint:
+        """
+        部署のエントリポイントを import して返す（2回目以降はキャッシュ）
+
+        レジストリの entry_point が書き換わったら import し直す。
+
+        Raises:
+            DepartmentPluginError: entry_point がない・形式が違う・import できない
+        """
+        info = self.get(department)
+        spec = (info or {}).get("entry_point")
+        if not spec:
+            raise DepartmentPluginError(f"{department} に entry_point がありません")
+
+        with self._lock:
+            cached = self._plugins.get(department)
+            if cached and cached[0] == spec:
+                return cached[1]
+
+            module_name, sep, attr = spec.partition(":")
+            if not sep or not module_name or not attr:
+                raise DepartmentPluginError(f"entry_point は 'モジュール:関数' の形式で指定してください: {spec}")
+            try:
+                target: Any = importlib.import_module(module_name)
+                for part in attr.split("."):
+                    target = getattr(target, part)
+            except (ImportError, AttributeError) as e:
+                raise DepartmentPluginError(f"{department} の entry_point を読み込めません: {spec} ({e})") from e
+            if not callable(target):
+                raise DepartmentPluginError(f"{department} の entry_point が呼び出し可能ではありません: {spec}")
+
+            self._plugins[department] = (spec, target)
+            return target
@@ -13,6 +13,11 @@ from typing import Dict, List, Any, Optional
 _THIS_DIR = Path(__file__).resolve().parent
 
 from output_paths import REPORTS_DIR, ensure_dirs
+from mission_trace import current_trace_id, span, start_trace, trace_env, trace_path
+from agent_log import get_logger
+from department_registry import DepartmentPluginError, DepartmentRegistry
+
+log = get_logger("EDITH CEO")
 
 
 class EDITHCorporation:
@@ -23,9 +28,10 @@ class EDITHCorporation:
         self.name = "EDITH"
         self.company_root = str(_THIS_DIR)
         self.departments = {}
+        self.registry = DepartmentRegistry.shared()
 
         self._initialize_organization()
-        print(f"[{self.name} CEO] コーポレーション起動完了")
+        log.info("コーポレーション起動完了")
 
     def _initialize_organization(self):
         """組織初期化"""
@@ -56,9 +62,7 @@ class EDITHCorporation:
     def create_department(self, dept_name: str, specialization: str, ashigaru_list: List[str]):
         """新事業部設立"""
 
-        print(f"\n[{self.name} CEO] 新事業部設立決定")
-        print(f"事業部名: {dept_name}")
-        print(f"専門分野: {specialization}")
+        log.info("新事業部設立決定", department=dept_name, specialization=specialization)
 
         dept_path = Path(self.company_root) / dept_name
         dept_path.mkdir(parents=True, exist_ok=True)
@@ -76,39 +80,37 @@ class EDITHCorporation:
             "created_at": datetime.now().isoformat()
         }
 
-        print(f"[{self.name} CEO] {dept_name} 事業部設立完了")
+        log.info(f"{dept_name} 事業部設立完了")
         return True
 
     def evaluate_department(self, dept_name: str, new_score: int, feedback: str):
         """事業部評価・フィードバック"""
 
         if dept_name not in self.departments:
-            print(f"[{self.name} CEO] 事業部 '{dept_name}' は存在しません")
+            log.warning(f"事業部 '{dept_name}' は存在しません")
             return False
 
         dept = self.departments[dept_name]
         old_score = dept["performance"]["score"]
 
-        print(f"\n[{self.name} CEO] {dept['name']} 評価実施")
-        print(f"前回スコア: {old_score} → 今回: {new_score}")
-        print(f"フィードバック: {feedback}")
+        log.info(f"{dept['name']} 評価実施", previous_score=old_score, score=new_score, feedback=feedback)
 
         dept["performance"]["score"] = new_score
         dept["performance"]["last_feedback"] = feedback
         dept["performance"]["evaluated_at"] = datetime.now().isoformat()
 
         if new_score < 70:
-            print(f"[{self.name} CEO] 改善必要。戦略見直しを指示")
+            log.info("改善必要。戦略見直しを指示")
             return self._request_improvement_plan(dept_name)
         elif new_score > old_score + 10:
-            print(f"[{self.name} CEO] 優秀な成果。予算増額検討")
+            log.info("優秀な成果。予算増額検討")
 
         return True
 
     def _request_improvement_plan(self, dept_name: str):
         """改善計画要求"""
 
-        print(f"[{self.name} CEO] {dept_name} に改善計画提出を要求")
+        log.info(f"{dept_name} に改善計画提出を要求")
 
         improvement_suggestions = [
             "足軽の専門性向上研修",
@@ -117,18 +119,14 @@ class EDITHCorporation:
             "足軽大将の配置検討"
         ]
 
-        print(f"[{self.name} CEO] 改善提案例:")
-        for i, suggestion in enumerate(improvement_suggestions, 1):
-            print(f"  {i}. {suggestion}")
+        log.info("改善提案例", suggestions=improvement_suggestions)
 
         return improvement_suggestions
 
     def propose_taisho_system(self, dept_name: str, unit_name: str, reason: str):
         """足軽大将配置提案"""
 
-        print(f"\n[{self.name} CEO] 足軽大将配置提案受理")
-        print(f"対象: {dept_name}/{unit_name}")
-        print(f"理由: {reason}")
+        log.info("足軽大将配置提案受理", target=f"{dept_name}/{unit_name}", reason=reason)
 
         dept = self.departments.get(dept_name)
         if not dept:
@@ -137,8 +135,8 @@ class EDITHCorporation:
         ashigaru_count = len(dept["ashigaru_units"])
 
         if ashigaru_count >= 4:
-            print(f"[{self.name} CEO] 足軽大将配置承認")
-            print(f"[{self.name} CEO] {unit_name}足軽大将を任命")
+            log.info("足軽大将配置承認")
+            log.info(f"{unit_name}足軽大将を任命")
 
             taisho_dir = Path(self.company_root) / dept_name / f"{unit_name}_taisho"
             taisho_dir.mkdir(parents=True, exist_ok=True)
@@ -152,7 +150,7 @@ class EDITHCorporation:
 
             return True
         else:
-            print(f"[{self.name} CEO] 足軽数不足。現在{ashigaru_count}名")
+            log.warning(f"足軽数不足。現在{ashigaru_count}名")
             return False
 
     def get_organization_status(self):
@@ -177,60 +175,96 @@ class EDITHCorporation:
         実際のTask Tool呼び出しはPythonではなくClaude/EDITHが行う。
         """
 
-        registry = self._load_registry()
-        if not registry:
+        try:
+            resolved = self.registry.resolve(mission_type)
+        except FileNotFoundError:
+            log.warning("department_registry.json が見つかりません")
             return {"status": "error", "error": "department_registry.json の読み込み失敗"}
+        except Exception as e:
+            log.error(f"レジストリ読み込みエラー: {e}")
+            return {"status": "error", "error": "department_registry.json の読み込み失敗"}
+
+        if resolved is None:
+            return {
+                "status": "not_found",
+                "error": f"ミッションタイプ '{mission_type}' に対応する部署が見つかりません",
+            }
 
-        # mission_type に対応する部署を検索
-        for dept_key, dept_info in registry.items():
-            if mission_type in dept_info.get("mission_types", []):
-                if not dept_info.get("enabled", False):
-                    return {
-                        "status": "disabled",
-                        "department": dept_key,
-                        "message": f"{dept_info['name']} は無効化されています",
-                    }
-
-                prompt_path = _THIS_DIR / dept_info["prompt_file"]
-                return {
-                    "status": "ready",
-                    "department": dept_key,
-                    "department_name": dept_info["name"],
-                    "prompt_file": str(prompt_path),
-                    "root_path": str(_THIS_DIR / dept_info["root_path"]),
-                }
+        dept_key, dept_info = resolved
+        if not dept_info.get("enabled", False):
+            return {
+                "status": "disabled",
+                "department": dept_key,
+                "message": f"{dept_info['name']} は無効化されています",
+            }
 
+        prompt_path = _THIS_DIR / dept_info["prompt_file"]
         return {
-            "status": "not_found",
-            "error": f"ミッションタイプ '{mission_type}' に対応する部署が見つかりません",
+            "status": "ready",
+            "department": dept_key,
+            "department_name": dept_info["name"],
+            "prompt_file": str(prompt_path),
+            "root_path": str(_THIS_DIR / dept_info["root_path"]),
+            "in_process": self.registry.runs_in_process(dept_key, mission_type),
         }
 
     def _load_registry(self) -> Optional[Dict]:
-        """department_registry.json を読み込む"""
-
-        registry_path = _THIS_DIR / "department_registry.json"
-        if not registry_path.exists():
-            print(f"[{self.name} CEO] department_registry.json が見つかりません")
-            return None
+        """department_registry.json を読み込む（変更がなければキャッシュを返す）"""
 
         try:
-            return json.loads(registry_path.read_text(encoding="utf-8"))
+            return self.registry.departments()
+        except FileNotFoundError:
+            log.warning("department_registry.json が見つかりません")
         except Exception as e:
-            print(f"[{self.name} CEO] レジストリ読み込みエラー: {e}")
-            return None
+            log.error(f"レジストリ読み込みエラー: {e}")
+        return None
 
     def execute_daily_mission(self, mission_type: str = "daily_blog"):
         """日常ミッションのディスパッチ情報を返す。
         （後方互換性のために残す。実際のTask Tool呼び出しはClaude/EDITHが行う）
+
+        ディスパッチ情報の trace_env を付けて run_ashigaru.py を実行すると、
+        足軽の処理がこのミッションのトレースに追記される。
         """
 
-        print(f"\n[{self.name} CEO] 本日のミッション: {mission_type}")
+        with start_trace("EDITH.execute_daily_mission", kind="ceo", mission_type=mission_type):
+            log.info(f"本日のミッション: {mission_type}")
 
-        dispatch = self.get_dispatch_info(mission_type)
-        print(f"[{self.name} CEO] ディスパッチ情報: {json.dumps(dispatch, ensure_ascii=False, indent=2)}")
+            with span("EDITH.get_dispatch_info", kind="ceo"):
+                dispatch = self.get_dispatch_info(mission_type)
+            dispatch["trace_env"] = trace_env()
+            log.info("ディスパッチ情報", dispatch=dispatch)
 
         return dispatch
 
+    def run_mission(self, mission_type: str = "daily_blog", mission_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """ミッションをこのプロセス内で実行し、CEO報告を保存する。
+        レジストリで entry_point を宣言している部署のミッション（in_process_missions）のみ。
+        それ以外はディスパッチ情報（trace_env 付き）を返す。
+        CEO → 事業部長 → 足軽大将 → 足軽 → HTTP を1つのトレースに記録する。
+        """
+
+        with start_trace("EDITH.run_mission", kind="ceo", mission_type=mission_type):
+            with span("EDITH.get_dispatch_info", kind="ceo"):
+                dispatch = self.get_dispatch_info(mission_type)
+            dispatch["trace_env"] = trace_env()
+
+            if dispatch.get("status") != "ready" or not dispatch.get("in_process"):
+                return dispatch
+
+            department = dispatch["department"]
+            try:
+                entry_point = self.registry.entry_point(department)
+            except DepartmentPluginError as e:
+                log.error(f"部署プラグイン読み込みエラー: {e}", department=department)
+                return {**dispatch, "status": "error", "error": str(e)}
+
+            log.info(f"{dispatch['department_name']} にミッション委任: {mission_type}", department=department)
+            result = entry_point(mission_type, mission_params)
+            self._save_mission_report(mission_type, result)
+
+        return result
+
     def _save_mission_report(self, mission_type: str, result: Dict[str, Any]):
         """CEOレベルのミッション報告保存"""
 
@@ -242,6 +276,8 @@ class EDITHCorporation:
             "executed_by": self.name,
             "executed_at": datetime.now().isoformat(),
             "mission_status": result.get("status", "unknown"),
+            "trace_id": current_trace_id() or result.get("trace_id"),
+            "trace_file": str(trace_path(current_trace_id())) if current_trace_id() else result.get("trace_file"),
             "steps_completed": len(result.get("steps", [])),
             "department_review": result.get("department_review", {}),
             "summary": {
@@ -256,12 +292,12 @@ class EDITHCorporation:
             encoding="utf-8"
         )
 
-        print(f"[{self.name} CEO] ミッション報告保存: {report_file}")
+        log.info(f"ミッション報告保存: {report_file}")
 
     def review_department_proposal(self, proposal_file: str = None):
         """事業部提案の審査・承認システム"""
 
-        print(f"\n[{self.name} CEO] 事業部提案審査開始")
+        log.info("事業部提案審査開始")
 
         if not proposal_file:
             reports_dir = REPORTS_DIR
@@ -269,10 +305,10 @@ class EDITHCorporation:
                 proposal_files = [f for f in reports_dir.iterdir() if f.name.startswith("blog_dept_proposal_")]
                 if proposal_files:
                     proposal_file = str(sorted(proposal_files)[-1])
-                    print(f"[{self.name} CEO] 最新提案書検出: {proposal_file}")
+                    log.info(f"最新提案書検出: {proposal_file}")
 
         if not proposal_file or not Path(proposal_file).exists():
-            print(f"[{self.name} CEO] 提案書が見つかりません")
+            log.warning("提案書が見つかりません")
             return None
 
         with open(proposal_file, "r", encoding="utf-8") as f:
@@ -283,21 +319,19 @@ class EDITHCorporation:
     def _evaluate_and_decide(self, proposal_data: Dict[str, Any]) -> Dict[str, Any]:
         """提案評価・意思決定"""
 
-        print(f"\n[{self.name} CEO] 提案内容精査中...")
+        log.info("提案内容精査中...")
 
         executive_summary = proposal_data.get("executive_summary", {})
         detailed_proposal = proposal_data.get("detailed_proposal", {})
 
-        print(f"[{self.name} CEO] 提案概要:")
-        print(f"  現状: {executive_summary.get('current_situation', 'N/A')}")
-        print(f"  目標: {executive_summary.get('target', 'N/A')}")
-        print(f"  課題: {executive_summary.get('challenge', 'N/A')}")
-        print(f"  解決策: {executive_summary.get('solution', 'N/A')}")
-        print(f"  期待結果: {executive_summary.get('expected_result', 'N/A')}")
+        log.info("提案概要", **{
+            key: executive_summary.get(key, "N/A")
+            for key in ("current_situation", "target", "challenge", "solution", "expected_result")
+        })
 
         approval_score = self._calculate_approval_score(detailed_proposal)
 
-        print(f"\n[{self.name} CEO] 提案評価スコア: {approval_score}/100")
+        log.info(f"提案評価スコア: {approval_score}/100")
 
         if approval_score >= 80:
             decision = self._approve_proposal(detailed_proposal)
@@ -323,7 +357,7 @@ class EDITHCorporation:
             encoding="utf-8"
         )
 
-        print(f"[{self.name} CEO] 決定記録保存: {decision_file}")
+        log.info(f"決定記録保存: {decision_file}")
 
         return decision_record
 
@@ -370,7 +404,7 @@ class EDITHCorporation:
     def _approve_proposal(self, proposal: Dict[str, Any]) -> Dict[str, Any]:
         """提案承認"""
 
-        print(f"\n[{self.name} CEO] 提案承認決定")
+        log.info("提案承認決定")
 
         approved_changes = []
 
@@ -384,7 +418,7 @@ class EDITHCorporation:
 
             ashigaru_dir = Path(self.company_root) / "blog_department" / ashigaru_name
             ashigaru_dir.mkdir(parents=True, exist_ok=True)
-            print(f"[{self.name} CEO] {ashigaru_name} 配置完了")
+            log.info(f"{ashigaru_name} 配置完了")
 
         taisho = proposal.get("taisho_recommendation")
         if taisho:
@@ -396,9 +430,9 @@ class EDITHCorporation:
 
             taisho_dir = Path(self.company_root) / "blog_department" / "content_taisho"
             taisho_dir.mkdir(parents=True, exist_ok=True)
-            print(f"[{self.name} CEO] コンテンツ足軽大将任命")
+            log.info("コンテンツ足軽大将任命")
 
-        print(f"[{self.name} CEO] 組織改革実行開始指示")
+        log.info("組織改革実行開始指示")
 
         return {
             "status": "approved",
@@ -410,7 +444,7 @@ class EDITHCorporation:
     def _conditional_approval(self, proposal: Dict[str, Any]) -> Dict[str, Any]:
         """条件付き承認"""
 
-        print(f"\n[{self.name} CEO] 条件付き承認")
+        log.info("条件付き承認")
 
         conditions = [
             "新設足軽は段階的配置（1名ずつ効果検証）",
@@ -418,9 +452,7 @@ class EDITHCorporation:
             "予算上限を80%に制限"
         ]
 
-        print(f"[{self.name} CEO] 条件:")
-        for i, condition in enumerate(conditions, 1):
-            print(f"  {i}. {condition}")
+        log.info("条件", conditions=conditions)
 
         return {
             "status": "conditional_approval",
@@ -432,7 +464,7 @@ class EDITHCorporation:
     def _reject_proposal(self, proposal: Dict[str, Any]) -> Dict[str, Any]:
         """提案却下"""
 
-        print(f"\n[{self.name} CEO] 提案却下")
+        log.info("提案却下")
 
         rejection_reasons = [
             "ROIの根拠不十分",
@@ -440,11 +472,9 @@ class EDITHCorporation:
             "実装計画が曖昧"
         ]
 
-        print(f"[{self.name} CEO] 却下理由:")
-        for i, reason in enumerate(rejection_reasons, 1):
-            print(f"  {i}. {reason}")
+        log.info("却下理由", reasons=rejection_reasons)
 
-        print(f"[{self.name} CEO] 再提案を要求")
+        log.info("再提案を要求")
 
         return {
             "status": "rejected",
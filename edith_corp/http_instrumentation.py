@@ -0,0 +1,119 @@
+"""
+EDITH Corporation - 外部HTTP呼び出しの共通フック
+requests（WordPress / Gemini / Brevo）と httplib2（googleapiclient: Search Console / GA4 /
+Google Calendar）の送信処理を1か所で包み、登録されたリスナーに呼び出しごとの情報を渡す。
+
+リスナーは call 辞書を受け取ってコンテキストマネージャを返す関数。
+送信の前に入り、送信後（status / headers / error を call に書き込んだ後）に抜ける。
+
+    call = {"method": "POST", "url": ..., "host": ..., "path": ..., "client": "requests",
+            "status": 201, "headers": {...}, "error": None, "bytes_sent": 1234}
+
+headers はレスポンスヘッダー（requests は大文字小文字を区別しない辞書、httplib2 は小文字キー）。
+"""
+
+import threading
+from contextlib import ExitStack
+from typing import Any, Callable, ContextManager, Dict, List
+from urllib.parse import urlsplit
+
+_listeners: List[Callable[[Dict[str, Any]], ContextManager]] = []
+_install_lock = threading.Lock()
+_installed = False
+
+
+def add_listener(listener: Callable[[Dict[str, Any]], ContextManager]):
+    """リスナーを登録（フック未導入なら導入する）"""
+    install()
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[Dict[str, Any]], ContextManager]):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _new_call(client: str, method: str, url: str, body: Any) -> Dict[str, Any]:
+    parts = urlsplit(url)
+    if isinstance(body, (bytes, str)):
+        bytes_sent = len(body)
+    else:
+        bytes_sent = 0
+    return {
+        "client": client,
+        "method": (method or "GET").upper(),
+        "url": url,
+        "host": parts.netloc,
+        "path": parts.path or "/",
+        "status": None,
+        "headers": None,
+        "error": None,
+        "bytes_sent": bytes_sent,
+    }
+
+
+def _observe(call: Dict[str, Any], send: Callable[[], Any]) -> Any:
+    """リスナーの文脈の中で送信する（リスナーがなければそのまま送信）"""
+    if not _listeners:
+        return send()
+
+    with ExitStack() as stack:
+        for listener in list(_listeners):
+            stack.enter_context(listener(call))
+        try:
+            return send()
+        except Exception as e:
+            call["error"] = type(e).__name__
+            raise
+
+
+def install():
+    """requests.Session.send と httplib2.Http.request を包む（何度呼んでも1回だけ）"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _installed = True
+
+        try:
+            import requests
+        except ImportError:
+            requests = None
+
+        if requests is not None:
+            original_send = requests.Session.send
+
+            def send(self, request, **kwargs):
+                call = _new_call("requests", request.method, request.url, request.body)
+
+                def do_send():
+                    response = original_send(self, request, **kwargs)
+                    call["status"] = response.status_code
+                    call["headers"] = response.headers
+                    return response
+
+                return _observe(call, do_send)
+
+            requests.Session.send = send
+
+        try:
+            import httplib2
+        except ImportError:
+            httplib2 = None
+
+        if httplib2 is not None:
+            original_request = httplib2.Http.request
+
+            def request(self, uri, method="GET", body=None, *args, **kwargs):
+                call = _new_call("httplib2", method, uri, body)
+
+                def do_request():
+                    response, content = original_request(self, uri, method, body, *args, **kwargs)
+                    call["status"] = response.status
+                    call["headers"] = response
+                    return response, content
+
+                return _observe(call, do_request)
+
+            httplib2.Http.request = request
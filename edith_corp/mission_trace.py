@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+EDITH Corporation - ミッショントレース
+CEO → 事業部長 → 足軽大将のステップ → 足軽のメソッド → 外部HTTP呼び出し の
+どこで時間を使っているかを、親子関係のあるスパンで記録する。
+
+- スパンごとに経過時間（wall）・CPU時間（そのスレッド分）・配下のHTTP呼び出し数
+- トレース中でなければ span() は何もしない（通常実行のコストはほぼゼロ）
+- HTTP呼び出しは http_instrumentation のフックで自動的に子スパンになる
+- 別プロセス（run_ashigaru.py）には環境変数 EDITH_TRACE_ID / EDITH_TRACE_PARENT で引き継ぐ
+- トレース終了時にミッション報告と同じ REPORTS_DIR に trace_<trace_id>.jsonl として追記
+
+使い方:
+  python3 mission_trace.py list
+  python3 mission_trace.py flame latest
+  python3 mission_trace.py flame mission_20260210_090000_1a2b3c [--no-merge] [--min-ms 5]
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows ではプロセス間ロックなし
+    fcntl = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import http_instrumentation
+from output_paths import REPORTS_DIR
+
+# 子プロセスへの引き継ぎに使う環境変数
+ENV_TRACE_ID = "EDITH_TRACE_ID"
+ENV_TRACE_PARENT = "EDITH_TRACE_PARENT"
+
+TRACE_FILE_PREFIX = "trace_"
+
+
+class Span:
+    """1区間の計測"""
+
+    __slots__ = (
+        "tracer", "span_id", "parent", "parent_id", "name", "kind", "attrs",
+        "started_at", "_wall_start", "_cpu_start", "wall_ms", "cpu_ms",
+        "http_calls", "status", "error", "thread",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, parent: Optional["Span"],
+                 parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent = parent
+        self.parent_id = parent.span_id if parent else parent_id
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+        self.started_at = datetime.now().astimezone().isoformat()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self.http_calls = 0
+        self.status = "ok"
+        self.error = None
+        self.thread = threading.current_thread().name
+
+    def set(self, **attrs):
+        """属性を追加"""
+        self.attrs.update(attrs)
+
+    def _finish(self):
+        self.wall_ms = (time.perf_counter() - self._wall_start) * 1000
+        self.cpu_ms = (time.thread_time() - self._cpu_start) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.tracer.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "started_at": self.started_at,
+            "wall_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "http_calls": self.http_calls,
+            "status": self.status,
+            "error": self.error,
+            "pid": os.getpid(),
+            "thread": self.thread,
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """1ミッション分のスパンを集めて書き出す"""
+
+    def __init__(self, trace_id: str, remote_parent_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.remote_parent_id = remote_parent_id
+        self.root: Optional[Span] = None
+        self.finished: List[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def trace_file(self) -> Path:
+        return trace_path(self.trace_id)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self.finished.append(span)
+            if span.kind == "http":
+                # 開いている祖先すべてに HTTP 呼び出しを数える
+                ancestor = span.parent
+                while ancestor is not None:
+                    ancestor.http_calls += 1
+                    ancestor = ancestor.parent
+                span.http_calls = 1
+
+    def export(self) -> Path:
+        """終了したスパンを trace_<trace_id>.jsonl に追記（1回の write でまとめて書く）"""
+        with self._lock:
+            spans, self.finished = self.finished, []
+        path = self.trace_file
+        if not spans:
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(
+            json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n" for s in spans
+        )
+        with open(path, "a", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(lines)
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return path
+
+
+# プロセス内で有効なトレーサー（同時に1つ）と、スレッド/タスクごとの現在のスパン
+_active_tracer: Optional[Tracer] = None
+_current_span: ContextVar[Optional[Span]] = ContextVar("edith_current_span", default=None)
+
+
+def trace_path(trace_id: str) -> Path:
+    """トレースファイルのパス（ミッション報告と同じ REPORTS_DIR）"""
+    return REPORTS_DIR / f"{TRACE_FILE_PREFIX}{trace_id}.jsonl"
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _active_tracer
+
+
+def current_trace_id() -> Optional[str]:
+    return _active_tracer.trace_id if _active_tracer else None
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attrs) -> Iterator[Optional[Span]]:
+    """
+    スパンを開く（トレース中でなければ何もしない）
+
+    Args:
+        name: スパン名（例: "ContentTaisho.step3_writing"）
+        kind: 種別（mission / department / taisho / step / ashigaru / http / internal）
+        **attrs: 付加情報
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        yield None
+        return
+
+    # 別スレッドで開かれたスパンは、文脈がなければミッションのルートにぶら下げる
+    parent = _current_span.get() or tracer.root
+    current = Span(tracer, name, kind, parent, tracer.remote_parent_id, attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"[:300]
+        raise
+    finally:
+        _current_span.reset(token)
+        current._finish()
+        tracer._record(current)
+
+
+@contextmanager
+def start_trace(name: str, trace_id: Optional[str] = None, kind: str = "mission", **attrs) -> Iterator[Optional[Span]]:
+    """
+    トレースを開始してルートスパンを開く
+
+    既にトレース中なら普通の子スパンになる。環境変数 EDITH_TRACE_ID があれば
+    そのトレースに参加し、EDITH_TRACE_PARENT を親とする（run_ashigaru.py など子プロセス用）。
+    終了時にスパンをトレースファイルへ書き出す。
+
+    Args:
+        name: ルートスパン名
+        trace_id: トレースID（省略時は環境変数か新規採番）
+        kind: ルートスパンの種別
+    """
+    global _active_tracer
+
+    if _active_tracer is not None:
+        with span(name, kind, **attrs) as current:
+            yield current
+        return
+
+    trace_id = (
+        trace_id
+        or os.environ.get(ENV_TRACE_ID)
+        or f"mission_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    )
+    tracer = Tracer(trace_id, os.environ.get(ENV_TRACE_PARENT))
+    http_instrumentation.add_listener(_http_span)
+
+    _active_tracer = tracer
+    try:
+        with span(name, kind, **attrs) as root:
+            tracer.root = root
+            yield root
+    finally:
+        _active_tracer = None
+        tracer.export()
+
+
+def trace_env() -> Dict[str, str]:
+    """
+    子プロセスに現在のトレースを引き継ぐ環境変数（トレース中でなければ空）
+
+    例: subprocess.run(cmd, env={**os.environ, **trace_env()})
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return {}
+
+    env = {ENV_TRACE_ID: tracer.trace_id}
+    parent = _current_span.get() or tracer.root
+    if parent is not None:
+        env[ENV_TRACE_PARENT] = parent.span_id
+    return env
+
+
+def traced(name: Optional[str] = None, kind: str = "internal"):
+    """関数・メソッドをスパンで包むデコレータ"""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active_tracer is None:
+                return func(*args, **kwargs)
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(obj: Any, kind: str = "ashigaru") -> Any:
+    """
+    インスタンスの公開メソッドをすべてスパン付きに差し替える（足軽の計測用）
+
+    インスタンス属性として上書きするので、self.method() の内部呼び出しも計測される。
+    """
+    if obj is None:
+        return None
+
+    class_name = type(obj).__name__
+    for attr in dir(type(obj)):
+        if attr.startswith("_"):
+            continue
+        method = getattr(obj, attr, None)
+        if callable(method) and hasattr(method, "__func__"):
+            setattr(obj, attr, traced(f"{class_name}.{attr}", kind)(method))
+    return obj
+
+
+@contextmanager
+def _http_span(call: Dict[str, Any]) -> Iterator[None]:
+    """http_instrumentation のリスナー: 外部HTTP呼び出しを子スパンにする"""
+    if _active_tracer is None:
+        yield
+        return
+
+    with span(f"HTTP {call['method']} {call['host']}{call['path']}", "http",
+              client=call["client"], bytes_sent=call["bytes_sent"]) as current:
+        yield
+        current.set(status=call["status"])
+
+
+# ==================== 表示 ====================
+
+def load_trace(path: Path) -> List[Dict[str, Any]]:
+    """トレースファイルを読む"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def resolve_trace_file(ref: str) -> Optional[Path]:
+    """'latest'・トレースID・ファイルパスからトレースファイルを解決"""
+    if ref == "latest":
+        files = sorted(REPORTS_DIR.glob(f"{TRACE_FILE_PREFIX}*.jsonl"), key=lambda p: p.stat().st_mtime)
+        return files[-1] if files else None
+    path = Path(ref)
+    if path.exists():
+        return path
+    path = trace_path(ref)
+    return path if path.exists() else None
+
+
+def _build_tree(spans: List[Dict[str, Any]], merge: bool) -> List[Dict[str, Any]]:
+    """スパンを親子の木にする（merge=True なら同じ親の同名スパンを1行にまとめる）"""
+    ids = {s["span_id"] for s in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in sorted(spans, key=lambda s: s["started_at"]):
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children.setdefault(parent, []).append(s)
+
+    def build(parent_id: Optional[str]) -> List[Dict[str, Any]]:
+        nodes: List[Dict[str, Any]] = []
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for s in children.get(parent_id, []):
+            node = by_name.get(s["name"]) if merge else None
+            if node is None:
+                node = {"name": s["name"], "kind": s["kind"], "count": 0, "wall_ms": 0.0,
+                        "cpu_ms": 0.0, "http_calls": 0, "errors": 0, "children": []}
+                nodes.append(node)
+                if merge:
+                    by_name[s["name"]] = node
+            node["count"] += 1
+            node["wall_ms"] += s["wall_ms"]
+            node["cpu_ms"] += s["cpu_ms"]
+            node["http_calls"] += s["http_calls"]
+            node["errors"] += s["status"] != "ok"
+            node["children"].extend(build(s["span_id"]))
+        if merge:
+            for node in nodes:
+                node["children"] = _merge_nodes(node["children"])
+        return nodes
+
+    return build(None)
+
+
+def _merge_nodes(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """同名の兄弟ノードを合算"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for node in nodes:
+        if node["name"] not in merged:
+            merged[node["name"]] = node
+            continue
+        target = merged[node["name"]]
+        for key in ("count", "wall_ms", "cpu_ms", "http_calls", "errors"):
+            target[key] += node[key]
+        target["children"] = _merge_nodes(target["children"] + node["children"])
+    return list(merged.values())
+
+
+def print_flame(spans: List[Dict[str, Any]], merge: bool = True, min_ms: float = 0.0, width: int = 30):
+    """フレームグラフ風の内訳を表示（バーはルートの経過時間に対する割合）"""
+    roots = _build_tree(spans, merge)
+    total = sum(r["wall_ms"] for r in roots) or 1.0
+
+    def rollup_http(node: Dict[str, Any]) -> int:
+        # 子プロセスのHTTP呼び出しは親プロセス側のスパンに数えられていないので木で合算する
+        node["http_calls"] = max(node["http_calls"], sum(rollup_http(c) for c in node["children"]))
+        return node["http_calls"]
+
+    for root in roots:
+        rollup_http(root)
+
+    print(f"{'wall(ms)':>11} {'self(ms)':>10} {'cpu(ms)':>10} {'http':>5}  {'':<{width}}  name")
+
+    def show(node: Dict[str, Any], depth: int):
+        if node["wall_ms"] < min_ms:
+            return
+        # 子が別スレッドで並行に走ると子の合計が親を超えるので0で止める
+        self_ms = max(0.0, node["wall_ms"] - sum(c["wall_ms"] for c in node["children"]))
+        bar = "█" * max(1, round(node["wall_ms"] / total * width))
+        label = node["name"] + (f" ×{node['count']}" if node["count"] > 1 else "")
+        if node["errors"]:
+            label += f" ❌{node['errors']}"
+        print(f"{node['wall_ms']:>11.1f} {self_ms:>10.1f} {node['cpu_ms']:>10.1f} {node['http_calls']:>5}  "
+              f"{bar:<{width}}  {'  ' * depth}{label}")
+        for child in sorted(node["children"], key=lambda c: -c["wall_ms"]):
+            show(child, depth + 1)
+
+    for root in roots:
+        show(root, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ミッショントレースの表示")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("list", help="トレースファイル一覧")
+
+    p_flame = subparsers.add_parser("flame", help="フレームグラフ風の内訳")
+    p_flame.add_argument("trace", nargs="?", default="latest", help="latest / トレースID / ファイルパス")
+    p_flame.add_argument("--no-merge", dest="merge", action="store_false", help="同名スパンをまとめない")
+    p_flame.add_argument("--min-ms", type=float, default=0.0, help="この時間未満のスパンを省略")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        files = sorted(REPORTS_DIR.glob(f"{TRACE_FILE_PREFIX}*.jsonl"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            spans = load_trace(path)
+            roots = [s for s in spans if not s["parent_id"]]
+            wall = sum(s["wall_ms"] for s in roots)
+            print(f"{path.name:<60} spans={len(spans):>5} wall={wall / 1000:.1f}s")
+        return
+
+    if args.command == "flame":
+        path = resolve_trace_file(args.trace)
+        if path is None:
+            print(f"❌ トレースが見つかりません: {args.trace}")
+            sys.exit(1)
+        print(f"📊 {path}")
+        print_flame(load_trace(path), merge=args.merge, min_ms=args.min_ms)
+        return
+
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+メルマガツールの負荷試験
+
+fake_brevo_server.py の代替サーバーを起動し、実際のツール（ListManager /
+SendManager）でワークフローを実行して API 呼び出しを計測する。
+- export:     ListManager.export_to_csv（リストの全件取得 → CSV）
+- import:     ListManager.bulk_import_csv（/contacts/import + 完了待ち）
+- batch_send: SendManager.send_campaign_batch(batch=True)（messageVersions）
+- send_each:  SendManager.send_campaign_batch(batch=False)（1通ずつ）
+
+ワークフローごとに API 呼び出し数・エラー数・calls/sec・p50/p99 レイテンシ・
+総所要時間を表示する。送信ログは一時ディレクトリに書くため本番の
+logs/send_log.db には影響しない。API計測（api_metrics）も無効にして、
+代替サーバーへの呼び出しを本番の集計に入れない。
+
+使い方:
+  python3 benchmark_brevo.py --contacts 10000 --latency-ms 40 --jitter-ms 20
+  python3 benchmark_brevo.py --contacts 10000 --rate-limit 50 --error-rate 0.02 --json result.json
+"""
+
+import csv
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+os.environ["EDITH_API_METRICS"] = "0"  # 代替サーバーへの呼び出しを API 集計に入れない
+
+from fake_brevo_server import FakeBrevoServer
+from list_manager import ListManager
+from send_manager import SendManager
+
+
+WORKFLOWS = ["export", "import", "batch_send", "send_each"]
+BENCH_API_KEY = "benchmark-key"
+BENCH_LIST_ID = 4
+SENDER = {"name": "Room8", "email": "bench@example.com"}
+
+
+class CallRecorder:
+    """BrevoAPI._request を包んで呼び出しごとの所要時間と失敗を記録する"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def attach(self, api) -> None:
+        """BrevoAPI インスタンスの _request を計測付きに差し替える"""
+        request = api._request
+
+        def timed_request(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return request(*args, **kwargs)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                raise
+            finally:
+                with self._lock:
+                    self.latencies.append(time.perf_counter() - started)
+
+        api._request = timed_request
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latencies = []
+            self.errors = 0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近傍順位法のパーセンタイル"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def run_workflow(name: str, recorder: CallRecorder, func: Callable[[], Dict]) -> Dict:
+    """
+    ワークフローを1回実行して計測結果をまとめる
+
+    Args:
+        name: ワークフロー名
+        recorder: 計測器
+        func: 実行する処理（結果の要約辞書を返す）
+
+    Returns:
+        計測結果
+    """
+    recorder.reset()
+    started = time.perf_counter()
+    error = None
+    try:
+        detail = func()
+    except Exception as e:
+        detail = {}
+        error = str(e)
+    wall = time.perf_counter() - started
+
+    calls = len(recorder.latencies)
+    return {
+        "workflow": name,
+        "calls": calls,
+        "errors": recorder.errors,
+        "wall_seconds": round(wall, 3),
+        "calls_per_sec": round(calls / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(recorder.latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(recorder.latencies, 99) * 1000, 1),
+        "detail": detail,
+        "error": error
+    }
+
+
+def write_import_csv(path: Path, count: int) -> None:
+    """インポート用の合成CSV（EMAIL / LASTNAME / FIRSTNAME）を作る"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["EMAIL", "LASTNAME", "FIRSTNAME"])
+        for i in range(count):
+            writer.writerow([f"import{i:06d}@example.com", "山田", f"{i}"])
+
+
+def run_benchmark(
+    contacts: int = 10000,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limit: Optional[int] = None,
+    import_delay: float = 0.5,
+    import_chunk_kb: Optional[int] = None,
+    each_count: int = SendManager.DAILY_LIMIT,
+    workflows: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    代替サーバーを起動してワークフローを順に実行
+
+    Args:
+        contacts: リストの連絡先数（インポート件数・一括送信件数も同じ）
+        latency_ms: サーバーの応答遅延（ミリ秒）
+        jitter_ms: 応答遅延の揺らぎ（ミリ秒）
+        error_rate: 5xx を返す確率
+        rate_limit: 1秒あたりのリクエスト上限
+        import_delay: インポート完了までの秒数
+        import_chunk_kb: インポート1リクエストの上限（KB、省略時は BrevoAPI の既定値）
+        each_count: send_each で送る件数
+        workflows: 実行するワークフロー（省略時は全部）
+
+    Returns:
+        ワークフローごとの計測結果
+    """
+    workflows = workflows or WORKFLOWS
+    results = []
+
+    server = FakeBrevoServer(
+        contact_count=contacts,
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        error_rate=error_rate,
+        rate_limit=rate_limit,
+        import_delay=import_delay,
+        api_key=BENCH_API_KEY
+    )
+
+    with server, tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        os.environ["BREVO_BASE_URL"] = server.base_url
+
+        class BenchSendManager(SendManager):
+            LOG_DIR = tmp_dir / "logs"
+            DAILY_LIMIT = contacts + each_count
+
+        recorder = CallRecorder()
+        list_manager = ListManager(BENCH_API_KEY)
+        send_manager = BenchSendManager(BENCH_API_KEY)
+        recorder.attach(list_manager.api)
+        recorder.attach(send_manager.api)
+
+        recipients = [
+            {"email": f"user{i:06d}@example.com", "name": f"ユーザー{i}"}
+            for i in range(contacts)
+        ]
+
+        def export():
+            path = list_manager.export_to_csv(list_id=BENCH_LIST_ID, output_path=tmp_dir / "export.csv")
+            with open(path, encoding="utf-8") as f:
+                return {"rows": sum(1 for _ in f) - 1}
+
+        def bulk_import():
+            path = tmp_dir / "import.csv"
+            write_import_csv(path, contacts)
+            result = list_manager.bulk_import_csv(
+                path,
+                [BENCH_LIST_ID],
+                max_chunk_bytes=import_chunk_kb * 1024 if import_chunk_kb else None,
+                poll_interval=min(0.2, import_delay or 0.2)
+            )
+            return {k: result[k] for k in ("chunk_count", "row_count", "completed_rows", "pending_rows")}
+
+        def batch_send():
+            result = send_manager.send_campaign_batch(
+                "bench_batch", "ベンチマーク", "<p>bench</p>", recipients, SENDER, batch=True
+            )
+            return {"sent": result["sent_count"], "failed": result["failed_count"]}
+
+        def send_each():
+            result = send_manager.send_campaign_batch(
+                "bench_each", "ベンチマーク", "<p>bench</p>", recipients[:each_count], SENDER
+            )
+            return {"sent": result["sent_count"], "failed": result["failed_count"]}
+
+        funcs = {"export": export, "import": bulk_import, "batch_send": batch_send, "send_each": send_each}
+        for name in workflows:
+            print(f"⏱️  {name} 実行中...")
+            results.append(run_workflow(name, recorder, funcs[name]))
+
+        os.environ.pop("BREVO_BASE_URL", None)
+
+    return results
+
+
+def print_report(results: List[Dict]) -> None:
+    """結果を表形式で表示"""
+    print("\n" + "=" * 80)
+    print("📊 ベンチマーク結果")
+    print("=" * 80)
+    print(f"{'workflow':<12}{'calls':>8}{'errors':>8}{'wall(s)':>10}{'calls/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for r in results:
+        print(f"{r['workflow']:<12}{r['calls']:>8}{r['errors']:>8}{r['wall_seconds']:>10}"
+              f"{r['calls_per_sec']:>10}{r['p50_ms']:>10}{r['p99_ms']:>10}")
+    print()
+    for r in results:
+        print(f"   {r['workflow']}: {json.dumps(r['detail'], ensure_ascii=False)}")
+        if r["error"]:
+            print(f"   ❌ {r['workflow']} 中断: {r['error'][:200]}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="メルマガツールの負荷試験（Brevo 代替サーバー使用）")
+    parser.add_argument("--contacts", type=int, default=10000, help="連絡先数")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="サーバー応答遅延（ミリ秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="応答遅延の揺らぎ（ミリ秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx を返す確率（0〜1）")
+    parser.add_argument("--rate-limit", type=int, help="1秒あたりのリクエスト上限（超過で429）")
+    parser.add_argument("--import-delay", type=float, default=0.5, help="インポート完了までの秒数")
+    parser.add_argument("--import-chunk-kb", type=int, help="インポート1リクエストの上限（KB）")
+    parser.add_argument("--each-count", type=int, default=SendManager.DAILY_LIMIT, help="send_each の送信件数")
+    parser.add_argument("--workflow", action="append", choices=WORKFLOWS, help="実行するワークフロー（複数指定可）")
+    parser.add_argument("--json", help="結果をJSONで保存するパス")
+
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        contacts=args.contacts,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        import_delay=args.import_delay,
+        import_chunk_kb=args.import_chunk_kb,
+        each_count=args.each_count,
+        workflows=args.workflow
+    )
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 保存: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,24 +10,36 @@ Brevo（旧Sendinblue）のREST APIを使った操作を提供する。
 """
 
 import os
+import sys
 import json
 import requests
+from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import api_metrics
+
 
 class BrevoAPI:
     """Brevo API クライアント"""
 
     BASE_URL = "https://api.brevo.com/v3"
+    MAX_MESSAGE_VERSIONS = 1000  # messageVersions 1リクエストあたりの上限
+    MAX_CONTACTS_PAGE = 1000  # GET /contacts の limit 上限
+    MAX_LIST_CONTACTS_PAGE = 500  # GET /contacts/lists/{id}/contacts の limit 上限
+    MAX_BATCH_UPDATE = 100  # POST /contacts/batch 1リクエストあたりの上限
+    MAX_IMPORT_BODY_BYTES = 8 * 1024 * 1024  # fileBody の上限（10MB）に余裕を持たせた値
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         初期化
 
         Args:
             api_key: Brevo APIキー（省略時は環境変数 BREVO_API_KEY から取得）
+            base_url: APIのベースURL（省略時は環境変数 BREVO_BASE_URL、なければ BASE_URL）
         """
+        self.base_url = (base_url or os.environ.get("BREVO_BASE_URL") or self.BASE_URL).rstrip("/")
         self.api_key = api_key or os.environ.get("BREVO_API_KEY")
         if not self.api_key:
             raise ValueError("BREVO_API_KEY が設定されていません")
@@ -37,6 +49,9 @@ class BrevoAPI:
             "content-type": "application/json",
             "api-key": self.api_key
         }
+        # api.brevo.com は api_metrics 側で brevo に分類される。
+        # BREVO_BASE_URL の代替サーバーは brevo として数えない（ホスト名のまま記録）
+        api_metrics.install()
 
     def _request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
         """
@@ -50,7 +65,7 @@ class BrevoAPI:
         Returns:
             レスポンスJSON
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        url = f"{self.base_url}{endpoint}"
 
         if method == "GET":
             response = requests.get(url, headers=self.headers, params=data)
@@ -77,7 +92,8 @@ class BrevoAPI:
         html_content: str,
         sender: Optional[Dict[str, str]] = None,
         reply_to: Optional[Dict[str, str]] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        tags: Optional[List[str]] = None
     ) -> Dict:
         """
         メール送信
@@ -89,6 +105,7 @@ class BrevoAPI:
             sender: 送信者情報 {"email": "from@example.com", "name": "Sender"}
             reply_to: 返信先
             params: テンプレート変数
+            tags: タグ（統計の集計用）
 
         Returns:
             送信結果
@@ -99,6 +116,54 @@ class BrevoAPI:
             "htmlContent": html_content
         }
 
+        if sender:
+            data["sender"] = sender
+        if reply_to:
+            data["replyTo"] = reply_to
+        if params:
+            data["params"] = params
+        if tags:
+            data["tags"] = tags
+
+        return self._request("POST", "/smtp/email", data)
+
+    def send_email_versions(
+        self,
+        message_versions: List[Dict],
+        subject: str,
+        html_content: str,
+        sender: Optional[Dict[str, str]] = None,
+        reply_to: Optional[Dict[str, str]] = None,
+        params: Optional[Dict] = None
+    ) -> Dict:
+        """
+        メール一括送信（messageVersions）
+
+        1回のリクエストで宛先ごとにパーソナライズしたメールを送信する。
+        1リクエストあたりの上限は MAX_MESSAGE_VERSIONS 件。
+
+        Args:
+            message_versions: [{"to": [{"email": "...", "name": "..."}], "params": {...}}]
+            subject: 件名
+            html_content: HTML本文
+            sender: 送信者情報
+            reply_to: 返信先
+            params: 全宛先共通のテンプレート変数
+
+        Returns:
+            送信結果（{"messageIds": [...]}）
+        """
+        if len(message_versions) > self.MAX_MESSAGE_VERSIONS:
+            raise ValueError(
+                f"messageVersions は最大 {self.MAX_MESSAGE_VERSIONS} 件です: {len(message_versions)}"
+            )
+
+        data = {
+            "subject": subject,
+            "htmlContent": html_content,
+            "messageVersions": message_versions
+        }
+
         if sender:
             data["sender"] = sender
         if reply_to:
@@ -216,6 +281,21 @@ class BrevoAPI:
 
         return self._request("GET", "/contacts", params)
 
+    def get_list_contacts(self, list_id: int, limit: int = 50, offset: int = 0) -> Dict:
+        """
+        リストの連絡先取得（サーバー側でリスト絞り込み）
+
+        Args:
+            list_id: リストID
+            limit: 取得件数（最大 MAX_LIST_CONTACTS_PAGE）
+            offset: オフセット
+
+        Returns:
+            {"contacts": [...], "count": 総件数}
+        """
+        params = {"limit": limit, "offset": offset}
+        return self._request("GET", f"/contacts/lists/{list_id}/contacts", params)
+
     def add_contact(
         self,
         email: str,
@@ -258,6 +338,18 @@ class BrevoAPI:
         data = {"attributes": attributes}
         self._request("PUT", f"/contacts/{email}", data)
 
+    def update_contacts_batch(self, contacts: List[Dict]) -> None:
+        """
+        連絡先一括更新（POST /contacts/batch）
+
+        Args:
+            contacts: [{"email": "...", "attributes": {...}}]（最大 MAX_BATCH_UPDATE 件）
+        """
+        if len(contacts) > self.MAX_BATCH_UPDATE:
+            raise ValueError(f"一括更新は最大 {self.MAX_BATCH_UPDATE} 件です: {len(contacts)}")
+
+        self._request("POST", "/contacts/batch", {"contacts": contacts})
+
     def delete_contact(self, email: str) -> None:
         """
         連絡先削除
@@ -288,6 +380,39 @@ class BrevoAPI:
 
         return self._request("POST", "/contacts/import", data)
 
+    def import_contacts_body(self, file_body: str, list_ids: List[int]) -> Dict:
+        """
+        CSVインポート（CSV本文を直接送信）
+
+        Args:
+            file_body: CSV本文（区切りは ;、1行目は EMAIL;FIRSTNAME;... の属性名）
+            list_ids: インポート先リストID
+
+        Returns:
+            {"processId": ...}
+        """
+        data = {
+            "fileBody": file_body,
+            "listIds": list_ids,
+            "emailBlacklist": False,
+            "smsBlacklist": False,
+            "updateExistingContacts": True
+        }
+
+        return self._request("POST", "/contacts/import", data)
+
+    def get_process(self, process_id: int) -> Dict:
+        """
+        非同期処理（インポート等）の状態取得
+
+        Args:
+            process_id: プロセスID
+
+        Returns:
+            プロセス情報（status: queued / in_process / completed）
+        """
+        return self._request("GET", f"/processes/{process_id}")
+
     # ==================== 統計・分析 ====================
 
     def get_campaign_stats(self, campaign_id: int) -> Dict:
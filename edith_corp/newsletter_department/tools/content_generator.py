@@ -7,9 +7,68 @@ HTMLテンプレートとの組み合わせで完成形を作る。
 """
 
 import json
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 from pathlib import Path
 
+from template_engine import CompiledTemplate, TemplateLoader
+
+
+# templates/base.html がない場合のテンプレート
+FALLBACK_TEMPLATE = CompiledTemplate("""
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Room8 Newsletter</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        h2 {
+            color: #0066cc;
+            border-bottom: 2px solid #0066cc;
+            padding-bottom: 8px;
+        }
+        h3 {
+            color: #333;
+        }
+        a {
+            color: #0066cc;
+        }
+        .footer {
+            margin-top: 40px;
+            padding-top: 20px;
+            border-top: 1px solid #ccc;
+            font-size: 12px;
+            color: #666;
+        }
+    </style>
+</head>
+<body>
+    <div style="text-align: center; margin-bottom: 30px;">
+        <h1 style="color: #0066cc;">Room8</h1>
+        <p style="color: #666;">AI × コワーキング × コミュニティ</p>
+    </div>
+
+    {{CONTENT}}
+
+    <div class="footer">
+        <p>株式会社Room8<br>
+        〒486-0931 愛知県春日井市松新町1-3 ルネッサンスシティ勝川 Nexia-C<br>
+        営業時間: 平日 10:00-18:00<br>
+        <a href="https://room8.co.jp">https://room8.co.jp</a></p>
+        <p><a href="{{UNSUBSCRIBE_URL}}">配信解除</a></p>
+    </div>
+</body>
+</html>
+""")
+
 
 class ContentGenerator:
     """メルマガコンテンツ生成"""
@@ -19,6 +78,7 @@ class ContentGenerator:
     def __init__(self):
         """初期化"""
         self.TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
+        self.templates = TemplateLoader(self.TEMPLATES_DIR)
 
     def generate_blog_update(self, blog_title: str, blog_url: str, excerpt: str) -> Dict[str, str]:
         """
@@ -113,37 +173,34 @@ class ContentGenerator:
         """
         subject = "📰 Room8 月間ダイジェスト"
 
-        html_items = ""
-        plain_items = ""
+        html_parts = ["""
+        <h2>今月のハイライト</h2>
+        """]
+        plain_parts = ["""
+Room8 月間ダイジェスト
+
+今月のハイライト
+
+"""]
 
         for item in items:
-            html_items += f"""
+            html_parts.append(f"""
             <div style="margin-bottom: 24px;">
                 <h3>{item['title']}</h3>
                 <p>{item['description']}</p>
                 <p><a href="{item['url']}">続きを読む →</a></p>
             </div>
-            """
+            """)
 
-            plain_items += f"""
+            plain_parts.append(f"""
 {item['title']}
 {item['description']}
 {item['url']}
 
-"""
-
-        html_content = f"""
-        <h2>今月のハイライト</h2>
-        {html_items}
-        """
-
-        plain_text = f"""
-Room8 月間ダイジェスト
-
-今月のハイライト
+""")
 
-{plain_items}
-        """
+        html_content = "".join(html_parts)
+        plain_text = "".join(plain_parts)
 
         return {
             "subject": subject,
@@ -151,78 +208,45 @@ Room8 月間ダイジェスト
             "plain_text": plain_text
         }
 
-    def _apply_template(self, content: str) -> str:
+    def _apply_template(self, content: str, values: Optional[Dict[str, str]] = None) -> str:
         """
         HTMLテンプレートを適用
 
         Args:
             content: 本文コンテンツ
+            values: {{CONTENT}} 以外の差し込み値
 
         Returns:
             完成したHTML
         """
-        template_path = self.TEMPLATES_DIR / "base.html"
-
-        if template_path.exists():
-            with open(template_path, "r", encoding="utf-8") as f:
-                template = f.read()
-            return template.replace("{{CONTENT}}", content)
-        else:
-            # テンプレートがない場合はシンプルなHTMLを返す
-            return f"""
-<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Room8 Newsletter</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        h2 {{
-            color: #0066cc;
-            border-bottom: 2px solid #0066cc;
-            padding-bottom: 8px;
-        }}
-        h3 {{
-            color: #333;
-        }}
-        a {{
-            color: #0066cc;
-        }}
-        .footer {{
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #ccc;
-            font-size: 12px;
-            color: #666;
-        }}
-    </style>
-</head>
-<body>
-    <div style="text-align: center; margin-bottom: 30px;">
-        <h1 style="color: #0066cc;">Room8</h1>
-        <p style="color: #666;">AI × コワーキング × コミュニティ</p>
-    </div>
+        return self._base_template().render({**(values or {}), "CONTENT": content})
 
-    {content}
+    def _base_template(self) -> CompiledTemplate:
+        """templates/base.html（なければ組み込みのシンプルなHTML）"""
+        return self.templates.get("base.html") or FALLBACK_TEMPLATE
 
-    <div class="footer">
-        <p>株式会社Room8<br>
-        〒486-0931 愛知県春日井市松新町1-3 ルネッサンスシティ勝川 Nexia-C<br>
-        営業時間: 平日 10:00-18:00<br>
-        <a href="https://room8.co.jp">https://room8.co.jp</a></p>
-        <p><a href="{{UNSUBSCRIBE_URL}}">配信解除</a></p>
-    </div>
-</body>
-</html>
-            """
+    def render_many(
+        self,
+        content: str,
+        recipients: Iterable[Dict[str, str]],
+        values: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        """
+        宛先ごとにパーソナライズしたHTMLをまとめて生成
+
+        本文とテンプレートの結合は1回だけ行い、宛先ごとには残りの差し込み箇所
+        （{{LASTNAME}} {{FIRSTNAME}} など）だけを埋める。
+        宛先の値にない差し込み箇所（{{UNSUBSCRIBE_URL}} など）はそのまま残る。
+
+        Args:
+            content: 本文コンテンツ（{{LASTNAME}} 等の差し込み箇所を含めてよい）
+            recipients: 宛先ごとの値 [{"LASTNAME": "...", "FIRSTNAME": "..."}]
+            values: 全宛先共通の差し込み値
+
+        Returns:
+            HTMLリスト（recipients と同じ順序）
+        """
+        return self._base_template().render_many(recipients, common={**(values or {}), "CONTENT": content})
 
     def save_template(self, template_name: str, template_content: str) -> None:
         """
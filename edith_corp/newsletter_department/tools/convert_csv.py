@@ -1,71 +1,192 @@
 #!/usr/bin/env python3
 """
 Room8の購読者リストをBrevo用フォーマットに変換
+
+1行ずつ読み込み → 検証 → 書き出しのストリーム処理（メモリ使用量は入力サイズに依存しない）。
+--jobs N を指定すると入力をバイト範囲で N 分割してプロセスプールで変換し、
+元の順序で結合する（セル内改行を含まないCSVが前提）。
 """
 
 import csv
+import os
+import re
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+FIELDNAMES = ['EMAIL', 'NAME', 'SEGMENT', 'STATUS', 'COMPANY', 'PHONE']
+SKIP_SAMPLE_LIMIT = 10  # 結果に残すスキップ詳細の件数
+MIN_SHARD_BYTES = 1024 * 1024  # 1シャードあたりの最小サイズ（小さい入力は分割しない）
+
+# ローカル部 @ ドメイン（ラベルは英数字とハイフン、2ラベル以上）
+EMAIL_PATTERN = re.compile(
+    r"^[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+"
+    r"@[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?"
+    r"(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?)+$"
+)
+
 
+def is_valid_email(email: str) -> bool:
+    """メールアドレスの形式チェック"""
+    return EMAIL_PATTERN.match(email) is not None and '..' not in email
 
-def convert_to_brevo_format(input_csv: str, output_csv: str, filter_segment: str = None):
+
+def _convert_rows(
+    rows: Iterable[Dict],
+    writer: csv.DictWriter,
+    filter_segment: Optional[str]
+) -> Dict:
     """
-    Room8フォーマットをBrevoフォーマットに変換
+    行を変換して writer に書き出す
 
-    Args:
-        input_csv: 入力CSVパス
-        output_csv: 出力CSVパス
-        filter_segment: セグメントフィルタ（例: "在籍"）
+    Returns:
+        {'converted_count': n, 'skipped_count': n, 'skipped': [先頭 SKIP_SAMPLE_LIMIT 件]}
     """
-    converted = []
+    converted_count = 0
+    skipped_count = 0
     skipped = []
 
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    for row in rows:
+        email = (row.get('EMAIL') or '').strip()
+        segment = (row.get('SEGMENT') or '').strip()
 
-        for row in reader:
-            email = row.get('EMAIL', '').strip()
-            name = row.get('NAME', '').strip()
-            segment = row.get('SEGMENT', '').strip()
-            status = row.get('STATUS', '').strip()
-
-            # メールアドレスが無効な場合はスキップ
-            if not email or '@' not in email:
+        # メールアドレスが無効な場合はスキップ
+        if not is_valid_email(email):
+            skipped_count += 1
+            if len(skipped) < SKIP_SAMPLE_LIMIT:
                 skipped.append(f"無効なメール: {email}")
-                continue
-
-            # 退会者も含めてインポート（セグメント分けで後から制御可能）
-
-            # セグメントフィルタ
-            if filter_segment and segment != filter_segment:
-                continue
-
-            # Brevoフォーマットに変換
-            brevo_row = {
-                'EMAIL': email,
-                'NAME': name,
-                'SEGMENT': segment,
-                'STATUS': status,
-                'COMPANY': row.get('COMPANY', '').strip(),
-                'PHONE': row.get('PHONE', '').strip()
-            }
-
-            converted.append(brevo_row)
-
-    # Brevo用CSVに出力
-    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ['EMAIL', 'NAME', 'SEGMENT', 'STATUS', 'COMPANY', 'PHONE']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(converted)
+            continue
+
+        # 退会者も含めてインポート（セグメント分けで後から制御可能）
+
+        # セグメントフィルタ
+        if filter_segment and segment != filter_segment:
+            continue
+
+        # Brevoフォーマットに変換
+        writer.writerow({
+            'EMAIL': email,
+            'NAME': (row.get('NAME') or '').strip(),
+            'SEGMENT': segment,
+            'STATUS': (row.get('STATUS') or '').strip(),
+            'COMPANY': (row.get('COMPANY') or '').strip(),
+            'PHONE': (row.get('PHONE') or '').strip()
+        })
+        converted_count += 1
+
+    return {
+        'converted_count': converted_count,
+        'skipped_count': skipped_count,
+        'skipped': skipped
+    }
 
+
+def _read_header(input_csv: str) -> Tuple[List[str], int]:
+    """ヘッダー行のカラム名と、ヘッダー直後のバイト位置"""
+    with open(input_csv, 'rb') as f:
+        header_line = f.readline()
+        header_end = f.tell()
+    header = next(csv.reader([header_line.decode('utf-8')]))
+    return header, header_end
+
+
+def _iter_shard_lines(input_csv: str, start: int, end: int, header_end: int) -> Iterable[str]:
+    """バイト範囲 [start, end) で始まる行を返す（範囲をまたぐ行は開始位置のシャードが担当）"""
+    with open(input_csv, 'rb') as f:
+        if start > header_end:
+            # 直前の改行まで戻って読み捨て、次の行頭に合わせる
+            f.seek(start - 1)
+            f.readline()
+        else:
+            f.seek(header_end)
+
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode('utf-8')
+
+
+def _convert_shard(
+    input_csv: str,
+    part_path: str,
+    start: int,
+    end: int,
+    header: List[str],
+    header_end: int,
+    filter_segment: Optional[str]
+) -> Dict:
+    """1シャードを変換してヘッダーなしで part_path に書き出す（プロセスプール用）"""
+    with open(part_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        rows = csv.DictReader(_iter_shard_lines(input_csv, start, end, header_end), fieldnames=header)
+        return _convert_rows(rows, writer, filter_segment)
+
+
+def _convert_sharded(input_csv: str, output_csv: str, filter_segment: Optional[str], jobs: int) -> Dict:
+    """入力をバイト範囲で分割して並列変換し、順番どおりに結合する"""
+    header, header_end = _read_header(input_csv)
+    size = os.path.getsize(input_csv)
+    shard_size = -(-(size - header_end) // jobs)
+    bounds = [
+        (header_end + i * shard_size, min(size, header_end + (i + 1) * shard_size))
+        for i in range(jobs)
+    ]
+    part_paths = [f"{output_csv}.part{i}" for i in range(jobs)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_convert_shard, input_csv, part, start, end, header, header_end, filter_segment)
+                for part, (start, end) in zip(part_paths, bounds)
+            ]
+            shard_results = [future.result() for future in futures]
+
+        with open(output_csv, 'w', encoding='utf-8', newline='') as out:
+            csv.DictWriter(out, fieldnames=FIELDNAMES).writeheader()
+            for part in part_paths:
+                with open(part, 'r', encoding='utf-8', newline='') as f:
+                    shutil.copyfileobj(f, out)
+    finally:
+        for part in part_paths:
+            if os.path.exists(part):
+                os.remove(part)
+
+    skipped = [s for r in shard_results for s in r['skipped']][:SKIP_SAMPLE_LIMIT]
     return {
-        'converted_count': len(converted),
-        'skipped_count': len(skipped),
+        'converted_count': sum(r['converted_count'] for r in shard_results),
+        'skipped_count': sum(r['skipped_count'] for r in shard_results),
         'skipped': skipped
     }
 
 
+def convert_to_brevo_format(input_csv: str, output_csv: str, filter_segment: str = None, jobs: int = 1):
+    """
+    Room8フォーマットをBrevoフォーマットに変換
+
+    Args:
+        input_csv: 入力CSVパス
+        output_csv: 出力CSVパス
+        filter_segment: セグメントフィルタ（例: "在籍"）
+        jobs: 並列プロセス数（1MB未満/シャードになる場合は減らす）
+
+    Returns:
+        {'converted_count': n, 'skipped_count': n, 'skipped': [先頭 SKIP_SAMPLE_LIMIT 件の詳細]}
+    """
+    jobs = max(1, min(jobs, os.path.getsize(input_csv) // MIN_SHARD_BYTES))
+    if jobs > 1:
+        return _convert_sharded(input_csv, output_csv, filter_segment, jobs)
+
+    with open(input_csv, 'r', encoding='utf-8') as fin, \
+            open(output_csv, 'w', encoding='utf-8', newline='') as fout:
+        writer = csv.DictWriter(fout, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        return _convert_rows(csv.DictReader(fin), writer, filter_segment)
+
+
 def main():
     import argparse
 
@@ -73,21 +194,22 @@ def main():
     parser.add_argument('input_csv', help='入力CSVファイル')
     parser.add_argument('--output', '-o', default='brevo_converted.csv', help='出力CSVファイル')
     parser.add_argument('--segment', '-s', help='セグメントフィルタ（例: 在籍）')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='並列プロセス数（大きな入力向け）')
 
     args = parser.parse_args()
 
-    result = convert_to_brevo_format(args.input_csv, args.output, args.segment)
+    result = convert_to_brevo_format(args.input_csv, args.output, args.segment, jobs=args.jobs)
 
     print(f"✅ 変換完了: {result['converted_count']}件")
     print(f"⚠️  スキップ: {result['skipped_count']}件")
 
     if result['skipped']:
         print("\nスキップ詳細:")
-        for skip in result['skipped'][:10]:  # 最初の10件のみ表示
+        for skip in result['skipped']:
             print(f"  - {skip}")
 
-        if len(result['skipped']) > 10:
-            print(f"  ... 他 {len(result['skipped']) - 10}件")
+        if result['skipped_count'] > len(result['skipped']):
+            print(f"  ... 他 {result['skipped_count'] - len(result['skipped'])}件")
 
     print(f"\n出力ファイル: {args.output}")
 
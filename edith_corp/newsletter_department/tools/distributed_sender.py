@@ -8,23 +8,33 @@ A/Bテスト・開封率分析用
 import json
 import os
 import random
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from brevo_api import BrevoAPI
+from list_manager import ListManager
+from send_log_store import SendLogStore
+from send_manager import SendManager
 
 class DistributedSender:
-    def __init__(self, api_key: str):
+    DEFAULT_CONCURRENCY = 4  # 1時間帯内の同時送信数
+
+    def __init__(self, api_key: str, store: Optional[SendLogStore] = None):
         self.api = BrevoAPI(api_key)
         self.schedule_dir = Path(__file__).parent / "schedules"
         self.schedule_dir.mkdir(exist_ok=True)
+        # 宛先ごとの進捗と送信枠は SendManager と同じストアに記録する
+        self.store = store or SendLogStore(SendManager.LOG_DIR / SendManager.DB_NAME)
 
     def create_schedule(
         self,
         campaign_name: str,
         recipients: List[Dict],
         time_slots: List[str],
-        shuffle: bool = True
+        shuffle: bool = True,
+        start_date: Optional[str] = None
     ) -> Dict:
         """
         分散送信スケジュールを作成
@@ -34,6 +44,7 @@ class DistributedSender:
             recipients: 受信者リスト [{'email': '...', 'name': '...'}]
             time_slots: 送信時間帯 ['09:00', '12:00', '15:00', '18:00', '21:00']
             shuffle: 受信者をシャッフルするか（時間帯の偏りを防ぐ）
+            start_date: 送信日（YYYY-MM-DD、省略時は今日）
 
         Returns:
             スケジュール情報
@@ -54,6 +65,7 @@ class DistributedSender:
         schedule = {
             'campaign_name': campaign_name,
             'created_at': datetime.now().isoformat(),
+            'start_date': start_date or datetime.now().strftime('%Y-%m-%d'),
             'total_recipients': total,
             'time_slots': []
         }
@@ -95,24 +107,30 @@ class DistributedSender:
         slot_index: int,
         subject: str,
         html_content: str,
-        sender: Dict[str, str]
+        sender: Dict[str, str],
+        concurrency: Optional[int] = None
     ) -> Dict:
         """
         指定された時間帯のグループに送信
 
+        宛先ごとに送信前 inflight / 送信後 sent・failed をチェックポイントとして
+        記録する。途中で停止しても再実行時は未処理の宛先だけを送信する。
+        inflight のまま残った宛先は送信済みの可能性があるため再送せず、
+        uncertain として結果に含める。
+
         Args:
             schedule_file: スケジュールファイルパス
             slot_index: 時間帯インデックス（0始まり）
             subject: メール件名
             html_content: HTML本文
             sender: 送信者 {'name': '...', 'email': '...'}
+            concurrency: 同時送信数（省略時は DEFAULT_CONCURRENCY）
 
         Returns:
             送信結果
         """
-        # スケジュール読み込み
-        with open(schedule_file, 'r', encoding='utf-8') as f:
-            schedule = json.load(f)
+        schedule_file = Path(schedule_file)
+        schedule = self._load_schedule(schedule_file)
 
         if slot_index >= len(schedule['time_slots']):
             raise ValueError(f"Invalid slot_index: {slot_index}")
@@ -123,54 +141,137 @@ class DistributedSender:
             print(f"⚠️ この時間帯は既に送信済みです: {slot['time']}")
             return {'status': 'already_sent', 'slot': slot}
 
-        # 送信実行
-        recipients = slot['recipients']
-        print(f"📧 送信中... [{slot['time']}] {len(recipients)}名")
+        schedule_id = schedule_file.stem
+        progress = self.store.get_slot_progress(schedule_id, slot_index)
+        uncertain = [email for email, row in progress.items() if row['status'] == 'inflight']
+        pending = [r for r in slot['recipients'] if r['email'] not in progress]
+
+        if progress:
+            print(f"↩️  再開: [{slot['time']}] 処理済み {len(progress)}名 / 残り {len(pending)}名")
+        print(f"📧 送信中... [{slot['time']}] {len(pending)}名")
 
         # Brevo API で送信（一括送信ではなく個別送信でトラッキング）
-        message_ids = []
-        failed = []
-
-        for recipient in recipients:
-            try:
-                response = self.api.send_email(
-                    to=[{'email': recipient['email'], 'name': recipient.get('name', '')}],
-                    subject=subject,
-                    html_content=html_content,
-                    sender=sender,
-                    tags=[schedule['campaign_name'], f"slot_{slot['time']}"]
-                )
-                message_ids.append(response.get('messageId'))
-            except Exception as e:
-                failed.append({'email': recipient['email'], 'error': str(e)})
-
-        # スケジュール更新
+        tags = [schedule['campaign_name'], f"slot_{slot['time']}"]
+        self._send_pipeline(
+            schedule_id, slot_index, pending, subject, html_content, sender, tags,
+            concurrency or self.DEFAULT_CONCURRENCY
+        )
+
+        # チェックポイントから結果を集計
+        progress = self.store.get_slot_progress(schedule_id, slot_index)
+        message_ids = [row['message_id'] for row in progress.values() if row['status'] == 'sent']
+        sent_emails = [email for email, row in progress.items() if row['status'] == 'sent']
+        failed = [
+            {'email': email, 'error': row['error']}
+            for email, row in progress.items() if row['status'] == 'failed'
+        ]
+
+        # 送信枠に反映（時間帯ごとに1回だけ。スケジュール保存前に停止した再実行でも重複しない）
+        self.store.record_slot_run(
+            schedule_id,
+            slot_index,
+            date=datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+            campaign_name=schedule['campaign_name'],
+            subject=subject,
+            sent_emails=sent_emails,
+            failed_emails=failed
+        )
+
+        # スケジュール更新（時間帯の完了時に1回だけ書き込む）
         slot['sent'] = True
         slot['sent_at'] = datetime.now().isoformat()
         slot['message_ids'] = message_ids
         slot['failed_count'] = len(failed)
-
-        with open(schedule_file, 'w', encoding='utf-8') as f:
-            json.dump(schedule, f, ensure_ascii=False, indent=2)
+        slot['uncertain'] = uncertain
+        self._save_schedule(schedule_file, schedule)
 
         result = {
             'status': 'success',
             'slot_time': slot['time'],
             'sent_count': len(message_ids),
             'failed_count': len(failed),
-            'failed': failed
+            'failed': failed,
+            'uncertain': uncertain
         }
 
         print(f"✅ 送信完了: {len(message_ids)}件")
         if failed:
             print(f"❌ 失敗: {len(failed)}件")
+        if uncertain:
+            print(f"❓ 送信結果不明（再送せず）: {len(uncertain)}件")
 
         return result
 
+    def _send_pipeline(
+        self,
+        schedule_id: str,
+        slot_index: int,
+        recipients: List[Dict],
+        subject: str,
+        html_content: str,
+        sender: Dict[str, str],
+        tags: List[str],
+        concurrency: int
+    ) -> None:
+        """
+        同時送信数を concurrency 以下に保ちながら送信し、宛先ごとに進捗を記録
+
+        チェックポイントの書き込みはすべてこのスレッドで行う。
+        """
+        def send_one(recipient: Dict) -> Dict:
+            return self.api.send_email(
+                to=[{'email': recipient['email'], 'name': recipient.get('name', '')}],
+                subject=subject,
+                html_content=html_content,
+                sender=sender,
+                tags=tags
+            )
+
+        queue = iter(recipients)
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                # 空きがあれば次の宛先を投入
+                for recipient in queue:
+                    self.store.mark_slot_email(schedule_id, slot_index, recipient['email'], 'inflight')
+                    in_flight[executor.submit(send_one, recipient)] = recipient
+                    if len(in_flight) >= concurrency:
+                        break
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    recipient = in_flight.pop(future)
+                    try:
+                        response = future.result()
+                        self.store.mark_slot_email(
+                            schedule_id, slot_index, recipient['email'], 'sent',
+                            message_id=response.get('messageId')
+                        )
+                    except Exception as e:
+                        self.store.mark_slot_email(
+                            schedule_id, slot_index, recipient['email'], 'failed', error=str(e)
+                        )
+
+    def _load_schedule(self, schedule_file: Path) -> Dict:
+        """スケジュール読み込み"""
+        with open(schedule_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_schedule(self, schedule_file: Path, schedule: Dict) -> None:
+        """スケジュール保存（一時ファイル経由で置き換え）"""
+        tmp_file = schedule_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(schedule, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, schedule_file)
+
     def get_schedule_status(self, schedule_file: Path) -> Dict:
         """スケジュールの進捗状況を取得"""
-        with open(schedule_file, 'r', encoding='utf-8') as f:
-            schedule = json.load(f)
+        schedule_file = Path(schedule_file)
+        schedule = self._load_schedule(schedule_file)
 
         total = schedule['total_recipients']
         sent = sum(slot['recipient_count'] for slot in schedule['time_slots'] if slot['sent'])
@@ -187,13 +288,98 @@ class DistributedSender:
                     'time': slot['time'],
                     'count': slot['recipient_count'],
                     'status': '✅ 送信済み' if slot['sent'] else '⏳ 未送信',
-                    'sent_at': slot.get('sent_at')
+                    'sent_at': slot.get('sent_at'),
+                    'processed': len(self.store.get_slot_progress(schedule_file.stem, i))
                 }
-                for slot in schedule['time_slots']
+                for i, slot in enumerate(schedule['time_slots'])
             ]
         }
 
 
+class SlotScheduler:
+    """
+    分散送信スケジューラ（常駐）
+
+    スケジュールの各時間帯の時刻まで待機し、到来した時間帯を send_slot で送信する。
+    再起動時は時刻を過ぎた未送信の時間帯を即座に送信し、途中だった時間帯は
+    チェックポイントから再開する。
+    """
+
+    POLL_INTERVAL = 60  # 待機中に時刻を再確認する間隔（秒）
+
+    def __init__(
+        self,
+        distributed_sender: DistributedSender,
+        schedule_file: Path,
+        subject: str,
+        html_content: str,
+        sender: Dict[str, str],
+        concurrency: Optional[int] = None
+    ):
+        self.distributed_sender = distributed_sender
+        self.schedule_file = Path(schedule_file)
+        self.subject = subject
+        self.html_content = html_content
+        self.sender = sender
+        self.concurrency = concurrency
+
+    def slot_datetime(self, schedule: Dict, slot: Dict) -> datetime:
+        """時間帯の送信時刻（ローカル時刻）"""
+        start_date = schedule.get('start_date') or schedule['created_at'][:10]
+        return datetime.strptime(f"{start_date} {slot['time']}", '%Y-%m-%d %H:%M')
+
+    def next_slot(self) -> Optional[tuple]:
+        """
+        次に送信する時間帯
+
+        Returns:
+            (slot_index, 送信時刻) / 全時間帯送信済みなら None
+        """
+        schedule = self.distributed_sender._load_schedule(self.schedule_file)
+        pending = [
+            (i, self.slot_datetime(schedule, slot))
+            for i, slot in enumerate(schedule['time_slots'])
+            if not slot['sent']
+        ]
+        if not pending:
+            return None
+        return min(pending, key=lambda item: item[1])
+
+    def run(self) -> List[Dict]:
+        """
+        全時間帯を送信し終えるまで常駐
+
+        Returns:
+            各時間帯の送信結果
+        """
+        results = []
+        print(f"🕘 スケジューラ起動: {self.schedule_file}")
+
+        while True:
+            upcoming = self.next_slot()
+            if upcoming is None:
+                break
+
+            slot_index, fire_at = upcoming
+            wait_seconds = (fire_at - datetime.now()).total_seconds()
+            if wait_seconds > 0:
+                print(f"⏳ 次の時間帯: {fire_at.strftime('%Y-%m-%d %H:%M')}（{int(wait_seconds)}秒後）")
+                time.sleep(min(wait_seconds, self.POLL_INTERVAL))
+                continue
+
+            results.append(self.distributed_sender.send_slot(
+                self.schedule_file,
+                slot_index,
+                self.subject,
+                self.html_content,
+                self.sender,
+                concurrency=self.concurrency
+            ))
+
+        print("✅ 全時間帯の送信が完了しました")
+        return results
+
+
 def main():
     """テスト用メイン関数"""
     import sys
@@ -201,8 +387,9 @@ def main():
     if len(sys.argv) < 2:
         print("使い方:")
         print("  1. スケジュール作成: python3 distributed_sender.py create <campaign_name>")
-        print("  2. 時間帯送信: python3 distributed_sender.py send <schedule_file> <slot_index>")
-        print("  3. 状況確認: python3 distributed_sender.py status <schedule_file>")
+        print("  2. 時間帯送信: python3 distributed_sender.py send <schedule_file> <slot_index> <subject> <html_file>")
+        print("  3. 常駐送信: python3 distributed_sender.py run <schedule_file> <subject> <html_file> [concurrency]")
+        print("  4. 状況確認: python3 distributed_sender.py status <schedule_file>")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -216,8 +403,7 @@ def main():
         campaign_name = sys.argv[2] if len(sys.argv) > 2 else "test_campaign"
 
         # テスト用: リストから受信者取得
-        api = BrevoAPI()
-        contacts = api.get_contacts(list_id=4, limit=500)
+        contacts = ListManager(BREVO_KEY).iter_contacts(list_id=4)
         recipients = [
             {'email': c['email'], 'name': f"{c.get('attributes', {}).get('LASTNAME', '')} {c.get('attributes', {}).get('FIRSTNAME', '')}".strip()}
             for c in contacts
@@ -227,6 +413,26 @@ def main():
         time_slots = ['09:00', '12:00', '15:00', '18:00', '21:00']
         schedule = sender_instance.create_schedule(campaign_name, recipients, time_slots, shuffle=True)
 
+    elif command in ("send", "run"):
+        schedule_file = Path(sys.argv[2])
+        if command == "send":
+            slot_index = int(sys.argv[3])
+            subject, html_file = sys.argv[4], sys.argv[5]
+        else:
+            subject, html_file = sys.argv[3], sys.argv[4]
+            concurrency = int(sys.argv[5]) if len(sys.argv) > 5 else None
+
+        with open(html_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        sender = {'name': 'Room8', 'email': 'k_tsuruta@room8.co.jp'}
+
+        if command == "send":
+            sender_instance.send_slot(schedule_file, slot_index, subject, html_content, sender)
+        else:
+            SlotScheduler(
+                sender_instance, schedule_file, subject, html_content, sender, concurrency=concurrency
+            ).run()
+
     elif command == "status":
         schedule_file = Path(sys.argv[2])
         status = sender_instance.get_schedule_status(schedule_file)
@@ -234,7 +440,7 @@ def main():
         print(f"進捗: {status['progress']}")
         print("\n時間帯別:")
         for slot in status['time_slots']:
-            print(f"  {slot['time']}: {slot['count']}名 - {slot['status']}")
+            print(f"  {slot['time']}: {slot['count']}名 - {slot['status']}（処理済み {slot['processed']}名）")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Brevo API のローカル代替サーバー（負荷試験・動作確認用）
+
+ツール群が使うエンドポイントだけをメモリ上で再現する。
+- POST /smtp/email（to / messageVersions）
+- GET/POST /contacts, PUT/DELETE /contacts/{email}, POST /contacts/batch
+- GET/POST /contacts/lists, GET /contacts/lists/{id}/contacts
+- GET/POST /contacts/folders
+- POST /contacts/import（fileBody）, GET /processes/{id}
+
+Brevo と同じ x-sib-ratelimit-* ヘッダーで固定窓のレート制限（超過時 429）を返し、
+応答遅延とエラー（5xx）を指定した確率で注入できる。
+
+使い方:
+  python3 fake_brevo_server.py --contacts 10000 --latency-ms 40 --error-rate 0.01 --rate-limit 100
+  BREVO_BASE_URL=http://127.0.0.1:8765/v3 BREVO_API_KEY=fake EDITH_API_METRICS=0 \
+      python3 list_manager.py count --list-id 4
+
+代替サーバーに向けて実行するときは EDITH_API_METRICS=0 で API 計測を無効にする
+（本番の api_metrics の集計に入れない）。
+"""
+
+import csv
+import io
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from brevo_api import BrevoAPI
+
+
+LASTNAMES = ["佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤"]
+FIRSTNAMES = ["太郎", "花子", "健", "由美", "翔太", "美咲", "大輔", "彩", "誠", "恵"]
+
+
+class FakeBrevoState:
+    """連絡先・リスト・インポート処理・送信記録のメモリ上の状態"""
+
+    def __init__(self, contact_count: int = 0, list_id: int = 4, import_delay: float = 0.5):
+        """
+        初期化
+
+        Args:
+            contact_count: 初期投入する連絡先数（list_id のリストに所属）
+            list_id: 初期リストID
+            import_delay: インポート処理が completed になるまでの秒数
+        """
+        self.lock = threading.Lock()
+        self.import_delay = import_delay
+        self.contacts: Dict[str, Dict] = {}
+        self.list_members: Dict[int, List[str]] = {}
+        self.lists: Dict[int, Dict] = {}
+        self.folders: Dict[int, Dict] = {1: {"id": 1, "name": "Your First Folder"}}
+        self.processes: Dict[int, Dict] = {}
+        self.sent_messages = 0
+        self._next_id = 1
+
+        self.create_list("Room8 Newsletter", 1, list_id=list_id)
+        for i in range(contact_count):
+            self.upsert_contact(
+                f"user{i:06d}@example.com",
+                {"LASTNAME": LASTNAMES[i % len(LASTNAMES)], "FIRSTNAME": FIRSTNAMES[i // len(LASTNAMES) % len(FIRSTNAMES)]},
+                [list_id]
+            )
+
+    def create_list(self, name: str, folder_id: int, list_id: Optional[int] = None) -> Dict:
+        list_id = list_id or max(self.lists, default=0) + 1
+        self.lists[list_id] = {"id": list_id, "name": name, "folderId": folder_id}
+        self.list_members.setdefault(list_id, [])
+        return self.lists[list_id]
+
+    def upsert_contact(self, email: str, attributes: Dict, list_ids: List[int]) -> Tuple[Dict, bool]:
+        """連絡先を追加または更新（(連絡先, 新規か) を返す）"""
+        email = email.lower()
+        contact = self.contacts.get(email)
+        created = contact is None
+        if created:
+            contact = {
+                "email": email,
+                "id": self._next_id,
+                "emailBlacklisted": False,
+                "smsBlacklisted": False,
+                "attributes": {},
+                "listIds": []
+            }
+            self._next_id += 1
+            self.contacts[email] = contact
+
+        contact["attributes"].update(attributes or {})
+        for list_id in list_ids or []:
+            if list_id not in contact["listIds"]:
+                contact["listIds"].append(list_id)
+                self.list_members.setdefault(list_id, []).append(email)
+        return contact, created
+
+    def delete_contact(self, email: str) -> bool:
+        contact = self.contacts.pop(email.lower(), None)
+        if contact is None:
+            return False
+        for list_id in contact["listIds"]:
+            self.list_members[list_id].remove(contact["email"])
+        return True
+
+
+class FakeBrevoServer:
+    """Brevo API 代替サーバー"""
+
+    RATE_LIMIT_HEADER = "x-sib-ratelimit-limit"
+    RATE_REMAINING_HEADER = "x-sib-ratelimit-remaining"
+    RATE_RESET_HEADER = "x-sib-ratelimit-reset"
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        contact_count: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_window: float = 1.0,
+        import_delay: float = 0.5,
+        api_key: Optional[str] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        初期化
+
+        Args:
+            host: 待ち受けホスト
+            port: 待ち受けポート（0 なら空きポート）
+            contact_count: 初期投入する連絡先数
+            latency_ms: 応答遅延（ミリ秒）
+            jitter_ms: 応答遅延に加える揺らぎの上限（ミリ秒）
+            error_rate: 5xx を返す確率（0〜1）
+            rate_limit: 窓あたりのリクエスト上限（None なら無制限）
+            rate_window: レート制限の窓（秒）
+            import_delay: インポート処理が completed になるまでの秒数
+            api_key: 受け付ける api-key（None なら何でも受け付ける）
+            seed: 乱数シード
+        """
+        self.state = FakeBrevoState(contact_count, import_delay=import_delay)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.api_key = api_key
+        self.random = random.Random(seed)
+
+        self._rate_lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.request_counts: Dict[str, int] = {}
+        self.status_counts: Dict[int, int] = {}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """BrevoAPI に渡すベースURL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v3"
+
+    def start(self) -> str:
+        """
+        バックグラウンドで起動
+
+        Returns:
+            ベースURL
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """停止"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeBrevoServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ==================== 共通処理 ====================
+
+    def _take_rate_slot(self) -> Tuple[bool, Dict[str, str]]:
+        """固定窓のレート制限（(許可されたか, ヘッダー) を返す）"""
+        if self.rate_limit is None:
+            return True, {}
+
+        with self._rate_lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window:
+                self._window_start = now
+                self._window_count = 0
+            allowed = self._window_count < self.rate_limit
+            if allowed:
+                self._window_count += 1
+            reset = max(0.0, self.rate_window - (now - self._window_start))
+            headers = {
+                self.RATE_LIMIT_HEADER: str(self.rate_limit),
+                self.RATE_REMAINING_HEADER: str(self.rate_limit - self._window_count),
+                self.RATE_RESET_HEADER: str(max(1, round(reset)))
+            }
+        return allowed, headers
+
+    def _count(self, route: str, status: int) -> None:
+        with self._rate_lock:
+            self.request_counts[route] = self.request_counts.get(route, 0) + 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("content-length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                parsed = urlparse(self.path)
+                path = parsed.path[3:] if parsed.path.startswith("/v3") else parsed.path
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+                route, status, body, headers = server.handle(
+                    method, path, query, raw, self.headers.get("api-key")
+                )
+                server._count(route, status)
+
+                payload = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        raw: bytes,
+        api_key: Optional[str]
+    ) -> Tuple[str, int, Optional[Dict], Dict[str, str]]:
+        """
+        1リクエストを処理
+
+        Returns:
+            (ルート名, ステータス, レスポンスJSON, 追加ヘッダー)
+        """
+        delay = self.latency_ms + (self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        allowed, headers = self._take_rate_slot()
+        if not allowed:
+            return "rate_limited", 429, _error("too_many_requests", "The expected rate limit is exceeded."), headers
+
+        if self.api_key is not None and api_key != self.api_key:
+            return "unauthorized", 401, _error("unauthorized", "Key not found"), headers
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            status = self.random.choice([500, 502, 503])
+            return "injected_error", status, _error("internal_error", "Injected failure"), headers
+
+        try:
+            data = json.loads(raw) if raw else {}
+        except json.JSONDecodeError:
+            return "bad_json", 400, _error("bad_request", "Invalid JSON"), headers
+
+        for route_method, pattern, name in ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match:
+                with self.state.lock:
+                    status, body = getattr(self, f"_{name}")(data, query, *map(unquote, match.groups()))
+                return name, status, body, headers
+
+        return "not_found", 404, _error("not_found", f"{method} {path}"), headers
+
+    # ==================== エンドポイント ====================
+
+    def _send_email(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        if not data.get("subject") or not data.get("htmlContent"):
+            return 400, _error("missing_parameter", "subject and htmlContent are required")
+
+        versions = data.get("messageVersions")
+        if versions is not None:
+            if len(versions) > BrevoAPI.MAX_MESSAGE_VERSIONS:
+                return 400, _error("invalid_parameter", "messageVersions exceeds the limit")
+            if any(not v.get("to") for v in versions):
+                return 400, _error("missing_parameter", "to is required in messageVersions")
+            self.state.sent_messages += len(versions)
+            return 201, {"messageIds": [_message_id() for _ in versions]}
+
+        if not data.get("to"):
+            return 400, _error("missing_parameter", "to is required")
+        self.state.sent_messages += 1
+        return 201, {"messageId": _message_id()}
+
+    def _get_contacts(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        limit, offset = _page(query, BrevoAPI.MAX_CONTACTS_PAGE)
+        if limit is None:
+            return 400, _error("out_of_range", f"limit must be <= {BrevoAPI.MAX_CONTACTS_PAGE}")
+        emails = list(self.state.contacts)[offset:offset + limit]
+        return 200, {
+            "contacts": [self.state.contacts[e] for e in emails],
+            "count": len(self.state.contacts)
+        }
+
+    def _get_list_contacts(self, data: Dict, query: Dict, list_id: str) -> Tuple[int, Dict]:
+        members = self.state.list_members.get(int(list_id))
+        if members is None:
+            return 404, _error("document_not_found", "List ID does not exist")
+        limit, offset = _page(query, BrevoAPI.MAX_LIST_CONTACTS_PAGE)
+        if limit is None:
+            return 400, _error("out_of_range", f"limit must be <= {BrevoAPI.MAX_LIST_CONTACTS_PAGE}")
+        return 200, {
+            "contacts": [self.state.contacts[e] for e in members[offset:offset + limit]],
+            "count": len(members)
+        }
+
+    def _add_contact(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        email = data.get("email")
+        if not email:
+            return 400, _error("missing_parameter", "email is required")
+        if email.lower() in self.state.contacts and not data.get("updateEnabled"):
+            return 400, _error("duplicate_parameter", "Contact already exist")
+        contact, _ = self.state.upsert_contact(email, data.get("attributes", {}), data.get("listIds", []))
+        return 201, {"id": contact["id"]}
+
+    def _update_contact(self, data: Dict, query: Dict, email: str) -> Tuple[int, Optional[Dict]]:
+        if email.lower() not in self.state.contacts:
+            return 404, _error("document_not_found", "Contact does not exist")
+        self.state.upsert_contact(email, data.get("attributes", {}), data.get("listIds", []))
+        return 204, None
+
+    def _delete_contact(self, data: Dict, query: Dict, email: str) -> Tuple[int, Optional[Dict]]:
+        if not self.state.delete_contact(email):
+            return 404, _error("document_not_found", "Contact does not exist")
+        return 204, None
+
+    def _batch_update(self, data: Dict, query: Dict) -> Tuple[int, Optional[Dict]]:
+        contacts = data.get("contacts") or []
+        if len(contacts) > BrevoAPI.MAX_BATCH_UPDATE:
+            return 400, _error("invalid_parameter", "contacts exceeds the limit")
+        for contact in contacts:
+            if contact.get("email", "").lower() in self.state.contacts:
+                self.state.upsert_contact(contact["email"], contact.get("attributes", {}), contact.get("listIds", []))
+        return 204, None
+
+    def _import_contacts(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        file_body = data.get("fileBody")
+        if file_body is None and not data.get("fileUrl"):
+            return 400, _error("missing_parameter", "fileBody or fileUrl is required")
+        if file_body is not None and len(file_body.encode("utf-8")) > 10 * 1024 * 1024:
+            return 400, _error("invalid_parameter", "fileBody exceeds 10MB")
+
+        imported = 0
+        for row in csv.DictReader(io.StringIO(file_body or ""), delimiter=";"):
+            email = row.pop("EMAIL", None) or row.pop("email", None)
+            if email:
+                self.state.upsert_contact(email, {k: v for k, v in row.items() if v}, data.get("listIds", []))
+                imported += 1
+
+        process_id = len(self.state.processes) + 1
+        self.state.processes[process_id] = {
+            "id": process_id,
+            "name": "Import contacts",
+            "created": time.monotonic(),
+            "rows": imported
+        }
+        return 202, {"processId": process_id}
+
+    def _get_process(self, data: Dict, query: Dict, process_id: str) -> Tuple[int, Dict]:
+        process = self.state.processes.get(int(process_id))
+        if process is None:
+            return 404, _error("document_not_found", "Process does not exist")
+        done = time.monotonic() - process["created"] >= self.state.import_delay
+        body = {"id": process["id"], "name": process["name"], "status": "completed" if done else "in_process"}
+        if done:
+            body["info"] = {"imported": process["rows"]}
+        return 200, body
+
+    def _get_lists(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        lists = [
+            dict(l, uniqueSubscribers=len(self.state.list_members[l["id"]]))
+            for l in self.state.lists.values()
+        ]
+        return 200, {"lists": lists, "count": len(lists)}
+
+    def _create_list(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        new_list = self.state.create_list(data.get("name", ""), data.get("folderId", 1))
+        return 201, {"id": new_list["id"]}
+
+    def _get_folders(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        return 200, {"folders": list(self.state.folders.values()), "count": len(self.state.folders)}
+
+    def _create_folder(self, data: Dict, query: Dict) -> Tuple[int, Dict]:
+        folder_id = max(self.state.folders, default=0) + 1
+        self.state.folders[folder_id] = {"id": folder_id, "name": data.get("name", "")}
+        return 201, {"id": folder_id}
+
+
+ROUTES = [
+    ("POST", re.compile(r"/smtp/email"), "send_email"),
+    ("GET", re.compile(r"/contacts"), "get_contacts"),
+    ("POST", re.compile(r"/contacts"), "add_contact"),
+    ("POST", re.compile(r"/contacts/batch"), "batch_update"),
+    ("POST", re.compile(r"/contacts/import"), "import_contacts"),
+    ("GET", re.compile(r"/contacts/lists"), "get_lists"),
+    ("POST", re.compile(r"/contacts/lists"), "create_list"),
+    ("GET", re.compile(r"/contacts/lists/(\d+)/contacts"), "get_list_contacts"),
+    ("GET", re.compile(r"/contacts/folders"), "get_folders"),
+    ("POST", re.compile(r"/contacts/folders"), "create_folder"),
+    ("PUT", re.compile(r"/contacts/([^/]+)"), "update_contact"),
+    ("DELETE", re.compile(r"/contacts/([^/]+)"), "delete_contact"),
+    ("GET", re.compile(r"/processes/(\d+)"), "get_process"),
+]
+
+
+def _error(code: str, message: str) -> Dict:
+    return {"code": code, "message": message}
+
+
+def _message_id() -> str:
+    return f"<{uuid.uuid4().hex}@smtp-relay.mailin.fr>"
+
+
+def _page(query: Dict[str, str], max_limit: int) -> Tuple[Optional[int], int]:
+    """limit/offset を取り出す（limit が上限超過なら None）"""
+    limit = int(query.get("limit", 50))
+    offset = int(query.get("offset", 0))
+    return (limit if limit <= max_limit else None), offset
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Brevo API ローカル代替サーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--contacts", type=int, default=1000, help="初期連絡先数（リストID 4）")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="応答遅延（ミリ秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="応答遅延の揺らぎ（ミリ秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx を返す確率（0〜1）")
+    parser.add_argument("--rate-limit", type=int, help="窓あたりのリクエスト上限")
+    parser.add_argument("--rate-window", type=float, default=1.0, help="レート制限の窓（秒）")
+    parser.add_argument("--import-delay", type=float, default=0.5, help="インポート完了までの秒数")
+
+    args = parser.parse_args()
+
+    server = FakeBrevoServer(
+        host=args.host,
+        port=args.port,
+        contact_count=args.contacts,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        import_delay=args.import_delay
+    )
+
+    print(f"🧪 Brevo 代替サーバー起動: {server.base_url}")
+    print(f"   連絡先: {args.contacts}件 / 遅延: {args.latency_ms}ms / エラー率: {args.error_rate}")
+    print(f"   BREVO_BASE_URL={server.base_url} を設定するとツールの接続先になります")
+    print("   （EDITH_API_METRICS=0 も設定して本番の API 集計に入れないこと）")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 停止しました")
+        print(f"   リクエスト数: {json.dumps(server.request_counts, ensure_ascii=False)}")
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -54,24 +54,19 @@ def main():
 
     # CSVからインポート
     print(f"\n📥 CSVをインポート中: {args.csv_path}")
-    result = manager.import_from_csv(Path(args.csv_path), list_ids=[list_id])
+    result = manager.bulk_import_csv(Path(args.csv_path), list_ids=[list_id])
 
     print(f"\n✅ インポート完了!")
-    print(f"   成功: {result['success_count']}件")
-    print(f"   エラー: {result['error_count']}件")
+    print(f"   送信: {result['row_count']}件（{result['chunk_count']}リクエスト）")
+    print(f"   完了: {result['completed_rows']}件")
+    print(f"   スキップ: {result['skipped_count']}件（メールアドレス不正）")
 
-    if result['errors']:
-        print("\n⚠️ エラー詳細:")
-        for error in result['errors'][:10]:
-            print(f"  - {error['email']}: {error['error']}")
-
-        if len(result['errors']) > 10:
-            print(f"  ... 他 {len(result['errors']) - 10}件")
+    if result['pending_rows']:
+        print(f"\n⏳ 完了待ちタイムアウト: {result['pending_rows']}件（Brevo側で処理継続中）")
 
     # 最終確認
     print(f"\n📊 最終確認中...")
-    contacts = manager.get_all_contacts(list_id=list_id)
-    print(f"✅ リストID {list_id} には現在 {len(contacts)} 件の連絡先があります")
+    print(f"✅ リストID {list_id} には現在 {manager.count_contacts(list_id=list_id)} 件の連絡先があります")
 
 
 if __name__ == '__main__':
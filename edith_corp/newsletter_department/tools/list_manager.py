@@ -7,7 +7,11 @@ CSVインポート・エクスポート機能も提供。
 """
 
 import csv
-from typing import List, Dict, Optional
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from typing import Callable, Iterator, List, Dict, Optional
 from pathlib import Path
 
 from brevo_api import BrevoAPI
@@ -28,6 +32,47 @@ class ListManager:
         self.api = BrevoAPI(api_key)
         self.LISTS_DIR.mkdir(parents=True, exist_ok=True)
 
+    FETCH_CONCURRENCY = 4  # ページ並列取得数
+    IMPORT_POLL_INTERVAL = 5  # 一括インポートの状態確認間隔（秒）
+    IMPORT_TIMEOUT = 600  # 一括インポートの完了待ち上限（秒）
+
+    def iter_contacts(self, list_id: Optional[int] = None, concurrency: Optional[int] = None) -> Iterator[Dict]:
+        """
+        連絡先を順次返すジェネレータ
+
+        最大ページサイズで1ページ目を取得し、レスポンスの count から残りの
+        オフセットを決めて並列に取得する。取得できたページから順に返すため
+        順序は保証しない。list_id 指定時はリスト専用エンドポイントで
+        サーバー側で絞り込む。
+
+        Args:
+            list_id: リストID（指定時はそのリストのみ）
+            concurrency: 並列取得数（省略時は FETCH_CONCURRENCY）
+
+        Yields:
+            連絡先
+        """
+        if list_id:
+            limit = self.api.MAX_LIST_CONTACTS_PAGE
+            fetch = lambda offset: self.api.get_list_contacts(list_id, limit=limit, offset=offset)
+        else:
+            limit = self.api.MAX_CONTACTS_PAGE
+            fetch = lambda offset: self.api.get_contacts(limit=limit, offset=offset)
+
+        first = fetch(0)
+        contacts = first.get("contacts", [])
+        yield from contacts
+
+        total = first.get("count", len(contacts))
+        offsets = range(limit, total, limit)
+        if not contacts or not offsets:
+            return
+
+        with ThreadPoolExecutor(max_workers=concurrency or self.FETCH_CONCURRENCY) as executor:
+            futures = [executor.submit(fetch, offset) for offset in offsets]
+            for future in as_completed(futures):
+                yield from future.result().get("contacts", [])
+
     def get_all_contacts(self, list_id: Optional[int] = None) -> List[Dict]:
         """
         全連絡先を取得
@@ -38,25 +83,23 @@ class ListManager:
         Returns:
             連絡先リスト
         """
-        all_contacts = []
-        offset = 0
-        limit = 50
-
-        while True:
-            response = self.api.get_contacts(list_id=list_id, limit=limit, offset=offset)
-            contacts = response.get("contacts", [])
+        return list(self.iter_contacts(list_id))
 
-            if not contacts:
-                break
-
-            all_contacts.extend(contacts)
-            offset += limit
+    def count_contacts(self, list_id: Optional[int] = None) -> int:
+        """
+        連絡先数を取得（1件だけ取得してレスポンスの count を使う）
 
-            # 全件取得済みならループを抜ける
-            if len(contacts) < limit:
-                break
+        Args:
+            list_id: リストID
 
-        return all_contacts
+        Returns:
+            連絡先数
+        """
+        if list_id:
+            response = self.api.get_list_contacts(list_id, limit=1)
+        else:
+            response = self.api.get_contacts(limit=1)
+        return response.get("count", 0)
 
     def add_contacts_batch(
         self,
@@ -106,25 +149,26 @@ class ListManager:
         Returns:
             出力ファイルパス
         """
-        contacts = self.get_all_contacts(list_id)
+        contacts = self.iter_contacts(list_id)
 
         if not output_path:
             list_name = f"list_{list_id}" if list_id else "all_contacts"
             output_path = self.LISTS_DIR / f"{list_name}.csv"
 
         with open(output_path, "w", newline="", encoding="utf-8") as f:
-            if not contacts:
+            first = next(contacts, None)
+            if first is None:
                 return output_path
 
             # カラム名を取得（最初の連絡先から）
             fieldnames = ["email"]
-            if contacts[0].get("attributes"):
-                fieldnames.extend(contacts[0]["attributes"].keys())
+            if first.get("attributes"):
+                fieldnames.extend(first["attributes"].keys())
 
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
             writer.writeheader()
 
-            for contact in contacts:
+            for contact in chain([first], contacts):
                 row = {"email": contact["email"]}
                 if contact.get("attributes"):
                     row.update(contact["attributes"])
@@ -159,6 +203,142 @@ class ListManager:
 
         return self.add_contacts_batch(contacts, list_ids)
 
+    def bulk_import_csv(
+        self,
+        csv_path: Path,
+        list_ids: List[int],
+        row_mapper: Optional[Callable[[Dict], Optional[Dict]]] = None,
+        max_chunk_bytes: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        CSVから連絡先を一括インポート（/contacts/import の fileBody）
+
+        CSVを1行ずつ読み、max_chunk_bytes を超えない大きさのCSV本文に分けて
+        送信する。インポートは非同期処理のため、送信後に各プロセスの状態を
+        完了までポーリングして結果をまとめる。
+
+        Args:
+            csv_path: CSVファイルパス
+            list_ids: インポート先リストID
+            row_mapper: 行 → {"EMAIL": ..., 属性名: 値} の変換関数（None を返すとスキップ）
+            max_chunk_bytes: 1リクエストのCSV本文の上限バイト数
+            poll_interval: 状態確認の間隔（秒）
+            timeout: 完了待ちの上限（秒）
+
+        Returns:
+            インポート結果
+        """
+        row_mapper = row_mapper or self._default_import_row
+        max_chunk_bytes = max_chunk_bytes or self.api.MAX_IMPORT_BODY_BYTES
+
+        processes = []
+        total_rows = 0
+        skipped_count = 0
+
+        with open(csv_path, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            chunks = self._iter_import_chunks(reader, row_mapper, max_chunk_bytes)
+
+            for file_body, row_count, skipped in chunks:
+                skipped_count += skipped
+                if not row_count:
+                    continue
+                response = self.api.import_contacts_body(file_body, list_ids)
+                processes.append({"process_id": response.get("processId"), "rows": row_count})
+                total_rows += row_count
+
+        # 完了待ち
+        pending = {p["process_id"]: p for p in processes if p["process_id"] is not None}
+        deadline = time.monotonic() + (timeout or self.IMPORT_TIMEOUT)
+        while pending and time.monotonic() < deadline:
+            for process_id in list(pending):
+                info = self.api.get_process(process_id)
+                if info.get("status") == "completed":
+                    pending.pop(process_id).update({"status": "completed", "info": info.get("info")})
+            if pending:
+                time.sleep(poll_interval or self.IMPORT_POLL_INTERVAL)
+
+        for process in pending.values():
+            process["status"] = "timeout"
+
+        completed = [p for p in processes if p.get("status") == "completed"]
+        return {
+            "chunk_count": len(processes),
+            "row_count": total_rows,
+            "skipped_count": skipped_count,
+            "completed_rows": sum(p["rows"] for p in completed),
+            "pending_rows": total_rows - sum(p["rows"] for p in completed),
+            "processes": processes
+        }
+
+    def _iter_import_chunks(
+        self,
+        reader: Iterator[Dict],
+        row_mapper: Callable[[Dict], Optional[Dict]],
+        max_chunk_bytes: int
+    ) -> Iterator[tuple]:
+        """
+        CSV行を fileBody 用の本文に分割する
+
+        Yields:
+            (CSV本文, 行数, スキップ数)
+        """
+        fieldnames = None
+        buffer = io.StringIO()
+        writer = None
+        header_bytes = 0
+        body_bytes = 0
+        row_count = 0
+        skipped = 0
+
+        for row in reader:
+            mapped = row_mapper(row)
+            if not mapped:
+                skipped += 1
+                continue
+
+            if fieldnames is None:
+                fieldnames = list(mapped.keys())
+
+            line = io.StringIO()
+            self._import_writer(line, fieldnames).writerow(mapped)
+            line_bytes = len(line.getvalue().encode("utf-8"))
+
+            if row_count and header_bytes + body_bytes + line_bytes > max_chunk_bytes:
+                yield buffer.getvalue(), row_count, skipped
+                buffer, writer = io.StringIO(), None
+                body_bytes = row_count = skipped = 0
+
+            if writer is None:
+                writer = self._import_writer(buffer, fieldnames)
+                writer.writeheader()
+                header_bytes = len(buffer.getvalue().encode("utf-8"))
+
+            buffer.write(line.getvalue())
+            body_bytes += line_bytes
+            row_count += 1
+
+        if row_count or skipped:
+            yield buffer.getvalue(), row_count, skipped
+
+    @staticmethod
+    def _import_writer(f: io.StringIO, fieldnames: List[str]) -> csv.DictWriter:
+        """fileBody 形式（; 区切り）の CSV writer"""
+        return csv.DictWriter(f, fieldnames=fieldnames, delimiter=";", lineterminator="\n", extrasaction="ignore")
+
+    @staticmethod
+    def _default_import_row(row: Dict) -> Optional[Dict]:
+        """import_from_csv と同じカラム解釈で EMAIL / LASTNAME / FIRSTNAME を取り出す"""
+        email = (row.get("email") or row.get("EMAIL") or "").strip()
+        if "@" not in email:
+            return None
+
+        name = row.get("name") or row.get("NAME") or row.get("FIRSTNAME") or ""
+        lastname = row.get("lastname") or row.get("LASTNAME") or ""
+        return {"EMAIL": email, "LASTNAME": lastname.strip(), "FIRSTNAME": name.strip()}
+
     def remove_bounced_contacts(self, list_id: Optional[int] = None) -> Dict:
         """
         バウンスした連絡先を削除
@@ -194,7 +374,7 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="リスト管理 CLI")
-    parser.add_argument("action", choices=["export", "import", "count"], help="実行するアクション")
+    parser.add_argument("action", choices=["export", "import", "bulk_import", "count"], help="実行するアクション")
     parser.add_argument("--list-id", type=int, help="リストID")
     parser.add_argument("--csv", help="CSVファイルパス")
 
@@ -222,10 +402,22 @@ def main():
             for error in result['errors']:
                 print(f"  - {error['email']}: {error['error']}")
 
+    elif args.action == "bulk_import":
+        # CSV一括インポート（/contacts/import）
+        if not args.csv or not args.list_id:
+            print("❌ --csv と --list-id を指定してください")
+            return
+
+        result = manager.bulk_import_csv(Path(args.csv), list_ids=[args.list_id])
+        print(f"✅ 一括インポート完了: {result['completed_rows']}/{result['row_count']}件 "
+              f"({result['chunk_count']}リクエスト, スキップ {result['skipped_count']}件)")
+
+        if result['pending_rows']:
+            print(f"⏳ 完了待ちタイムアウト: {result['pending_rows']}件（Brevo側で処理継続中）")
+
     elif args.action == "count":
         # 連絡先数を確認
-        contacts = manager.get_all_contacts(list_id=args.list_id)
-        print(f"📊 連絡先数: {len(contacts)}")
+        print(f"📊 連絡先数: {manager.count_contacts(list_id=args.list_id)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+送信ログストア
+
+送信履歴を SQLite に保存する。
+- 送信済みアドレス: (campaign_name, email) の主キーで索引
+- 1日の送信数カウンタ（UTC日付単位）
+- キャンペーン実行記録・失敗記録
+- 分散送信の宛先ごとの進捗チェックポイント・時間帯ごとの実行記録（1回だけ）
+- 旧形式（logs/send_log_YYYY-MM-DD.json）からのインポート
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent_emails (
+    campaign_name TEXT NOT NULL,
+    email         TEXT NOT NULL,
+    sent_date     TEXT NOT NULL,
+    sent_at       TEXT NOT NULL,
+    PRIMARY KEY (campaign_name, email)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_quota (
+    date       TEXT PRIMARY KEY,
+    sent_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS campaign_runs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    date          TEXT NOT NULL,
+    name          TEXT NOT NULL,
+    subject       TEXT,
+    sent_at       TEXT NOT NULL,
+    sent_count    INTEGER NOT NULL,
+    failed_count  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_campaign_runs_date ON campaign_runs (date);
+
+CREATE TABLE IF NOT EXISTS failed_emails (
+    run_id INTEGER NOT NULL REFERENCES campaign_runs (id),
+    email  TEXT NOT NULL,
+    error  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_failed_emails_run ON failed_emails (run_id);
+
+CREATE TABLE IF NOT EXISTS slot_progress (
+    schedule_id TEXT NOT NULL,
+    slot_index  INTEGER NOT NULL,
+    email       TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    message_id  TEXT,
+    error       TEXT,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (schedule_id, slot_index, email)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS slot_runs (
+    schedule_id TEXT NOT NULL,
+    slot_index  INTEGER NOT NULL,
+    run_id      INTEGER NOT NULL REFERENCES campaign_runs (id),
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (schedule_id, slot_index)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS imported_logs (
+    filename    TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+class SendLogStore:
+    """SQLite 送信ログストア"""
+
+    def __init__(self, db_path: Path):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteファイルパス
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_new = not self.db_path.exists()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """トランザクション付き接続（正常終了でcommit、例外でrollback）"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ==================== 送信枠 ====================
+
+    def get_sent_count(self, date: str) -> int:
+        """
+        指定日の送信数を取得
+
+        Args:
+            date: 日付（YYYY-MM-DD、UTC）
+
+        Returns:
+            送信数
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT sent_count FROM daily_quota WHERE date = ?", (date,)
+            ).fetchone()
+        return row["sent_count"] if row else 0
+
+    # ==================== 送信記録 ====================
+
+    def record_run(
+        self,
+        date: str,
+        campaign_name: str,
+        subject: str,
+        sent_emails: List[str],
+        failed_emails: List[Dict],
+        sent_at: Optional[str] = None
+    ) -> int:
+        """
+        送信結果を1トランザクションで記録
+
+        Args:
+            date: 日付（YYYY-MM-DD、UTC）
+            campaign_name: キャンペーン名
+            subject: 件名
+            sent_emails: 送信成功メールアドレス
+            failed_emails: 失敗リスト [{"email": "...", "error": "..."}]
+            sent_at: 送信日時（省略時は現在時刻）
+
+        Returns:
+            キャンペーン実行ID
+        """
+        sent_at = sent_at or datetime.now(timezone.utc).isoformat()
+
+        with self._connect() as conn:
+            return self._insert_run(conn, date, campaign_name, subject, sent_emails, failed_emails, sent_at)
+
+    def _insert_run(
+        self,
+        conn: sqlite3.Connection,
+        date: str,
+        campaign_name: str,
+        subject: str,
+        sent_emails: List[str],
+        failed_emails: List[Dict],
+        sent_at: str
+    ) -> int:
+        """record_run / import_json_logs 共通の書き込み処理（実行IDを返す）"""
+        cursor = conn.execute(
+            "INSERT INTO campaign_runs (date, name, subject, sent_at, sent_count, failed_count) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (date, campaign_name, subject, sent_at, len(sent_emails), len(failed_emails))
+        )
+        run_id = cursor.lastrowid
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO sent_emails (campaign_name, email, sent_date, sent_at) "
+            "VALUES (?, ?, ?, ?)",
+            ((campaign_name, email, date, sent_at) for email in sent_emails)
+        )
+        conn.executemany(
+            "INSERT INTO failed_emails (run_id, email, error) VALUES (?, ?, ?)",
+            ((run_id, f["email"], f.get("error")) for f in failed_emails)
+        )
+        conn.execute(
+            "INSERT INTO daily_quota (date, sent_count) VALUES (?, ?) "
+            "ON CONFLICT (date) DO UPDATE SET sent_count = sent_count + excluded.sent_count",
+            (date, len(sent_emails))
+        )
+        return run_id
+
+    # ==================== 未送信抽出 ====================
+
+    def filter_unsent(self, emails: List[str], campaign_name: str) -> List[str]:
+        """
+        指定キャンペーンで未送信のメールアドレスを抽出（入力順を保持）
+
+        一時テーブルに候補を入れ、(campaign_name, email) 主キーとの
+        アンチジョイン1回で判定する。
+
+        Args:
+            emails: 候補メールアドレス
+            campaign_name: キャンペーン名
+
+        Returns:
+            未送信メールアドレス
+        """
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE candidates (pos INTEGER PRIMARY KEY, email TEXT NOT NULL)")
+            conn.executemany(
+                "INSERT INTO candidates (pos, email) VALUES (?, ?)",
+                enumerate(emails)
+            )
+            rows = conn.execute(
+                "SELECT c.email FROM candidates c "
+                "WHERE NOT EXISTS ("
+                "  SELECT 1 FROM sent_emails s WHERE s.campaign_name = ? AND s.email = c.email"
+                ") ORDER BY c.pos",
+                (campaign_name,)
+            ).fetchall()
+            conn.execute("DROP TABLE candidates")
+        return [row["email"] for row in rows]
+
+    def get_campaign_runs(self, date: str) -> List[Dict]:
+        """
+        指定日のキャンペーン実行記録を取得
+
+        Args:
+            date: 日付（YYYY-MM-DD、UTC）
+
+        Returns:
+            実行記録リスト
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, name, subject, sent_at, sent_count, failed_count "
+                "FROM campaign_runs WHERE date = ? ORDER BY id",
+                (date,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # ==================== 分散送信チェックポイント ====================
+
+    def get_slot_progress(self, schedule_id: str, slot_index: int) -> Dict[str, Dict]:
+        """
+        時間帯の宛先ごとの進捗を取得
+
+        Args:
+            schedule_id: スケジュールID
+            slot_index: 時間帯インデックス
+
+        Returns:
+            {email: {"status": "inflight|sent|failed", "message_id": ..., "error": ...}}
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT email, status, message_id, error FROM slot_progress "
+                "WHERE schedule_id = ? AND slot_index = ?",
+                (schedule_id, slot_index)
+            ).fetchall()
+        return {row["email"]: dict(row) for row in rows}
+
+    def mark_slot_email(
+        self,
+        schedule_id: str,
+        slot_index: int,
+        email: str,
+        status: str,
+        message_id: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        宛先の進捗を記録（送信前に inflight、送信後に sent/failed）
+
+        Args:
+            schedule_id: スケジュールID
+            slot_index: 時間帯インデックス
+            email: メールアドレス
+            status: inflight / sent / failed
+            message_id: BrevoのメッセージID
+            error: エラー内容
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO slot_progress "
+                "(schedule_id, slot_index, email, status, message_id, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (schedule_id, slot_index, email) DO UPDATE SET "
+                "status = excluded.status, message_id = excluded.message_id, "
+                "error = excluded.error, updated_at = excluded.updated_at",
+                (schedule_id, slot_index, email, status, message_id, error,
+                 datetime.now(timezone.utc).isoformat())
+            )
+
+    def record_slot_run(
+        self,
+        schedule_id: str,
+        slot_index: int,
+        date: str,
+        campaign_name: str,
+        subject: str,
+        sent_emails: List[str],
+        failed_emails: List[Dict]
+    ) -> int:
+        """
+        時間帯の送信結果を記録（時間帯ごとに1回だけ）
+
+        実行記録と slot_runs を同じトランザクションで書き込む。記録後・スケジュール
+        更新前に停止して再実行しても、送信数の加算と実行記録は重複しない。
+
+        Args:
+            schedule_id: スケジュールID
+            slot_index: 時間帯インデックス
+            date: 日付（YYYY-MM-DD、UTC）
+            campaign_name: キャンペーン名
+            subject: 件名
+            sent_emails: 送信成功メールアドレス
+            failed_emails: 失敗リスト [{"email": "...", "error": "..."}]
+
+        Returns:
+            キャンペーン実行ID（記録済みなら既存のID）
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT run_id FROM slot_runs WHERE schedule_id = ? AND slot_index = ?",
+                (schedule_id, slot_index)
+            ).fetchone()
+            if row:
+                return row["run_id"]
+
+            sent_at = datetime.now(timezone.utc).isoformat()
+            run_id = self._insert_run(conn, date, campaign_name, subject, sent_emails, failed_emails, sent_at)
+            conn.execute(
+                "INSERT INTO slot_runs (schedule_id, slot_index, run_id, recorded_at) VALUES (?, ?, ?, ?)",
+                (schedule_id, slot_index, run_id, sent_at)
+            )
+            return run_id
+
+    # ==================== 旧ログ移行 ====================
+
+    def import_json_logs(self, log_dir: Path) -> Dict:
+        """
+        旧形式の send_log_*.json を取り込む（取り込み済みファイルはスキップ）
+
+        旧形式では sent_emails が日単位でまとめられているが、campaigns の
+        順序と sent_count に従って extend されているため、先頭から順に
+        切り出すことでキャンペーンごとの送信先を復元できる。
+
+        Args:
+            log_dir: 旧ログディレクトリ
+
+        Returns:
+            {"imported_files": n, "skipped_files": n, "sent_emails": n}
+        """
+        imported_files = 0
+        skipped_files = 0
+        sent_total = 0
+
+        with self._connect() as conn:
+            done = {row["filename"] for row in conn.execute("SELECT filename FROM imported_logs")}
+
+            for log_file in sorted(Path(log_dir).glob("send_log_*.json")):
+                if log_file.name in done:
+                    skipped_files += 1
+                    continue
+
+                with open(log_file, "r", encoding="utf-8") as f:
+                    log = json.load(f)
+
+                date = log.get("date") or log_file.stem.replace("send_log_", "")
+                day_emails = log.get("sent_emails", [])
+                offset = 0
+
+                for campaign in log.get("campaigns", []):
+                    count = campaign.get("sent_count", 0)
+                    emails = day_emails[offset:offset + count]
+                    offset += count
+                    self._insert_run(
+                        conn,
+                        date,
+                        campaign["name"],
+                        campaign.get("subject", ""),
+                        emails,
+                        campaign.get("failed_emails", []),
+                        campaign.get("sent_at") or f"{date}T00:00:00+00:00"
+                    )
+                    sent_total += len(emails)
+
+                # campaigns と対応しない sent_count の差分も送信枠に反映
+                recorded = min(offset, len(day_emails))
+                extra = log.get("sent_count", 0) - recorded
+                if extra > 0:
+                    conn.execute(
+                        "INSERT INTO daily_quota (date, sent_count) VALUES (?, ?) "
+                        "ON CONFLICT (date) DO UPDATE SET sent_count = sent_count + excluded.sent_count",
+                        (date, extra)
+                    )
+
+                conn.execute(
+                    "INSERT INTO imported_logs (filename, imported_at) VALUES (?, ?)",
+                    (log_file.name, datetime.now(timezone.utc).isoformat())
+                )
+                imported_files += 1
+
+        return {
+            "imported_files": imported_files,
+            "skipped_files": skipped_files,
+            "sent_emails": sent_total
+        }
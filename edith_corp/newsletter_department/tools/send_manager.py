@@ -4,24 +4,27 @@
 
 1日300通制限を考慮した分割送信を管理する。
 - 送信済み/未送信の管理
-- 送信ログ記録
+- 送信ログ記録（SQLite: logs/send_log.db）
 - リトライ処理
 """
 
 import os
 import json
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 from brevo_api import BrevoAPI
+from send_log_store import SendLogStore
 
 
 class SendManager:
     """分割送信マネージャー"""
 
     DAILY_LIMIT = 300  # 1日の送信上限
+    BATCH_SIZE = BrevoAPI.MAX_MESSAGE_VERSIONS  # 一括送信1リクエストあたりの宛先数
     LOG_DIR = Path(__file__).parent.parent / "logs"
+    DB_NAME = "send_log.db"
 
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -32,58 +35,16 @@ class SendManager:
         """
         self.api = BrevoAPI(api_key)
         self.LOG_DIR.mkdir(parents=True, exist_ok=True)
+        self.store = SendLogStore(self.LOG_DIR / self.DB_NAME)
+
+        # 初回のみ旧形式の send_log_*.json を取り込む
+        if self.store.is_new:
+            self.store.import_json_logs(self.LOG_DIR)
 
     def _get_today_utc(self) -> str:
         """今日の日付（UTC）を取得"""
         return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-    def _get_log_path(self, date: Optional[str] = None) -> Path:
-        """
-        送信ログのパスを取得
-
-        Args:
-            date: 日付（YYYY-MM-DD、省略時は今日）
-
-        Returns:
-            ログファイルパス
-        """
-        date = date or self._get_today_utc()
-        return self.LOG_DIR / f"send_log_{date}.json"
-
-    def _load_log(self, date: Optional[str] = None) -> Dict:
-        """
-        送信ログ読み込み
-
-        Args:
-            date: 日付
-
-        Returns:
-            ログデータ
-        """
-        log_path = self._get_log_path(date)
-        if log_path.exists():
-            with open(log_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        else:
-            return {
-                "date": date or self._get_today_utc(),
-                "sent_count": 0,
-                "sent_emails": [],
-                "campaigns": []
-            }
-
-    def _save_log(self, log_data: Dict, date: Optional[str] = None) -> None:
-        """
-        送信ログ保存
-
-        Args:
-            log_data: ログデータ
-            date: 日付
-        """
-        log_path = self._get_log_path(date)
-        with open(log_path, "w", encoding="utf-8") as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
-
     def get_remaining_quota(self, date: Optional[str] = None) -> int:
         """
         本日の残り送信可能数を取得
@@ -94,8 +55,8 @@ class SendManager:
         Returns:
             残り送信可能数
         """
-        log = self._load_log(date)
-        return max(0, self.DAILY_LIMIT - log["sent_count"])
+        sent_count = self.store.get_sent_count(date or self._get_today_utc())
+        return max(0, self.DAILY_LIMIT - sent_count)
 
     def send_campaign_batch(
         self,
@@ -104,7 +65,8 @@ class SendManager:
         html_content: str,
         recipients: List[Dict[str, str]],
         sender: Dict[str, str],
-        max_send: Optional[int] = None
+        max_send: Optional[int] = None,
+        batch: bool = False
     ) -> Dict:
         """
         分割送信実行
@@ -113,9 +75,10 @@ class SendManager:
             campaign_name: キャンペーン名
             subject: 件名
             html_content: HTML本文
-            recipients: 宛先リスト [{"email": "...", "name": "..."}]
+            recipients: 宛先リスト [{"email": "...", "name": "...", "params": {...}}]
             sender: 送信者情報 {"email": "...", "name": "..."}
             max_send: 最大送信数（省略時は残り枠すべて使う）
+            batch: True の場合は messageVersions でまとめて送信（BATCH_SIZE 件/リクエスト）
 
         Returns:
             送信結果
@@ -138,49 +101,115 @@ class SendManager:
             send_count = min(send_count, max_send)
 
         # 送信対象を抽出
-        batch = recipients[:send_count]
+        targets = recipients[:send_count]
         remaining_recipients = recipients[send_count:]
 
         # 送信実行
+        if batch:
+            sent_emails, failed_emails = self._send_versions(targets, subject, html_content, sender)
+        else:
+            sent_emails, failed_emails = self._send_each(targets, subject, html_content, sender)
+
+        # ログ記録
+        self.store.record_run(
+            date=self._get_today_utc(),
+            campaign_name=campaign_name,
+            subject=subject,
+            sent_emails=sent_emails,
+            failed_emails=failed_emails
+        )
+
+        return {
+            "status": "success",
+            "sent_count": len(sent_emails),
+            "failed_count": len(failed_emails),
+            "remaining_count": len(remaining_recipients),
+            "quota_remaining": self.get_remaining_quota(),
+            "next_reset_time": self._get_next_reset_time() if len(remaining_recipients) > 0 else None,
+            "failed_emails": failed_emails
+        }
+
+    def _send_each(
+        self,
+        targets: List[Dict[str, str]],
+        subject: str,
+        html_content: str,
+        sender: Dict[str, str]
+    ) -> Tuple[List[str], List[Dict]]:
+        """
+        1通ずつ送信
+
+        Returns:
+            (送信成功メールアドレス, 失敗リスト)
+        """
         sent_emails = []
         failed_emails = []
 
-        for recipient in batch:
+        for recipient in targets:
             try:
                 self.api.send_email(
-                    to=[recipient],
+                    to=[self._to_address(recipient)],
                     subject=subject,
                     html_content=html_content,
-                    sender=sender
+                    sender=sender,
+                    params=recipient.get("params")
                 )
                 sent_emails.append(recipient["email"])
             except Exception as e:
                 print(f"⚠️ 送信失敗: {recipient['email']} - {e}")
                 failed_emails.append({"email": recipient["email"], "error": str(e)})
 
-        # ログ記録
-        log = self._load_log()
-        log["sent_count"] += len(sent_emails)
-        log["sent_emails"].extend(sent_emails)
-        log["campaigns"].append({
-            "name": campaign_name,
-            "subject": subject,
-            "sent_at": datetime.now(timezone.utc).isoformat(),
-            "sent_count": len(sent_emails),
-            "failed_count": len(failed_emails),
-            "failed_emails": failed_emails
-        })
-        self._save_log(log)
+        return sent_emails, failed_emails
 
-        return {
-            "status": "success",
-            "sent_count": len(sent_emails),
-            "failed_count": len(failed_emails),
-            "remaining_count": len(remaining_recipients),
-            "quota_remaining": self.get_remaining_quota(),
-            "next_reset_time": self._get_next_reset_time() if len(remaining_recipients) > 0 else None,
-            "failed_emails": failed_emails
-        }
+    def _send_versions(
+        self,
+        targets: List[Dict[str, str]],
+        subject: str,
+        html_content: str,
+        sender: Dict[str, str]
+    ) -> Tuple[List[str], List[Dict]]:
+        """
+        messageVersions でまとめて送信
+
+        BATCH_SIZE 件ずつ1リクエストにまとめる。リクエストが失敗した場合は
+        そのチャンクの全宛先を失敗として記録する（ログの意味は1通ずつ送信と同じ）。
+
+        Returns:
+            (送信成功メールアドレス, 失敗リスト)
+        """
+        sent_emails = []
+        failed_emails = []
+
+        for start in range(0, len(targets), self.BATCH_SIZE):
+            chunk = targets[start:start + self.BATCH_SIZE]
+            message_versions = []
+            for recipient in chunk:
+                version = {"to": [self._to_address(recipient)]}
+                if recipient.get("params"):
+                    version["params"] = recipient["params"]
+                message_versions.append(version)
+
+            try:
+                self.api.send_email_versions(
+                    message_versions=message_versions,
+                    subject=subject,
+                    html_content=html_content,
+                    sender=sender
+                )
+                sent_emails.extend(r["email"] for r in chunk)
+            except Exception as e:
+                print(f"⚠️ 一括送信失敗: {len(chunk)}件 - {e}")
+                failed_emails.extend({"email": r["email"], "error": str(e)} for r in chunk)
+
+        return sent_emails, failed_emails
+
+    @staticmethod
+    def _to_address(recipient: Dict) -> Dict[str, str]:
+        """宛先辞書から Brevo の to 形式（email/name のみ）を作成"""
+        address = {"email": recipient["email"]}
+        if recipient.get("name"):
+            address["name"] = recipient["name"]
+        return address
 
     def _get_next_reset_time(self) -> str:
         """
@@ -209,18 +238,9 @@ class SendManager:
         Returns:
             未送信の連絡先リスト
         """
-        # 過去のログから送信済みメールアドレスを収集
-        sent_emails = set()
-
-        for log_file in self.LOG_DIR.glob("send_log_*.json"):
-            with open(log_file, "r", encoding="utf-8") as f:
-                log = json.load(f)
-                for campaign in log.get("campaigns", []):
-                    if campaign["name"] == campaign_name:
-                        sent_emails.update(log["sent_emails"])
-
-        # 未送信の連絡先を抽出
-        unsent = [c for c in all_contacts if c["email"] not in sent_emails]
+        # (campaign_name, email) 索引とのアンチジョインで未送信を判定
+        unsent_emails = set(self.store.filter_unsent([c["email"] for c in all_contacts], campaign_name))
+        unsent = [c for c in all_contacts if c["email"] in unsent_emails]
 
         return unsent
 
@@ -230,8 +250,9 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="分割送信マネージャー CLI")
-    parser.add_argument("action", choices=["quota", "send_test"], help="実行するアクション")
+    parser.add_argument("action", choices=["quota", "send_test", "import_logs"], help="実行するアクション")
     parser.add_argument("--email", help="テスト送信先メールアドレス")
+    parser.add_argument("--batch", action="store_true", help="messageVersions で一括送信する")
 
     args = parser.parse_args()
 
@@ -243,10 +264,16 @@ def main():
         print(f"📊 本日の残り送信枠: {remaining}/{manager.DAILY_LIMIT}")
 
         if remaining < manager.DAILY_LIMIT:
-            log = manager._load_log()
-            print(f"✅ 送信済み: {log['sent_count']}通")
+            sent_count = manager.store.get_sent_count(manager._get_today_utc())
+            print(f"✅ 送信済み: {sent_count}通")
             print(f"📅 次回リセット: {manager._get_next_reset_time()}")
 
+    elif args.action == "import_logs":
+        # 旧形式ログの取り込み（取り込み済みファイルはスキップ）
+        result = manager.store.import_json_logs(manager.LOG_DIR)
+        print(f"✅ 取り込み完了: {result['imported_files']}ファイル, {result['sent_emails']}件 "
+              f"(スキップ {result['skipped_files']}ファイル)")
+
     elif args.action == "send_test":
         # テスト送信
         if not args.email:
@@ -258,7 +285,8 @@ def main():
             subject="分割送信テスト",
             html_content="<h1>テスト</h1><p>分割送信のテストです。</p>",
             recipients=[{"email": args.email, "name": "Test User"}],
-            sender={"email": "noreply@room8.co.jp", "name": "Room8"}
+            sender={"email": "noreply@room8.co.jp", "name": "Room8"},
+            batch=args.batch
         )
 
         print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -1,28 +1,319 @@
 #!/usr/bin/env python3
 """
 メルマガ配信スクリプト
-使い方: python3 send_newsletter.py "件名" "本文HTMLファイルパス"
+使い方: python3 send_newsletter.py "件名" "本文HTMLファイルパス" [--concurrency N]
+
+3段のストリーム処理で配信する。
+1. 取得: LIST_ID の全連絡先をページ単位で取得
+2. 描画: 送信済みを除外し、件名・本文の {{LASTNAME}} {{FIRSTNAME}} を宛先ごとに差し込み
+   （本文にはHTMLエスケープした値を入れる。それ以外の {{KEY}} はそのまま残す）
+3. 送信: 同時送信数を制限して送信（DAILY_LIMIT の残り枠まで）
+
+段の間は上限付きキューでつなぎ、後段が詰まると前段が待つ（バックプレッシャー）。
+取得・描画・送信ログの記録で例外が起きたら全段を止め、結果は status "failed"。
+記録できなかった送信済み分は最後にもう一度記録し、それでも駄目なら unrecorded_emails で返す。
 """
 
+import html
 import os
 import sys
-import json
+import queue
+import threading
+import time
 from pathlib import Path
-from brevo_api import BrevoAPI
+from typing import Dict, List, Optional
+from list_manager import ListManager
 from send_manager import SendManager
+from template_engine import CompiledTemplate
 
 BREVO_KEY = os.environ.get("BREVO_API_KEY")
 LIST_ID = 4  # Room8 Newsletter
 
+_DONE = object()  # 段の終了を伝える番兵
+
+RECIPIENT_FIELDS = ("LASTNAME", "FIRSTNAME")  # 宛先ごとに差し込む値
+
+
+class NewsletterPipeline:
+    """取得 → 描画 → 送信 のストリーム配信"""
+
+    QUEUE_SIZE = 200  # 段の間のキュー上限
+    FILTER_BATCH = 500  # 送信済み判定をまとめて行う件数
+    RECORD_BATCH = 100  # 送信ログへの記録単位
+    PROGRESS_INTERVAL = 5  # 進捗表示の間隔（秒）
+
+    def __init__(
+        self,
+        send_manager: SendManager,
+        list_manager: ListManager,
+        campaign_name: str,
+        subject: str,
+        html_content: str,
+        sender: Dict[str, str],
+        concurrency: int = 4
+    ):
+        self.send_manager = send_manager
+        self.list_manager = list_manager
+        self.campaign_name = campaign_name
+        self.subject_template = CompiledTemplate(subject)
+        self.body_template = CompiledTemplate(html_content)
+        self.subject = subject
+        self.sender = sender
+        self.concurrency = concurrency
+
+        unknown = [name for name in self.body_template.placeholders if name not in RECIPIENT_FIELDS]
+        if unknown:
+            print(f"⚠️ 差し込み値のない箇所はそのまま送信されます: {', '.join(unknown)}")
+
+        self._contacts: queue.Queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._messages: queue.Queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        self.quota = 0
+        self.fetched = 0
+        self.already_sent = 0
+        self.rendered = 0
+        self.sent_count = 0
+        self.deferred_count = 0
+        self.failed: List[Dict] = []
+        self.error: Optional[str] = None
+        self._unrecorded_sent: List[str] = []
+        self._unrecorded_failed: List[Dict] = []
+
+    # ==================== 各段 ====================
+
+    def _fetch(self) -> None:
+        """取得段: 連絡先を順次キューへ（例外時も必ず番兵を送る）"""
+        try:
+            for contact in self.list_manager.iter_contacts(list_id=LIST_ID):
+                if not self._put(self._contacts, contact):
+                    return
+                self.fetched += 1
+        except Exception as e:
+            self._fail("取得", e)
+        finally:
+            # 停止中は描画段が _stop を見て抜けるので、入らなくてもよい
+            self._put(self._contacts, _DONE)
+
+    def _render(self) -> None:
+        """描画段: 送信済みを除外し、件名・本文を宛先ごとに描画"""
+        batch = []
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = self._contacts.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is not _DONE:
+                    batch.append(item)
+                if batch and (item is _DONE or len(batch) >= self.FILTER_BATCH):
+                    self._render_batch(batch)
+                    batch = []
+                if item is _DONE:
+                    break
+        except Exception as e:
+            self._fail("描画", e)
+        finally:
+            # 停止中は送信段が _stop を見て抜けるので、入らなくてもよい
+            for _ in range(self.concurrency):
+                self._put(self._messages, _DONE)
+
+    def _render_batch(self, contacts: List[Dict]) -> None:
+        unsent = set(self.send_manager.store.filter_unsent([c["email"] for c in contacts], self.campaign_name))
+        self.already_sent += len(contacts) - len(unsent)
+
+        for contact in contacts:
+            if contact["email"] not in unsent or self._stop.is_set():
+                continue
+            attributes = contact.get("attributes", {})
+            values = {name: str(attributes.get(name) or "") for name in RECIPIENT_FIELDS}
+            message = {
+                "to": {
+                    "email": contact["email"],
+                    "name": f"{values['LASTNAME']} {values['FIRSTNAME']}".strip()
+                },
+                "subject": self.subject_template.render(values),
+                "html_content": self.body_template.render(
+                    {name: html.escape(value) for name, value in values.items()}
+                )
+            }
+            if not self._put(self._messages, message):
+                return
+            self.rendered += 1
+
+    def _send(self) -> None:
+        """送信段: 残り枠の範囲で送信し、結果を送信ログに記録（停止したらキューの残りは送らない）"""
+        while not self._stop.is_set():
+            try:
+                message = self._messages.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if message is _DONE or self._stop.is_set():
+                return
+
+            with self._lock:
+                if self.sent_count + len(self.failed) >= self.quota:
+                    # 枠を使い切ったら残りは翌日分
+                    self.deferred_count += 1
+                    self._stop.set()
+                    continue
+                self.sent_count += 1  # 枠を予約（失敗時に戻す）
+
+            try:
+                self.send_manager.api.send_email(
+                    to=[self._to_address(message["to"])],
+                    subject=message["subject"],
+                    html_content=message["html_content"],
+                    sender=self.sender
+                )
+                with self._lock:
+                    self._unrecorded_sent.append(message["to"]["email"])
+            except Exception as e:
+                with self._lock:
+                    self.sent_count -= 1
+                    failure = {"email": message["to"]["email"], "error": str(e)}
+                    self.failed.append(failure)
+                    self._unrecorded_failed.append(failure)
+
+            try:
+                self._flush_records(force=False)
+            except Exception as e:
+                self._fail("記録", e)
+
+    # ==================== 補助 ====================
+
+    def _fail(self, stage: str, error: Exception) -> None:
+        """段の例外を記録して全段を止める（最初の1件だけ残す）"""
+        with self._lock:
+            if self.error is None:
+                self.error = f"{stage}段: {type(error).__name__}: {error}"
+        print(f"❌ {stage}段でエラー、配信を中断します: {error}")
+        self._stop.set()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """停止要求が出るまで put を試みる（停止したら False）"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _to_address(to: Dict[str, str]) -> Dict[str, str]:
+        return to if to.get("name") else {"email": to["email"]}
+
+    def _flush_records(self, force: bool) -> None:
+        """送信結果を RECORD_BATCH 件ごとに送信ログへ記録（失敗したら未記録に戻して例外を投げる）"""
+        with self._lock:
+            if not force and len(self._unrecorded_sent) + len(self._unrecorded_failed) < self.RECORD_BATCH:
+                return
+            sent, failed = self._unrecorded_sent, self._unrecorded_failed
+            self._unrecorded_sent, self._unrecorded_failed = [], []
+
+        if not (sent or failed):
+            return
+        try:
+            self.send_manager.store.record_run(
+                date=self.send_manager._get_today_utc(),
+                campaign_name=self.campaign_name,
+                subject=self.subject,
+                sent_emails=sent,
+                failed_emails=failed
+            )
+        except Exception:
+            # 記録できなかった分を戻す（再実行で同じ宛先に再送しないよう、後で記録し直す）
+            with self._lock:
+                self._unrecorded_sent[:0] = sent
+                self._unrecorded_failed[:0] = failed
+            raise
+
+    def _print_progress(self, started: float) -> None:
+        elapsed = max(time.monotonic() - started, 1e-6)
+        print(f"📈 取得 {self.fetched} / 描画 {self.rendered} / 送信 {self.sent_count}/{self.quota}"
+              f"（失敗 {len(self.failed)}） {self.sent_count / elapsed:.1f}通/秒")
+
+    # ==================== 実行 ====================
+
+    def run(self) -> Dict:
+        """
+        配信実行
+
+        Returns:
+            配信結果
+        """
+        self.quota = self.send_manager.get_remaining_quota()
+        started = time.monotonic()
+
+        if self.quota == 0:
+            return {
+                "status": "quota_exceeded",
+                "sent_count": 0,
+                "failed": [],
+                "quota_remaining": 0,
+                "next_reset_time": self.send_manager._get_next_reset_time()
+            }
+
+        threads = [
+            threading.Thread(target=self._fetch, daemon=True),
+            threading.Thread(target=self._render, daemon=True),
+        ] + [threading.Thread(target=self._send, daemon=True) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads[1:]:
+                while thread.is_alive():
+                    thread.join(timeout=self.PROGRESS_INTERVAL)
+                    if thread.is_alive():
+                        self._print_progress(started)
+        finally:
+            self._stop.set()
+            try:
+                self._flush_records(force=True)
+            except Exception as e:
+                self._fail("記録", e)
+
+        elapsed = time.monotonic() - started
+        stopped_early = self.deferred_count > 0 and self.error is None
+        result = {
+            "status": "failed" if self.error else "success",
+            "sent_count": self.sent_count,
+            "failed": self.failed,
+            "already_sent_count": self.already_sent,
+            "deferred": stopped_early,
+            "quota_remaining": self.send_manager.get_remaining_quota(),
+            "next_reset_time": self.send_manager._get_next_reset_time() if stopped_early else None,
+            "elapsed_seconds": round(elapsed, 1),
+            "throughput": round(self.sent_count / elapsed, 2) if elapsed else 0.0
+        }
+        if self.error:
+            result["error"] = self.error
+        if self._unrecorded_sent:
+            # 送信済みだが送信ログにない宛先（再実行前に記録しないと再送される）
+            result["unrecorded_emails"] = list(self._unrecorded_sent)
+        return result
+
+
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="メルマガ配信")
+    parser.add_argument("subject", help="件名（{{LASTNAME}} {{FIRSTNAME}} で宛名を差し込み可）")
+    parser.add_argument("html_file", help="本文HTMLファイル")
+    parser.add_argument("--concurrency", type=int, default=4, help="同時送信数（デフォルト: 4）")
+
     if len(sys.argv) < 3:
         print("使い方: python3 send_newsletter.py '件名' 'HTMLファイルパス'")
         print("\n例:")
         print("  python3 send_newsletter.py '2月のAI LAB開催' './templates/ailab_event.html'")
         sys.exit(1)
 
-    subject = sys.argv[1]
-    html_file = sys.argv[2]
+    args = parser.parse_args()
+    subject = args.subject
+    html_file = args.html_file
 
     # HTMLファイル読み込み
     if not Path(html_file).exists():
@@ -32,24 +323,6 @@ def main():
     with open(html_file, 'r', encoding='utf-8') as f:
         html_content = f.read()
 
-    # Brevo API初期化
-    brevo = BrevoAPI(BREVO_KEY)
-    send_mgr = SendManager(BREVO_KEY)
-
-    # リストから受信者取得
-    print(f"📋 リストID {LIST_ID} から受信者を取得中...")
-    contacts = brevo.get_contacts(list_id=LIST_ID, limit=500)
-
-    recipients = [
-        {
-            'email': c['email'],
-            'name': f"{c.get('attributes', {}).get('LASTNAME', '')} {c.get('attributes', {}).get('FIRSTNAME', '')}".strip()
-        }
-        for c in contacts
-    ]
-
-    print(f"✅ {len(recipients)}名の受信者を取得")
-
     # 送信者設定
     sender = {
         'name': 'Room8',
@@ -59,32 +332,52 @@ def main():
     # 配信実行
     print(f"\n📧 メルマガ配信開始...")
     print(f"   件名: {subject}")
-    print(f"   受信者数: {len(recipients)}名")
+    print(f"   リストID: {LIST_ID}")
     print(f"   送信者: {sender['name']} <{sender['email']}>")
 
-    result = send_mgr.send_campaign_batch(
+    pipeline = NewsletterPipeline(
+        send_manager=SendManager(BREVO_KEY),
+        list_manager=ListManager(BREVO_KEY),
         campaign_name=f"Newsletter_{subject}",
         subject=subject,
         html_content=html_content,
-        recipients=recipients,
-        sender=sender
+        sender=sender,
+        concurrency=args.concurrency
     )
+    result = pipeline.run()
 
     # 結果表示
     print("\n" + "=" * 80)
     print("📊 配信結果")
     print("=" * 80)
-    print(f"✅ 送信成功: {result['sent_count']}件")
-    print(f"📬 残り配信可能数: {result['remaining_quota']}件")
 
-    if result.get('unsent_recipients'):
-        print(f"⏳ 未送信: {len(result['unsent_recipients'])}件（明日送信されます）")
+    if result['status'] == 'quota_exceeded':
+        print(f"⚠️ 本日の送信枠を使い切っています。次回リセット: {result['next_reset_time']}")
+        return
+
+    if result['status'] == 'failed':
+        print(f"❌ 配信中断: {result['error']}")
+        if result.get('unrecorded_emails'):
+            print(f"⚠️ 送信ログに記録できなかった送信済み宛先: {len(result['unrecorded_emails'])}件"
+                  "（記録しないまま再実行するとこの宛先に再送されます）")
+        else:
+            print("   再実行すると未送信分のみ送信します")
+
+    print(f"✅ 送信成功: {result['sent_count']}件（{result['elapsed_seconds']}秒, {result['throughput']}通/秒）")
+    print(f"⏭️  送信済みのため除外: {result['already_sent_count']}件")
+    print(f"📬 残り配信可能数: {result['quota_remaining']}件")
+
+    if result['deferred']:
+        print(f"⏳ 送信枠に達したため残りは明日送信します（再実行で未送信分のみ送信）")
         print(f"   次回送信可能時刻: {result.get('next_reset_time', 'N/A')}")
 
-    if result.get('failed'):
+    if result['failed']:
         print(f"❌ 失敗: {len(result['failed'])}件")
         for fail in result['failed'][:5]:  # 最初の5件だけ表示
             print(f"   - {fail['email']}: {fail['error']}")
 
+    if result['status'] == 'failed':
+        sys.exit(1)
+
 if __name__ == '__main__':
     main()
@@ -2,14 +2,22 @@
 """
 日本語の氏名を姓名に分割
 
-ルールベース + よくある姓のパターンマッチングで判定
+ルールベース + 姓辞書の最長一致で判定
+- 姓辞書（data/japanese_surnames.txt）をトライ木に読み込み、先頭からの最長一致で姓を決める
+- 企業キーワードは1つの正規表現（オートマトン）で一括判定
+- 判定方法に応じた確信度を返す（低確信度の名前だけを LLM に回すため）
+- 名前全体が姓（長谷川・小野寺など）なら短い姓で割らない。
+  残りが1文字や姓そのものになる分割も確信度を下げる
 """
 
 import csv
 import re
-from typing import Dict, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
 
 
+SURNAME_DICT_PATH = Path(__file__).parent.parent / "data" / "japanese_surnames.txt"
+
 # よくある日本の姓（2文字）
 COMMON_SURNAMES_2 = [
     '田中', '鈴木', '高橋', '佐藤', '伊藤', '渡辺', '山本', '中村', '小林', '加藤',
@@ -32,16 +40,124 @@ COMPANY_KEYWORDS = [
     '(株)', '(有)', '(合)', '㈱', '㈲'
 ]
 
+# 企業キーワードを1パスで検出する正規表現（長いキーワードを優先）
+COMPANY_PATTERN = re.compile(
+    "|".join(re.escape(k) for k in sorted(COMPANY_KEYWORDS, key=len, reverse=True))
+)
+
+ROMAJI_PATTERN = re.compile(r'^[A-Za-z\s]+$')
+WHITESPACE_PATTERN = re.compile(r'[\s　]+')
+
+
+class SurnameTrie:
+    """姓のトライ木（先頭からの最長一致検索）"""
+
+    _END = ""  # 終端マーカー（1文字のキーと衝突しない）
+
+    def __init__(self, surnames: Iterable[str] = ()):
+        self._root: Dict[str, dict] = {}
+        self._size = 0
+        for surname in surnames:
+            self.add(surname)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, text: str) -> bool:
+        """text 全体が辞書の姓と完全一致するか"""
+        node = self._root
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return False
+        return self._END in node
+
+    def add(self, surname: str) -> None:
+        node = self._root
+        for char in surname:
+            node = node.setdefault(char, {})
+        if self._END not in node:
+            node[self._END] = True
+            self._size += 1
+
+    def longest_prefix(self, text: str, min_rest: int = 1) -> Optional[str]:
+        """
+        text の先頭に一致する最長の姓を返す
+
+        Args:
+            text: 検索対象
+            min_rest: 姓の後ろに残すべき最小文字数（名が空にならないように）
+
+        Returns:
+            一致した姓（なければ None）
+        """
+        node = self._root
+        longest = 0
+        limit = len(text) - min_rest
+        for i, char in enumerate(text[:limit]):
+            node = node.get(char)
+            if node is None:
+                break
+            if self._END in node:
+                longest = i + 1
+        return text[:longest] if longest else None
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SurnameTrie":
+        """1行1件の辞書ファイルから作成（# 始まりの行と空行は無視）"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(
+                line.strip() for line in f
+                if line.strip() and not line.startswith("#")
+            )
+
+
+_surname_trie: Optional[SurnameTrie] = None
+
+
+def get_surname_trie() -> SurnameTrie:
+    """姓辞書のトライ木（初回呼び出し時に1回だけ読み込む）"""
+    global _surname_trie
+    if _surname_trie is None:
+        trie = SurnameTrie.from_file(SURNAME_DICT_PATH) if SURNAME_DICT_PATH.exists() else SurnameTrie()
+        for surname in COMMON_SURNAMES_3 + COMMON_SURNAMES_2:
+            trie.add(surname)
+        _surname_trie = trie
+    return _surname_trie
+
 
 def is_company_name(name: str) -> bool:
     """企業名かどうかを判定"""
-    for keyword in COMPANY_KEYWORDS:
-        if keyword in name:
-            return True
-    return False
+    return COMPANY_PATTERN.search(name) is not None
+
+
+# 判定方法ごとの確信度（0〜1）。低いものは LLM での分割に回す
+METHOD_CONFIDENCE = {
+    "empty": 1.0,            # 空文字
+    "company": 0.95,         # 企業キーワードを含む
+    "whitespace": 0.95,      # 姓名の間に空白がある
+    "romaji": 0.9,           # ローマ字2語以上（最初を姓とするルールはLLMと同じ）
+    "dictionary": 0.85,      # 姓辞書に2文字以上の姓が一致
+    "dictionary_short": 0.6, # 姓辞書に1文字の姓が一致（林・森など、2文字姓との取り違えが多い）
+    "dictionary_ambiguous": 0.5,  # 姓辞書に一致したが、名が1文字または名自体が姓（大和/田 など誤分割の疑い）
+    "romaji_single": 0.5,    # ローマ字1語
+    "short": 0.4,            # 2文字以下
+    "surname_only": 0.4,     # 名前全体が辞書の姓（長谷川 → 長谷/川 のように割らない）
+    "fallback": 0.3,         # 辞書に一致せず先頭2文字を姓とした
+}
+
+
+def _split_result(lastname: str, firstname: str, original: str, method: str) -> Dict:
+    return {
+        "lastname": lastname,
+        "firstname": firstname,
+        "original": original,
+        "method": method,
+        "confidence": METHOD_CONFIDENCE[method]
+    }
 
 
-def split_japanese_name(full_name: str) -> Dict[str, str]:
+def split_japanese_name(full_name: str) -> Dict:
     """
     日本語氏名を姓名に分割
 
@@ -49,109 +165,96 @@ def split_japanese_name(full_name: str) -> Dict[str, str]:
         full_name: フルネーム
 
     Returns:
-        {"lastname": "姓", "firstname": "名", "original": "元の名前"}
+        {"lastname": "姓", "firstname": "名", "original": "元の名前",
+         "method": 判定方法, "confidence": 確信度}
     """
     full_name = full_name.strip()
 
     # 空文字チェック
     if not full_name:
-        return {"lastname": "", "firstname": "", "original": ""}
+        return _split_result("", "", "", "empty")
 
     # 企業名の場合はそのまま返す
     if is_company_name(full_name):
-        return {"lastname": "", "firstname": full_name, "original": full_name}
+        return _split_result("", full_name, full_name, "company")
 
     # 英数字のみ（ローマ字名）の場合はスペース分割
-    if re.match(r'^[A-Za-z\s]+$', full_name):
+    if ROMAJI_PATTERN.match(full_name):
         parts = full_name.split()
         if len(parts) >= 2:
             # 西洋名の場合は "名 姓" が多いが、日本人のローマ字表記は "姓 名" が多い
             # とりあえず最初を姓とする
-            return {
-                "lastname": parts[0],
-                "firstname": " ".join(parts[1:]),
-                "original": full_name
-            }
+            return _split_result(parts[0], " ".join(parts[1:]), full_name, "romaji")
         else:
-            return {"lastname": "", "firstname": full_name, "original": full_name}
+            return _split_result("", full_name, full_name, "romaji_single")
 
     # スペース区切りがある場合
     if ' ' in full_name or '　' in full_name:
-        parts = re.split(r'[\s　]+', full_name)
+        parts = WHITESPACE_PATTERN.split(full_name)
         if len(parts) >= 2:
-            return {
-                "lastname": parts[0],
-                "firstname": " ".join(parts[1:]),
-                "original": full_name
-            }
-
-    # 3文字姓のパターンマッチ
-    for surname in COMMON_SURNAMES_3:
-        if full_name.startswith(surname) and len(full_name) > len(surname):
-            return {
-                "lastname": surname,
-                "firstname": full_name[len(surname):],
-                "original": full_name
-            }
-
-    # 2文字姓のパターンマッチ
-    for surname in COMMON_SURNAMES_2:
-        if full_name.startswith(surname) and len(full_name) > 2:
-            return {
-                "lastname": surname,
-                "firstname": full_name[2:],
-                "original": full_name
-            }
+            return _split_result(parts[0], " ".join(parts[1:]), full_name, "whitespace")
+
+    trie = get_surname_trie()
+
+    # 名前全体が姓そのもの（名の記入なし）
+    if full_name in trie:
+        return _split_result(full_name, "", full_name, "surname_only")
+
+    # 姓辞書の最長一致
+    surname = trie.longest_prefix(full_name)
+    if surname:
+        firstname = full_name[len(surname):]
+        if len(firstname) == 1 or firstname in trie:
+            method = "dictionary_ambiguous"
+        elif len(surname) >= 2:
+            method = "dictionary"
+        else:
+            method = "dictionary_short"
+        return _split_result(surname, firstname, full_name, method)
 
     # パターンマッチできない場合は最初の2文字を姓とする（日本の姓は2文字が多い）
     if len(full_name) >= 3:
-        return {
-            "lastname": full_name[:2],
-            "firstname": full_name[2:],
-            "original": full_name
-        }
+        return _split_result(full_name[:2], full_name[2:], full_name, "fallback")
 
     # 2文字以下の場合は姓のみとする
-    return {
-        "lastname": full_name,
-        "firstname": "",
-        "original": full_name
-    }
+    return _split_result(full_name, "", full_name, "short")
 
 
 def process_csv(input_csv: str, output_csv: str):
     """
     CSVの名前を姓名に分割
 
+    1行読むごとに分割して書き出すため、入力サイズに関係なくメモリ使用量は一定。
+
     Args:
         input_csv: 入力CSVパス
         output_csv: 出力CSVパス
     """
-    results = []
+    count = 0
 
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open(input_csv, 'r', encoding='utf-8') as fin, \
+            open(output_csv, 'w', encoding='utf-8', newline='') as fout:
+        reader = csv.DictReader(fin)
+        if not reader.fieldnames:
+            return 0
 
-        for row in reader:
-            name = row.get('NAME', '').strip()
-            split_result = split_japanese_name(name)
+        # 既存カラム + LASTNAME, FIRSTNAME を追加
+        fieldnames = list(reader.fieldnames)
+        for column in ('LASTNAME', 'FIRSTNAME'):
+            if column not in fieldnames:
+                fieldnames.append(column)
 
-            # 既存カラム + LASTNAME, FIRSTNAME を追加
-            new_row = dict(row)
-            new_row['LASTNAME'] = split_result['lastname']
-            new_row['FIRSTNAME'] = split_result['firstname']
+        writer = csv.DictWriter(fout, fieldnames=fieldnames)
+        writer.writeheader()
 
-            results.append(new_row)
-
-    # 出力
-    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-        if results:
-            fieldnames = list(results[0].keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
+        for row in reader:
+            split_result = split_japanese_name((row.get('NAME') or '').strip())
+            row['LASTNAME'] = split_result['lastname']
+            row['FIRSTNAME'] = split_result['firstname']
+            writer.writerow(row)
+            count += 1
 
-    return len(results)
+    return count
 
 
 def main():
@@ -170,6 +273,7 @@ def main():
         print(f"元の名前: {result['original']}")
         print(f"姓: {result['lastname']}")
         print(f"名: {result['firstname']}")
+        print(f"判定: {result['method']}（確信度 {result['confidence']}）")
     else:
         # CSV処理
         count = process_csv(args.input_csv, args.output)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+HTMLテンプレートエンジン
+
+テンプレートを読み込み時に「固定文字列」と「差し込み箇所」に分割しておき、
+描画は join 1回で行う。
+- 差し込み箇所は {{NAME}}（英大文字・数字・_）。未指定の差し込み箇所はそのまま残す
+  （空欄にしたいときだけ default="" を指定）
+- Brevo が差し込む {{ contact.LASTNAME }} / {{ unsubscribe }} などは対象外（そのまま残る）
+- ファイルから読み込んだテンプレートは更新日時（mtime）が変わったときだけ再読み込み
+- render_many で共通部分を1回だけ差し込み、宛先ごとの差分だけを描画する
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{([A-Z][A-Z0-9_]*)\}\}")
+
+
+class CompiledTemplate:
+    """分割済みテンプレート"""
+
+    def __init__(self, source: str):
+        """
+        初期化
+
+        Args:
+            source: テンプレート文字列
+        """
+        self.source = source
+        # 偶数番目が固定文字列、奇数番目が差し込み名（re.split のキャプチャ）
+        parts = PLACEHOLDER_PATTERN.split(source)
+        self._literals: List[str] = parts[0::2]
+        self._names: List[str] = parts[1::2]
+
+    @property
+    def placeholders(self) -> List[str]:
+        """差し込み名（出現順・重複なし）"""
+        return list(dict.fromkeys(self._names))
+
+    def render(self, values: Optional[Dict[str, str]] = None, default: Optional[str] = None) -> str:
+        """
+        描画
+
+        Args:
+            values: {差し込み名: 値}
+            default: 値がない差し込み箇所に入れる文字列（None なら {{NAME}} のまま残す）
+
+        Returns:
+            描画結果
+        """
+        values = values or {}
+        pieces = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            value = values.get(name, default)
+            pieces.append("{{" + name + "}}" if value is None else str(value))
+            pieces.append(literal)
+        return "".join(pieces)
+
+    def partial(self, values: Dict[str, str]) -> "CompiledTemplate":
+        """
+        一部の差し込み箇所だけを埋めたテンプレートを作る
+
+        差し込んだ値に含まれる {{NAME}} も次の描画の差し込み箇所になる。
+        """
+        return CompiledTemplate(self.render(values))
+
+    def render_many(
+        self,
+        per_recipient: Iterable[Dict[str, str]],
+        common: Optional[Dict[str, str]] = None,
+        default: Optional[str] = None
+    ) -> List[str]:
+        """
+        宛先ごとに描画
+
+        共通の値（本文など）は最初に1回だけ差し込み、宛先ごとには残りの
+        差し込み箇所だけを join する。
+
+        Args:
+            per_recipient: 宛先ごとの値 [{"LASTNAME": ..., "FIRSTNAME": ...}]
+            common: 全宛先共通の値
+            default: 宛先の値がない差し込み箇所に入れる文字列
+                （None なら {{NAME}} のまま残す。空欄にするときだけ "" を渡す）
+
+        Returns:
+            描画結果（per_recipient と同じ順序）
+        """
+        template = self.partial(common) if common else self
+        return [template.render(values, default=default) for values in per_recipient]
+
+
+class TemplateLoader:
+    """テンプレートファイルの読み込みとキャッシュ（mtime で無効化）"""
+
+    def __init__(self, templates_dir: Path):
+        """
+        初期化
+
+        Args:
+            templates_dir: テンプレートディレクトリ
+        """
+        self.templates_dir = Path(templates_dir)
+        self._cache: Dict[str, Tuple[float, CompiledTemplate]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[CompiledTemplate]:
+        """
+        テンプレート取得
+
+        Args:
+            name: ファイル名（例: "base.html"）
+
+        Returns:
+            分割済みテンプレート（ファイルがなければ None）
+        """
+        path = self.templates_dir / name
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            with self._lock:
+                self._cache.pop(name, None)
+            return None
+
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            template = CompiledTemplate(f.read())
+
+        with self._lock:
+            self._cache[name] = (mtime, template)
+        return template
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+distributed_sender の時間帯送信・SlotScheduler のテスト（Brevo には接続しない）
+- 時刻を過ぎた時間帯は時刻順に即送信、未来の時間帯は POLL_INTERVAL 以内で待機
+- 途中まで送った時間帯はチェックポイントから再開（inflight は再送せず uncertain）
+- 送信失敗は failed として記録、送信済みの時間帯は再送しない
+- 送信枠の記録後・スケジュール保存前に停止しても、再実行で送信数を二重に数えない
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+os.environ["EDITH_API_METRICS"] = "0"  # テストの送信を API 集計に入れない
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+import distributed_sender
+from distributed_sender import DistributedSender, SlotScheduler
+from send_log_store import SendLogStore
+from testutil import run_tests, temp_dir
+
+SENDER = {"name": "Room8", "email": "k_tsuruta@room8.co.jp"}
+
+
+class FakeApi:
+    """send_email だけの BrevoAPI（fail に入っている宛先は例外）"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send_email(self, to, subject, html_content, sender, tags=None):
+        email = to[0]["email"]
+        if email in self.fail:
+            raise RuntimeError("400 invalid email")
+        with self._lock:
+            self.sent.append(email)
+            return {"messageId": f"<{email}>"}
+
+
+class StopWaiting(Exception):
+    pass
+
+
+def _sender(tmp: Path, api: FakeApi) -> DistributedSender:
+    """送信ログ・スケジュールを一時ディレクトリに置き、API を差し替えた DistributedSender"""
+    sender = DistributedSender("test-key", store=SendLogStore(tmp / "send_log.db"))
+    sender.api = api
+    sender.schedule_dir = tmp
+    return sender
+
+
+def _recipients(n):
+    return [{"email": f"user{i}@example.com", "name": f"宛先{i}"} for i in range(n)]
+
+
+def _schedule_file(sender: DistributedSender, name: str, recipients, slots, start_date) -> Path:
+    sender.create_schedule(name, recipients, slots, shuffle=False, start_date=start_date)
+    return next(sender.schedule_dir.glob(f"{name}_*.json"))
+
+
+def test_scheduler_sends_past_slots_in_time_order():
+    """Test 1: 時刻を過ぎた時間帯は時刻順にすべて送信し、再実行しても再送しない"""
+    with temp_dir() as tmp:
+        api = FakeApi()
+        sender = _sender(tmp, api)
+        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        schedule_file = _schedule_file(sender, "past", _recipients(5), ["21:00", "09:00"], yesterday)
+
+        scheduler = SlotScheduler(sender, schedule_file, "件名", "<p>本文</p>", SENDER, concurrency=2)
+        assert scheduler.next_slot()[0] == 1  # 09:00 が先
+
+        results = scheduler.run()
+        assert [r["slot_time"] for r in results] == ["09:00", "21:00"]
+        assert [r["sent_count"] for r in results] == [2, 3]
+        assert sorted(api.sent) == sorted(r["email"] for r in _recipients(5))
+        assert scheduler.next_slot() is None
+
+        assert scheduler.run() == []
+        assert sender.send_slot(schedule_file, 0, "件名", "", SENDER)["status"] == "already_sent"
+        assert len(api.sent) == 5
+        assert sender.get_schedule_status(schedule_file)["pending"] == 0
+
+
+def test_scheduler_waits_for_future_slot():
+    """Test 2: 未来の時間帯は POLL_INTERVAL 以内の sleep で待つ"""
+    with temp_dir() as tmp:
+        api = FakeApi()
+        sender = _sender(tmp, api)
+        schedule_file = _schedule_file(sender, "future", _recipients(4), ["09:00", "21:00"], "2026-02-10")
+        # 09:00 は過ぎた時刻、21:00 は2時間後として扱う
+        fire_at = {"09:00": datetime.now() - timedelta(minutes=5), "21:00": datetime.now() + timedelta(hours=2)}
+
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            raise StopWaiting()
+
+        original_sleep = distributed_sender.time.sleep
+        distributed_sender.time.sleep = fake_sleep
+        try:
+            scheduler = SlotScheduler(sender, schedule_file, "件名", "", SENDER)
+            scheduler.slot_datetime = lambda schedule, slot: fire_at[slot["time"]]
+            try:
+                scheduler.run()
+                assert False, "未来の時間帯で待機しなかった"
+            except StopWaiting:
+                pass
+        finally:
+            distributed_sender.time.sleep = original_sleep
+
+        assert len(api.sent) == 2  # 過ぎた時間帯だけ送信済み
+        assert sleeps == [SlotScheduler.POLL_INTERVAL]
+        assert scheduler.next_slot()[0] == 1
+
+
+def test_send_slot_resumes_from_checkpoint():
+    """Test 3: チェックポイントから再開し、inflight は再送せず uncertain、失敗は failed"""
+    with temp_dir() as tmp:
+        recipients = _recipients(6)
+        api = FakeApi(fail={"user5@example.com"})
+        sender = _sender(tmp, api)
+        schedule_file = _schedule_file(sender, "resume", recipients, ["09:00"], "2026-02-10")
+
+        # 前回の実行: user0 は送信済み、user1 は送信中に停止
+        schedule_id = schedule_file.stem
+        sender.store.mark_slot_email(schedule_id, 0, "user0@example.com", "sent", message_id="<old>")
+        sender.store.mark_slot_email(schedule_id, 0, "user1@example.com", "inflight")
+
+        result = sender.send_slot(schedule_file, 0, "件名", "", SENDER, concurrency=3)
+
+        assert sorted(api.sent) == ["user2@example.com", "user3@example.com", "user4@example.com"]
+        assert result["sent_count"] == 4  # 前回分を含む
+        assert result["failed"] == [{"email": "user5@example.com", "error": "400 invalid email"}]
+        assert result["uncertain"] == ["user1@example.com"]
+
+        schedule = sender._load_schedule(schedule_file)
+        slot = schedule["time_slots"][0]
+        assert slot["sent"] and slot["failed_count"] == 1
+        assert "<old>" in slot["message_ids"]
+
+
+def test_resume_after_record_does_not_double_count():
+    """Test 4: 送信枠の記録後・スケジュール保存前に停止しても再実行で二重に数えない"""
+    with temp_dir() as tmp:
+        api = FakeApi()
+        sender = _sender(tmp, api)
+        schedule_file = _schedule_file(sender, "crash", _recipients(3), ["09:00"], "2026-02-10")
+
+        original_save = sender._save_schedule
+
+        def crash(schedule_file, schedule):
+            raise RuntimeError("停止")
+
+        sender._save_schedule = crash
+        try:
+            sender.send_slot(schedule_file, 0, "件名", "", SENDER)
+            assert False, "スケジュール保存で停止しなかった"
+        except RuntimeError:
+            pass
+        sender._save_schedule = original_save
+
+        result = sender.send_slot(schedule_file, 0, "件名", "", SENDER)
+        assert result["sent_count"] == 3
+        assert len(api.sent) == 3
+
+        date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        assert sender.store.get_sent_count(date) == 3
+        assert len(sender.store.get_campaign_runs(date)) == 1
+        assert sender._load_schedule(schedule_file)["time_slots"][0]["sent"]
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+send_log_store.SendLogStore のテスト（一時ディレクトリの SQLite）
+- 送信記録と1日の送信数カウンタ（同じ宛先を2回記録しても送信済みは1件）
+- 未送信抽出（キャンペーン単位・入力順を保持）
+- 失敗記録・実行記録
+- 分散送信のチェックポイント（inflight → sent の上書き）
+- 時間帯ごとの実行記録は2回目以降は既存の実行IDを返す（送信数も加算しない）
+- 旧形式 send_log_*.json の取り込み（2回目はスキップ）
+"""
+
+import json
+import sys
+from pathlib import Path
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from send_log_store import SendLogStore
+from testutil import run_tests, temp_dir
+
+DATE = "2026-02-10"
+
+
+def test_record_run_and_quota():
+    """Test 1: 送信記録で送信数が日ごとに加算され、実行記録・失敗が残る"""
+    with temp_dir() as tmp:
+        db_path = tmp / "logs" / "send_log.db"
+        store = SendLogStore(db_path)
+        assert store.is_new
+        assert store.get_sent_count(DATE) == 0
+
+        run_id = store.record_run(
+            DATE, "Newsletter_A", "件名A",
+            sent_emails=["a@example.com", "b@example.com"],
+            failed_emails=[{"email": "c@example.com", "error": "400"}]
+        )
+        store.record_run(DATE, "Newsletter_B", "件名B", ["a@example.com"], [])
+
+        assert store.get_sent_count(DATE) == 3
+        assert store.get_sent_count("2026-02-11") == 0
+
+        runs = store.get_campaign_runs(DATE)
+        assert [(r["name"], r["sent_count"], r["failed_count"]) for r in runs] == [
+            ("Newsletter_A", 2, 1), ("Newsletter_B", 1, 0)
+        ]
+        assert runs[0]["id"] == run_id
+
+        # 作り直しても中身は残る
+        assert not SendLogStore(db_path).is_new
+
+
+def test_filter_unsent():
+    """Test 2: 未送信抽出はキャンペーン単位で、入力順を保つ"""
+    with temp_dir() as tmp:
+        store = SendLogStore(tmp / "send_log.db")
+        store.record_run(DATE, "Newsletter_A", "", ["b@example.com", "d@example.com"], [])
+
+        candidates = ["d@example.com", "a@example.com", "b@example.com", "c@example.com"]
+        assert store.filter_unsent(candidates, "Newsletter_A") == ["a@example.com", "c@example.com"]
+        assert store.filter_unsent(candidates, "Newsletter_B") == candidates
+        assert store.filter_unsent([], "Newsletter_A") == []
+
+        # 同じ宛先を再記録しても送信済みは1件のまま（送信数カウンタは加算）
+        store.record_run(DATE, "Newsletter_A", "", ["b@example.com"], [])
+        assert store.filter_unsent(candidates, "Newsletter_A") == ["a@example.com", "c@example.com"]
+        assert store.get_sent_count(DATE) == 3
+
+
+def test_import_json_logs():
+    """Test 3: 旧形式のログをキャンペーンごとに復元して取り込み、2回目はスキップ"""
+    with temp_dir() as tmp:
+        log_dir = tmp / "logs"
+        log_dir.mkdir()
+        legacy = {
+            "date": DATE,
+            "sent_count": 4,  # campaigns と対応しない1件も送信枠に反映される
+            "sent_emails": ["a@example.com", "b@example.com", "c@example.com"],
+            "campaigns": [
+                {"name": "Newsletter_A", "subject": "A", "sent_count": 2,
+                 "failed_emails": [{"email": "x@example.com", "error": "400"}]},
+                {"name": "Newsletter_B", "subject": "B", "sent_count": 1},
+            ],
+        }
+        (log_dir / f"send_log_{DATE}.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        store = SendLogStore(log_dir / "send_log.db")
+        summary = store.import_json_logs(log_dir)
+        assert summary == {"imported_files": 1, "skipped_files": 0, "sent_emails": 3}
+
+        assert store.get_sent_count(DATE) == 4
+        assert store.filter_unsent(["a@example.com", "c@example.com"], "Newsletter_A") == ["c@example.com"]
+        assert store.filter_unsent(["a@example.com", "c@example.com"], "Newsletter_B") == ["a@example.com"]
+        runs = store.get_campaign_runs(DATE)
+        assert [(r["name"], r["failed_count"]) for r in runs] == [("Newsletter_A", 1), ("Newsletter_B", 0)]
+
+        again = store.import_json_logs(log_dir)
+        assert again == {"imported_files": 0, "skipped_files": 1, "sent_emails": 0}
+        assert store.get_sent_count(DATE) == 4
+
+
+def test_slot_progress():
+    """Test 4: チェックポイントは宛先ごとに上書きされ、時間帯ごとに分かれる"""
+    with temp_dir() as tmp:
+        store = SendLogStore(tmp / "send_log.db")
+        store.mark_slot_email("sched1", 0, "a@example.com", "inflight")
+        store.mark_slot_email("sched1", 0, "b@example.com", "inflight")
+        store.mark_slot_email("sched1", 0, "a@example.com", "sent", message_id="<m1>")
+        store.mark_slot_email("sched1", 0, "b@example.com", "failed", error="timeout")
+        store.mark_slot_email("sched1", 1, "a@example.com", "inflight")
+
+        progress = store.get_slot_progress("sched1", 0)
+        assert progress["a@example.com"]["status"] == "sent"
+        assert progress["a@example.com"]["message_id"] == "<m1>"
+        assert progress["b@example.com"]["status"] == "failed"
+        assert progress["b@example.com"]["error"] == "timeout"
+        assert list(store.get_slot_progress("sched1", 1)) == ["a@example.com"]
+        assert store.get_slot_progress("sched2", 0) == {}
+
+
+def test_record_slot_run_once():
+    """Test 5: 同じ時間帯の実行記録は1回だけ（送信数・実行記録は重複しない）"""
+    with temp_dir() as tmp:
+        store = SendLogStore(tmp / "send_log.db")
+        failed = [{"email": "x@example.com", "error": "400"}]
+        run_id = store.record_slot_run("sched1", 0, DATE, "Newsletter_A", "件名", ["a@example.com"], failed)
+        again = store.record_slot_run("sched1", 0, DATE, "Newsletter_A", "件名", ["a@example.com"], failed)
+        assert again == run_id
+        assert store.get_sent_count(DATE) == 1
+        assert len(store.get_campaign_runs(DATE)) == 1
+
+        store.record_slot_run("sched1", 1, DATE, "Newsletter_A", "件名", ["b@example.com"], [])
+        assert store.get_sent_count(DATE) == 2
+        assert len(store.get_campaign_runs(DATE)) == 2
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+send_newsletter.NewsletterPipeline のテスト（Brevo には接続しない）
+- 連絡先の取得中に例外（429・通信エラー）が起きても止まらずに failed を返す
+- 本文の宛名はHTMLエスケープ、件名はそのまま
+- 宛先ごとの値以外の {{KEY}}（{{UNSUBSCRIBE_URL}} など）は消さない
+- 送信済みは送信ログ（SQLite）に記録され、再実行で除外される
+- 送信ログの記録に失敗しても止まらずに failed を返し、送信済み分は最後に記録し直す
+"""
+
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from send_log_store import SendLogStore
+from send_newsletter import NewsletterPipeline
+from testutil import run_tests, temp_dir
+
+SENDER = {"name": "Room8", "email": "k_tsuruta@room8.co.jp"}
+BODY = '<p>{{LASTNAME}} {{FIRSTNAME}}様</p><a href="{{UNSUBSCRIBE_URL}}">配信停止</a>'
+
+
+class FakeListManager:
+    """iter_contacts だけを持つ ListManager（fail_after 件目で例外）"""
+
+    def __init__(self, contacts, fail_after=None):
+        self.contacts = contacts
+        self.fail_after = fail_after
+
+    def iter_contacts(self, list_id=None):
+        for i, contact in enumerate(self.contacts):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("429 Too Many Requests")
+            yield contact
+
+
+class FakeApi:
+    def __init__(self):
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send_email(self, to, subject, html_content, sender):
+        with self._lock:
+            self.sent.append({"to": to[0], "subject": subject, "html_content": html_content})
+
+
+class FakeSendManager:
+    """SendManager の送信枠・送信ログ部分（ログは一時ディレクトリの SQLite）"""
+
+    DAILY_LIMIT = 300
+
+    def __init__(self, db_path: Path):
+        self.api = FakeApi()
+        self.store = SendLogStore(db_path)
+
+    def _get_today_utc(self):
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _get_next_reset_time(self):
+        return "tomorrow"
+
+    def get_remaining_quota(self):
+        return max(0, self.DAILY_LIMIT - self.store.get_sent_count(self._get_today_utc()))
+
+
+class LockedStore:
+    """record_run が最初の failures 回だけ "database is locked" になる送信ログ"""
+
+    def __init__(self, store: SendLogStore, failures: int):
+        self.store = store
+        self.failures = failures
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def record_run(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise sqlite3.OperationalError("database is locked")
+        return self.store.record_run(*args, **kwargs)
+
+
+def _contacts(n, **attributes):
+    return [{"email": f"user{i}@example.com", "attributes": dict(attributes)} for i in range(n)]
+
+
+def _run(send_manager, list_manager, subject="{{LASTNAME}}様へ", body=BODY, timeout=15):
+    """パイプラインを別スレッドで実行（ハングしたら失敗）"""
+    pipeline = NewsletterPipeline(
+        send_manager=send_manager,
+        list_manager=list_manager,
+        campaign_name="Newsletter_test",
+        subject=subject,
+        html_content=body,
+        sender=SENDER,
+        concurrency=3
+    )
+    pipeline.PROGRESS_INTERVAL = 0.2
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(pipeline.run()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "NewsletterPipeline.run() が終了しない"
+    return result
+
+
+def test_fetch_error_returns_failed():
+    """Test 1: 取得中の例外で止まらず failed を返し、送信済み分は記録される"""
+    with temp_dir() as tmp:
+        manager = FakeSendManager(tmp / "send_log.db")
+        result = _run(manager, FakeListManager(_contacts(50), fail_after=20))
+
+        assert result["status"] == "failed"
+        assert "429" in result["error"]
+        assert result["deferred"] is False
+        # 送信できた分は送信ログに入っている（再実行で除外される）
+        assert result["sent_count"] == len(manager.api.sent)
+        assert manager.store.get_sent_count(manager._get_today_utc()) == result["sent_count"]
+
+
+def test_render_values_escaped_and_unknown_kept():
+    """Test 2: 本文の宛名はエスケープ、件名はそのまま、未知の差し込み箇所は残す"""
+    with temp_dir() as tmp:
+        manager = FakeSendManager(tmp / "send_log.db")
+        contacts = _contacts(1, LASTNAME="<img src=x onerror=alert(1)>", FIRSTNAME="A&B")
+        result = _run(manager, FakeListManager(contacts))
+
+        assert result["status"] == "success"
+        message = manager.api.sent[0]
+        assert message["html_content"] == (
+            "<p>&lt;img src=x onerror=alert(1)&gt; A&amp;B様</p>"
+            '<a href="{{UNSUBSCRIBE_URL}}">配信停止</a>'
+        )
+        assert message["subject"] == "<img src=x onerror=alert(1)>様へ"
+
+
+def test_resend_skips_already_sent():
+    """Test 3: 再実行では送信済みを除外し、枠を超えた分は翌日に回す"""
+    with temp_dir() as tmp:
+        manager = FakeSendManager(tmp / "send_log.db")
+        first = _run(manager, FakeListManager(_contacts(30)))
+        assert first["status"] == "success" and first["sent_count"] == 30
+
+        manager.DAILY_LIMIT = 40
+        second = _run(manager, FakeListManager(_contacts(60)))
+        assert second["status"] == "success"
+        assert second["already_sent_count"] == 30
+        assert second["sent_count"] == 10
+        assert second["deferred"] is True
+        assert second["quota_remaining"] == 0
+
+
+def test_record_error_stops_and_rerecords():
+    """Test 4: 記録の失敗で止まらず failed を返し、送信済み分は最後に記録し直す"""
+    with temp_dir() as tmp:
+        manager = FakeSendManager(tmp / "send_log.db")
+        manager.DAILY_LIMIT = 10000
+        manager.store = LockedStore(manager.store, failures=1)
+        result = _run(manager, FakeListManager(_contacts(1000)))
+
+        assert result["status"] == "failed"
+        assert "database is locked" in result["error"]
+        assert "unrecorded_emails" not in result
+        sent = [message["to"]["email"] for message in manager.api.sent]
+        assert result["sent_count"] == len(sent) < 1000
+        assert manager.store.get_sent_count(manager._get_today_utc()) == len(sent)
+        assert manager.store.filter_unsent(sent, "Newsletter_test") == []
+
+
+def test_record_error_reports_unrecorded():
+    """Test 5: 最後の記録も失敗したら、記録できなかった送信済み宛先を返す"""
+    with temp_dir() as tmp:
+        manager = FakeSendManager(tmp / "send_log.db")
+        manager.store = LockedStore(manager.store, failures=10 ** 6)
+        result = _run(manager, FakeListManager(_contacts(250)))
+
+        assert result["status"] == "failed"
+        sent = [message["to"]["email"] for message in manager.api.sent]
+        assert sorted(result["unrecorded_emails"]) == sorted(sent)
+        assert manager.store.get_sent_count(manager._get_today_utc()) == 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
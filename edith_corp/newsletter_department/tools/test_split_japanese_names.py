@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+split_japanese_names の姓名分割テスト
+- 名前全体が姓（長谷川・小野寺・大和田）のときに短い姓で割らない
+- 名が1文字・名自体が姓のときは確信度を下げて LLM に回す
+- 通常の辞書一致・空白・企業名・ローマ字
+"""
+
+import sys
+from pathlib import Path
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from split_japanese_names import SurnameTrie, split_japanese_name
+from testutil import run_tests
+
+# update_names_with_claude.MIN_RULE_CONFIDENCE（これ未満は LLM に回る）
+LLM_THRESHOLD = 0.8
+
+
+def _split(name: str):
+    result = split_japanese_name(name)
+    return result["lastname"], result["firstname"], result["method"], result["confidence"]
+
+
+def test_whole_name_is_surname():
+    """Test 1: 名前全体が姓なら割らずに姓のみ（低確信度）"""
+    for name in ["長谷川", "小野寺", "大和田", "佐々木"]:
+        lastname, firstname, method, confidence = _split(name)
+        assert (lastname, firstname, method) == (name, "", "surname_only"), name
+        assert confidence < LLM_THRESHOLD, name
+
+
+def test_ambiguous_remainder():
+    """Test 2: 名が1文字、または名自体が姓なら確信度を下げる"""
+    lastname, firstname, method, confidence = _split("田中一")
+    assert (lastname, firstname, method) == ("田中", "一", "dictionary_ambiguous")
+    assert confidence < LLM_THRESHOLD
+
+    lastname, firstname, method, confidence = _split("大和田中")
+    assert (lastname, firstname, method) == ("大和田", "中", "dictionary_ambiguous")
+    assert confidence < LLM_THRESHOLD
+
+    lastname, firstname, method, confidence = _split("中村田中")
+    assert (lastname, firstname, method) == ("中村", "田中", "dictionary_ambiguous")
+    assert confidence < LLM_THRESHOLD
+
+
+def test_dictionary_split():
+    """Test 3: 通常の辞書一致は最長の姓で分割して確定"""
+    assert _split("長谷川太郎")[:3] == ("長谷川", "太郎", "dictionary")
+    assert _split("小野寺花子")[:3] == ("小野寺", "花子", "dictionary")
+    assert _split("田中太郎")[:3] == ("田中", "太郎", "dictionary")
+    assert _split("田中太郎")[3] >= LLM_THRESHOLD
+    assert _split("林太郎")[:3] == ("林", "太郎", "dictionary_short")
+
+
+def test_other_rules():
+    """Test 4: 空文字・企業名・空白・ローマ字"""
+    assert _split("")[2] == "empty"
+    assert _split("株式会社Room8")[:3] == ("", "株式会社Room8", "company")
+    assert _split("長谷 川子")[:3] == ("長谷", "川子", "whitespace")
+    assert _split("Tsuruta Taro")[:3] == ("Tsuruta", "Taro", "romaji")
+
+
+def test_surname_trie():
+    """Test 5: トライ木の完全一致と最長一致"""
+    trie = SurnameTrie(["長谷", "長谷川", "林"])
+    assert "長谷川" in trie and "長谷" in trie
+    assert "長" not in trie and "長谷川太" not in trie
+    assert trie.longest_prefix("長谷川太郎") == "長谷川"
+    # 名を1文字以上残す
+    assert trie.longest_prefix("長谷川") == "長谷"
+    assert trie.longest_prefix("林") is None
+    assert len(trie) == 3
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+template_engine の描画テスト
+- 値のない {{NAME}} はそのまま残る（{{UNSUBSCRIBE_URL}} などを消さない）
+- 空欄にするのは default="" を指定したときだけ
+- render_many は共通部分を先に埋め、宛先ごとの値だけを差し込む
+"""
+
+import os
+import sys
+from pathlib import Path
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from template_engine import CompiledTemplate, TemplateLoader
+from testutil import run_tests, temp_dir
+
+SOURCE = '<p>{{LASTNAME}} {{FIRSTNAME}}様</p>{{CONTENT}}<a href="{{UNSUBSCRIBE_URL}}">配信停止</a>{{ contact.EMAIL }}'
+
+
+def test_render_keeps_unknown_placeholders():
+    """Test 1: 値のない差し込み箇所はそのまま残る"""
+    html = CompiledTemplate(SOURCE).render({"LASTNAME": "田中", "FIRSTNAME": "太郎"})
+    assert html.startswith("<p>田中 太郎様</p>{{CONTENT}}")
+    assert 'href="{{UNSUBSCRIBE_URL}}"' in html
+    # Brevo の差し込み（小文字・空白入り）は対象外
+    assert html.endswith("{{ contact.EMAIL }}")
+
+
+def test_render_many_default_is_opt_in():
+    """Test 2: render_many は既定で未知の差し込み箇所を残し、default="" のときだけ空欄にする"""
+    template = CompiledTemplate(SOURCE)
+    recipients = [{"LASTNAME": "田中", "FIRSTNAME": ""}, {"LASTNAME": "鈴木", "FIRSTNAME": "花子"}]
+
+    kept = template.render_many(recipients, common={"CONTENT": "<p>本文</p>"})
+    assert kept[0] == '<p>田中 様</p><p>本文</p><a href="{{UNSUBSCRIBE_URL}}">配信停止</a>{{ contact.EMAIL }}'
+    assert kept[1].startswith("<p>鈴木 花子様</p>")
+
+    blanked = template.render_many(recipients, common={"CONTENT": ""}, default="")
+    assert 'href=""' in blanked[0]
+
+
+def test_partial_values_become_placeholders():
+    """Test 3: 共通値に含まれる {{NAME}} も宛先ごとの差し込み箇所になる"""
+    template = CompiledTemplate("{{CONTENT}}").partial({"CONTENT": "{{LASTNAME}}さん"})
+    assert template.placeholders == ["LASTNAME"]
+    assert template.render({"LASTNAME": "佐藤"}) == "佐藤さん"
+
+
+def test_loader_reloads_on_mtime():
+    """Test 4: TemplateLoader はファイル更新時だけ読み直す"""
+    with temp_dir() as tmp:
+        path = tmp / "base.html"
+        path.write_text("v1 {{CONTENT}}", encoding="utf-8")
+        loader = TemplateLoader(tmp)
+        first = loader.get("base.html")
+        assert loader.get("base.html") is first
+
+        path.write_text("v2 {{CONTENT}}", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+        assert loader.get("base.html").render({"CONTENT": "x"}) == "v2 x"
+
+        path.unlink()
+        assert loader.get("base.html") is None
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
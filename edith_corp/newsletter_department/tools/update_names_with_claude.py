@@ -3,17 +3,98 @@
 BrevoのリストからNAMEを取得し、Gemini AIで姓名に分割してBrevoを更新
 
 Gemini API（有料枠 GEMINI_IMAGE_API_KEY）を使って日本語名を精度高く姓名分割する。
+- 1プロンプトで複数の名前をまとめて分割（JSON配列の構造化出力）
+- 複数バッチを並列実行
+- 分割結果をキャッシュし、未分割の名前だけをモデルに送る
+- ルールベース（split_japanese_names）で確信度の高い名前はモデルに送らない
+- Brevoへの反映は一括更新エンドポイント（/contacts/batch）
 """
 
 import os
 import json
-import time
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
 from brevo_api import BrevoAPI
 from list_manager import ListManager
+from split_japanese_names import split_japanese_name
 import google.generativeai as genai
 
 
+BATCH_SIZE = 50  # 1プロンプトあたりの名前数
+BATCH_CONCURRENCY = 4  # 同時に実行するバッチ数
+MIN_RULE_CONFIDENCE = 0.8  # ルールベースの結果を採用する最小確信度
+CACHE_PATH = Path(__file__).parent.parent / "lists" / "name_split_cache.json"
+
+SPLIT_RULES = """- 日本語名の場合は姓と名に分割
+- ローマ字名の場合は最初の単語を姓、残りを名とする
+- 企業名・組織名の場合は姓を空文字、名に全体を入れる
+- 名前が不明な場合は姓を空文字、名に全体を入れる"""
+
+BATCH_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "name": {"type": "STRING"},
+            "lastname": {"type": "STRING"},
+            "firstname": {"type": "STRING"}
+        },
+        "required": ["name", "lastname", "firstname"]
+    }
+}
+
+
+class NameSplitCache:
+    """名前 → {"lastname", "firstname"} の永続キャッシュ（JSONファイル）"""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def get(self, name: str) -> Optional[Dict[str, str]]:
+        return self._entries.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, results: Dict[str, Dict[str, str]]) -> None:
+        with self._lock:
+            self._entries.update(results)
+            self._dirty = True
+
+    def save(self) -> None:
+        """変更があれば一時ファイル経由で保存"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def _extract_json(response_text: str) -> str:
+    """```json ... ``` で囲まれている場合は中身を取り出す"""
+    if "```json" in response_text:
+        return response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        return response_text.split("```")[1].split("```")[0].strip()
+    return response_text
+
+
 def split_name_with_gemini(full_name: str, model) -> Dict[str, str]:
     """
     Gemini AIで姓名を分割
@@ -30,10 +111,7 @@ def split_name_with_gemini(full_name: str, model) -> Dict[str, str]:
 名前: {full_name}
 
 以下のルールに従ってください：
-- 日本語名の場合は姓と名に分割
-- ローマ字名の場合は最初の単語を姓、残りを名とする
-- 企業名・組織名の場合は姓を空文字、名に全体を入れる
-- 名前が不明な場合は姓を空文字、名に全体を入れる
+{SPLIT_RULES}
 
 JSON形式で回答してください：
 {{"lastname": "姓", "firstname": "名"}}
@@ -41,13 +119,7 @@ JSON形式で回答してください：
 JSON以外の説明は不要です。"""
 
     response = model.generate_content(prompt)
-    response_text = response.text.strip()
-
-    # JSONブロックから抽出（```json ... ``` がある場合）
-    if "```json" in response_text:
-        response_text = response_text.split("```json")[1].split("```")[0].strip()
-    elif "```" in response_text:
-        response_text = response_text.split("```")[1].split("```")[0].strip()
+    response_text = _extract_json(response.text.strip())
 
     try:
         result = json.loads(response_text)
@@ -60,17 +132,179 @@ JSON以外の説明は不要です。"""
         return {"lastname": "", "firstname": full_name}
 
 
-def update_brevo_contacts_with_names(list_id: int, dry_run: bool = True):
+def split_names_batch_with_gemini(names: List[str], model) -> Dict[str, Dict[str, str]]:
+    """
+    Gemini AIで複数の名前をまとめて姓名分割
+
+    Args:
+        names: フルネームのリスト
+        model: Gemini model
+
+    Returns:
+        {フルネーム: {"lastname": "姓", "firstname": "名"}}（応答に含まれなかった名前は含まない）
+    """
+    prompt = f"""以下のJSON配列の各名前を姓と名に分割してください。
+
+名前: {json.dumps(names, ensure_ascii=False)}
+
+以下のルールに従ってください：
+{SPLIT_RULES}
+
+入力と同じ順序で、各名前について {{"name": 入力の名前, "lastname": "姓", "firstname": "名"}} を
+要素とするJSON配列で回答してください。"""
+
+    response = model.generate_content(
+        prompt,
+        generation_config={
+            "response_mime_type": "application/json",
+            "response_schema": BATCH_RESPONSE_SCHEMA
+        }
+    )
+    items = json.loads(_extract_json(response.text.strip()))
+
+    requested = set(names)
+    results = {}
+    for item in items:
+        name = item.get("name", "")
+        if name in requested:
+            results[name] = {
+                "lastname": item.get("lastname", "").strip(),
+                "firstname": item.get("firstname", "").strip()
+            }
+    return results
+
+
+def split_names(
+    names: List[str],
+    model,
+    cache: NameSplitCache,
+    batch_size: int = BATCH_SIZE,
+    concurrency: int = BATCH_CONCURRENCY
+) -> Dict[str, Dict[str, str]]:
+    """
+    キャッシュを参照しつつ名前を姓名分割（未分割の名前だけをバッチ並列でモデルに送る）
+
+    Args:
+        names: フルネームのリスト（重複可）
+        model: Gemini model
+        cache: 分割結果キャッシュ
+        batch_size: 1プロンプトあたりの名前数
+        concurrency: 同時実行バッチ数
+
+    Returns:
+        {フルネーム: {"lastname": "姓", "firstname": "名"}}
+    """
+    unique_names = list(dict.fromkeys(names))
+    misses = [name for name in unique_names if name not in cache]
+    batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+
+    print(f"🧠 キャッシュ: {len(unique_names) - len(misses)}件ヒット / {len(misses)}件を{len(batches)}バッチで分割")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(split_names_batch_with_gemini, batch, model): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                cache.update(future.result())
+            except Exception as e:
+                print(f"   ❌ バッチエラー（{len(batch)}件）: {e}")
+
+    cache.save()
+    return {name: cache.get(name) for name in unique_names if name in cache}
+
+
+def split_names_hybrid(
+    names: List[str],
+    model,
+    cache: NameSplitCache,
+    min_confidence: float = MIN_RULE_CONFIDENCE
+) -> Dict[str, Dict[str, str]]:
+    """
+    ルールベースで分割し、確信度が min_confidence 未満の名前だけを LLM に回す
+
+    Args:
+        names: フルネームのリスト（重複可）
+        model: Gemini model
+        cache: 分割結果キャッシュ（LLM 分割分のみ保存）
+        min_confidence: ルールベースの結果を採用する最小確信度
+
+    Returns:
+        {フルネーム: {"lastname": "姓", "firstname": "名", "source": "rule:<method>" | "llm"}}
+    """
+    results = {}
+    low_confidence = []
+
+    for name in dict.fromkeys(names):
+        split_result = split_japanese_name(name)
+        if split_result["confidence"] >= min_confidence:
+            results[name] = {
+                "lastname": split_result["lastname"],
+                "firstname": split_result["firstname"],
+                "source": f"rule:{split_result['method']}"
+            }
+        else:
+            low_confidence.append(name)
+
+    print(f"📏 ルールベース: {len(results)}件確定 / {len(low_confidence)}件を LLM へ"
+          f"（確信度 {min_confidence} 未満）")
+
+    for name, split_result in split_names(low_confidence, model, cache).items():
+        results[name] = {**split_result, "source": "llm"}
+
+    return results
+
+
+def apply_names_to_brevo(brevo_api: BrevoAPI, results: List[Dict]) -> Dict:
+    """
+    姓名分割結果を一括更新エンドポイントでBrevoに反映
+
+    Args:
+        brevo_api: BrevoAPI
+        results: [{"email": ..., "lastname": ..., "firstname": ...}]
+
+    Returns:
+        {"success_count": n, "error_count": n}
+    """
+    success_count = 0
+    error_count = 0
+    batch_size = brevo_api.MAX_BATCH_UPDATE
+
+    for i in range(0, len(results), batch_size):
+        chunk = results[i:i + batch_size]
+        try:
+            brevo_api.update_contacts_batch([
+                {
+                    "email": r["email"],
+                    "attributes": {"LASTNAME": r["lastname"], "FIRSTNAME": r["firstname"]}
+                }
+                for r in chunk
+            ])
+            success_count += len(chunk)
+        except Exception as e:
+            print(f"   ❌ 一括更新エラー（{len(chunk)}件）: {e}")
+            error_count += len(chunk)
+
+    return {"success_count": success_count, "error_count": error_count}
+
+
+def update_brevo_contacts_with_names(
+    list_id: int,
+    dry_run: bool = True,
+    gemini_api_key: Optional[str] = None,
+    min_confidence: float = MIN_RULE_CONFIDENCE
+):
     """
     Brevoのリストから連絡先を取得し、姓名を分割してBrevoを更新
 
     Args:
         list_id: リストID
         dry_run: True の場合は実際には更新せず、結果のみ表示
+        gemini_api_key: Gemini APIキー（省略時は環境変数 GEMINI_IMAGE_API_KEY）
+        min_confidence: ルールベースの結果を採用する最小確信度（1より大きくすると全件LLM）
     """
     # API初期化
     brevo_api_key = os.environ.get("BREVO_API_KEY")
-    gemini_api_key = os.environ.get("GEMINI_IMAGE_API_KEY")
+    gemini_api_key = gemini_api_key or os.environ.get("GEMINI_IMAGE_API_KEY")
 
     if not gemini_api_key:
         raise ValueError("GEMINI_IMAGE_API_KEY が設定されていません")
@@ -87,54 +321,45 @@ def update_brevo_contacts_with_names(list_id: int, dry_run: bool = True):
     contacts = manager.get_all_contacts(list_id=list_id)
     print(f"✅ {len(contacts)}件の連絡先を取得")
 
+    targets = []
+    for contact in contacts:
+        current_name = contact.get("attributes", {}).get("FIRSTNAME", "")
+        if current_name:
+            targets.append((contact.get("email"), current_name))
+    print(f"⏭️  名前なし: {len(contacts) - len(targets)}件スキップ")
+
     # 姓名分割処理
+    split_results = split_names_hybrid(
+        [name for _, name in targets], gemini_model, NameSplitCache(), min_confidence=min_confidence
+    )
+
     results = []
-    success_count = 0
     error_count = 0
-
-    for i, contact in enumerate(contacts, 1):
-        email = contact.get("email")
-        attributes = contact.get("attributes", {})
-        current_name = attributes.get("FIRSTNAME", "")
-
-        if not current_name:
-            print(f"⏭️  [{i}/{len(contacts)}] {email}: 名前なし、スキップ")
+    for email, current_name in targets:
+        split_result = split_results.get(current_name)
+        if not split_result:
+            error_count += 1
             continue
 
-        print(f"🔍 [{i}/{len(contacts)}] {email}: {current_name}")
-
-        try:
-            # Geminiで姓名分割
-            split_result = split_name_with_gemini(current_name, gemini_model)
-            lastname = split_result["lastname"]
-            firstname = split_result["firstname"]
-
-            print(f"   → 姓: {lastname}, 名: {firstname}")
-
-            # 結果を記録
-            results.append({
-                "email": email,
-                "original_name": current_name,
-                "lastname": lastname,
-                "firstname": firstname
-            })
-
-            # Brevoを更新
-            if not dry_run:
-                brevo_api.update_contact(email, {
-                    "LASTNAME": lastname,
-                    "FIRSTNAME": firstname
-                })
-                print(f"   ✅ 更新完了")
-
-            success_count += 1
-
-            # レート制限対策（有料枠なので短めに）
-            time.sleep(1)
-
-        except Exception as e:
-            print(f"   ❌ エラー: {e}")
-            error_count += 1
+        results.append({
+            "email": email,
+            "original_name": current_name,
+            "lastname": split_result["lastname"],
+            "firstname": split_result["firstname"],
+            "source": split_result["source"]
+        })
+
+    for r in results[:20]:
+        print(f"   {r['original_name']} → 姓: {r['lastname']}, 名: {r['firstname']}")
+    if len(results) > 20:
+        print(f"   ... 他 {len(results) - 20}件")
+
+    # Brevoを更新
+    success_count = len(results)
+    if not dry_run:
+        applied = apply_names_to_brevo(brevo_api, results)
+        success_count = applied["success_count"]
+        error_count += applied["error_count"]
 
     # 結果サマリ
     print(f"\n{'='*60}")
@@ -162,12 +387,15 @@ def main():
     parser = argparse.ArgumentParser(description='BrevoリストのNAMEをGemini AIで姓名分割')
     parser.add_argument('--list-id', type=int, default=4, help='リストID（デフォルト: 4）')
     parser.add_argument('--apply', action='store_true', help='実際にBrevoを更新する（指定しない場合はDRY RUN）')
+    parser.add_argument('--min-confidence', type=float, default=MIN_RULE_CONFIDENCE,
+                        help=f'ルールベースの結果を採用する最小確信度（デフォルト: {MIN_RULE_CONFIDENCE}）')
 
     args = parser.parse_args()
 
     update_brevo_contacts_with_names(
         list_id=args.list_id,
-        dry_run=not args.apply
+        dry_run=not args.apply,
+        min_confidence=args.min_confidence
     )
 
 
@@ -9,6 +9,7 @@ from pathlib import Path
 OUTPUT_ROOT = Path.home() / "Documents" / "edith_output"
 BLOG_ARTICLES_DIR = OUTPUT_ROOT / "blog" / "articles"
 BLOG_ARTICLES_INDEX = OUTPUT_ROOT / "blog" / "articles_index.json"
+BLOG_SERIES_DB = OUTPUT_ROOT / "blog" / "series_database.json"
 REPORTS_DIR = OUTPUT_ROOT / "reports"
 BRIEFS_DIR = OUTPUT_ROOT / "briefs"
 SECRETARY_DIR = OUTPUT_ROOT / "secretary"
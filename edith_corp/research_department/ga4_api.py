@@ -11,12 +11,15 @@ Search Consoleと同じサービスアカウント認証方式を使用。
 """
 
 import json
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
 _THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR.parent))
+import api_metrics
 
 
 class GA4API:
@@ -36,6 +39,7 @@ class GA4API:
                 self.credentials_path,
                 scopes=self.SCOPES,
             )
+            api_metrics.install()
             self.service = build(
                 "analyticsdata", "v1beta", credentials=credentials
             )
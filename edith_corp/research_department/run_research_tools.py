@@ -27,6 +27,7 @@ if not _BLOG_DIR.exists():
 
 sys.path.insert(0, str(_THIS_DIR.parent))
 from output_paths import BLOG_ARTICLES_DIR, BLOG_ARTICLES_INDEX
+from articles_index import ArticlesIndex
 
 
 def cmd_search_console() -> dict:
@@ -83,10 +84,10 @@ def cmd_existing_articles() -> dict:
     """既存記事一覧を取得（articles_index.json優先、なければディレクトリスキャン）"""
 
     # articles_index.json があればそこから読む（過去記事含む全記事）
-    if BLOG_ARTICLES_INDEX.exists():
+    index = ArticlesIndex.shared(BLOG_ARTICLES_INDEX)
+    if index.exists():
         try:
-            data = json.loads(BLOG_ARTICLES_INDEX.read_text(encoding="utf-8"))
-            all_articles = data.get("articles", [])
+            all_articles = index.articles()
             return {
                 "status": "success",
                 "articles": [
@@ -101,7 +102,7 @@ def cmd_existing_articles() -> dict:
                     for a in all_articles
                 ],
                 "count": len(all_articles),
-                "index_updated_at": data.get("updated_at", ""),
+                "index_updated_at": index.updated_at,
                 "retrieved_at": datetime.now().isoformat(),
             }
         except (json.JSONDecodeError, OSError):
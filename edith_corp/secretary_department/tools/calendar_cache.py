@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+秘書部門 - カレンダーイベントキャッシュ（SQLite）
+calendar_tool.py がカレンダーごとの予定と syncToken を保存する。
+
+- 初回は期間の起点（window_start）以降を全件取得して保存
+- 2回目以降は syncToken で差分だけ取得して反映（削除は status=cancelled で届く）
+- 予定は開始・終了のUNIX時刻に索引を張り、期間の重なりで検索する
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, date, time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from zoneinfo import ZoneInfo
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    event_id    TEXT NOT NULL,
+    start_ts    REAL NOT NULL,
+    end_ts      REAL NOT NULL,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_events_range ON events (calendar_id, start_ts, end_ts);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    calendar_id  TEXT PRIMARY KEY,
+    sync_token   TEXT,
+    window_start REAL NOT NULL,
+    synced_at    TEXT NOT NULL
+);
+"""
+
+
+def event_timestamp(value: Dict, timezone: str) -> float:
+    """
+    イベントの start / end（{"dateTime": ...} または {"date": ...}）をUNIX時刻に変換
+
+    終日イベントの日付はカレンダーのタイムゾーンの0時とする。
+    """
+    if value.get("dateTime"):
+        return datetime.fromisoformat(value["dateTime"]).timestamp()
+    day = date.fromisoformat(value["date"])
+    return datetime.combine(day, time(), tzinfo=ZoneInfo(timezone)).timestamp()
+
+
+class CalendarCache:
+    """カレンダーごとの予定と syncToken の保存先"""
+
+    def __init__(self, db_path: Path):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteファイルパス
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """読み取り用の接続"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みトランザクション（開始時に書き込みロックを取り、正常終了でcommit、例外でrollback）"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ==================== 同期状態 ====================
+
+    def sync_state(self, calendar_id: str) -> Optional[Dict]:
+        """
+        同期状態を取得
+
+        Returns:
+            {"sync_token": ..., "window_start": ..., "synced_at": ...}（未同期なら None）
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT sync_token, window_start, synced_at FROM sync_state WHERE calendar_id = ?",
+                (calendar_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def reset(self, calendar_id: str):
+        """カレンダーのキャッシュと syncToken を破棄（次回は全件取得）"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            conn.execute("DELETE FROM sync_state WHERE calendar_id = ?", (calendar_id,))
+
+    # ==================== 反映 ====================
+
+    def apply(
+        self,
+        calendar_id: str,
+        items: Iterable[Dict],
+        sync_token: Optional[str],
+        timezone: str,
+        window_start: Optional[float] = None
+    ) -> Dict:
+        """
+        取得した予定を1トランザクションで反映
+
+        Args:
+            calendar_id: カレンダーID
+            items: events().list() の items（status=cancelled は削除として扱う）
+            sync_token: 次回の差分取得に使う nextSyncToken
+            timezone: 終日イベントの日付を解釈するタイムゾーン
+            window_start: 全件取得のときの期間の起点（指定すると既存のキャッシュを置き換える）
+
+        Returns:
+            {"upserted": n, "deleted": n}
+        """
+        upserts = []
+        deletes = []
+        for event in items:
+            if event.get("status") == "cancelled" or "start" not in event:
+                deletes.append((calendar_id, event["id"]))
+                continue
+            upserts.append((
+                calendar_id,
+                event["id"],
+                event_timestamp(event["start"], timezone),
+                event_timestamp(event["end"], timezone),
+                json.dumps(event, ensure_ascii=False)
+            ))
+
+        with self._transaction() as conn:
+            full = window_start is not None
+            if full:
+                conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            else:
+                row = conn.execute(
+                    "SELECT window_start FROM sync_state WHERE calendar_id = ?", (calendar_id,)
+                ).fetchone()
+                window_start = row["window_start"] if row else 0.0
+
+            conn.executemany("DELETE FROM events WHERE calendar_id = ? AND event_id = ?", deletes)
+            conn.executemany(
+                "INSERT INTO events VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (calendar_id, event_id) DO UPDATE SET "
+                "start_ts = excluded.start_ts, end_ts = excluded.end_ts, data = excluded.data",
+                upserts
+            )
+            conn.execute(
+                "INSERT INTO sync_state VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (calendar_id) DO UPDATE SET sync_token = excluded.sync_token, "
+                "window_start = excluded.window_start, synced_at = excluded.synced_at",
+                (calendar_id, sync_token, window_start, datetime.now().astimezone().isoformat())
+            )
+
+        return {"upserted": len(upserts), "deleted": 0 if full else len(deletes)}
+
+    # ==================== 参照 ====================
+
+    def events(self, calendar_ids: List[str], time_min: float, time_max: float) -> List[Dict]:
+        """
+        期間 [time_min, time_max) に重なる予定を取得
+
+        Args:
+            calendar_ids: 対象のカレンダーID
+            time_min: 期間の開始（UNIX時刻）
+            time_max: 期間の終了（UNIX時刻）
+
+        Returns:
+            [{"calendar_id": ..., "start_ts": ..., "end_ts": ..., "event": {...}}, ...]（開始順）
+        """
+        if not calendar_ids:
+            return []
+
+        placeholders = ", ".join("?" * len(calendar_ids))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT calendar_id, start_ts, end_ts, data FROM events "
+                f"WHERE calendar_id IN ({placeholders}) AND start_ts < ? AND end_ts > ? "
+                f"ORDER BY start_ts",
+                [*calendar_ids, time_max, time_min]
+            ).fetchall()
+
+        return [
+            {
+                "calendar_id": row["calendar_id"],
+                "start_ts": row["start_ts"],
+                "end_ts": row["end_ts"],
+                "event": json.loads(row["data"]),
+            }
+            for row in rows
+        ]
@@ -7,9 +7,17 @@ Google Calendar API を使って予定の取得・作成・削除を行う。
 カレンダーオーナーがサービスアカウントのメールアドレスに
 カレンダー共有（編集権限）を設定する必要がある。
 
+list は対象カレンダーを並列に問い合わせ、nextPageToken を最後まで辿る。
+取得した予定はカレンダーごとに calendar_cache.db に保存し、2回目以降は
+syncToken の差分取得だけで済ませてキャッシュから返す（--no-cache で直接取得）。
+free は全カレンダーの予定区間を結合し、営業時間から差し引いて空き枠の候補を返す。
+
 Usage:
   python3 calendar_tool.py list --from today --to today [--calendar all|appointments|meeting_room|initial_consultation]
   python3 calendar_tool.py list --from 2026-02-09 --to 2026-02-15
+  python3 calendar_tool.py list --from today --to week --no-cache
+  python3 calendar_tool.py free --from 2026-02-09 --to 2026-02-13 --duration 60 --calendar appointments,meeting_room
+  python3 calendar_tool.py free --from today --to week --duration 30 --source freebusy --rank longest
   python3 calendar_tool.py create --calendar appointments --title "打ち合わせ" --date 2026-02-15 --start 14:00 --end 15:00
   python3 calendar_tool.py delete --calendar appointments --event-id <event_id>
 """
@@ -17,10 +25,19 @@ Usage:
 import sys
 import json
 import argparse
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 _THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from calendar_cache import CalendarCache, event_timestamp
+import api_metrics
 
 # サービスアカウント認証情報（Search Console / GA4 と共用）
 _CREDENTIALS_PATH = (
@@ -34,8 +51,27 @@ _CREDENTIALS_PATH = (
 # カレンダー設定
 _CONFIG_PATH = _THIS_DIR.parent / "config" / "calendar_config.json"
 
+# 予定キャッシュ（カレンダーごとの予定と syncToken）
+_SECRETARY_OUTPUT = Path.home() / "Documents" / "edith_output" / "secretary"
+CALENDAR_CACHE_DB = _SECRETARY_OUTPUT / "calendar_cache.db"
+
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# 並列に問い合わせるカレンダー数の上限
+MAX_WORKERS = 4
+# events().list() の1ページの件数（API上限）
+PAGE_SIZE = 2500
+# キャッシュする過去の日数（これより前を含む期間はキャッシュを使わず直接取得）
+CACHE_PAST_DAYS = 90
+
+# free: 既定の営業時間と候補枠の開始時刻の刻み（分）
+WORK_START = "09:00"
+WORK_END = "18:00"
+SLOT_STEP_MINUTES = 30
+
+# スレッドごとのサービス（httplib2 はスレッドセーフでないため共有しない）
+_thread_local = threading.local()
+
 
 def _load_config() -> dict:
     if _CONFIG_PATH.exists():
@@ -50,11 +86,11 @@ def _load_config() -> dict:
     }
 
 
-def _get_calendar_service():
-    """Google Calendar APIサービスを初期化"""
+def _get_credentials(config: dict):
+    """サービスアカウントの認証情報を読み込む"""
     try:
         from google.oauth2 import service_account
-        from googleapiclient.discovery import build
+        from googleapiclient.discovery import build  # noqa: F401
     except ImportError:
         print(json.dumps({
             "status": "error",
@@ -62,7 +98,6 @@ def _get_calendar_service():
         }, ensure_ascii=False, indent=2))
         sys.exit(1)
 
-    config = _load_config()
     creds_path = config.get("credentials_path", str(_CREDENTIALS_PATH))
 
     if not Path(creds_path).exists():
@@ -78,12 +113,30 @@ def _get_calendar_service():
 
     # ドメイン全体の委任: 鶴田さんとしてカレンダーにアクセス
     delegate_to = config.get("delegate_to", "k_tsuruta@room8.co.jp")
-    credentials = credentials.with_subject(delegate_to)
+    return credentials.with_subject(delegate_to)
+
+
+def _build_service(credentials):
+    from googleapiclient.discovery import build
+    api_metrics.install()
+    return build("calendar", "v3", credentials=credentials)
+
 
-    service = build("calendar", "v3", credentials=credentials)
+def _get_calendar_service():
+    """Google Calendar APIサービスを初期化"""
+    config = _load_config()
+    service = _build_service(_get_credentials(config))
     return service, config
 
 
+def _thread_service(credentials):
+    """ワーカースレッド用のサービス（スレッドごとに1回だけ生成）"""
+    service = getattr(_thread_local, "service", None)
+    if service is None:
+        service = _thread_local.service = _build_service(credentials)
+    return service
+
+
 def _resolve_date(s: str) -> str:
     """'today', 'tomorrow', 'week' を日付文字列に変換"""
     today = date.today()
@@ -110,12 +163,165 @@ def _get_calendar_ids(config: dict, calendar_name: str) -> list:
         cal = calendars[calendar_name]
         return [{"key": calendar_name, "id": cal["id"], "name": cal["name"], "tag": cal.get("tag", "")}]
 
+    # カンマ区切りの複数指定（例: appointments,meeting_room）。1つでも不明なら空
+    if "," in calendar_name:
+        targets = []
+        for name in dict.fromkeys(n.strip() for n in calendar_name.split(",") if n.strip()):
+            found = _get_calendar_ids(config, name)
+            if not found:
+                return []
+            targets.extend(found)
+        return targets
+
     return []
 
 
+def _day_start(day: str, timezone: str) -> datetime:
+    """日付（YYYY-MM-DD）のカレンダータイムゾーンでの0時"""
+    return datetime.combine(date.fromisoformat(day), time(), tzinfo=ZoneInfo(timezone))
+
+
+def _list_events(service, calendar_id: str, **params) -> Tuple[List[Dict], Optional[str]]:
+    """
+    events().list() を nextPageToken が尽きるまで辿る
+
+    Returns:
+        (全ページの items, 最終ページの nextSyncToken)
+    """
+    items = []
+    page_token = None
+    while True:
+        if page_token:
+            params["pageToken"] = page_token
+        response = service.events().list(
+            calendarId=calendar_id,
+            maxResults=PAGE_SIZE,
+            **params,
+        ).execute()
+        items.extend(response.get("items", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return items, response.get("nextSyncToken")
+
+
+def _sync_calendar(service, cache: CalendarCache, calendar_id: str, timezone: str, window_start: datetime) -> str:
+    """
+    キャッシュを最新にする（syncToken があれば差分、なければ window_start 以降を全件）
+
+    全件取得ではキャッシュを置き換えるので、window_start より前の予定は残らない。
+
+    Returns:
+        "incremental" または "full"
+    """
+    state = cache.sync_state(calendar_id)
+    if state and state["sync_token"]:
+        try:
+            items, sync_token = _list_events(
+                service, calendar_id,
+                syncToken=state["sync_token"],
+                singleEvents=True,
+                timeZone=timezone,
+            )
+            cache.apply(calendar_id, items, sync_token, timezone)
+            return "incremental"
+        except Exception as e:
+            # 410 Gone: syncToken の期限切れ → 全件取得し直す
+            if getattr(getattr(e, "resp", None), "status", None) != 410:
+                raise
+            cache.reset(calendar_id)
+
+    items, sync_token = _list_events(
+        service, calendar_id,
+        timeMin=window_start.isoformat(),
+        singleEvents=True,
+        timeZone=timezone,
+    )
+    cache.apply(calendar_id, items, sync_token, timezone, window_start=window_start.timestamp())
+    return "full"
+
+
+def _fetch_calendar(
+    credentials,
+    cache: Optional[CalendarCache],
+    target: dict,
+    time_min: datetime,
+    time_max: datetime,
+    timezone: str
+) -> Tuple[List[Dict], str]:
+    """
+    1カレンダー分の予定を取得（ワーカースレッドで実行）
+
+    キャッシュの期間内ならキャッシュを同期してから読み、
+    期間外（または cache=None）なら API から直接取得する。
+
+    Returns:
+        (予定の items, 取得方法 "incremental" / "full" / "direct")
+    """
+    service = _thread_service(credentials)
+
+    if cache is not None:
+        state = cache.sync_state(target["id"])
+        default_start = _day_start((date.today() - timedelta(days=CACHE_PAST_DAYS)).isoformat(), timezone)
+        cached_from = (
+            datetime.fromtimestamp(state["window_start"], ZoneInfo(timezone)) if state else default_start
+        )
+        if time_min >= cached_from:
+            # 全件取得し直すとき（410 など）の起点は今日から数え直す（今回の期間は含める）
+            window_start = min(default_start, time_min)
+            mode = _sync_calendar(service, cache, target["id"], timezone, window_start)
+            rows = cache.events([target["id"]], time_min.timestamp(), time_max.timestamp())
+            return [row["event"] for row in rows], mode
+
+    items, _ = _list_events(
+        service, target["id"],
+        timeMin=time_min.isoformat(),
+        timeMax=time_max.isoformat(),
+        singleEvents=True,
+        orderBy="startTime",
+        timeZone=timezone,
+    )
+    return [event for event in items if event.get("status") != "cancelled"], "direct"
+
+
+def _fetch_calendars(
+    credentials,
+    cache: Optional[CalendarCache],
+    targets: list,
+    time_min: datetime,
+    time_max: datetime,
+    timezone: str
+) -> Tuple[List[Tuple[dict, List[Dict]]], Dict[str, str], List[Dict]]:
+    """
+    複数カレンダーを並列に取得
+
+    Returns:
+        ([(カレンダー, 予定の items), ...], {カレンダー名: 取得方法}, エラーリスト)
+    """
+    results = []
+    sync_modes = {}
+    errors = []
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(targets))) as executor:
+        futures = [
+            (target, executor.submit(_fetch_calendar, credentials, cache, target, time_min, time_max, timezone))
+            for target in targets
+        ]
+
+        for target, future in futures:
+            try:
+                items, mode = future.result()
+            except Exception as e:
+                errors.append({"calendar": target["name"], "error": str(e)})
+                continue
+            results.append((target, items))
+            sync_modes[target["name"]] = mode
+
+    return results, sync_modes, errors
+
+
 def cmd_list(args) -> dict:
-    """期間内の予定一覧を取得（複数カレンダー対応）"""
-    service, config = _get_calendar_service()
+    """期間内の予定一覧を取得（複数カレンダーを並列取得、syncToken キャッシュ対応）"""
+    config = _load_config()
     timezone = config.get("timezone", "Asia/Tokyo")
     calendar_name = args.calendar or "all"
 
@@ -129,41 +335,32 @@ def cmd_list(args) -> dict:
     date_from = _resolve_date(args.date_from)
     date_to = _resolve_date(args.date_to)
 
-    time_min = f"{date_from}T00:00:00+09:00"
-    time_max = f"{date_to}T23:59:59+09:00"
+    time_min = _day_start(date_from, timezone)
+    time_max = _day_start(date_to, timezone) + timedelta(days=1)
 
-    all_events = []
-    errors = []
+    credentials = _get_credentials(config)
+    cache = None if getattr(args, "no_cache", False) else CalendarCache(CALENDAR_CACHE_DB)
 
-    for target in targets:
-        try:
-            events_result = service.events().list(
-                calendarId=target["id"],
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy="startTime",
-                timeZone=timezone,
-            ).execute()
-
-            for event in events_result.get("items", []):
-                start = event["start"].get("dateTime", event["start"].get("date"))
-                end = event["end"].get("dateTime", event["end"].get("date"))
-                all_events.append({
-                    "id": event["id"],
-                    "calendar": target["name"],
-                    "calendar_key": target["key"],
-                    "tag": target["tag"],
-                    "title": f"{target['tag']} {event.get('summary', '(無題)')}".strip(),
-                    "original_title": event.get("summary", "(無題)"),
-                    "start": start,
-                    "end": end,
-                    "description": event.get("description", ""),
-                    "location": event.get("location", ""),
-                    "all_day": "date" in event["start"],
-                })
-        except Exception as e:
-            errors.append({"calendar": target["name"], "error": str(e)})
+    results, sync_modes, errors = _fetch_calendars(credentials, cache, targets, time_min, time_max, timezone)
+
+    all_events = []
+    for target, items in results:
+        for event in items:
+            start = event["start"].get("dateTime", event["start"].get("date"))
+            end = event["end"].get("dateTime", event["end"].get("date"))
+            all_events.append({
+                "id": event["id"],
+                "calendar": target["name"],
+                "calendar_key": target["key"],
+                "tag": target["tag"],
+                "title": f"{target['tag']} {event.get('summary', '(無題)')}".strip(),
+                "original_title": event.get("summary", "(無題)"),
+                "start": start,
+                "end": end,
+                "description": event.get("description", ""),
+                "location": event.get("location", ""),
+                "all_day": "date" in event["start"],
+            })
 
     # 開始時刻でソート
     all_events.sort(key=lambda e: e["start"])
@@ -174,12 +371,213 @@ def cmd_list(args) -> dict:
         "count": len(all_events),
         "period": {"from": date_from, "to": date_to},
         "calendars_queried": [t["name"] for t in targets],
+        "sync": sync_modes,
     }
     if errors:
         result["errors"] = errors
     return result
 
 
+def _merge_intervals(intervals: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """重なる・接する区間を結合（開始時刻でソートして1回走査）"""
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _free_intervals(
+    busy: List[Tuple[float, float]],
+    windows: List[Tuple[float, float]],
+    min_seconds: float
+) -> List[Tuple[float, float]]:
+    """
+    探索する時間窓から予定区間を差し引いた空き区間
+
+    Args:
+        busy: 結合済みの予定区間（開始順・重なりなし）
+        windows: 探索する時間窓（開始順・重なりなし）
+        min_seconds: 空きとみなす最短の長さ（秒）
+
+    Returns:
+        空き区間（開始順）
+    """
+    free = []
+    i = 0
+    for win_start, win_end in windows:
+        # この窓より前に終わる予定は以降の窓にも関係しない
+        while i < len(busy) and busy[i][1] <= win_start:
+            i += 1
+
+        cursor = win_start
+        j = i
+        while j < len(busy) and busy[j][0] < win_end:
+            if busy[j][0] - cursor >= min_seconds:
+                free.append((cursor, busy[j][0]))
+            cursor = max(cursor, busy[j][1])
+            j += 1
+        if win_end - cursor >= min_seconds:
+            free.append((cursor, win_end))
+    return free
+
+
+def _align_up(ts: float, step_minutes: int, tz: ZoneInfo) -> float:
+    """ローカル時刻で step_minutes 刻みに切り上げ"""
+    step = step_minutes * 60
+    offset = datetime.fromtimestamp(ts, tz).utcoffset().total_seconds()
+    return math.ceil((ts + offset) / step) * step - offset
+
+
+def _busy_from_freebusy(
+    credentials,
+    targets: list,
+    time_min: datetime,
+    time_max: datetime,
+    timezone: str
+) -> Tuple[List[Tuple[float, float]], List[Dict]]:
+    """
+    freebusy.query で全カレンダーの予定区間を1回で取得
+
+    Returns:
+        (予定区間, エラーリスト)
+    """
+    service = _build_service(credentials)
+    response = service.freebusy().query(body={
+        "timeMin": time_min.isoformat(),
+        "timeMax": time_max.isoformat(),
+        "timeZone": timezone,
+        "items": [{"id": t["id"]} for t in targets],
+    }).execute()
+
+    busy = []
+    errors = []
+    calendars = response.get("calendars", {})
+    for target in targets:
+        entry = calendars.get(target["id"], {})
+        if entry.get("errors"):
+            reasons = ", ".join(e.get("reason", "") for e in entry["errors"])
+            errors.append({"calendar": target["name"], "error": reasons})
+            continue
+        busy.extend(
+            (datetime.fromisoformat(b["start"]).timestamp(), datetime.fromisoformat(b["end"]).timestamp())
+            for b in entry.get("busy", [])
+        )
+    return busy, errors
+
+
+def cmd_free(args) -> dict:
+    """空き時間の候補枠を探す（全カレンダーの予定を結合して営業時間から差し引く）"""
+    config = _load_config()
+    timezone = config.get("timezone", "Asia/Tokyo")
+    tz = ZoneInfo(timezone)
+    calendar_name = args.calendar or "all"
+
+    targets = _get_calendar_ids(config, calendar_name)
+    if not targets:
+        return {
+            "status": "error",
+            "error": f"カレンダー '{calendar_name}' が見つかりません。利用可能: {list(config.get('calendars', {}).keys())}",
+        }
+
+    if args.duration <= 0:
+        return {"status": "error", "error": "--duration は1分以上を指定してください。"}
+
+    try:
+        work_start = time.fromisoformat(args.work_start)
+        work_end = time.fromisoformat(args.work_end)
+    except ValueError:
+        return {"status": "error", "error": "--work-start / --work-end は HH:MM で指定してください。"}
+    if work_end <= work_start:
+        return {"status": "error", "error": "--work-end は --work-start より後にしてください。"}
+
+    date_from = _resolve_date(args.date_from)
+    date_to = _resolve_date(args.date_to)
+
+    time_min = _day_start(date_from, timezone)
+    time_max = _day_start(date_to, timezone) + timedelta(days=1)
+
+    credentials = _get_credentials(config)
+
+    if args.source == "freebusy":
+        busy, errors = _busy_from_freebusy(credentials, targets, time_min, time_max, timezone)
+    else:
+        cache = CalendarCache(CALENDAR_CACHE_DB)
+        results, _, errors = _fetch_calendars(credentials, cache, targets, time_min, time_max, timezone)
+        # 「予定なし」（transparent）の予定は空きを塞がない
+        busy = [
+            (event_timestamp(event["start"], timezone), event_timestamp(event["end"], timezone))
+            for _, items in results
+            for event in items
+            if event.get("transparency") != "transparent"
+        ]
+
+    # 一部のカレンダーが取れないまま空きを返すと二重予約になるためエラーにする
+    if errors:
+        return {
+            "status": "error",
+            "error": "予定を取得できないカレンダーがあります。",
+            "errors": errors,
+        }
+
+    # 探索する時間窓（日ごとの営業時間、現在より前は除く）
+    now = datetime.now(tz)
+    windows = []
+    day = date.fromisoformat(date_from)
+    while day <= date.fromisoformat(date_to):
+        if args.include_weekends or day.weekday() < 5:
+            win_start = max(datetime.combine(day, work_start, tzinfo=tz), now)
+            win_end = datetime.combine(day, work_end, tzinfo=tz)
+            if win_start < win_end:
+                windows.append((win_start.timestamp(), win_end.timestamp()))
+        day += timedelta(days=1)
+
+    duration = args.duration * 60
+    free = _free_intervals(_merge_intervals(busy), windows, duration)
+
+    # 空き区間ごとに刻みに揃えた先頭を候補枠にする
+    slots = []
+    for free_start, free_end in free:
+        slot_start = _align_up(free_start, SLOT_STEP_MINUTES, tz)
+        if slot_start + duration <= free_end:
+            slots.append((slot_start, free_start, free_end))
+
+    if args.rank == "longest":
+        # 前後に余裕のある（長い空き区間の）枠を優先
+        slots.sort(key=lambda s: (-(s[2] - s[1]), s[0]))
+
+    def _iso(ts: float) -> str:
+        return datetime.fromtimestamp(ts, tz).isoformat(timespec="seconds")
+
+    return {
+        "status": "success",
+        "duration_minutes": args.duration,
+        "period": {"from": date_from, "to": date_to},
+        "working_hours": {"start": args.work_start, "end": args.work_end},
+        "calendars_queried": [t["name"] for t in targets],
+        "source": args.source,
+        "busy_count": len(busy),
+        "slots": [
+            {
+                "rank": rank,
+                "date": _iso(slot_start)[:10],
+                "start": _iso(slot_start),
+                "end": _iso(slot_start + duration),
+                "free_block": {
+                    "start": _iso(free_start),
+                    "end": _iso(free_end),
+                    "minutes": int((free_end - free_start) // 60),
+                },
+            }
+            for rank, (slot_start, free_start, free_end) in enumerate(slots[:args.limit], start=1)
+        ],
+        "total_candidates": len(slots),
+    }
+
+
 def cmd_create(args) -> dict:
     """予定を作成"""
     service, config = _get_calendar_service()
@@ -305,6 +703,20 @@ def main():
     p_list.add_argument("--from", dest="date_from", required=True, help="開始日 (YYYY-MM-DD or today/tomorrow)")
     p_list.add_argument("--to", dest="date_to", required=True, help="終了日 (YYYY-MM-DD or today/tomorrow/week)")
     p_list.add_argument("--calendar", default="all", help="カレンダー名 (all/appointments/meeting_room/initial_consultation)")
+    p_list.add_argument("--no-cache", dest="no_cache", action="store_true", help="キャッシュを使わずAPIから直接取得")
+
+    # free
+    p_free = subparsers.add_parser("free", help="空き時間の候補枠")
+    p_free.add_argument("--from", dest="date_from", default="today", help="開始日 (YYYY-MM-DD or today/tomorrow)")
+    p_free.add_argument("--to", dest="date_to", default="week", help="終了日 (YYYY-MM-DD or today/tomorrow/week)")
+    p_free.add_argument("--duration", type=int, default=60, help="必要な長さ（分）")
+    p_free.add_argument("--calendar", default="all", help="カレンダー名 (all または appointments,meeting_room のようにカンマ区切り)")
+    p_free.add_argument("--work-start", dest="work_start", default=WORK_START, help="営業開始 (HH:MM)")
+    p_free.add_argument("--work-end", dest="work_end", default=WORK_END, help="営業終了 (HH:MM)")
+    p_free.add_argument("--include-weekends", dest="include_weekends", action="store_true", help="土日も探す")
+    p_free.add_argument("--source", choices=["cache", "freebusy"], default="cache", help="予定の取得元（キャッシュ or freebusy API）")
+    p_free.add_argument("--rank", choices=["earliest", "longest"], default="earliest", help="候補の並び順")
+    p_free.add_argument("--limit", type=int, default=10, help="返す候補数")
 
     # create
     p_create = subparsers.add_parser("create", help="予定作成")
@@ -331,6 +743,7 @@ def main():
 
     commands = {
         "list": cmd_list,
+        "free": cmd_free,
         "create": cmd_create,
         "delete": cmd_delete,
     }
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+秘書部門 - タスクストア（SQLite）
+task_tool.py の保存先。tasks.json の代わりに tasks.db を使う。
+
+- status / due_date / assignee / project に索引
+- 追加・更新・削除は1トランザクション（BEGIN IMMEDIATE で書き込みを直列化）
+  → 複数エージェントが同時に追加しても取りこぼさない
+- 旧形式の tasks.json からの取り込み
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# タスクJSONのキー順（CLI出力の互換のためこの順で返す）
+TASK_FIELDS = [
+    "id", "title", "description", "status", "priority", "urgency", "assignee",
+    "category", "project", "due_date", "created_at", "updated_at", "completed_at",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id           TEXT PRIMARY KEY,
+    title        TEXT,
+    description  TEXT,
+    status       TEXT,
+    priority     TEXT,
+    urgency      TEXT,
+    assignee     TEXT,
+    category     TEXT,
+    project      TEXT,
+    due_date     TEXT,
+    created_at   TEXT,
+    updated_at   TEXT,
+    completed_at TEXT,
+    extra        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks (assignee);
+CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks (project);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# list のフィルタで完全一致比較するカラム
+FILTER_COLUMNS = ("status", "category", "project", "assignee", "urgency")
+
+
+class TaskStore:
+    """SQLite タスクストア"""
+
+    def __init__(self, db_path: Path):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteファイルパス
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_new = not self.db_path.exists()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """読み取り用の接続"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みトランザクション（開始時に書き込みロックを取り、正常終了でcommit、例外でrollback）"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Dict:
+        task = {field: row[field] for field in TASK_FIELDS}
+        if row["extra"]:
+            task.update(json.loads(row["extra"]))
+        return task
+
+    @staticmethod
+    def _task_to_row(task: Dict) -> Tuple:
+        extra = {k: v for k, v in task.items() if k not in TASK_FIELDS}
+        return tuple(task.get(field) for field in TASK_FIELDS) + (
+            json.dumps(extra, ensure_ascii=False, default=str) if extra else None,
+        )
+
+    # ==================== 参照 ====================
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        """IDでタスクを取得"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._row_to_task(row) if row else None
+
+    def count(self) -> int:
+        """全タスク数"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def list(
+        self,
+        filters: Optional[Dict[str, str]] = None,
+        due_on: Optional[str] = None,
+        due_until: Optional[str] = None,
+        overdue_before: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        条件に合うタスクを追加順で取得（条件は1回のSQLにまとめる）
+
+        Args:
+            filters: {カラム名: 値}（FILTER_COLUMNS の完全一致）
+            due_on: 期限がこの日（YYYY-MM-DD）
+            due_until: 期限がこの日以前
+            overdue_before: 期限がこの日より前で、完了・キャンセル以外
+
+        Returns:
+            タスクリスト
+        """
+        clauses = []
+        params: List[str] = []
+
+        for column, value in (filters or {}).items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"未対応のフィルタ: {column}")
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        if due_on:
+            clauses.append("due_date = ?")
+            params.append(due_on)
+        if due_until:
+            clauses.append("due_date IS NOT NULL AND due_date != '' AND due_date <= ?")
+            params.append(due_until)
+        if overdue_before:
+            clauses.append(
+                "due_date IS NOT NULL AND due_date != '' AND due_date < ? "
+                "AND status NOT IN ('completed', 'cancelled')"
+            )
+            params.append(overdue_before)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM tasks{where} ORDER BY rowid", params).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    # ==================== 更新 ====================
+
+    def add(self, fields: Dict) -> Dict:
+        """
+        タスク追加（IDは next_id から採番）
+
+        Args:
+            fields: id 以外のタスク項目
+
+        Returns:
+            追加したタスク
+        """
+        with self._transaction() as conn:
+            next_id = self._next_id(conn)
+            task = {"id": f"t{next_id:03d}", **fields}
+            conn.execute(f"INSERT INTO tasks VALUES ({', '.join('?' * (len(TASK_FIELDS) + 1))})",
+                         self._task_to_row(task))
+            self._set_next_id(conn, next_id + 1)
+        return self.get(task["id"])
+
+    def update(self, task_id: str, changes: Dict) -> Optional[Dict]:
+        """
+        タスクの項目を更新
+
+        Args:
+            task_id: タスクID
+            changes: {項目名: 新しい値}
+
+        Returns:
+            更新後のタスク（存在しなければ None）
+        """
+        columns = [c for c in changes if c in TASK_FIELDS and c != "id"]
+        if not columns:
+            return self.get(task_id)
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                [changes[c] for c in columns] + [task_id]
+            )
+            if cursor.rowcount == 0:
+                return None
+        return self.get(task_id)
+
+    def delete(self, task_id: str) -> bool:
+        """タスク削除（削除できたら True）"""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount > 0
+
+    def _next_id(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        return int(row["value"]) if row else 1
+
+    def _set_next_id(self, conn: sqlite3.Connection, value: int):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('next_id', ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (str(value),)
+        )
+
+    # ==================== 旧形式の取り込み ====================
+
+    def import_json(self, json_path: Path) -> Dict:
+        """
+        tasks.json を取り込む（同じIDは上書き、next_id は大きい方を採用）
+
+        Args:
+            json_path: tasks.json のパス
+
+        Returns:
+            {"imported": n, "next_id": n}
+        """
+        data = json.loads(Path(json_path).read_text(encoding="utf-8"))
+        tasks = data.get("tasks", [])
+
+        with self._transaction() as conn:
+            conn.executemany(
+                f"INSERT INTO tasks VALUES ({', '.join('?' * (len(TASK_FIELDS) + 1))}) "
+                f"ON CONFLICT (id) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in TASK_FIELDS[1:] + ["extra"]),
+                (self._task_to_row(task) for task in tasks)
+            )
+            next_id = max(self._next_id(conn), int(data.get("next_id", 1)))
+            self._set_next_id(conn, next_id)
+
+        return {"imported": len(tasks), "next_id": next_id}
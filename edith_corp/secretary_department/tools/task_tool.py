@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """
 秘書部門 - タスク管理ツール
-tasks.json に対する CRUD 操作を提供する。
+tasks.db（SQLite）に対する CRUD 操作を提供する。
 秘書エージェントが Bash で実行する。
+初回実行時に旧形式の tasks.json があれば自動で取り込む。
 
 Usage:
   python3 task_tool.py list [--status pending] [--category business] [--due today|week|overdue] [--assignee ai] [--urgency now]
@@ -10,6 +11,7 @@ Usage:
   python3 task_tool.py update <id> [--title "新タイトル"] [--status completed] [--priority low] [--urgency anytime] [--assignee outsource] [--due 2026-03-01]
   python3 task_tool.py complete <id>
   python3 task_tool.py delete <id>
+  python3 task_tool.py import_json [--file tasks.json]
 """
 
 import sys
@@ -19,90 +21,74 @@ from pathlib import Path
 from datetime import datetime, date, timedelta
 
 _THIS_DIR = Path(__file__).resolve().parent
-_SECRETARY_OUTPUT = Path.home() / "Documents" / "edith_output" / "secretary"
-TASKS_FILE = _SECRETARY_OUTPUT / "tasks.json"
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from task_store import TaskStore
+from agent_log import get_logger
 
+log = get_logger("タスク管理ツール")
 
-def _ensure_dir():
-    _SECRETARY_OUTPUT.mkdir(parents=True, exist_ok=True)
+_SECRETARY_OUTPUT = Path.home() / "Documents" / "edith_output" / "secretary"
+TASKS_FILE = _SECRETARY_OUTPUT / "tasks.json"
+TASKS_DB = _SECRETARY_OUTPUT / "tasks.db"
 
 
-def _load_tasks() -> dict:
-    _ensure_dir()
-    if TASKS_FILE.exists():
+def _open_store() -> TaskStore:
+    """タスクストアを開く（DB新規作成時は旧 tasks.json を取り込む）"""
+    store = TaskStore(TASKS_DB)
+    if store.is_new and TASKS_FILE.exists():
         try:
-            return json.loads(TASKS_FILE.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {"tasks": [], "next_id": 1}
-
-
-def _save_tasks(data: dict):
-    _ensure_dir()
-    TASKS_FILE.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2, default=str),
-        encoding="utf-8",
-    )
+            store.import_json(TASKS_FILE)
+        except (json.JSONDecodeError, OSError) as e:
+            # tasks.db はもう作られているので次回以降は自動で取り込まない
+            log.warning(
+                f"{TASKS_FILE} を取り込めませんでした（{e}）。"
+                f"ファイルを直してから `python3 task_tool.py import_json` で取り込んでください"
+            )
+    return store
 
 
 def _now_iso() -> str:
     return datetime.now().astimezone().isoformat()
 
 
-def _make_id(n: int) -> str:
-    return f"t{n:03d}"
-
-
 def cmd_list(args) -> dict:
     """タスク一覧（フィルタ可）"""
-    data = _load_tasks()
-    tasks = data["tasks"]
-
-    # フィルタ
-    if args.status:
-        tasks = [t for t in tasks if t["status"] == args.status]
-    if args.category:
-        tasks = [t for t in tasks if t.get("category") == args.category]
-    if args.project:
-        tasks = [t for t in tasks if t.get("project") == args.project]
-    if args.assignee:
-        tasks = [t for t in tasks if t.get("assignee") == args.assignee]
-    if args.urgency:
-        tasks = [t for t in tasks if t.get("urgency") == args.urgency]
+    store = _open_store()
 
     today = date.today()
+    due_filters = {}
     if args.due == "today":
-        tasks = [t for t in tasks if t.get("due_date") == today.isoformat()]
+        due_filters["due_on"] = today.isoformat()
     elif args.due == "week":
-        week_end = today + timedelta(days=7)
-        tasks = [
-            t for t in tasks
-            if t.get("due_date") and t["due_date"] <= week_end.isoformat()
-        ]
+        due_filters["due_until"] = (today + timedelta(days=7)).isoformat()
     elif args.due == "overdue":
-        tasks = [
-            t for t in tasks
-            if t.get("due_date")
-            and t["due_date"] < today.isoformat()
-            and t["status"] not in ("completed", "cancelled")
-        ]
+        due_filters["overdue_before"] = today.isoformat()
+
+    tasks = store.list(
+        filters={
+            "status": args.status,
+            "category": args.category,
+            "project": args.project,
+            "assignee": args.assignee,
+            "urgency": args.urgency,
+        },
+        **due_filters,
+    )
 
     return {
         "status": "success",
         "tasks": tasks,
         "count": len(tasks),
-        "total": len(data["tasks"]),
+        "total": store.count(),
     }
 
 
 def cmd_add(args) -> dict:
     """タスク追加"""
-    data = _load_tasks()
-    task_id = _make_id(data["next_id"])
     now = _now_iso()
 
-    task = {
-        "id": task_id,
+    task = _open_store().add({
         "title": args.title,
         "description": args.description or "",
         "status": "pending",
@@ -115,11 +101,7 @@ def cmd_add(args) -> dict:
         "created_at": now,
         "updated_at": now,
         "completed_at": None,
-    }
-
-    data["tasks"].append(task)
-    data["next_id"] += 1
-    _save_tasks(data)
+    })
 
     return {
         "status": "success",
@@ -130,70 +112,62 @@ def cmd_add(args) -> dict:
 
 def cmd_update(args) -> dict:
     """タスク更新"""
-    data = _load_tasks()
-
-    for task in data["tasks"]:
-        if task["id"] == args.id:
-            if args.title:
-                task["title"] = args.title
-            if args.description:
-                task["description"] = args.description
-            if args.status:
-                task["status"] = args.status
-                if args.status == "completed":
-                    task["completed_at"] = _now_iso()
-            if args.priority:
-                task["priority"] = args.priority
-            if args.due:
-                task["due_date"] = args.due
-            if args.project:
-                task["project"] = args.project
-            if args.category:
-                task["category"] = args.category
-            if args.urgency:
-                task["urgency"] = args.urgency
-            if args.assignee:
-                task["assignee"] = args.assignee
-            task["updated_at"] = _now_iso()
-            _save_tasks(data)
-            return {
-                "status": "success",
-                "action": "updated",
-                "task": task,
-            }
-
-    return {"status": "error", "error": f"Task {args.id} not found"}
+    changes = {}
+    if args.title:
+        changes["title"] = args.title
+    if args.description:
+        changes["description"] = args.description
+    if args.status:
+        changes["status"] = args.status
+        if args.status == "completed":
+            changes["completed_at"] = _now_iso()
+    if args.priority:
+        changes["priority"] = args.priority
+    if args.due:
+        changes["due_date"] = args.due
+    if args.project:
+        changes["project"] = args.project
+    if args.category:
+        changes["category"] = args.category
+    if args.urgency:
+        changes["urgency"] = args.urgency
+    if args.assignee:
+        changes["assignee"] = args.assignee
+    changes["updated_at"] = _now_iso()
+
+    task = _open_store().update(args.id, changes)
+    if task is None:
+        return {"status": "error", "error": f"Task {args.id} not found"}
+
+    return {
+        "status": "success",
+        "action": "updated",
+        "task": task,
+    }
 
 
 def cmd_complete(args) -> dict:
     """タスク完了"""
-    data = _load_tasks()
-
-    for task in data["tasks"]:
-        if task["id"] == args.id:
-            task["status"] = "completed"
-            task["completed_at"] = _now_iso()
-            task["updated_at"] = _now_iso()
-            _save_tasks(data)
-            return {
-                "status": "success",
-                "action": "completed",
-                "task": task,
-            }
+    task = _open_store().update(args.id, {
+        "status": "completed",
+        "completed_at": _now_iso(),
+        "updated_at": _now_iso(),
+    })
+    if task is None:
+        return {"status": "error", "error": f"Task {args.id} not found"}
 
-    return {"status": "error", "error": f"Task {args.id} not found"}
+    return {
+        "status": "success",
+        "action": "completed",
+        "task": task,
+    }
 
 
 def cmd_delete(args) -> dict:
     """タスク削除"""
-    data = _load_tasks()
-    original_count = len(data["tasks"])
-    data["tasks"] = [t for t in data["tasks"] if t["id"] != args.id]
-
-    if len(data["tasks"]) == original_count:
+    if not _open_store().delete(args.id):
         return {"status": "error", "error": f"Task {args.id} not found"}
 
-    _save_tasks(data)
     return {
         "status": "success",
         "action": "deleted",
@@ -201,6 +175,21 @@ def cmd_delete(args) -> dict:
     }
 
 
+def cmd_import_json(args) -> dict:
+    """旧形式の tasks.json を取り込む（同じIDは上書き）"""
+    json_path = Path(args.file) if args.file else TASKS_FILE
+    if not json_path.exists():
+        return {"status": "error", "error": f"{json_path} not found"}
+
+    result = TaskStore(TASKS_DB).import_json(json_path)
+    return {
+        "status": "success",
+        "action": "imported",
+        "source": str(json_path),
+        **result,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(description="秘書部門タスク管理ツール")
     subparsers = parser.add_subparsers(dest="command", help="コマンド")
@@ -246,6 +235,10 @@ def main():
     p_delete = subparsers.add_parser("delete", help="タスク削除")
     p_delete.add_argument("id", help="タスクID")
 
+    # import_json
+    p_import = subparsers.add_parser("import_json", help="旧形式の tasks.json を取り込む")
+    p_import.add_argument("--file", help="取り込むJSON（省略時は tasks.json）")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -258,6 +251,7 @@ def main():
         "update": cmd_update,
         "complete": cmd_complete,
         "delete": cmd_delete,
+        "import_json": cmd_import_json,
     }
 
     try:
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+calendar_cache.CalendarCache のテスト（一時ディレクトリの SQLite）
+- 全件取得（window_start 指定）は既存のキャッシュを置き換える
+- 差分反映は status=cancelled を削除、それ以外を上書き、syncToken を更新
+- 期間の重なり検索（境界ちょうどは含まない）・カレンダーごとの分離
+- 終日イベントはカレンダーのタイムゾーンの0時
+- reset で予定と syncToken を破棄
+- calendar_tool: syncToken 期限切れ（410）の全件取得は起点を今日から数え直し、古い予定を残さない
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+import calendar_tool
+from calendar_cache import CalendarCache, event_timestamp
+from testutil import run_tests, temp_dir
+
+TZ = "Asia/Tokyo"
+CAL = "primary"
+
+
+def _ts(hour, minute=0, day=10):
+    return datetime(2026, 2, day, hour, minute, tzinfo=ZoneInfo(TZ)).timestamp()
+
+
+def _event(event_id, start_hour, end_hour, day=10, **fields):
+    return {
+        "id": event_id,
+        "status": "confirmed",
+        "start": {"dateTime": f"2026-02-{day:02d}T{start_hour:02d}:00:00+09:00"},
+        "end": {"dateTime": f"2026-02-{day:02d}T{end_hour:02d}:00:00+09:00"},
+        **fields,
+    }
+
+
+def _ids(cache, time_min=None, time_max=None, calendar_ids=(CAL,)):
+    rows = cache.events(list(calendar_ids), time_min or _ts(0), time_max or _ts(0, day=11))
+    return [row["event"]["id"] for row in rows]
+
+
+def test_full_sync_replaces_cache():
+    """Test 1: 全件取得は既存の予定を置き換え、syncToken と起点を保存する"""
+    with temp_dir() as tmp:
+        cache = CalendarCache(tmp / "calendar_cache.db")
+        assert cache.sync_state(CAL) is None
+
+        first = cache.apply(CAL, [_event("a", 9, 10), _event("b", 13, 14)], "token1", TZ, window_start=_ts(0))
+        assert first == {"upserted": 2, "deleted": 0}
+        assert _ids(cache) == ["a", "b"]
+
+        # 取得し直した全件に b がなければ消える（cancelled は全件取得でも数えない）
+        second = cache.apply(
+            CAL, [_event("c", 11, 12), {"id": "a", "status": "cancelled"}], "token2", TZ, window_start=_ts(8)
+        )
+        assert second == {"upserted": 1, "deleted": 0}
+        assert _ids(cache) == ["c"]
+
+        state = cache.sync_state(CAL)
+        assert state["sync_token"] == "token2"
+        assert state["window_start"] == _ts(8)
+
+
+def test_incremental_sync():
+    """Test 2: 差分反映は cancelled を削除、変更を上書きし、起点は引き継ぐ"""
+    with temp_dir() as tmp:
+        cache = CalendarCache(tmp / "calendar_cache.db")
+        cache.apply(CAL, [_event("a", 9, 10), _event("b", 13, 14)], "token1", TZ, window_start=_ts(0))
+
+        result = cache.apply(
+            CAL,
+            [
+                {"id": "a", "status": "cancelled"},
+                _event("b", 15, 16, summary="時間変更"),
+                _event("d", 8, 9),
+                {"id": "unknown", "status": "cancelled"},
+            ],
+            "token2", TZ
+        )
+        assert result == {"upserted": 2, "deleted": 2}
+        rows = cache.events([CAL], _ts(0), _ts(0, day=11))
+        assert [row["event"]["id"] for row in rows] == ["d", "b"]
+        assert rows[1]["start_ts"] == _ts(15)
+        assert rows[1]["event"]["summary"] == "時間変更"
+
+        state = cache.sync_state(CAL)
+        assert state["sync_token"] == "token2"
+        assert state["window_start"] == _ts(0)
+
+
+def test_events_overlap_and_calendars():
+    """Test 3: 期間に重なる予定だけを開始順で返し、カレンダーごとに分かれる"""
+    with temp_dir() as tmp:
+        cache = CalendarCache(tmp / "calendar_cache.db")
+        cache.apply(CAL, [_event("a", 9, 10), _event("b", 12, 15)], "t", TZ, window_start=_ts(0))
+        cache.apply("team", [_event("x", 11, 13)], "t", TZ, window_start=_ts(0))
+
+        assert _ids(cache, _ts(10), _ts(12)) == []  # 境界ちょうどは重ならない
+        assert _ids(cache, _ts(9, 30), _ts(12, 30)) == ["a", "b"]
+        assert _ids(cache, _ts(13), _ts(14)) == ["b"]
+        assert _ids(cache, _ts(9), _ts(14), calendar_ids=(CAL, "team")) == ["a", "x", "b"]
+        assert _ids(cache, calendar_ids=()) == []
+
+        cache.reset(CAL)
+        assert cache.sync_state(CAL) is None
+        assert _ids(cache) == []
+        assert _ids(cache, calendar_ids=("team",)) == ["x"]
+
+
+def test_all_day_event_timezone():
+    """Test 4: 終日イベントはカレンダーのタイムゾーンの0時から"""
+    assert event_timestamp({"date": "2026-02-10"}, TZ) == _ts(0)
+    assert event_timestamp({"dateTime": "2026-02-10T09:00:00+09:00"}, "UTC") == _ts(9)
+
+    with temp_dir() as tmp:
+        cache = CalendarCache(tmp / "calendar_cache.db")
+        holiday = {"id": "h", "start": {"date": "2026-02-11"}, "end": {"date": "2026-02-12"}}
+        cache.apply(CAL, [holiday], "t", TZ, window_start=_ts(0))
+        assert _ids(cache, _ts(23, day=10), _ts(1, day=11)) == ["h"]
+        assert _ids(cache, _ts(0, day=12), _ts(1, day=12)) == []
+
+
+class SyncTokenGone(Exception):
+    """syncToken 期限切れ（HttpError 410 と同じく resp.status を持つ）"""
+    resp = SimpleNamespace(status=410)
+
+
+class FakeService:
+    """events().list().execute() だけのサービス（syncToken 付きの呼び出しは 410）"""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        self.calls.append(params)
+        if "syncToken" in params:
+            raise SyncTokenGone()
+        return self
+
+    def execute(self):
+        return {"items": self.items, "nextSyncToken": "fresh"}
+
+
+def test_full_resync_moves_window():
+    """Test 5: 410 で全件取得し直すと起点は今日から数え直し、それより前の予定は消える"""
+    today = date.today()
+    old_day = today - timedelta(days=calendar_tool.CACHE_PAST_DAYS + 30)
+    old_start = calendar_tool._day_start(old_day.isoformat(), TZ)
+    today_start = calendar_tool._day_start(today.isoformat(), TZ)
+    old_event = {"id": "old", "start": {"date": old_day.isoformat()},
+                 "end": {"date": (old_day + timedelta(days=1)).isoformat()}}
+    new_event = {"id": "new", "start": {"date": today.isoformat()},
+                 "end": {"date": (today + timedelta(days=1)).isoformat()}}
+
+    with temp_dir() as tmp:
+        cache = CalendarCache(tmp / "calendar_cache.db")
+        cache.apply(CAL, [old_event], "stale", TZ, window_start=old_start.timestamp())
+
+        service = FakeService([new_event])
+        calendar_tool._thread_local.service = service
+        try:
+            items, mode = calendar_tool._fetch_calendar(
+                None, cache, {"id": CAL, "name": "primary"},
+                today_start, today_start + timedelta(days=1), TZ
+            )
+        finally:
+            del calendar_tool._thread_local.service
+
+        expected_start = calendar_tool._day_start(
+            (today - timedelta(days=calendar_tool.CACHE_PAST_DAYS)).isoformat(), TZ
+        )
+        assert mode == "full"
+        assert [event["id"] for event in items] == ["new"]
+        assert service.calls[-1]["timeMin"] == expected_start.isoformat()
+
+        state = cache.sync_state(CAL)
+        assert state["sync_token"] == "fresh"
+        assert state["window_start"] == expected_start.timestamp()
+        assert cache.events([CAL], old_start.timestamp(), expected_start.timestamp()) == []
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+calendar_tool の空き時間計算のテスト（Google Calendar には接続しない）
+- _merge_intervals: 重なる・接する・内包する区間の結合
+- _free_intervals: 窓の端をまたぐ予定、複数の窓、min_seconds ちょうどの空き
+- _align_up: ローカル時刻での30分刻みの切り上げ（JST・+05:45 のタイムゾーン）
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from calendar_tool import _align_up, _free_intervals, _merge_intervals
+from testutil import run_tests
+
+JST = ZoneInfo("Asia/Tokyo")
+MINUTE = 60
+
+
+def _ts(hour, minute=0, day=10, tz=JST):
+    return datetime(2026, 2, day, hour, minute, tzinfo=tz).timestamp()
+
+
+def _hm(intervals, tz=JST):
+    """区間を ("HH:MM", "HH:MM") に変換（比較用）"""
+    def fmt(ts):
+        return datetime.fromtimestamp(ts, tz).strftime("%H:%M")
+    return [(fmt(start), fmt(end)) for start, end in intervals]
+
+
+def test_merge_overlapping_and_touching():
+    """Test 1: 重なる・接する・内包する区間は1つに、離れた区間は別のまま"""
+    assert _merge_intervals([]) == []
+    merged = _merge_intervals([
+        (_ts(13), _ts(14)),
+        (_ts(9), _ts(10)),
+        (_ts(9, 30), _ts(11)),   # 重なる
+        (_ts(11), _ts(11, 30)),  # 接する
+        (_ts(9, 45), _ts(10)),   # 内包
+        (_ts(15), _ts(16)),
+    ])
+    assert _hm(merged) == [("09:00", "11:30"), ("13:00", "14:00"), ("15:00", "16:00")]
+
+    # 長い区間の後ろに短い区間が続いても終了は縮まない
+    assert _hm(_merge_intervals([(_ts(9), _ts(18)), (_ts(10), _ts(11))])) == [("09:00", "18:00")]
+
+
+def test_free_busy_across_window_edges():
+    """Test 2: 窓の開始前・終了後にまたがる予定は窓の中だけを塞ぐ"""
+    window = [(_ts(9), _ts(18))]
+    busy = _merge_intervals([(_ts(8), _ts(10)), (_ts(12), _ts(13)), (_ts(17), _ts(19))])
+    assert _hm(_free_intervals(busy, window, 30 * MINUTE)) == [("10:00", "12:00"), ("13:00", "17:00")]
+
+    # 窓全体を覆う予定があれば空きなし、予定がなければ窓全体
+    assert _free_intervals([(_ts(8), _ts(19))], window, 30 * MINUTE) == []
+    assert _free_intervals([], window, 30 * MINUTE) == window
+    # 窓の外だけの予定は影響しない
+    assert _free_intervals([(_ts(6), _ts(9)), (_ts(18), _ts(20))], window, 30 * MINUTE) == window
+
+
+def test_free_multiple_windows():
+    """Test 3: 日をまたぐ予定は両日の窓を塞ぎ、各窓の空きを開始順に返す"""
+    windows = [(_ts(9, day=d), _ts(18, day=d)) for d in (10, 11, 12)]
+    busy = _merge_intervals([
+        (_ts(16, day=10), _ts(10, day=11)),  # 10日夕方〜11日朝
+        (_ts(14, day=11), _ts(15, day=11)),
+        (_ts(9, day=12), _ts(18, day=12)),   # 12日は終日
+    ])
+    free = _free_intervals(busy, windows, 30 * MINUTE)
+    assert [datetime.fromtimestamp(start, JST).day for start, _ in free] == [10, 11, 11]
+    assert _hm(free) == [("09:00", "16:00"), ("10:00", "14:00"), ("15:00", "18:00")]
+
+
+def test_free_min_seconds_boundary():
+    """Test 4: min_seconds ちょうどの空きは含み、1秒でも短ければ除く"""
+    window = [(_ts(9), _ts(12))]
+    busy = [(_ts(9, 30), _ts(10)), (_ts(11), _ts(11, 30))]
+
+    free = _free_intervals(busy, window, 30 * MINUTE)
+    assert _hm(free) == [("09:00", "09:30"), ("10:00", "11:00"), ("11:30", "12:00")]
+
+    free = _free_intervals(busy, window, 30 * MINUTE + 1)
+    assert _hm(free) == [("10:00", "11:00")]
+
+    free = _free_intervals(busy, window, 60 * MINUTE + 1)
+    assert free == []
+
+
+def test_align_up_local_30_minutes():
+    """Test 5: ローカル時刻の30分刻みに切り上げ（刻み上の時刻はそのまま）"""
+    assert _align_up(_ts(9), 30, JST) == _ts(9)
+    assert _align_up(_ts(9, 0) + 1, 30, JST) == _ts(9, 30)
+    assert _align_up(_ts(9, 10), 30, JST) == _ts(9, 30)
+    assert _align_up(_ts(9, 30), 30, JST) == _ts(9, 30)
+    assert _align_up(_ts(23, 45), 30, JST) == _ts(0, day=11)
+    assert _align_up(_ts(9, 10), 60, JST) == _ts(10)
+
+    # UTC からのずれが30分単位でないタイムゾーンでも、ローカル時刻で揃える
+    nepal = ZoneInfo("Asia/Kathmandu")
+    aligned = _align_up(_ts(9, 10, tz=nepal), 30, nepal)
+    assert aligned == _ts(9, 30, tz=nepal)
+    assert datetime.fromtimestamp(aligned, nepal).strftime("%H:%M") == "09:30"
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+task_store.TaskStore のテスト（一時ディレクトリの SQLite）
+- 追加の採番（t001, t002 ...）とキー順・未知キーの保持
+- 複数スレッドから同時に追加しても取りこぼさない
+- 更新・削除（存在しないIDは None / False）、例外時は rollback
+- list の絞り込み（フィルタ・期限・期限切れ）
+- 旧形式 tasks.json の取り込み（同じIDは上書き、next_id は大きい方）
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+_THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_THIS_DIR))
+sys.path.insert(0, str(_THIS_DIR.parent.parent))
+from task_store import TASK_FIELDS, TaskStore
+from testutil import run_tests, temp_dir
+
+
+def _task(title, **fields):
+    return {"title": title, "status": "pending", "priority": "medium", **fields}
+
+
+def test_add_and_get():
+    """Test 1: 連番で採番し、キー順と未知のキーを保持する"""
+    with temp_dir() as tmp:
+        store = TaskStore(tmp / "tasks.db")
+        assert store.is_new
+
+        first = store.add(_task("資料作成", tags=["週次"]))
+        second = store.add(_task("見積もり"))
+        assert (first["id"], second["id"]) == ("t001", "t002")
+        assert list(first)[:len(TASK_FIELDS)] == TASK_FIELDS
+        assert first["tags"] == ["週次"]
+        assert store.get("t001") == first
+        assert store.get("t999") is None
+        assert store.count() == 2
+
+        # 作り直しても採番は続く
+        reopened = TaskStore(tmp / "tasks.db")
+        assert not reopened.is_new
+        assert reopened.add(_task("請求"))["id"] == "t003"
+
+
+def test_concurrent_add():
+    """Test 2: 同時に追加してもIDが重複せず、全件残る"""
+    with temp_dir() as tmp:
+        TaskStore(tmp / "tasks.db")
+        errors = []
+
+        def worker(n):
+            try:
+                store = TaskStore(tmp / "tasks.db")
+                for i in range(10):
+                    store.add(_task(f"worker{n}-{i}"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        store = TaskStore(tmp / "tasks.db")
+        ids = [task["id"] for task in store.list()]
+        assert len(ids) == len(set(ids)) == 50
+        assert store.add(_task("最後"))["id"] == "t051"
+
+
+def test_update_delete_and_rollback():
+    """Test 3: 更新・削除は存在するIDだけ、例外時は書き込みを戻す"""
+    with temp_dir() as tmp:
+        store = TaskStore(tmp / "tasks.db")
+        store.add(_task("資料作成"))
+
+        updated = store.update("t001", {"status": "completed", "id": "t999", "unknown": "x"})
+        assert updated["id"] == "t001" and updated["status"] == "completed"
+        assert "unknown" not in updated
+        assert store.update("t999", {"status": "completed"}) is None
+        assert store.update("t001", {"unknown": "x"}) == updated
+
+        try:
+            with store._transaction() as conn:
+                conn.execute("DELETE FROM tasks")
+                raise RuntimeError("中断")
+        except RuntimeError:
+            pass
+        assert store.count() == 1
+
+        assert store.delete("t001") is True
+        assert store.delete("t001") is False
+        assert store.count() == 0
+
+
+def test_list_filters():
+    """Test 4: フィルタ・期限・期限切れの絞り込みは追加順で返す"""
+    with temp_dir() as tmp:
+        store = TaskStore(tmp / "tasks.db")
+        store.add(_task("A", assignee="edith", project="blog", due_date="2026-02-09"))
+        store.add(_task("B", assignee="edith", project="newsletter", due_date="2026-02-10"))
+        store.add(_task("C", assignee="tsuruta", project="blog", due_date="2026-02-12"))
+        store.add(_task("D", assignee="edith", status="completed", due_date="2026-02-01"))
+        store.add(_task("E", assignee="edith", due_date=""))
+
+        def titles(**kwargs):
+            return [task["title"] for task in store.list(**kwargs)]
+
+        assert titles() == ["A", "B", "C", "D", "E"]
+        assert titles(filters={"assignee": "edith", "project": "blog"}) == ["A"]
+        assert titles(filters={"assignee": "edith", "project": None}) == ["A", "B", "D", "E"]
+        assert titles(due_on="2026-02-10") == ["B"]
+        assert titles(due_until="2026-02-10") == ["A", "B", "D"]
+        assert titles(overdue_before="2026-02-10") == ["A"]
+
+        try:
+            store.list(filters={"title": "A"})
+            assert False, "未対応のフィルタで ValueError にならない"
+        except ValueError:
+            pass
+
+
+def test_import_json():
+    """Test 5: tasks.json の取り込みは同じIDを上書きし、next_id は大きい方"""
+    with temp_dir() as tmp:
+        store = TaskStore(tmp / "tasks.db")
+        for i in range(12):
+            store.add(_task(f"既存{i}"))
+
+        json_path = tmp / "tasks.json"
+        json_path.write_text(json.dumps({
+            "next_id": 5,
+            "tasks": [
+                {"id": "t001", **_task("上書き"), "notes": "メモ"},
+                {"id": "t100", **_task("旧タスク")},
+            ],
+        }, ensure_ascii=False), encoding="utf-8")
+
+        assert store.import_json(json_path) == {"imported": 2, "next_id": 13}
+        assert store.count() == 13
+        assert store.get("t001")["title"] == "上書き"
+        assert store.get("t001")["notes"] == "メモ"
+        assert store.get("t100")["title"] == "旧タスク"
+        assert store.add(_task("次"))["id"] == "t013"
+
+        # 空のストアでは JSON の next_id を引き継ぐ
+        fresh = TaskStore(tmp / "fresh.db")
+        assert fresh.import_json(json_path)["next_id"] == 5
+        assert fresh.add(_task("次"))["id"] == "t005"
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
@@ -6,10 +6,17 @@
 
 import json
 import os
+import sys
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from agent_log import get_logger
+
+log = get_logger("戦略記憶")
+integration_log = get_logger("記憶統合")
+
 class StrategicMemory:
     """戦略的記憶の自律管理システム"""
 
@@ -33,8 +40,8 @@ class StrategicMemory:
         # メモリバンク初期化
         self.memory_bank = self._load_memory_bank()
 
-        print(f"[戦略記憶] 自律記憶システム起動")
-        print(f"[戦略記憶] 記憶カテゴリ: {len(self.dirs)}種類")
+        log.info("自律記憶システム起動")
+        log.info(f"記憶カテゴリ: {len(self.dirs)}種類")
 
     def _load_memory_bank(self) -> Dict[str, Any]:
         """既存の記憶バンクを読み込み"""
@@ -60,7 +67,7 @@ class StrategicMemory:
     def auto_save_insight(self, insight_type: str, data: Dict[str, Any], context: str = None) -> bool:
         """重要な発見を自動保存"""
 
-        print(f"[戦略記憶] 💾 自動保存開始: {insight_type}")
+        log.info(f"💾 自動保存開始: {insight_type}")
 
         # インサイトの分類と処理
         if insight_type == "success_pattern":
@@ -113,7 +120,7 @@ class StrategicMemory:
         # 戦略ドキュメント自動更新
         self._update_strategy_document(pattern)
 
-        print(f"[戦略記憶] ✅ 成功パターン保存: {pattern['pattern_id']}")
+        log.info(f"✅ 成功パターン保存: {pattern['pattern_id']}")
         return True
 
     def _save_keyword_discovery(self, data: Dict[str, Any], context: str) -> bool:
@@ -141,7 +148,7 @@ class StrategicMemory:
         # キーワードバンクに追加
         self._append_to_keyword_bank(discovery)
 
-        print(f"[戦略記憶] ✅ キーワード発見保存: {discovery['keyword']}")
+        log.info(f"✅ キーワード発見保存: {discovery['keyword']}")
         return True
 
     def _save_performance_milestone(self, data: Dict[str, Any], context: str) -> bool:
@@ -167,7 +174,7 @@ class StrategicMemory:
         # パフォーマンストレンド更新
         self._update_performance_trends(milestone)
 
-        print(f"[戦略記憶] ✅ パフォーマンス記録: {milestone['metric_name']} = {milestone['value']}")
+        log.info(f"✅ パフォーマンス記録: {milestone['metric_name']} = {milestone['value']}")
         return True
 
     def _save_failure_learning(self, data: Dict[str, Any], context: str) -> bool:
@@ -191,7 +198,7 @@ class StrategicMemory:
         with open(failure_file, "w", encoding="utf-8") as f:
             json.dump(learning, f, ensure_ascii=False, indent=2)
 
-        print(f"[戦略記憶] ✅ 失敗学習保存: {learning['failure_type']}")
+        log.info(f"✅ 失敗学習保存: {learning['failure_type']}")
         return True
 
     def _save_strategic_decision(self, data: Dict[str, Any], context: str) -> bool:
@@ -214,7 +221,7 @@ class StrategicMemory:
         with open(strategy_file, "w", encoding="utf-8") as f:
             json.dump(decision, f, ensure_ascii=False, indent=2)
 
-        print(f"[戦略記憶] ✅ 戦略決定保存: {decision['title']}")
+        log.info(f"✅ 戦略決定保存: {decision['title']}")
         return True
 
     def _save_general_insight(self, insight_type: str, data: Dict[str, Any], context: str) -> bool:
@@ -233,7 +240,7 @@ class StrategicMemory:
         with open(general_file, "w", encoding="utf-8") as f:
             json.dump(insight, f, ensure_ascii=False, indent=2)
 
-        print(f"[戦略記憶] ✅ インサイト保存: {insight_type}")
+        log.info(f"✅ インサイト保存: {insight_type}")
         return True
 
     def _update_strategy_document(self, pattern: Dict[str, Any]):
@@ -325,7 +332,7 @@ class StrategicMemory:
                         "memory": item
                     })
 
-        print(f"[戦略記憶] 🔍 関連記憶 {len(relevant_memories)}件を想起")
+        log.info(f"🔍 関連記憶 {len(relevant_memories)}件を想起")
         return relevant_memories
 
     def save_memory_bank(self):
@@ -340,7 +347,7 @@ class StrategicMemory:
         with open(bank_file, "w", encoding="utf-8") as f:
             json.dump(self.memory_bank, f, ensure_ascii=False, indent=2)
 
-        print(f"[戦略記憶] 💾 メモリバンク保存: {self.memory_bank['total_memories']}件")
+        log.info(f"💾 メモリバンク保存: {self.memory_bank['total_memories']}件")
 
     def get_memory_stats(self) -> Dict[str, Any]:
         """記憶統計の取得"""
@@ -365,7 +372,7 @@ class MemoryIntegration:
 
     def __init__(self):
         self.memory = StrategicMemory()
-        print(f"[記憶統合] 自律記憶システム統合完了")
+        integration_log.info("自律記憶システム統合完了")
 
     def on_seo_analysis_complete(self, analysis_data: Dict[str, Any]):
         """SEO分析完了時の自動記録"""
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+api_metrics の書き出しのテスト（ローカルのHTTPサーバーに requests で送る）
+- 集計ディレクトリに書き込めなくても、計測対象の呼び出しは成功する
+- 書き出せなかった集計はメモリに戻り、次の flush で書かれる
+- 壊れた日ごとのファイルは退避して作り直し、load_rollup は空として読む
+- record（リスナー）の中ではファイルに書かない
+"""
+
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import api_metrics
+import http_instrumentation
+import requests
+from api_metrics import ApiMetrics
+from testutil import run_tests, temp_dir
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def _measured(metrics_dir: Path):
+    """ローカルサーバーを立て、metrics_dir に書く ApiMetrics でリスナーを有効にする"""
+    server = HTTPServer(("127.0.0.1", 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    metrics = ApiMetrics(metrics_dir)
+    original = api_metrics._metrics
+    api_metrics._metrics = metrics
+    http_instrumentation.add_listener(api_metrics._measure)
+    try:
+        yield metrics, f"http://127.0.0.1:{server.server_port}/wp-json/wp/v2/posts/12"
+    finally:
+        http_instrumentation.remove_listener(api_metrics._measure)
+        api_metrics._metrics = original
+        server.shutdown()
+        server.server_close()
+
+
+def _wordpress_calls(path: Path) -> int:
+    return json.loads(path.read_text(encoding="utf-8"))["services"]["wordpress"]["calls"]
+
+
+def test_unwritable_dir_does_not_break_calls():
+    """Test 1: 書き込めないディレクトリでも呼び出しは成功し、集計は次回に書かれる"""
+    with temp_dir() as tmp:
+        blocker = tmp / "not_a_dir"
+        blocker.write_text("x")
+
+        with _measured(blocker / "api_metrics") as (metrics, url):
+            for _ in range(3):
+                assert requests.get(url, timeout=5).text == "ok"
+            assert metrics.flush() == []
+
+            metrics.metrics_dir = tmp / "api_metrics"
+            assert requests.get(url, timeout=5).status_code == 200
+            written = metrics.flush()
+
+        assert written == [metrics.rollup_path(date.today().isoformat())]
+        assert _wordpress_calls(written[0]) == 4
+
+
+def test_corrupt_rollup_is_moved_aside():
+    """Test 2: 壊れたファイルは .corrupt-* に退避して作り直す"""
+    with temp_dir() as tmp:
+        metrics_dir = tmp
+        with _measured(metrics_dir) as (metrics, url):
+            path = metrics.rollup_path(date.today().isoformat())
+            path.write_text("{not json", encoding="utf-8")
+
+            assert requests.get(url, timeout=5).text == "ok"
+            assert metrics.flush() == [path]
+
+        assert _wordpress_calls(path) == 1
+        corrupt = list(metrics_dir.glob("*.corrupt-*"))
+        assert len(corrupt) == 1
+        assert corrupt[0].read_text(encoding="utf-8") == "{not json"
+        assert api_metrics.load_rollup(corrupt[0]) == {}
+
+
+def test_record_does_not_write():
+    """Test 3: 呼び出しの記録ではファイルを書かない（書き出しは flush のみ）"""
+    with temp_dir() as tmp:
+        metrics_dir = tmp / "api_metrics"
+        original_interval = api_metrics.FLUSH_INTERVAL
+        api_metrics.FLUSH_INTERVAL = 0
+        try:
+            with _measured(metrics_dir) as (metrics, url):
+                for _ in range(2):
+                    requests.get(url, timeout=5)
+                assert not metrics_dir.exists()
+                assert metrics.flush()
+        finally:
+            api_metrics.FLUSH_INTERVAL = original_interval
+        assert _wordpress_calls(metrics.rollup_path(date.today().isoformat())) == 2
+
+
+if __name__ == "__main__":
+    sys.exit(run_tests(globals()))
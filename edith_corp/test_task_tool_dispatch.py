@@ -33,25 +33,15 @@ def _run_ashigaru(command: str, params: dict = None) -> dict:
         cwd=str(_BLOG_DEPT),
     )
 
-    # stdoutの最後の有効なJSON行を探す
+    # stdoutは結果JSONだけ（ログは stderr）
     stdout = result.stdout.strip()
     if not stdout:
         raise ValueError(f"No stdout output. stderr: {result.stderr[:500]}")
 
-    # stdout全体がJSONかもしれない、または最後のJSON部分を探す
     try:
         return json.loads(stdout)
-    except json.JSONDecodeError:
-        # 複数行の場合、最後の } から逆向きにJSONを探す
-        lines = stdout.split("\n")
-        # 最後の行からJSON部分を結合して試す
-        for i in range(len(lines)):
-            candidate = "\n".join(lines[i:])
-            try:
-                return json.loads(candidate)
-            except json.JSONDecodeError:
-                continue
-        raise ValueError(f"Could not parse JSON from stdout: {stdout[:500]}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"stdout is not a single JSON document ({e}): {stdout[:500]}")
 
 
 def test_registry_loading():
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+EDITH Corporation - テスト用の共通処理
+各部門の test_*.py から使う。pytest でも、ファイルの直接実行でも同じテスト関数を回す。
+
+- temp_dir(): 一時ディレクトリ（Path）。SQLite ストアやログの置き場所
+- run_tests(): モジュール内の test_* 関数を定義順に実行して [OK] / [NG] を表示
+
+    sys.path.insert(0, str(_THIS_DIR.parent.parent))  # edith_corp
+    from testutil import run_tests, temp_dir
+
+    if __name__ == "__main__":
+        sys.exit(run_tests(globals()))
+"""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+
+@contextmanager
+def temp_dir() -> Iterator[Path]:
+    """終了時に削除される一時ディレクトリ"""
+    with tempfile.TemporaryDirectory() as tmp:
+        yield Path(tmp)
+
+
+def run_tests(namespace: Dict[str, Any]) -> int:
+    """
+    namespace（テストモジュールの globals()）の test_* 関数を定義順に実行
+
+    Returns:
+        終了コード（全件成功なら 0）
+    """
+    tests = [fn for name, fn in namespace.items() if name.startswith("test_") and callable(fn)]
+
+    failed = 0
+    for test_fn in tests:
+        try:
+            test_fn()
+            print(f"  [OK] {test_fn.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [NG] {test_fn.__doc__}: {e}")
+
+    print(f"\n  合計: {len(tests) - failed} passed, {failed} failed / {len(tests)} tests")
+    return 0 if failed == 0 else 1